@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+查询结果编码性能对比工具
+
+用途：在模拟的查询结果上对比旧的 str(dict) 输出与 JSON、列式结果编码器的耗时
+"""
+
+import argparse
+import datetime
+import decimal
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from mcp_dbutils.encoder import encode_result  # noqa: E402
+
+COLUMNS = ["id", "name", "amount", "created_at", "ref", "score", "note"]
+
+
+def make_rows(count: int) -> list:
+    """生成包含常见数据库类型的行"""
+    start = datetime.datetime(2024, 1, 1)
+    return [
+        (
+            i,
+            f"customer-{i}",
+            decimal.Decimal(i) / 100,
+            start + datetime.timedelta(seconds=i),
+            uuid.UUID(int=i),
+            i * 0.5,
+            None if i % 3 else "follow up",
+        )
+        for i in range(count)
+    ]
+
+
+def legacy_encode(columns: list, rows: list) -> str:
+    """旧实现：逐行构建字典后输出Python字面量"""
+    formatted = [dict(zip(columns, row)) for row in rows]
+    return str({"columns": columns, "rows": formatted, "row_count": len(rows), "truncated": False})
+
+
+def measure(func, *args, repeat: int) -> float:
+    """返回多次运行中的最短耗时(秒)"""
+    best = float("inf")
+    for _ in range(repeat):
+        begin = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - begin)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare result encoding paths")
+    parser.add_argument("--rows", type=int, default=100_000, help="Rows in the simulated result")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per encoder, the fastest is reported")
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    legacy = measure(legacy_encode, COLUMNS, rows, repeat=args.repeat)
+    encoded = measure(encode_result, COLUMNS, rows, repeat=args.repeat)
+    columnar = measure(encode_result, COLUMNS, rows, False, True, repeat=args.repeat)
+
+    print(f"Rows: {args.rows}")
+    print(f"str(dict):   {legacy * 1000:.1f}ms, {len(legacy_encode(COLUMNS, rows)) / 1024:.0f}KB")
+    print(f"JSON:        {encoded * 1000:.1f}ms, {len(encode_result(COLUMNS, rows)) / 1024:.0f}KB")
+    print(f"Columnar:    {columnar * 1000:.1f}ms, {len(encode_result(COLUMNS, rows, columnar=True)) / 1024:.0f}KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,7 @@ from pathlib import Path
 import yaml
 
 from .base import LOG_NAME, ConnectionServer
+from .daemon import daemon_command, default_socket_path, require_unix_sockets, run_shim
 from .log import create_logger
 
 # 获取包信息
@@ -26,6 +27,11 @@ async def run_server():
     parser = argparse.ArgumentParser(description='MCP Connection Server')
     parser.add_argument('--config', required=True, help='YAML配置文件路径')
     parser.add_argument('--local-host', help='本地主机地址')
+    parser.add_argument('command', nargs='?', choices=['daemon'],
+                        help='daemon: 作为守护进程在Unix域套接字上为本机所有客户端提供服务')
+    parser.add_argument('--connect-daemon', action='store_true',
+                        help='将stdio转发给守护进程，未运行时自动启动')
+    parser.add_argument('--socket', help='守护进程的Unix域套接字路径，默认按配置文件生成')
 
     args = parser.parse_args()
 
@@ -59,8 +65,19 @@ async def run_server():
 
     # 创建并运行服务器
     try:
+        if args.command == 'daemon' or args.connect_daemon:
+            # 只有守护进程模式需要Unix域套接字，普通模式在所有平台上运行
+            require_unix_sockets()
+            socket_path = args.socket or default_socket_path(args.config)
+        if args.connect_daemon:
+            # 转发模式不创建服务器，连接池和缓存由守护进程持有
+            await run_shim(socket_path, daemon_command(args.config, socket_path))
+            return
         server = ConnectionServer(args.config, debug)
-        await server.run(model)
+        if args.command == 'daemon':
+            await server.run_daemon(socket_path)
+        else:
+            await server.run(model)
     except KeyboardInterrupt:
         log("info", "服务器已停止")
     except Exception as e:
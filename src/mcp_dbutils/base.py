@@ -1,17 +1,43 @@
 """Connection server base class"""
 
+import asyncio
+import contextvars
+import functools
+import hashlib
 import json
+import os
+import secrets
+import threading
+import time
 from abc import ABC, abstractmethod
-from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
 from datetime import datetime
 from importlib.metadata import PackageNotFoundError, metadata
-from typing import Any, AsyncContextManager, Dict, overload
+from typing import Any, AsyncContextManager, Awaitable, Callable, Dict, Hashable, Iterator, List, Optional, Tuple, overload
 
 import mcp.types as types
-import yaml
 import mcp.server
 
+from . import daemon
 from .audit import format_logs, get_logs, log_write_operation
+from .budget import ResultBudget
+from .cache import MetadataCache, ResultCache, sql_words, table_key
+from .encoder import ResultFormat, encode_result, parse_result_format
+from .export import ExportWriter, open_export, parse_export_format, resolve_export_path
+from .pagination import KeysetPage
+from .shared_cache import SHARED_CACHE_FILE, SharedCache, decode_metadata, encode_metadata
+from .config import (
+    DEFAULT_MAX_WORKERS,
+    ConfigStore,
+    CacheConfig,
+    ConnectionConfig,
+    CursorConfig,
+    ExportConfig,
+    HealthCheckConfig,
+    LimitsConfig,
+    MetadataCacheConfig,
+)
 from .log import create_logger
 from .stats import ResourceStats
 
@@ -34,6 +60,12 @@ class ConnectionError(ConnectionHandlerError):
     pass
 
 
+class ConcurrencyLimitError(ConnectionHandlerError):
+    """Tool call rejected by per-connection admission control"""
+
+    pass
+
+
 # 常量定义
 DATABASE_CONNECTION_NAME = "Database connection name"
 EMPTY_QUERY_ERROR = "SQL query cannot be empty"
@@ -65,10 +97,400 @@ LOG_LEVEL_ERROR = "error"  # 4
 LOG_LEVEL_CRITICAL = "critical"  # 5
 LOG_LEVEL_ALERT = "alert"  # 6
 LOG_LEVEL_EMERGENCY = "emergency"  # 7
+
+# 服务端超时未生效时，客户端额外等待的秒数
+QUERY_TIMEOUT_GRACE = 2
+
+# 每次从游标读取的最大行数
+FETCH_BATCH_SIZE = 1000
+
+# 导出时两次读取之间的最长间隔（秒），写入一批行不会超过这个时间
+EXPORT_IDLE_TTL = 60
+
+# 只读且结果只取决于参数的工具，相同的并发调用共享一次执行
+COALESCED_TOOLS = frozenset((
+    "dbutils-list-tables",
+    "dbutils-run-query",
+    "dbutils-describe-table",
+    "dbutils-get-ddl",
+    "dbutils-list-indexes",
+    "dbutils-get-stats",
+    "dbutils-list-constraints",
+    "dbutils-explain-query",
+))
+
+
+class QueryContext:
+    """Limits and cancellation state of one query
+
+    The context travels with the query into worker threads. Driver code
+    registers a canceller while a statement runs, so a cancelled tool call
+    can interrupt the statement from the event loop.
+    """
+
+    def __init__(
+        self,
+        timeout: Optional[float] = None,
+        max_rows: Optional[int] = None,
+        result_format: ResultFormat = "text",
+        keyset: Optional[KeysetPage] = None,
+        budget: Optional[ResultBudget] = None,
+    ):
+        self.timeout = timeout
+        self.max_rows = max_rows
+        self.result_format = result_format
+        self.keyset = keyset
+        self.budget = budget
+        self.cancelled = False
+        self._canceller: Optional[Callable[[], Any]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def timeout_ms(self) -> Optional[int]:
+        """Timeout in whole milliseconds, None if unlimited"""
+        return max(1, int(self.timeout * 1000)) if self.timeout else None
+
+    def set_canceller(self, canceller: Optional[Callable[[], Any]]):
+        """Register the function interrupting the running statement"""
+        with self._lock:
+            self._canceller = canceller
+
+    def cancel(self):
+        """Interrupt the running statement, if any
+
+        The canceller may block on the network, so it runs in its own thread.
+        """
+        with self._lock:
+            self.cancelled = True
+            canceller = self._canceller
+        if canceller is not None:
+            threading.Thread(target=self._run_canceller, args=(canceller,), daemon=True).start()
+
+    @staticmethod
+    def _run_canceller(canceller: Callable[[], Any]):
+        try:
+            canceller()
+        except Exception:
+            # 取消是尽力而为，连接可能已经关闭
+            pass
+
+
+# 当前查询的超时与取消状态，以及工具调用请求的超时
+current_query: contextvars.ContextVar[Optional[QueryContext]] = contextvars.ContextVar(
+    "dbutils_current_query", default=None
+)
+requested_timeout: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "dbutils_requested_timeout", default=None
+)
+requested_max_rows: contextvars.ContextVar[Optional[int]] = contextvars.ContextVar(
+    "dbutils_requested_max_rows", default=None
+)
+requested_format: contextvars.ContextVar[ResultFormat] = contextvars.ContextVar(
+    "dbutils_requested_format", default="text"
+)
+requested_keyset: contextvars.ContextVar[Optional[KeysetPage]] = contextvars.ContextVar(
+    "dbutils_requested_keyset", default=None
+)
                     
+class RowBatches:
+    """Result rows read from a cursor one batch at a time
+
+    Iterating yields lists of at most FETCH_BATCH_SIZE rows, so consumers can
+    process a result without holding all of it. Iteration ends after
+    max_rows rows; one extra row is requested to tell whether the result was
+    cut short, which is then reported by truncated and kept in overflow.
+    With a budget, iteration also ends before the first row exceeding it,
+    and rows left out are kept in overflow as well. Rows given as pending
+    are yielded before any are fetched. Use async iteration when fetchmany
+    is a coroutine function.
+    """
+
+    def __init__(
+        self,
+        fetchmany: Callable[[int], Any],
+        max_rows: Optional[int] = None,
+        budget: Optional[ResultBudget] = None,
+        pending: Optional[list] = None,
+    ):
+        self.fetchmany = fetchmany
+        self.max_rows = max_rows
+        self.budget = budget
+        self.pending = pending or []
+        self.rows_read = 0
+        self.truncated = False
+        self.overflow: list = []
+
+    def _next_size(self) -> int:
+        """Rows to request next, 0 once the row past max_rows has been read"""
+        if self.max_rows is None:
+            return FETCH_BATCH_SIZE
+        return max(0, min(FETCH_BATCH_SIZE, self.max_rows + 1 - self.rows_read))
+
+    def _accept(self, batch) -> list:
+        """Count a fetched batch and drop the row read past max_rows"""
+        batch = list(batch)
+        self.rows_read += len(batch)
+        if self.max_rows is not None and self.rows_read > self.max_rows:
+            self.truncated = True
+            keep = len(batch) - (self.rows_read - self.max_rows)
+            self.overflow = batch[keep:]
+            del batch[keep:]
+        if self.budget is not None and batch:
+            admitted = self.budget.admit(batch)
+            if len(admitted) < len(batch):
+                self.truncated = True
+                self.overflow = batch[len(admitted):] + self.overflow
+            batch = admitted
+        return batch
+
+    def _accept_pending(self) -> list:
+        """Count the rows given as pending like a fetched batch"""
+        pending, self.pending = self.pending, []
+        return self._accept(pending)
+
+    def __iter__(self) -> Iterator[list]:
+        if self.pending:
+            batch = self._accept_pending()
+            if batch:
+                yield batch
+            if self.truncated:
+                return
+        size = self._next_size()
+        while size:
+            batch = self._accept(self.fetchmany(size))
+            if batch:
+                yield batch
+            if self.truncated or len(batch) < size:
+                return
+            size = self._next_size()
+
+    async def __aiter__(self):
+        if self.pending:
+            batch = self._accept_pending()
+            if batch:
+                yield batch
+            if self.truncated:
+                return
+        size = self._next_size()
+        while size:
+            batch = self._accept(await self.fetchmany(size))
+            if batch:
+                yield batch
+            if self.truncated or len(batch) < size:
+                return
+            size = self._next_size()
+
+
+class ResultCursor:
+    """Rows of a query left on the server between tool calls
+
+    The cursor pins the connection its query runs on until it is closed, so
+    later pages continue where the previous one stopped instead of running
+    the query again. Drivers provide fetchmany and close, both coroutine
+    functions when is_async is set, and describe, returning the column names
+    once rows have been fetched.
+    """
+
+    def __init__(
+        self,
+        fetchmany: Callable[[int], Any],
+        close: Callable[[], Any],
+        describe: Callable[[], List[str]],
+        is_async: bool = False,
+    ):
+        self.fetchmany = fetchmany
+        self.describe = describe
+        self.is_async = is_async
+        self.columns: Optional[List[str]] = None
+        self.rows_read = 0
+        self.exhausted = False
+        self.closed = False
+        self._close = close
+        # 上一页多读的一行，用于判断是否还有数据
+        self._pending: list = []
+
+    def _start_page(self, size: int, budget: Optional[ResultBudget]) -> RowBatches:
+        pending, self._pending = self._pending, []
+        return RowBatches(self.fetchmany, size, budget, pending)
+
+    def _finish_page(self, rows: list, batches: RowBatches) -> list:
+        self._pending = batches.overflow
+        self.exhausted = not batches.truncated
+        self.rows_read += len(rows)
+        if self.columns is None:
+            self.columns = self.describe()
+        return rows
+
+    def read_page(self, size: int, budget: Optional[ResultBudget] = None) -> list:
+        """Read up to size rows within budget, setting exhausted if none are left"""
+        batches = self._start_page(size, budget)
+        rows = [row for batch in batches for row in batch]
+        return self._finish_page(rows, batches)
+
+    async def read_page_async(self, size: int, budget: Optional[ResultBudget] = None) -> list:
+        """Read up to size rows from an asyncio driver, see read_page"""
+        batches = self._start_page(size, budget)
+        rows = [row async for batch in batches for row in batch]
+        return self._finish_page(rows, batches)
+
+    def close(self) -> Any:
+        """Release the cursor and its connection, returns an awaitable when is_async"""
+        self.closed = True
+        return self._close()
+
+
+def run_in_executor(func: Callable) -> Callable:
+    """Run a synchronous handler method in the handler's worker threads
+
+    The decorated method keeps the async interface of ConnectionHandler, but
+    its blocking driver calls no longer stall the event loop.
+    """
+
+    @functools.wraps(func)
+    async def wrapper(self: "ConnectionHandler", *args, **kwargs):
+        return await self.run_in_thread(func, self, *args, **kwargs)
+
+    return wrapper
+
+
+def cached_metadata(func: Callable) -> Callable:
+    """Serve a metadata method from the connection's metadata cache
+
+    Results are cached per method and arguments and reused while the
+    database's schema version is unchanged, see ConnectionHandler.load_metadata.
+    Place it above run_in_executor, so cache hits skip the worker threads.
+    """
+
+    @functools.wraps(func)
+    async def wrapper(self: "ConnectionHandler", *args, **kwargs):
+        key = (func.__name__, *args, *sorted(kwargs.items()))
+        return await self.load_metadata(key, lambda: func(self, *args, **kwargs))
+
+    return wrapper
+
+
+class ConcurrencyLimiter:
+    """Per-connection admission control for tool calls
+
+    At most max_concurrency calls run at once. Further calls wait in FIFO
+    order; once max_queue calls are waiting, new calls are rejected, and a
+    call that waits longer than queue_timeout fails.
+    """
+
+    def __init__(self, connection: str, limits: LimitsConfig):
+        self.connection = connection
+        self.limits = limits
+        self._semaphore = asyncio.Semaphore(limits.max_concurrency)
+        self.waiting = 0
+
+    @asynccontextmanager
+    async def acquire(self, stats: ResourceStats):
+        """Hold a slot for the duration of a tool call
+
+        Args:
+            stats: Statistics receiving queue metrics
+
+        Raises:
+            ConcurrencyLimitError: If the queue is full or the wait times out
+        """
+        if self._semaphore.locked():
+            if self.waiting >= self.limits.max_queue:
+                stats.record_rejection()
+                raise ConcurrencyLimitError(
+                    f"Too many pending requests for connection {self.connection} "
+                    f"({self.limits.max_concurrency} running, {self.waiting} queued)"
+                )
+            # 需要排队时记录队列深度和等待时间
+            self.waiting += 1
+            stats.record_queued()
+            start = time.monotonic()
+            admitted = False
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=self.limits.queue_timeout)
+                admitted = True
+            except asyncio.TimeoutError:
+                raise ConcurrencyLimitError(
+                    f"Timed out after {self.limits.queue_timeout}s waiting for a free slot "
+                    f"on connection {self.connection}"
+                )
+            finally:
+                self.waiting -= 1
+                stats.record_dequeued(time.monotonic() - start, admitted)
+        else:
+            await self._semaphore.acquire()
+
+        try:
+            yield
+        finally:
+            self._semaphore.release()
+
+
+class SingleFlight:
+    """Concurrent calls with the same key share one execution
+
+    The first call starts the work in a task of its own; calls arriving
+    while it runs await that task instead of starting another, and all of
+    them receive its result or exception. Nothing is kept once the task
+    finishes. The task is cancelled only when every caller waiting for it
+    has been cancelled.
+    """
+
+    class _Call:
+        def __init__(self, task: asyncio.Future):
+            self.task = task
+            self.waiters = 0
+
+    def __init__(self):
+        self._calls: Dict[Hashable, SingleFlight._Call] = {}
+        self.shared = 0  # 由其他调用的执行结果满足的调用数
+
+    async def do(self, key: Hashable, start: Callable[[], Awaitable[Any]]) -> Any:
+        """Run start() unless a call with the same key is in flight
+
+        Args:
+            key: Identity of the call
+            start: Coroutine function doing the work
+        """
+        call = self._calls.get(key)
+        if call is None:
+            call = self._calls[key] = self._Call(asyncio.ensure_future(start()))
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+        else:
+            self.shared += 1
+        call.waiters += 1
+        try:
+            # 调用方被取消时不影响其他等待者
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                self._forget(key, call)
+                call.task.cancel()
+
+    def _forget(self, key: Hashable, call: "SingleFlight._Call"):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._calls
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+
 class ConnectionHandler(ABC):
     """Abstract base class defining common interface for connection handlers"""
 
+    # 每个处理器独立的工作线程池，首次使用时创建
+    _executor: Optional[ThreadPoolExecutor] = None
+    _executor_lock = threading.Lock()
+
+    # 驱动模式：'sync' 在工作线程中调用阻塞驱动，'async' 直接运行于事件循环
+    driver: str = "sync"
+
+    # 本机所有服务进程共享的缓存文件，由服务器在每次调用前设置
+    shared_cache: Optional[SharedCache] = None
+
     def __init__(self, config_path: str, connection: str, debug: bool = False):
         """Initialize connection handler
 
@@ -84,6 +506,8 @@ class ConnectionHandler(ABC):
         self.log = create_logger(f"{LOG_NAME}.handler.{connection}", debug)
         self.stats = ResourceStats()
         self._session = None
+        self._result_cache: Optional[ResultCache] = None
+        self._metadata_cache: Optional[MetadataCache] = None
 
     def send_log(self, level: str, message: str):
         """通过MCP发送日志消息和写入stderr
@@ -119,6 +543,229 @@ class ConnectionHandler(ABC):
         """Log error message with optional formatting"""
         self.send_log(LOG_LEVEL_ERROR, message.format(*args, **kwargs))
 
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Get the worker thread pool, creating it on first use"""
+        with ConnectionHandler._executor_lock:
+            if self._executor is None:
+                max_workers = getattr(getattr(self, "config", None), "max_workers", None)
+                if not isinstance(max_workers, int) or max_workers < 1:
+                    max_workers = DEFAULT_MAX_WORKERS
+                self._executor = ThreadPoolExecutor(
+                    max_workers=max_workers,
+                    thread_name_prefix=f"{LOG_NAME}-{self.connection}",
+                )
+            return self._executor
+
+    async def run_in_thread(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a blocking function in this handler's worker threads
+
+        Args:
+            func: Function to call
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            The return value of func
+        """
+        loop = asyncio.get_running_loop()
+        # 复制上下文，使工作线程能读取当前查询的超时并注册取消函数
+        context = contextvars.copy_context()
+        future = loop.run_in_executor(
+            self._get_executor(), functools.partial(context.run, func, *args, **kwargs)
+        )
+        try:
+            return await future
+        except asyncio.CancelledError:
+            # 工作线程无法被取消，中断其正在数据库中执行的语句
+            query = context.get(current_query)
+            if query is not None:
+                query.cancel()
+            raise
+
+    def get_query_timeout(self) -> Optional[float]:
+        """Get the timeout of the query being executed
+
+        Returns:
+            Timeout in seconds, None if unlimited
+        """
+        query = current_query.get()
+        return query.timeout if query is not None else None
+
+    def get_query_timeout_ms(self) -> Optional[int]:
+        """Get the timeout of the query being executed in milliseconds"""
+        query = current_query.get()
+        return query.timeout_ms if query is not None else None
+
+    @contextmanager
+    def cancel_scope(self, canceller: Callable[[], Any]) -> Iterator[None]:
+        """Allow the running statement to be interrupted by canceller
+
+        Args:
+            canceller: Thread-safe function interrupting the statement
+
+        Raises:
+            ConnectionHandlerError: If the query was cancelled before it started
+        """
+        query = current_query.get()
+        if query is None:
+            yield
+            return
+        if query.cancelled:
+            raise ConnectionHandlerError("Query cancelled")
+        query.set_canceller(canceller)
+        try:
+            yield
+        finally:
+            query.set_canceller(None)
+
+    def get_max_rows(self) -> Optional[int]:
+        """Get the row cap of the query being executed, None if unlimited"""
+        query = current_query.get()
+        return query.max_rows if query is not None else None
+
+    def get_result_format(self) -> ResultFormat:
+        """Get the format the query result should be returned in"""
+        query = current_query.get()
+        return query.result_format if query is not None else "text"
+
+    def get_result_budget(self) -> Optional[ResultBudget]:
+        """Get the byte budget of the query being executed, None if unlimited"""
+        query = current_query.get()
+        return query.budget if query is not None else None
+
+    def format_result(self, columns: List[str], rows: list, truncated: bool, **extra: Any) -> str:
+        """Render query rows in the format requested by the tool call
+
+        Rows are read as tuples; only the text format builds a dictionary per
+        row, the json format writes objects straight from the tuples and the
+        columnar format writes the tuples as arrays.
+
+        Cells cut and rows left out by the byte budget are listed in
+        truncated_cells and truncated_reason. For a keyset page, rows left
+        unread are not reported as truncated; next_after carries the key of
+        the last row instead.
+
+        Args:
+            columns: Column names
+            rows: Rows as sequences
+            truncated: Whether rows were left unread
+            extra: Additional top-level fields, such as the database type
+        """
+        query = current_query.get()
+        if query is not None and query.budget is not None:
+            extra.update(query.budget.report(columns))
+        if query is not None and query.keyset is not None and truncated and rows:
+            try:
+                extra["next_after"] = query.keyset.next_after(columns, rows[-1])
+            except ValueError as e:
+                raise ConnectionHandlerError(str(e))
+            truncated = False
+        if not truncated:
+            extra.pop("truncated_reason", None)
+        result_format = self.get_result_format()
+        if result_format != "text":
+            return encode_result(columns, rows, truncated, columnar=result_format == "columnar", **extra)
+        return str({
+            **extra,
+            "columns": columns,
+            "rows": [dict(zip(columns, row)) for row in rows],
+            "row_count": len(rows),
+            "truncated": truncated,
+        })
+
+    def iter_rows(self, fetchmany: Callable[[int], Any]) -> "RowBatches":
+        """Read result rows batch by batch, stopping at the query's max_rows or byte budget
+
+        Args:
+            fetchmany: The cursor's fetchmany method
+        """
+        return RowBatches(fetchmany, self.get_max_rows(), self.get_result_budget())
+
+    def fetch_rows(self, fetchmany: Callable[[int], Any]) -> Tuple[list, bool]:
+        """Read result rows, stopping at the query's max_rows or byte budget
+
+        Args:
+            fetchmany: The cursor's fetchmany method
+
+        Returns:
+            Tuple of the rows read and whether more rows were left unread
+        """
+        batches = self.iter_rows(fetchmany)
+        rows = [row for batch in batches for row in batch]
+        return rows, batches.truncated
+
+    async def fetch_rows_async(self, fetchmany: Callable[[int], Any]) -> Tuple[list, bool]:
+        """Read result rows from an asyncio driver, see fetch_rows"""
+        batches = self.iter_rows(fetchmany)
+        rows = [row async for batch in batches for row in batch]
+        return rows, batches.truncated
+
+    @staticmethod
+    def _strictest_limit(*limits: Any) -> Any:
+        """Smallest of the given positive limits, None if none is set"""
+        values = [
+            limit
+            for limit in limits
+            if isinstance(limit, (int, float)) and not isinstance(limit, bool) and limit > 0
+        ]
+        return min(values) if values else None
+
+    def _resolve_query_timeout(self) -> Optional[float]:
+        """Combine the connection's query_timeout with the timeout requested by the tool call"""
+        return self._strictest_limit(
+            getattr(getattr(self, "config", None), "query_timeout", None),
+            requested_timeout.get(),
+        )
+
+    def _resolve_max_rows(self) -> Optional[int]:
+        """Combine the connection's max_rows with the row cap requested by the tool call"""
+        return self._strictest_limit(
+            getattr(getattr(self, "config", None), "max_rows", None),
+            requested_max_rows.get(),
+        )
+
+    def _resolve_result_budget(self) -> Optional[ResultBudget]:
+        """Create the byte budget of a query from the connection's limits"""
+        config = getattr(self, "config", None)
+        max_bytes = self._strictest_limit(getattr(config, "max_result_bytes", None))
+        max_cell_bytes = self._strictest_limit(getattr(config, "max_cell_bytes", None))
+        if max_bytes is None and max_cell_bytes is None:
+            return None
+        return ResultBudget(max_bytes, max_cell_bytes)
+
+    async def _run_query(self, coro) -> Any:
+        """Await a query coroutine with the resolved timeout
+
+        The driver enforces the timeout on the server; the wait here only
+        catches drivers that fail to, and gives up a little later.
+
+        Args:
+            coro: Coroutine executing the query, not yet started
+        """
+        query = QueryContext(
+            self._resolve_query_timeout(),
+            self._resolve_max_rows(),
+            requested_format.get(),
+            requested_keyset.get(),
+            self._resolve_result_budget(),
+        )
+        token = current_query.set(query)
+        try:
+            if query.timeout is None:
+                return await coro
+            return await asyncio.wait_for(coro, timeout=query.timeout + QUERY_TIMEOUT_GRACE)
+        except asyncio.TimeoutError:
+            raise ConnectionHandlerError(f"Query exceeded the {query.timeout}s timeout")
+        finally:
+            current_query.reset(token)
+
+    def shutdown_executor(self):
+        """Stop the worker threads once pending calls have finished"""
+        with ConnectionHandler._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
     @property
     @abstractmethod
     def db_type(self) -> str:
@@ -145,12 +792,158 @@ class ConnectionHandler(ABC):
         """Internal write query execution method to be implemented by subclasses"""
         pass
 
+    def _get_result_cache(self) -> Optional[ResultCache]:
+        """Get the connection's result cache, None if caching is not configured"""
+        config = getattr(getattr(self, "config", None), "cache", None)
+        if not isinstance(config, CacheConfig):
+            return None
+        cache = getattr(self, "_result_cache", None)
+        if cache is None:
+            cache = self._result_cache = ResultCache(config.ttl, config.max_bytes)
+        return cache
+
+    def _invalidate_result_cache(self, table: Optional[str] = None):
+        """Drop cached results mentioning a table written through this connection"""
+        cache = getattr(self, "_result_cache", None)
+        if cache is not None:
+            cache.invalidate(table)
+
+    def _get_metadata_cache(self) -> Optional[MetadataCache]:
+        """Get the connection's metadata cache, None if caching is not configured"""
+        config = getattr(getattr(self, "config", None), "metadata_cache", None)
+        if not isinstance(config, MetadataCacheConfig):
+            return None
+        cache = getattr(self, "_metadata_cache", None)
+        if cache is None:
+            cache = self._metadata_cache = MetadataCache(config.ttl, config.max_entries)
+        return cache
+
+    def _get_cache_scope(self) -> str:
+        """Identity of the database in the shared cache, the same in every process"""
+        scope = getattr(self, "_cache_scope", None)
+        if scope is None:
+            info = [self.db_type, self.config.get_masked_connection_info(), getattr(self.config, "user", None)]
+            data = json.dumps(info, sort_keys=True, default=str).encode("utf-8")
+            scope = self._cache_scope = hashlib.sha256(data).hexdigest()
+        return scope
+
+    async def _call_shared_cache(self, method: str, *args) -> Any:
+        """Call a method of the shared cache in a worker thread
+
+        Returns:
+            Its return value, None if no shared cache is set or the call failed
+        """
+        shared = self.shared_cache
+        if shared is None:
+            return None
+        try:
+            return await self.run_in_thread(getattr(shared, method), *args)
+        except Exception as e:
+            # 共享缓存只用于加速，出错时按未命中处理
+            self.log("debug", f"Shared cache {method} failed: {str(e)}")
+            return None
+
+    async def _shared_get(self, *parts: Any) -> Optional[str]:
+        """Get an entry other processes may have written to the shared cache"""
+        if self.shared_cache is None:
+            return None
+        value = await self._call_shared_cache("get", SharedCache.make_key(self._get_cache_scope(), *parts))
+        if value is not None:
+            self.stats.record_shared_cache_hit()
+        return value
+
+    async def _shared_put(self, parts: Tuple[Any, ...], value: str, ttl: float, words: Any = ()):
+        """Write an entry to the shared cache for other processes"""
+        if self.shared_cache is None:
+            return
+        scope = self._get_cache_scope()
+        await self._call_shared_cache("put", SharedCache.make_key(scope, *parts), scope, value, ttl, words)
+
+    async def _shared_invalidate(self, table: Optional[str] = None):
+        """Drop shared entries mentioning a table written through this connection"""
+        if self.shared_cache is None:
+            return
+        name = table_key(table) if table else None
+        await self._call_shared_cache("invalidate", self._get_cache_scope(), name)
+
+    async def _schema_version(self) -> Any:
+        """Internal method reading a value that changes with every DDL statement
+
+        Drivers override it with a query cheaper than the metadata calls it
+        guards. The default None makes cached metadata expire by TTL only.
+        """
+        return None
+
+    async def load_metadata(self, key: Tuple[Any, ...], load: Callable[[], Any]) -> Any:
+        """Get metadata from the cache or load it
+
+        The schema version is read before the lookup and before loading, so
+        metadata loaded while DDL runs is cached under the older version and
+        dropped by the next lookup. If the version cannot be read the cache
+        is bypassed.
+
+        Args:
+            key: Method name and arguments
+            load: Coroutine function loading the metadata
+        """
+        cache = self._get_metadata_cache()
+        if cache is None:
+            return await load()
+        try:
+            version = await self._schema_version()
+        except Exception as e:
+            self.log("debug", f"Schema version probe failed, metadata cache bypassed: {str(e)}")
+            return await load()
+        entry = cache.get(key, version)
+        if entry is None:
+            # 本进程未缓存时查找其他进程在同一schema版本下读取的结果
+            shared = await self._shared_get("metadata", version, *key)
+            if shared is not None:
+                cache.put(key, decode_metadata(shared), version)
+                entry = cache.get(key, version)
+        self.stats.record_metadata_lookup(entry is not None)
+        if entry is not None:
+            return entry.value
+        value = await load()
+        cache.put(key, value, version)
+        data = encode_metadata(value)
+        if data is not None:
+            await self._shared_put(("metadata", version, *key), data, cache.ttl)
+        return value
+
     async def execute_query(self, sql: str) -> str:
-        """Execute SQL query with performance tracking"""
+        """Execute SQL query with performance tracking
+
+        With a result cache configured, a query repeating a cached one with
+        the same result format and row cap is answered from the cache.
+        """
+        cache = self._get_result_cache()
+        if cache is not None:
+            keyset = requested_keyset.get()
+            key = cache.make_key(
+                sql,
+                requested_format.get(),
+                self._resolve_max_rows(),
+                tuple(keyset.key) if keyset is not None else None,
+            )
+            cached = cache.get(key)
+            if cached is None:
+                cached = await self._shared_get("result", *key)
+                if cached is not None:
+                    cache.put(key, cached, cache.generation)
+            self.stats.record_cache_lookup(cached is not None, cache.size)
+            if cached is not None:
+                self.send_log(LOG_LEVEL_INFO, "Query result served from cache")
+                return cached
+            generation = cache.generation
+
         start_time = datetime.now()
         try:
             self.stats.record_query()
-            result = await self._execute_query(sql)
+            result = await self._run_query(self._execute_query(sql))
+            if cache is not None and generation == cache.generation:
+                cache.put(key, result, generation)
+                await self._shared_put(("result", *key), result, cache.ttl, sql_words(key[0]))
             duration = (datetime.now() - start_time).total_seconds()
             self.stats.record_query_duration(sql, duration)
             self.stats.update_memory_usage(result)
@@ -168,6 +961,122 @@ class ConnectionHandler(ABC):
             )
             raise
 
+    async def _open_cursor(self, sql: str, idle_ttl: float) -> ResultCursor:
+        """Internal method executing a query for paging, implemented by drivers that support it"""
+        raise ConnectionHandlerError(f"Paging query results is not supported for {self.db_type}")
+
+    async def open_cursor(self, sql: str, idle_ttl: float) -> ResultCursor:
+        """Execute a query and keep its result on the server for paging
+
+        Args:
+            sql: SQL query
+            idle_ttl: Seconds the cursor may wait between pages
+
+        Returns:
+            ResultCursor holding a connection until it is closed
+        """
+        start_time = datetime.now()
+        try:
+            self.stats.record_query()
+            cursor = await self._run_query(self._open_cursor(sql, idle_ttl))
+            self.stats.record_query_duration(sql, (datetime.now() - start_time).total_seconds())
+            return cursor
+        except Exception as e:
+            self.stats.record_error(e.__class__.__name__)
+            self.send_log(LOG_LEVEL_ERROR, f"Query error - {str(e)}")
+            raise
+
+    async def fetch_page(self, cursor: ResultCursor, size: int, token: str) -> str:
+        """Read the next page of an open cursor in the requested result format
+
+        Args:
+            cursor: Cursor returned by open_cursor
+            size: Maximum rows in the page
+            token: Continuation token reported while rows remain
+
+        Returns:
+            Formatted page with next_token set unless the cursor is exhausted
+        """
+        async def read_page() -> str:
+            # 每页行数不超过max_rows
+            page_size = self._strictest_limit(size, self.get_max_rows())
+            budget = self.get_result_budget()
+            if cursor.is_async:
+                rows = await cursor.read_page_async(page_size, budget)
+            else:
+                rows = await self.run_in_thread(cursor.read_page, page_size, budget)
+            extra = {} if cursor.exhausted else {"next_token": token}
+            return self.format_result(cursor.columns, rows, False, **extra)
+
+        try:
+            result = await self._run_query(read_page())
+        except ConnectionHandlerError:
+            raise
+        except Exception as e:
+            raise ConnectionHandlerError(f"[{self.db_type}] Fetching rows failed: {str(e)}")
+        self.stats.update_memory_usage(result)
+        return result
+
+    async def close_cursor(self, cursor: ResultCursor):
+        """Close a cursor and return its connection"""
+        if cursor.closed:
+            return
+        if cursor.is_async:
+            await cursor.close()
+        else:
+            await self.run_in_thread(cursor.close)
+
+    async def _export_query(self, sql: str, writer: ExportWriter):
+        """Internal method streaming a query result into writer
+
+        Rows are read through the driver's paging cursor, without max_rows
+        or the byte budget. Drivers with a native bulk export may override it.
+        """
+        cursor = await self._open_cursor(sql, EXPORT_IDLE_TTL)
+        try:
+            if cursor.is_async:
+                async for batch in RowBatches(cursor.fetchmany):
+                    await self.run_in_thread(writer.write, cursor.describe(), batch)
+            else:
+                await self.run_in_thread(self._write_export, cursor, writer)
+            if not writer.started:
+                writer.write(cursor.describe(), [])
+        except ConnectionHandlerError:
+            raise
+        except Exception as e:
+            raise ConnectionHandlerError(f"[{self.db_type}] Export failed: {str(e)}")
+        finally:
+            await self.close_cursor(cursor)
+
+    @staticmethod
+    def _write_export(cursor: ResultCursor, writer: ExportWriter):
+        """Copy all rows of a blocking driver's cursor into writer"""
+        for batch in RowBatches(cursor.fetchmany):
+            writer.write(cursor.describe(), batch)
+
+    async def export_query(self, sql: str, writer: ExportWriter) -> int:
+        """Execute a query and write its whole result to a file
+
+        Args:
+            sql: SQL query
+            writer: Writer of the export file, committed by the caller
+
+        Returns:
+            Number of rows written
+        """
+        start_time = datetime.now()
+        try:
+            self.stats.record_query()
+            await self._run_query(self._export_query(sql, writer))
+            duration = (datetime.now() - start_time).total_seconds()
+            self.stats.record_query_duration(sql, duration)
+            self.send_log(LOG_LEVEL_INFO, f"Exported {writer.row_count} rows in {duration * 1000:.2f}ms")
+            return writer.row_count
+        except Exception as e:
+            self.stats.record_error(e.__class__.__name__)
+            self.send_log(LOG_LEVEL_ERROR, f"Export error - {str(e)}")
+            raise
+
     async def execute_write_query(self, sql: str) -> str:
         """Execute SQL write query with performance tracking
 
@@ -200,7 +1109,12 @@ class ConnectionHandler(ABC):
                 f"Executing write operation: {sql_type} on table {table_name}",
             )
 
-            result = await self._execute_write_query(sql)
+            try:
+                result = await self._run_query(self._execute_write_query(sql))
+            finally:
+                # 写入失败时也可能已部分生效
+                self._invalidate_result_cache(table_name)
+                await self._shared_invalidate(table_name)
 
             # 尝试从结果中提取受影响的行数
             try:
@@ -466,6 +1380,27 @@ class ConnectionHandler(ABC):
             raise
 
 
+class PagedQuery:
+    """A query result kept open for dbutils-fetch-more"""
+
+    def __init__(
+        self,
+        connection: str,
+        handler: ConnectionHandler,
+        cursor: ResultCursor,
+        result_format: ResultFormat,
+        page_size: int,
+    ):
+        self.connection = connection
+        self.handler = handler
+        self.cursor = cursor
+        self.result_format = result_format
+        self.page_size = page_size
+        self.last_used = time.monotonic()
+        # 同一结果的页按顺序读取
+        self.lock = asyncio.Lock()
+
+
 class ConnectionServer:
     """Unified connection server class"""
 
@@ -478,15 +1413,48 @@ class ConnectionServer:
         """
         self.config_path = config_path
         self.debug = debug
-        
+        # 按连接名称缓存的长生命周期处理器，在工具调用之间复用
+        self._handlers: Dict[str, ConnectionHandler] = {}
+        # 创建处理器时使用的连接配置，配置变更后重新创建处理器
+        self._handler_configs: Dict[str, dict] = {}
+        # 正在使用各处理器的调用数，被替换的处理器在调用结束后才释放
+        self._handler_users: Dict[ConnectionHandler, int] = {}
+        self._retired_handlers: list[Tuple[str, ConnectionHandler]] = []
+        self._handlers_lock = asyncio.Lock()
+        # 按连接名称的工具调用准入控制
+        self._limiters: Dict[str, ConcurrencyLimiter] = {}
+        # 连接状态缓存: 连接名称 -> (检查时间, 检查时的连接配置, 状态)
+        self._health_cache: Dict[str, Tuple[float, dict, str]] = {}
+        self._health_task: Optional[asyncio.Task] = None
+        # 分页查询保留的游标: 续页令牌 -> 查询结果，每个游标占用一个连接
+        self._cursors: Dict[str, PagedQuery] = {}
+        self._cursors_opening = 0
+        self._cursor_task: Optional[asyncio.Task] = None
+        self._active_lifespans = 0
+        # 执行中的只读工具调用，相同的并发调用等待同一次执行
+        self._inflight = SingleFlight()
+        # 与本机其他服务进程共享的缓存文件，配置shared_cache后首次调用时打开
+        self._shared_cache: Optional[SharedCache] = None
+
         @asynccontextmanager
         async def app_lifespan(app: mcp.server.fastmcp.FastMCP):
             """Application lifespan context manager for SSE model"""
             self.send_log(LOG_LEVEL_INFO, "App Lifespan initialising")
-            try:                    
+            self._active_lifespans += 1
+            if self._active_lifespans == 1:
+                self._start_health_checks()
+            try:
                 yield
             finally:
-                self.send_log(LOG_LEVEL_INFO, "SSE model server stopped") 
+                self._active_lifespans -= 1
+                # SSE模式下每个会话都会进入lifespan，只有最后一个会话结束时才释放处理器
+                if self._active_lifespans <= 0:
+                    await self._stop_health_checks()
+                    await self.close_handlers()
+                self.send_log(LOG_LEVEL_INFO, "SSE model server stopped")
+
+        # 守护进程模式在整个运行期间持有lifespan，客户端全部断开后仍保留处理器
+        self._lifespan = app_lifespan
             
         # 获取包信息用于服务器配置
         try:
@@ -550,6 +1518,10 @@ class ConnectionServer:
                 self.send_log(LOG_LEVEL_ERROR, f"Error in list_prompts: {str(e)}")
                 raise
 
+    def _load_config(self) -> Optional[dict]:
+        """获取配置文件内容，文件未变更时复用已解析的快照，不可修改"""
+        return ConfigStore.for_path(self.config_path).load()
+
     def _get_config_or_raise(self, connection: str) -> dict:
         """读取配置文件并验证连接配置
 
@@ -562,26 +1534,25 @@ class ConnectionServer:
         Raises:
             ConfigurationError: 如果配置文件格式不正确或连接不存在
         """
-        with open(self.config_path, "r") as f:
-            config = yaml.safe_load(f)
-            if not config or "connections" not in config:
-                raise ConfigurationError(
-                    "Configuration file must contain 'connections' section"
-                )
-            if connection not in config["connections"]:
-                available_connections = list(config["connections"].keys())
-                raise ConfigurationError(
-                    f"Connection not found: {connection}. Available connections: {available_connections}"
-                )
+        config = self._load_config()
+        if not config or "connections" not in config:
+            raise ConfigurationError(
+                "Configuration file must contain 'connections' section"
+            )
+        if connection not in config["connections"]:
+            available_connections = list(config["connections"].keys())
+            raise ConfigurationError(
+                f"Connection not found: {connection}. Available connections: {available_connections}"
+            )
 
-            db_config = config["connections"][connection]
+        db_config = config["connections"][connection]
 
-            if "type" not in db_config:
-                raise ConfigurationError(
-                    "Database configuration must include 'type' field"
-                )
+        if "type" not in db_config:
+            raise ConfigurationError(
+                "Database configuration must include 'type' field"
+            )
 
-            return db_config
+        return db_config
 
     def _get_sql_type(self, sql: str) -> str:
         """Get SQL statement type
@@ -723,46 +1694,221 @@ class ConnectionServer:
                 ))
 
     def _create_handler_for_type(
-        self, db_type: str, connection: str
+        self, db_type: str, connection: str, driver: str = "sync"
     ) -> ConnectionHandler:
         """基于数据库类型创建相应的处理器
 
         Args:
             db_type: 数据库类型
             connection: 连接名称
+            driver: 驱动模式（'sync' 或 'async'）
+
+        Returns:
+            ConnectionHandler: 数据库连接处理器
+
+        Raises:
+            ConfigurationError: 如果数据库类型不支持或导入失败
+        """
+        self.send_log(LOG_LEVEL_DEBUG, f"Creating handler for database type: {db_type}")
+
+        try:
+            if db_type == "sqlite":
+                from .sqlite.handler import SQLiteHandler
+
+                return SQLiteHandler(self.config_path, connection, self.debug)
+            elif db_type == "postgres" and driver == "async":
+                from .postgres.async_handler import AsyncPostgreSQLHandler
+
+                return AsyncPostgreSQLHandler(self.config_path, connection, self.debug)
+            elif db_type == "postgres":
+                from .postgres.handler import PostgreSQLHandler
+
+                return PostgreSQLHandler(self.config_path, connection, self.debug)
+            elif db_type == "mysql" and driver == "async":
+                from .mysql.async_handler import AsyncMySQLHandler
+
+                return AsyncMySQLHandler(self.config_path, connection, self.debug)
+            elif db_type == "mysql":
+                from .mysql.handler import MySQLHandler
+
+                return MySQLHandler(self.config_path, connection, self.debug)
+            elif db_type == "oracle":
+                from .oracle.handler import OracleHandler
+                
+                return OracleHandler(self.config_path, connection, self.debug)
+            else:
+                raise ConfigurationError(f"Unsupported database type: {db_type}")
+        except ImportError as e:
+            # 捕获导入错误并转换为ConfigurationError，以保持与现有测试兼容
+            raise ConfigurationError(
+                f"Failed to import handler for {db_type}: {str(e)}"
+            )
+
+    async def _get_or_create_handler(
+        self, connection: str, db_config: dict
+    ) -> ConnectionHandler:
+        """获取已缓存的处理器，不存在时创建并缓存
+
+        Args:
+            connection: 连接名称
+            db_config: 连接配置
+
+        Returns:
+            ConnectionHandler: 数据库连接处理器
+
+        Raises:
+            ConfigurationError: 如果数据库类型不支持或导入失败
+        """
+        db_type = db_config["type"]
+        driver = db_config.get("driver", "sync")
+        handler = self._handlers.get(connection)
+        if self._is_current_handler(connection, handler, db_config):
+            return handler
+
+        async with self._handlers_lock:
+            handler = self._handlers.get(connection)
+            if self._is_current_handler(connection, handler, db_config):
+                return handler
+
+            if handler is not None:
+                # 连接配置已变更，释放旧处理器后重新创建
+                self.send_log(
+                    LOG_LEVEL_DEBUG,
+                    f"Configuration changed for {connection}, recreating handler",
+                )
+                await self._retire_handler(connection, handler)
+
+            handler = self._create_handler_for_type(db_type, connection, driver)
+            self._handlers[connection] = handler
+            self._handler_configs[connection] = db_config
+            self.send_log(
+                LOG_LEVEL_DEBUG, f"Handler created successfully for {connection}"
+            )
+            return handler
+
+    @staticmethod
+    def _handler_matches(handler: ConnectionHandler, db_type: str, driver: str) -> bool:
+        """判断已缓存的处理器是否仍符合当前配置"""
+        return handler.db_type == db_type and handler.driver == driver
+
+    def _is_current_handler(
+        self, connection: str, handler: Optional[ConnectionHandler], db_config: dict
+    ) -> bool:
+        """判断已缓存的处理器是否由当前的连接配置创建"""
+        return (
+            handler is not None
+            and self._handler_matches(handler, db_config["type"], db_config.get("driver", "sync"))
+            and self._handler_configs.get(connection) == db_config
+        )
+
+    async def _retire_handler(self, connection: str, handler: ConnectionHandler):
+        """替换处理器，仍在使用旧处理器的调用结束后再释放它"""
+        if self._handler_users.get(handler, 0) > 0:
+            self._retired_handlers.append((connection, handler))
+        else:
+            await self._cleanup_handler(connection, handler)
+
+    async def _cleanup_handler(self, connection: str, handler: ConnectionHandler):
+        """释放单个处理器的资源
+
+        Args:
+            connection: 连接名称
+            handler: 数据库连接处理器
+        """
+        self.send_log(LOG_LEVEL_DEBUG, f"Cleaning up handler for {connection}")
+        try:
+            if hasattr(handler, "cleanup") and callable(handler.cleanup):
+                await handler.cleanup()
+        except Exception as e:
+            self.send_log(
+                LOG_LEVEL_WARNING,
+                f"Error cleaning up handler for {connection}: {str(e)}",
+            )
+
+    async def close_handlers(self):
+        """Close all cached connection handlers
+
+        Called when the server shuts down so that pools and cached connections
+        held by handlers are released.
+        """
+        await self._close_cursors()
+
+        async with self._handlers_lock:
+            handlers = list(self._handlers.items()) + self._retired_handlers
+            self._handlers.clear()
+            self._handler_configs.clear()
+            self._retired_handlers = []
+
+        for connection, handler in handlers:
+            await self._cleanup_handler(connection, handler)
+
+        # 关闭按处理器类共享的连接池（如Oracle）
+        for handler_cls in {type(handler) for _, handler in handlers}:
+            close_pools = getattr(handler_cls, "close_pools", None)
+            if callable(close_pools):
+                try:
+                    await close_pools()
+                except Exception as e:
+                    self.send_log(
+                        LOG_LEVEL_WARNING,
+                        f"Error closing {handler_cls.__name__} pools: {str(e)}",
+                    )
+
+        if self._shared_cache is not None:
+            self._shared_cache.close()
+            self._shared_cache = None
+
+    def _get_shared_cache(self) -> Optional[SharedCache]:
+        """获取与本机其他服务进程共享的缓存，未配置时返回None
+
+        缓存目录的相对路径以配置文件所在目录为基准，配置变更后重新打开
+
+        Raises:
+            ConfigurationError: 如果shared_cache配置无效
+        """
+        try:
+            config = ConnectionConfig.parse_shared_cache(self._load_config() or {})
+        except ValueError as e:
+            raise ConfigurationError(str(e))
+        if config.directory is None:
+            self._shared_cache = None
+            return None
+        path = os.path.join(
+            os.path.dirname(os.path.abspath(self.config_path)),
+            os.path.expanduser(config.directory),
+            SHARED_CACHE_FILE,
+        )
+        shared = self._shared_cache
+        if shared is None or (shared.path, shared.max_bytes, shared.max_entry_bytes) != (
+            path, config.max_bytes, config.max_entry_bytes
+        ):
+            # 旧实例可能仍被进行中的调用使用，由垃圾回收关闭
+            shared = self._shared_cache = SharedCache(path, config.max_bytes, config.max_entry_bytes)
+        return shared
+
+    def _get_limiter(self, connection: str, db_config: dict) -> ConcurrencyLimiter:
+        """获取连接的准入控制器，限制配置变更时重新创建
+
+        Args:
+            connection: 连接名称
+            db_config: 连接配置
 
         Returns:
-            ConnectionHandler: 数据库连接处理器
+            ConcurrencyLimiter: 准入控制器
 
         Raises:
-            ConfigurationError: 如果数据库类型不支持或导入失败
+            ConfigurationError: 如果限制配置无效
         """
-        self.send_log(LOG_LEVEL_DEBUG, f"Creating handler for database type: {db_type}")
-
         try:
-            if db_type == "sqlite":
-                from .sqlite.handler import SQLiteHandler
-
-                return SQLiteHandler(self.config_path, connection, self.debug)
-            elif db_type == "postgres":
-                from .postgres.handler import PostgreSQLHandler
-
-                return PostgreSQLHandler(self.config_path, connection, self.debug)
-            elif db_type == "mysql":
-                from .mysql.handler import MySQLHandler
+            limits = ConnectionConfig.parse_limits(db_config)
+        except ValueError as e:
+            raise ConfigurationError(str(e))
 
-                return MySQLHandler(self.config_path, connection, self.debug)
-            elif db_type == "oracle":
-                from .oracle.handler import OracleHandler
-                
-                return OracleHandler(self.config_path, connection, self.debug)
-            else:
-                raise ConfigurationError(f"Unsupported database type: {db_type}")
-        except ImportError as e:
-            # 捕获导入错误并转换为ConfigurationError，以保持与现有测试兼容
-            raise ConfigurationError(
-                f"Failed to import handler for {db_type}: {str(e)}"
-            )
+        limiter = self._limiters.get(connection)
+        if limiter is None or limiter.limits != limits:
+            limiter = ConcurrencyLimiter(connection, limits)
+            self._limiters[connection] = limiter
+        return limiter
 
     @asynccontextmanager
     async def get_handler(
@@ -770,7 +1916,11 @@ class ConnectionServer:
     ) -> AsyncContextManager[ConnectionHandler]:
         """Get connection handler
 
-        Get appropriate connection handler based on connection name
+        Get appropriate connection handler based on connection name. Handlers
+        are created lazily on first use and reused across tool calls; they are
+        released by close_handlers() when the server shuts down. Callers
+        hold one of the connection's concurrency slots while the context is
+        open, waiting in line if all slots are taken.
 
         Args:
             connection: str = DATABASE_CONNECTION_NAME
@@ -781,29 +1931,144 @@ class ConnectionServer:
         # Read configuration file and validate connection
         db_config = self._get_config_or_raise(connection)
 
-        # Create appropriate handler based on database type
-        handler = None
-        try:
-            db_type = db_config["type"]
-            handler = self._create_handler_for_type(db_type, connection)
+        limiter = self._get_limiter(connection, db_config)
+        handler = await self._get_or_create_handler(connection, db_config)
 
-            # Set session for MCP logging
-            if hasattr(self.server, "session"):
-                handler._session = self.server.session
+        # Set session for MCP logging
+        if hasattr(self.server, "session"):
+            handler._session = self.server.session
+        handler.shared_cache = self._get_shared_cache()
 
+        # Wait for a free slot before touching the database
+        async with limiter.acquire(handler.stats):
             handler.stats.record_connection_start()
+            self._handler_users[handler] = self._handler_users.get(handler, 0) + 1
+            try:
+                yield handler
+            finally:
+                handler.stats.record_connection_end()
+                await self._release_handler(handler)
+
+    async def _release_handler(self, handler: ConnectionHandler):
+        """结束一次调用对处理器的使用，释放已被替换且不再使用的处理器"""
+        users = self._handler_users.pop(handler, 1) - 1
+        if users > 0:
+            self._handler_users[handler] = users
+            return
+        for retired in self._retired_handlers:
+            if retired[1] is handler:
+                self._retired_handlers.remove(retired)
+                await self._cleanup_handler(*retired)
+                break
+
+    def _get_cursor_config(self) -> CursorConfig:
+        """读取分页游标配置
+
+        Raises:
+            ConfigurationError: 如果cursors配置无效
+        """
+        try:
+            return ConnectionConfig.parse_cursors(self._load_config() or {})
+        except ValueError as e:
+            raise ConfigurationError(str(e))
+
+    async def _reserve_cursor(self, cursors: CursorConfig):
+        """为即将打开的游标预留位置，已满时关闭最久未读取的空闲游标
+
+        Raises:
+            ConfigurationError: 如果cursors.max_open为0，即禁用了分页
+            ConcurrencyLimitError: 如果打开的游标都在读取中
+        """
+        if cursors.max_open == 0:
+            raise ConfigurationError("Paging query results is disabled (cursors.max_open is 0)")
+        while len(self._cursors) + self._cursors_opening >= cursors.max_open:
+            idle = [(token, paged) for token, paged in self._cursors.items() if not paged.lock.locked()]
+            if not idle:
+                raise ConcurrencyLimitError(
+                    f"Too many open result cursors ({cursors.max_open}). "
+                    "Retry once other paged queries have finished"
+                )
+            token, _ = min(idle, key=lambda item: item[1].last_used)
+            self.send_log(LOG_LEVEL_DEBUG, "Closing least recently used result cursor")
+            await self._close_cursor(token)
+        self._cursors_opening += 1
+
+    def _register_cursor(self, paged: PagedQuery) -> str:
+        """保存游标并返回续页令牌，游标关闭前其处理器不会被释放"""
+        token = secrets.token_urlsafe(16)
+        self._cursors[token] = paged
+        self._handler_users[paged.handler] = self._handler_users.get(paged.handler, 0) + 1
+        if self._cursor_task is None or self._cursor_task.done():
+            self._cursor_task = asyncio.create_task(self._expire_cursors())
+        return token
+
+    async def _close_cursor(self, token: str):
+        """关闭游标，归还其占用的连接"""
+        paged = self._cursors.pop(token, None)
+        if paged is None:
+            return
+        try:
+            await paged.handler.close_cursor(paged.cursor)
+        except Exception as e:
             self.send_log(
-                LOG_LEVEL_DEBUG, f"Handler created successfully for {connection}"
+                LOG_LEVEL_WARNING,
+                f"Error closing result cursor for {paged.connection}: {str(e)}",
             )
-
-            yield handler
         finally:
-            if handler:
-                self.send_log(LOG_LEVEL_DEBUG, f"Cleaning up handler for {connection}")
-                handler.stats.record_connection_end()
+            await self._release_handler(paged.handler)
 
-                if hasattr(handler, "cleanup") and callable(handler.cleanup):
-                    await handler.cleanup()
+    async def _close_cursors(self):
+        """关闭所有游标并停止过期检查任务"""
+        task, self._cursor_task = self._cursor_task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        for token in list(self._cursors):
+            await self._close_cursor(token)
+
+    async def _expire_cursors(self):
+        """关闭空闲超过idle_ttl的游标，没有游标时结束"""
+        while True:
+            try:
+                idle_ttl = self._get_cursor_config().idle_ttl
+            except ConfigurationError:
+                idle_ttl = CursorConfig.idle_ttl
+            now = time.monotonic()
+            next_check = idle_ttl
+            for token, paged in list(self._cursors.items()):
+                idle = now - paged.last_used
+                if idle >= idle_ttl and not paged.lock.locked():
+                    self.send_log(LOG_LEVEL_DEBUG, f"Result cursor for {paged.connection} expired")
+                    await self._close_cursor(token)
+                else:
+                    next_check = min(next_check, idle_ttl - idle)
+            if not self._cursors:
+                return
+            await asyncio.sleep(max(next_check, 1))
+
+    async def _read_page(self, token: str, paged: PagedQuery, page_size: int) -> list[types.TextContent]:
+        """读取游标的下一页，读完或出错时关闭游标
+
+        每页换发新的续页令牌，重复使用旧令牌会报错而不是跳过一页。
+        """
+        next_token = secrets.token_urlsafe(16)
+        format_token = requested_format.set(paged.result_format)
+        try:
+            result = await paged.handler.fetch_page(paged.cursor, page_size, next_token)
+        except BaseException:
+            await self._close_cursor(token)
+            raise
+        finally:
+            requested_format.reset(format_token)
+        paged.last_used = time.monotonic()
+        if paged.cursor.exhausted:
+            await self._close_cursor(token)
+        elif self._cursors.pop(token, None) is paged:
+            self._cursors[next_token] = paged
+        return [types.TextContent(type="text", text=result)]
 
     def _get_available_tools(self) -> list[types.Tool]:
         """返回所有可用的数据库工具列表
@@ -889,6 +2154,32 @@ class ConnectionServer:
                             "type": "string",
                             "description": "SQL query (SELECT only)",
                         },
+                        "timeout": {
+                            "type": "number",
+                            "description": "Optional query timeout in seconds. Cannot exceed the connection's query_timeout",
+                        },
+                        "max_rows": {
+                            "type": "integer",
+                            "description": "Optional maximum number of rows to return. Cannot exceed the connection's max_rows; results cut at the limit are marked truncated",
+                        },
+                        "format": {
+                            "type": "string",
+                            "enum": ["text", "json", "columnar"],
+                            "description": "Result format: 'text' (default), 'json' for standard JSON with typed values (decimals and large integers as strings, ISO 8601 dates, base64 binary), or 'columnar' for the same JSON with column names listed once and each row as an array",
+                        },
+                        "page_size": {
+                            "type": "integer",
+                            "description": "Optional number of rows per page. Returns the first page and, while rows remain, a next_token to pass to dbutils-fetch-more; with key, a next_after to pass back as after instead",
+                        },
+                        "key": {
+                            "type": ["string", "array"],
+                            "items": {"type": "string"},
+                            "description": "Optional unique, non-NULL column (or list of columns) of the query result to page through in key order. Each page runs the query again from the last key, so nothing is kept open between pages. Requires page_size; the SQL should not contain ORDER BY or LIMIT",
+                        },
+                        "after": {
+                            "type": "string",
+                            "description": "The next_after value returned with the previous keyset page",
+                        },
                     },
                     "required": ["connection", "sql"],
                 },
@@ -912,10 +2203,95 @@ class ConnectionServer:
                     "usage_tips": [
                         "Always use SELECT statements only - other SQL operations are not permitted",
                         "Use LIMIT to restrict large result sets",
+                        "Set page_size to walk through a large result page by page with dbutils-fetch-more",
                         "For complex queries, consider using dbutils-explain-query first to understand query execution plan"
                     ]
                 }
             ),
+            types.Tool(
+                name="dbutils-fetch-more",
+                description="Returns the next page of a query started by dbutils-run-query with page_size. The query is not executed again: rows are read from where the previous page stopped, in the format of the first page. Each page includes a next_token while rows remain; the token expires once the last page is read or after a period of inactivity.",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "connection": {
+                            "type": "string",
+                            "description": DATABASE_CONNECTION_NAME,
+                        },
+                        "token": {
+                            "type": "string",
+                            "description": "The next_token returned with the previous page",
+                        },
+                        "page_size": {
+                            "type": "integer",
+                            "description": "Optional number of rows in this page, defaults to the page_size of the query",
+                        },
+                    },
+                    "required": ["connection", "token"],
+                },
+                annotations={
+                    "examples": [
+                        {
+                            "input": {
+                                "connection": "example_db",
+                                "token": "Jx3v9QdLr0yJ1m2kP4sT5w"
+                            },
+                            "output": "The next page of rows of the query, with a next_token if more rows remain"
+                        }
+                    ],
+                    "usage_tips": [
+                        "Stop requesting pages once you have the rows you need; unread results expire on their own",
+                        "Results are read in order, so each token can only be used once"
+                    ]
+                }
+            ),
+            types.Tool(
+                name="dbutils-export-query",
+                description="Executes a read-only SELECT query and writes its whole result to a file in the server's export directory, as CSV, JSON Lines or Parquet. Rows are streamed from the database to the file and never included in the response, which only reports the file path, row count, size in bytes and duration. Use this tool for large extracts meant for other programs rather than for reading data yourself. Requires an export directory in the server configuration.",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "connection": {
+                            "type": "string",
+                            "description": DATABASE_CONNECTION_NAME,
+                        },
+                        "sql": {
+                            "type": "string",
+                            "description": "SQL query (SELECT only)",
+                        },
+                        "format": {
+                            "type": "string",
+                            "enum": ["csv", "jsonl", "parquet"],
+                            "description": "File format, csv by default",
+                        },
+                        "filename": {
+                            "type": "string",
+                            "description": "Optional file name relative to the export directory; generated if omitted. Existing files are never overwritten",
+                        },
+                        "timeout": {
+                            "type": "number",
+                            "description": "Optional time limit in seconds. Cannot exceed the connection's query_timeout",
+                        },
+                    },
+                    "required": ["connection", "sql"],
+                },
+                annotations={
+                    "examples": [
+                        {
+                            "input": {
+                                "connection": "example_db",
+                                "sql": "SELECT * FROM orders WHERE created_at >= '2025-01-01'",
+                                "format": "parquet"
+                            },
+                            "output": "The path of the written file with its row count, size in bytes and duration"
+                        }
+                    ],
+                    "usage_tips": [
+                        "Prefer this over dbutils-run-query when the result is too large to read or only needed as a file",
+                        "max_rows and the result byte limits do not apply; the connection's query_timeout does"
+                    ]
+                }
+            ),
             types.Tool(
                 name="dbutils-list-tables",
                 description="Lists all tables in the specified database connection. Results include table names, URIs, and available table descriptions. Results are grouped by database type and clearly labeled for easy identification. Use this tool when you need to understand database structure or locate specific tables. Only works within the allowed connection scope.",
@@ -1133,57 +2509,57 @@ class ConnectionServer:
 
         try:
             # 读取配置文件
-            with open(self.config_path, "r") as f:
-                config = yaml.safe_load(f)
-                if not config or "connections" not in config:
-                    return [
-                        types.TextContent(
-                            type="text",
-                            text="No database connections found in configuration.",
+            config = self._load_config()
+            if not config or "connections" not in config:
+                return [
+                    types.TextContent(
+                        type="text",
+                        text="No database connections found in configuration.",
+                    )
+                ]
+
+            # 并发检查所有连接的状态（TTL内复用缓存结果）
+            statuses = {}
+            if check_status and config["connections"]:
+                statuses = await self._get_connection_statuses(
+                    config["connections"], ConnectionConfig.parse_health_check(config)
+                )
+
+            # 获取配置中的所有连接
+            for conn_name, conn_config in config["connections"].items():
+                db_type = conn_config.get("type", "unknown")
+                connection_info = []
+
+                # 添加基本信息
+                connection_info.append(f"Connection: {conn_name}")
+                connection_info.append(f"Type: {db_type}")
+
+                # 根据数据库类型添加特定信息（排除敏感信息）
+                if db_type == "sqlite":
+                    if "path" in conn_config:
+                        connection_info.append(f"Path: {conn_config['path']}")
+                    elif "database" in conn_config:
+                        connection_info.append(
+                            f"Database: {conn_config['database']}"
                         )
-                    ]
+                elif db_type in ["mysql", "postgres", "postgresql"]:
+                    if "host" in conn_config:
+                        connection_info.append(f"Host: {conn_config['host']}")
+                    if "port" in conn_config:
+                        connection_info.append(f"Port: {conn_config['port']}")
+                    if "database" in conn_config:
+                        connection_info.append(
+                            f"Database: {conn_config['database']}"
+                        )
+                    if "user" in conn_config:
+                        connection_info.append(f"User: {conn_config['user']}")
+                    # 不显示密码
 
-                # 获取配置中的所有连接
-                for conn_name, conn_config in config["connections"].items():
-                    db_type = conn_config.get("type", "unknown")
-                    connection_info = []
-
-                    # 添加基本信息
-                    connection_info.append(f"Connection: {conn_name}")
-                    connection_info.append(f"Type: {db_type}")
-
-                    # 根据数据库类型添加特定信息（排除敏感信息）
-                    if db_type == "sqlite":
-                        if "path" in conn_config:
-                            connection_info.append(f"Path: {conn_config['path']}")
-                        elif "database" in conn_config:
-                            connection_info.append(
-                                f"Database: {conn_config['database']}"
-                            )
-                    elif db_type in ["mysql", "postgres", "postgresql"]:
-                        if "host" in conn_config:
-                            connection_info.append(f"Host: {conn_config['host']}")
-                        if "port" in conn_config:
-                            connection_info.append(f"Port: {conn_config['port']}")
-                        if "database" in conn_config:
-                            connection_info.append(
-                                f"Database: {conn_config['database']}"
-                            )
-                        if "user" in conn_config:
-                            connection_info.append(f"User: {conn_config['user']}")
-                        # 不显示密码
-
-                    # 检查连接状态（如果需要）
-                    if check_status:
-                        try:
-                            async with self.get_handler(conn_name) as handler:
-                                # 尝试执行一个简单查询来验证连接
-                                await handler.test_connection()
-                                connection_info.append("Status: Available")
-                        except Exception as e:
-                            connection_info.append(f"Status: Unavailable ({str(e)})")
-
-                    connections.append("\n".join(connection_info))
+                # 检查连接状态（如果需要）
+                if check_status:
+                    connection_info.append(f"Status: {statuses[conn_name]}")
+
+                connections.append("\n".join(connection_info))
         except Exception as e:
             self.send_log(LOG_LEVEL_ERROR, f"Error listing connections: {str(e)}")
             return [
@@ -1202,6 +2578,115 @@ class ConnectionServer:
         result = "Available database connections:\n\n" + "\n\n".join(connections)
         return [types.TextContent(type="text", text=result)]
 
+    async def _probe_connection(self, connection: str, timeout: float) -> str:
+        """检查单个连接是否可用
+
+        Args:
+            connection: 数据库连接名称
+            timeout: 探测的最长时间(秒)，超时视为不可用
+
+        Returns:
+            str: 连接状态描述
+        """
+        async def probe() -> bool:
+            async with self.get_handler(connection) as handler:
+                # 尝试执行一个简单查询来验证连接
+                return await handler.test_connection()
+
+        try:
+            available = await asyncio.wait_for(probe(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return f"Unavailable (no response within {timeout}s)"
+        except Exception as e:
+            return f"Unavailable ({str(e)})"
+        return "Available" if available else "Unavailable (connection test failed)"
+
+    async def _get_connection_statuses(
+        self, connections: dict, health_check: HealthCheckConfig, refresh: bool = False
+    ) -> Dict[str, str]:
+        """获取连接状态，缓存过期或配置变更的连接会被并发探测
+
+        Args:
+            connections: 配置文件中的连接配置
+            health_check: 健康检查配置
+            refresh: 忽略缓存，重新探测所有连接
+
+        Returns:
+            Dict[str, str]: 连接名称到状态描述的映射
+        """
+        # 丢弃已从配置中删除的连接
+        for name in set(self._health_cache) - set(connections):
+            del self._health_cache[name]
+
+        now = time.monotonic()
+        statuses = {}
+        stale = []
+        for name, conn_config in connections.items():
+            cached = self._health_cache.get(name)
+            if (
+                not refresh
+                and cached is not None
+                and cached[1] == conn_config
+                and now - cached[0] < health_check.ttl
+            ):
+                statuses[name] = cached[2]
+            else:
+                stale.append(name)
+
+        if stale:
+            # 总耗时取决于最慢的一个探测，而不是所有探测之和
+            results = await asyncio.gather(
+                *(self._probe_connection(name, health_check.timeout) for name in stale)
+            )
+            checked_at = time.monotonic()
+            for name, status in zip(stale, results):
+                self._health_cache[name] = (checked_at, connections[name], status)
+                statuses[name] = status
+        return statuses
+
+    def _start_health_checks(self):
+        """如果配置了health_check.interval，启动后台状态刷新任务"""
+        try:
+            config = self._load_config() or {}
+            health_check = ConnectionConfig.parse_health_check(config)
+        except Exception as e:
+            self.send_log(LOG_LEVEL_WARNING, f"Background health checks disabled: {str(e)}")
+            return
+        if health_check.interval is not None and (self._health_task is None or self._health_task.done()):
+            self._health_task = asyncio.create_task(self._refresh_health(health_check.interval))
+
+    async def _stop_health_checks(self):
+        """停止后台状态刷新任务"""
+        task, self._health_task = self._health_task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def _refresh_health(self, interval: float):
+        """定期刷新连接状态缓存，使列出连接时无需等待探测
+
+        Args:
+            interval: 初始刷新间隔(秒)，每轮按配置文件更新
+        """
+        while True:
+            try:
+                config = self._load_config() or {}
+                health_check = ConnectionConfig.parse_health_check(config)
+                if health_check.interval is None:
+                    self.send_log(LOG_LEVEL_INFO, "Background health checks stopped")
+                    return
+                interval = health_check.interval
+                await self._get_connection_statuses(
+                    config.get("connections") or {}, health_check, refresh=True
+                )
+            except Exception as e:
+                self.send_log(LOG_LEVEL_WARNING, f"Background health check failed: {str(e)}")
+            await asyncio.sleep(interval)
+
     async def _handle_list_tables(self, connection: str) -> list[types.TextContent]:
         """处理列表表格工具调用
 
@@ -1242,19 +2727,33 @@ class ConnectionServer:
             ]
 
     async def _handle_run_query(
-        self, connection: str, sql: str
+        self,
+        connection: str,
+        sql: str,
+        timeout: Optional[float] = None,
+        max_rows: Optional[int] = None,
+        result_format: Optional[str] = None,
+        page_size: Optional[int] = None,
+        key: Any = None,
+        after: Optional[str] = None,
     ) -> list[types.TextContent]:
         """处理运行查询工具调用
 
         Args:
             connection: 数据库连接名称
             sql: SQL查询语句
+            timeout: 本次调用的超时时间(秒)，不能超过连接配置的query_timeout
+            max_rows: 本次调用返回的最大行数，不能超过连接配置的max_rows
+            result_format: 结果格式，text(默认)、json或columnar
+            page_size: 分页读取时每页的行数，未指定key时剩余的行通过dbutils-fetch-more读取
+            key: 按键分页的键列，每页单独执行按键定位的查询，服务端不保留状态
+            after: 按键分页时上一页返回的next_after
 
         Returns:
             list[types.TextContent]: 查询结果
 
         Raises:
-            ConfigurationError: 如果SQL为空或非SELECT语句
+            ConfigurationError: 如果SQL为空、非SELECT语句或timeout/max_rows/format/page_size/key/after无效
         """
         if not sql:
             raise ConfigurationError(EMPTY_QUERY_ERROR)
@@ -1263,10 +2762,210 @@ class ConnectionServer:
         if not sql.lower().startswith("select"):
             raise ConfigurationError(SELECT_ONLY_ERROR)
 
+        if timeout is not None and (
+            isinstance(timeout, bool) or not isinstance(timeout, (int, float)) or timeout <= 0
+        ):
+            raise ConfigurationError(f"Invalid timeout: {timeout}. Must be a positive number of seconds")
+        if max_rows is not None and (
+            isinstance(max_rows, bool) or not isinstance(max_rows, int) or max_rows < 1
+        ):
+            raise ConfigurationError(f"Invalid max_rows: {max_rows}. Must be a positive integer")
+        self._validate_page_size(page_size)
+        keyset = None
+        if key is not None or after is not None:
+            if key is None:
+                raise ConfigurationError("after requires key")
+            if page_size is None:
+                raise ConfigurationError("Keyset pagination requires page_size")
+            try:
+                keyset = KeysetPage.parse(key, after)
+            except ValueError as e:
+                raise ConfigurationError(str(e))
+            # 多读一行判断是否还有下一页
+            max_rows = min(max_rows or page_size, page_size)
+        try:
+            result_format = parse_result_format(result_format)
+        except ValueError as e:
+            raise ConfigurationError(str(e))
+
         async with self.get_handler(connection) as handler:
-            result = await handler.execute_query(sql)
+            if keyset is not None:
+                try:
+                    sql = keyset.build_query(sql, handler.db_type, max_rows + 1)
+                except ValueError as e:
+                    raise ConfigurationError(str(e))
+            timeout_token = requested_timeout.set(timeout)
+            max_rows_token = requested_max_rows.set(max_rows)
+            format_token = requested_format.set(result_format)
+            keyset_token = requested_keyset.set(keyset)
+            try:
+                if page_size is not None and keyset is None:
+                    return await self._open_paged_query(connection, handler, sql, result_format, page_size)
+                result = await handler.execute_query(sql)
+            finally:
+                requested_keyset.reset(keyset_token)
+                requested_format.reset(format_token)
+                requested_max_rows.reset(max_rows_token)
+                requested_timeout.reset(timeout_token)
             return [types.TextContent(type="text", text=result)]
 
+    @staticmethod
+    def _validate_page_size(page_size: Optional[int]):
+        """检查分页大小
+
+        Raises:
+            ConfigurationError: 如果page_size不是正整数
+        """
+        if page_size is not None and (
+            isinstance(page_size, bool) or not isinstance(page_size, int) or page_size < 1
+        ):
+            raise ConfigurationError(f"Invalid page_size: {page_size}. Must be a positive integer")
+
+    async def _open_paged_query(
+        self,
+        connection: str,
+        handler: ConnectionHandler,
+        sql: str,
+        result_format: ResultFormat,
+        page_size: int,
+    ) -> list[types.TextContent]:
+        """执行查询并返回第一页，剩余的行保留在服务端游标中
+
+        Args:
+            connection: 数据库连接名称
+            handler: 数据库连接处理器
+            sql: SQL查询语句
+            result_format: 结果格式
+            page_size: 每页的行数
+
+        Returns:
+            list[types.TextContent]: 第一页结果，还有剩余行时包含next_token
+        """
+        cursors = self._get_cursor_config()
+        await self._reserve_cursor(cursors)
+        try:
+            cursor = await handler.open_cursor(sql, cursors.idle_ttl)
+            paged = PagedQuery(connection, handler, cursor, result_format, page_size)
+            token = self._register_cursor(paged)
+        finally:
+            self._cursors_opening -= 1
+        async with paged.lock:
+            return await self._read_page(token, paged, page_size)
+
+    async def _handle_fetch_more(
+        self, connection: str, token: str, page_size: Optional[int] = None
+    ) -> list[types.TextContent]:
+        """处理读取下一页工具调用
+
+        Args:
+            connection: 数据库连接名称
+            token: 上一页返回的续页令牌
+            page_size: 本页的行数，默认使用查询时的page_size
+
+        Returns:
+            list[types.TextContent]: 下一页结果，还有剩余行时包含新的next_token
+
+        Raises:
+            ConfigurationError: 如果令牌为空、未知或已过期，或page_size无效
+        """
+        if not token:
+            raise ConfigurationError("Continuation token cannot be empty")
+        self._validate_page_size(page_size)
+
+        paged = self._cursors.get(token)
+        if paged is None or paged.connection != connection:
+            raise ConfigurationError(
+                "Unknown or expired continuation token. Run the query again with page_size"
+            )
+        limiter = self._get_limiter(connection, self._get_config_or_raise(connection))
+        async with limiter.acquire(paged.handler.stats), paged.lock:
+            # 等待期间游标可能已过期或读完
+            if token not in self._cursors:
+                raise ConfigurationError(
+                    "Unknown or expired continuation token. Run the query again with page_size"
+                )
+            return await self._read_page(token, paged, page_size or paged.page_size)
+
+    def _get_export_config(self) -> ExportConfig:
+        """读取导出配置，相对路径以配置文件所在目录为基准
+
+        Raises:
+            ConfigurationError: 如果exports配置无效
+        """
+        try:
+            exports = ConnectionConfig.parse_exports(self._load_config() or {})
+        except ValueError as e:
+            raise ConfigurationError(str(e))
+        if exports.directory is not None:
+            exports.directory = os.path.join(
+                os.path.dirname(os.path.abspath(self.config_path)),
+                os.path.expanduser(exports.directory),
+            )
+        return exports
+
+    async def _handle_export_query(
+        self,
+        connection: str,
+        sql: str,
+        export_format: Optional[str] = None,
+        filename: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> list[types.TextContent]:
+        """处理导出查询工具调用，结果直接写入导出目录中的文件
+
+        Args:
+            connection: 数据库连接名称
+            sql: SQL查询语句
+            export_format: 文件格式，csv、jsonl或parquet
+            filename: 导出目录中的文件名，默认自动生成
+            timeout: 本次调用的超时时间（秒），不能超过连接配置的query_timeout
+
+        Returns:
+            list[types.TextContent]: 文件路径、行数、字节数和耗时
+
+        Raises:
+            ConfigurationError: 如果SQL无效、未配置导出目录或format/filename/timeout无效
+        """
+        if not sql:
+            raise ConfigurationError(EMPTY_QUERY_ERROR)
+        if not sql.lower().startswith("select"):
+            raise ConfigurationError(SELECT_ONLY_ERROR)
+        if timeout is not None and (
+            isinstance(timeout, bool) or not isinstance(timeout, (int, float)) or timeout <= 0
+        ):
+            raise ConfigurationError(f"Invalid timeout: {timeout}. Must be a positive number of seconds")
+
+        exports = self._get_export_config()
+        if exports.directory is None:
+            raise ConfigurationError("Exporting query results is disabled (exports.directory is not set)")
+        try:
+            export_format = parse_export_format(export_format)
+            path = resolve_export_path(exports.directory, filename, export_format, connection)
+            writer = open_export(path, export_format)
+        except (ValueError, OSError) as e:
+            raise ConfigurationError(str(e))
+
+        start = time.monotonic()
+        try:
+            async with self.get_handler(connection) as handler:
+                timeout_token = requested_timeout.set(timeout)
+                try:
+                    row_count = await handler.export_query(sql.rstrip().rstrip(";"), writer)
+                finally:
+                    requested_timeout.reset(timeout_token)
+            size = await asyncio.to_thread(writer.commit)
+        except BaseException:
+            writer.discard()
+            raise
+        result = {
+            "path": path,
+            "format": export_format,
+            "row_count": row_count,
+            "bytes": size,
+            "duration_ms": round((time.monotonic() - start) * 1000, 2),
+        }
+        return [types.TextContent(type="text", text=json.dumps(result))]
+
     async def _handle_table_tools(
         self, name: str, connection: str, table: str
     ) -> list[types.TextContent]:
@@ -1561,40 +3260,95 @@ class ConnectionServer:
 
             connection = arguments["connection"]
 
-            if name == "dbutils-list-tables":
-                return await self._handle_list_tables(connection)
-            elif name == "dbutils-run-query":
-                sql = arguments.get("sql", "").strip()
-                return await self._handle_run_query(connection, sql)
-            elif name in [
-                "dbutils-describe-table",
-                "dbutils-get-ddl",
-                "dbutils-list-indexes",
-                "dbutils-get-stats",
-                "dbutils-list-constraints",
-            ]:
-                table = arguments.get("table", "").strip()
-                return await self._handle_table_tools(name, connection, table)
-            elif name == "dbutils-explain-query":
-                sql = arguments.get("sql", "").strip()
-                return await self._handle_explain_query(connection, sql)
-            elif name == "dbutils-get-performance":
-                return await self._handle_performance(connection)
-            elif name == "dbutils-analyze-query":
-                sql = arguments.get("sql", "").strip()
-                return await self._handle_analyze_query(connection, sql)
-            elif name == "dbutils-execute-write":
-                sql = arguments.get("sql", "").strip()
-                confirmation = arguments.get("confirmation", "").strip()
-                return await self._handle_execute_write(connection, sql, confirmation)
-            elif name == "dbutils-get-audit-logs":
-                table = arguments.get("table", "").strip()
-                operation_type = arguments.get("operation_type", "").strip()
-                status = arguments.get("status", "").strip()
-                limit = arguments.get("limit", 100)
-                return await self._handle_get_audit_logs(connection, table, operation_type, status, limit)
-            else:
-                raise ConfigurationError(f"Unknown tool: {name}")
+            key = self._coalesce_key(name, arguments)
+            if key is None:
+                return await self._call_tool(name, connection, arguments)
+            if key in self._inflight:
+                self.send_log(LOG_LEVEL_DEBUG, f"Joining identical {name} call in flight on {connection}")
+            return await self._inflight.do(key, lambda: self._call_tool(name, connection, arguments))
+
+    def _coalesce_key(self, name: str, arguments: dict) -> Optional[Tuple[str, str]]:
+        """Key identifying identical tool calls, None if the tool must run each time
+
+        Only read-only tools whose result depends on their arguments alone
+        are coalesced. Paged queries are not, since each call opens a
+        cursor of its own.
+        """
+        if name not in COALESCED_TOOLS:
+            return None
+        if name == "dbutils-run-query" and arguments.get("page_size") and not arguments.get("key"):
+            return None
+        try:
+            return name, json.dumps(arguments, sort_keys=True)
+        except (TypeError, ValueError):
+            return None
+
+    async def _call_tool(self, name: str, connection: str, arguments: dict) -> list[types.TextContent]:
+        """Run a tool that operates on a connection
+
+        Args:
+            name: Tool name
+            connection: Connection name
+            arguments: Tool arguments
+
+        Returns:
+            list[types.TextContent]: Tool result
+        """
+        if name == "dbutils-list-tables":
+            return await self._handle_list_tables(connection)
+        elif name == "dbutils-run-query":
+            sql = arguments.get("sql", "").strip()
+            return await self._handle_run_query(
+                connection,
+                sql,
+                arguments.get("timeout"),
+                arguments.get("max_rows"),
+                arguments.get("format"),
+                arguments.get("page_size"),
+                arguments.get("key"),
+                arguments.get("after"),
+            )
+        elif name == "dbutils-fetch-more":
+            token = arguments.get("token", "").strip()
+            return await self._handle_fetch_more(connection, token, arguments.get("page_size"))
+        elif name == "dbutils-export-query":
+            sql = arguments.get("sql", "").strip()
+            return await self._handle_export_query(
+                connection,
+                sql,
+                arguments.get("format"),
+                arguments.get("filename"),
+                arguments.get("timeout"),
+            )
+        elif name in [
+            "dbutils-describe-table",
+            "dbutils-get-ddl",
+            "dbutils-list-indexes",
+            "dbutils-get-stats",
+            "dbutils-list-constraints",
+        ]:
+            table = arguments.get("table", "").strip()
+            return await self._handle_table_tools(name, connection, table)
+        elif name == "dbutils-explain-query":
+            sql = arguments.get("sql", "").strip()
+            return await self._handle_explain_query(connection, sql)
+        elif name == "dbutils-get-performance":
+            return await self._handle_performance(connection)
+        elif name == "dbutils-analyze-query":
+            sql = arguments.get("sql", "").strip()
+            return await self._handle_analyze_query(connection, sql)
+        elif name == "dbutils-execute-write":
+            sql = arguments.get("sql", "").strip()
+            confirmation = arguments.get("confirmation", "").strip()
+            return await self._handle_execute_write(connection, sql, confirmation)
+        elif name == "dbutils-get-audit-logs":
+            table = arguments.get("table", "").strip()
+            operation_type = arguments.get("operation_type", "").strip()
+            status = arguments.get("status", "").strip()
+            limit = arguments.get("limit", 100)
+            return await self._handle_get_audit_logs(connection, table, operation_type, status, limit)
+        else:
+            raise ConfigurationError(f"Unknown tool: {name}")
 
     async def run(self, model: str | None = None) -> None:
         """Run server"""
@@ -1608,5 +3362,17 @@ class ConnectionServer:
             #     )
         elif model == "sse":            
             await self.mcp.run_sse_async()
+
+    async def run_daemon(self, socket_path: str) -> None:
+        """Serve MCP clients connecting through a Unix domain socket
+
+        Handlers, pools, caches and stats are kept for the life of the
+        daemon, also while no client is connected.
+
+        Args:
+            socket_path: Path of the socket to listen on
+        """
+        async with self._lifespan(self.mcp):
+            await daemon.serve(self, socket_path)
             
                 
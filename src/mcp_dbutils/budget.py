@@ -0,0 +1,150 @@
+"""Byte budget of query results"""
+
+import bisect
+import datetime
+import decimal
+import itertools
+import uuid
+from operator import add, itemgetter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Appended to text cells cut to max_cell_bytes
+TRUNCATION_MARKER = "...[truncated]"
+
+# Estimated encoded size of a value of fixed size, and separators per cell
+FIXED_CELL_BYTES = 32
+CELL_OVERHEAD = 4
+
+# 编码后大小有上限的类型，无需逐个计算
+_FIXED_TYPES = frozenset((
+    int, float, bool, type(None), decimal.Decimal, uuid.UUID,
+    datetime.datetime, datetime.date, datetime.time, datetime.timedelta,
+))
+_BINARY_TYPES = (bytes, bytearray, memoryview)
+
+
+def cell_size(value: Any) -> int:
+    """Size of a value in bytes: UTF-8 for text, raw bytes for binary values"""
+    if isinstance(value, str):
+        # isascii无需扫描字符串
+        return len(value) if value.isascii() else len(value.encode("utf-8"))
+    if isinstance(value, memoryview):
+        return value.nbytes
+    if isinstance(value, _BINARY_TYPES):
+        return len(value)
+    if type(value) in _FIXED_TYPES:
+        return FIXED_CELL_BYTES
+    # JSON/数组等列按文本形式计算
+    return cell_size(str(value))
+
+
+def truncate_cell(value: Any, limit: int) -> Any:
+    """Cut a value to its first limit bytes
+
+    Binary values stay binary; other values become text ending in
+    TRUNCATION_MARKER.
+    """
+    if isinstance(value, _BINARY_TYPES):
+        return bytes(value[:limit])
+    if not isinstance(value, str):
+        value = str(value)
+    if value.isascii():
+        return value[:limit] + TRUNCATION_MARKER
+    # 按字节截断时丢弃被截开的多字节字符
+    return value.encode("utf-8")[:limit].decode("utf-8", "ignore") + TRUNCATION_MARKER
+
+
+class ResultBudget:
+    """Bytes one tool call may return, enforced while rows are fetched
+
+    Cells longer than max_cell_bytes are cut to a preview, and reading stops
+    before the first row that would take the result past max_bytes, though
+    the first row is always returned. Sizes are measured on the values, so
+    the encoded result is somewhat larger. Every cut is recorded, for the
+    result to report what was left out.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None, max_cell_bytes: Optional[int] = None):
+        self.max_bytes = max_bytes
+        self.max_cell_bytes = max_cell_bytes
+        self.used = 0
+        self.rows = 0
+        self.exhausted = False
+        # 被截断的单元格: (行号, 列号, 原始字节数)
+        self.cut_cells: List[Tuple[int, int, int]] = []
+
+    def admit(self, rows: Sequence[Sequence[Any]]) -> list:
+        """Take the rows of a batch that fit in the remaining budget
+
+        Args:
+            rows: Rows as sequences
+
+        Returns:
+            Leading rows that fit, with long cells cut. Rows past the first
+            one that does not fit are left out and exhausted is set.
+        """
+        if not rows or self.exhausted:
+            return []
+        width = len(rows[0])
+        fixed = width * CELL_OVERHEAD
+        row_sizes = [0] * len(rows)
+        long_cells: Dict[int, List[Tuple[int, int]]] = {}
+        limit = self.max_cell_bytes
+        for column in range(width):
+            values = list(map(itemgetter(column), rows))
+            # 定长类型的列按估算大小整列计算
+            value_types = set(map(type, values))
+            if value_types <= _FIXED_TYPES:
+                fixed += FIXED_CELL_BYTES
+                continue
+            if value_types == {str} and all(map(str.isascii, values)):
+                sizes = list(map(len, values))
+            else:
+                sizes = list(map(cell_size, values))
+            if limit is not None and max(sizes) > limit:
+                for index, size in enumerate(sizes):
+                    # 定长类型的值不截断
+                    if size > limit and type(values[index]) not in _FIXED_TYPES:
+                        long_cells.setdefault(index, []).append((column, size))
+                        sizes[index] = limit + len(TRUNCATION_MARKER)
+            row_sizes = list(map(add, row_sizes, sizes))
+        row_sizes = [size + fixed for size in row_sizes]
+
+        keep = len(rows)
+        if self.max_bytes is not None:
+            totals = list(itertools.accumulate(row_sizes, initial=self.used))
+            # 至少返回一行，分页读取时每页都能前进
+            keep = max(bisect.bisect_right(totals, self.max_bytes) - 1, 0 if self.rows else 1)
+            if keep < len(rows):
+                self.exhausted = True
+            self.used = totals[keep]
+        else:
+            self.used += sum(row_sizes)
+
+        admitted = list(rows[:keep])
+        for index, cells in long_cells.items():
+            if index >= keep:
+                continue
+            row = list(admitted[index])
+            for column, size in cells:
+                row[column] = truncate_cell(row[column], limit)
+                self.cut_cells.append((self.rows + index, column, size))
+            admitted[index] = tuple(row)
+        self.rows += keep
+        return admitted
+
+    def report(self, columns: Sequence[str]) -> Dict[str, Any]:
+        """Result fields describing what the budget left out
+
+        Args:
+            columns: Column names
+        """
+        fields: Dict[str, Any] = {}
+        if self.cut_cells:
+            fields["truncated_cells"] = [
+                {"row": row, "column": columns[column], "bytes": size}
+                for row, column, size in sorted(self.cut_cells)
+            ]
+        if self.exhausted:
+            fields["truncated_reason"] = "max_result_bytes"
+        return fields
@@ -0,0 +1,171 @@
+"""Caches of read query results and table metadata"""
+
+import re
+import time
+from collections import OrderedDict
+from typing import Any, FrozenSet, Hashable, NamedTuple, Optional, Tuple
+
+from .budget import cell_size
+
+# 字符串字面量、带引号的标识符和空白，规范化时只压缩引号外的空白
+_SQL_TOKENS = re.compile(r"""('(?:[^']|'')*'|"(?:[^"]|"")*"|`[^`]*`)|\s+""")
+_IDENTIFIERS = re.compile(r"[A-Za-z_][A-Za-z0-9_$]*")
+
+
+def normalize_sql(sql: str) -> str:
+    """Collapse whitespace outside quotes and drop a trailing semicolon"""
+    sql = _SQL_TOKENS.sub(lambda match: match.group(1) or " ", sql.strip())
+    return sql.rstrip("; ")
+
+
+def sql_words(sql: str) -> FrozenSet[str]:
+    """Lower-case identifiers in a SQL statement, a superset of the tables it reads"""
+    return frozenset(_IDENTIFIERS.findall(sql.lower()))
+
+
+def table_key(table: str) -> Optional[str]:
+    """Unqualified, unquoted, lower-case table name, None if unknown"""
+    name = table.split("(", 1)[0].strip().rsplit(".", 1)[-1].strip('`"[]').lower()
+    return name if name and name != "unknown_table" else None
+
+
+class CacheEntry(NamedTuple):
+    result: str
+    size: int
+    expires: float
+    # SQL中出现的标识符，写入其中任一表时失效
+    words: FrozenSet[str]
+
+
+class ResultCache:
+    """LRU cache of read query results bounded by total bytes
+
+    Entries expire after ttl seconds and are dropped when a write through
+    the same connection touches a table their SQL mentions. Matching is by
+    name, so a write may drop more entries than necessary but never fewer,
+    except for tables only reached through views or functions, which only
+    expire.
+    """
+
+    def __init__(self, ttl: float, max_bytes: int):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.evictions = 0
+        # 每次失效递增，查询期间发生过失效的结果不写入缓存
+        self.generation = 0
+        self._entries: OrderedDict[Hashable, CacheEntry] = OrderedDict()
+
+    @staticmethod
+    def make_key(sql: str, *params: Any) -> Tuple[Any, ...]:
+        """Key of a query: its normalized SQL and the options shaping its result"""
+        return (normalize_sql(sql), *params)
+
+    def get(self, key: Hashable) -> Optional[str]:
+        """Get a cached result, None if missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires <= time.monotonic():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry.result
+
+    def put(self, key: Hashable, result: str, generation: int):
+        """Cache a result unless a write happened since generation was read
+
+        Args:
+            key: Key from make_key, its first item being the SQL
+            result: Formatted query result
+            generation: Value of generation when the query started
+        """
+        if generation != self.generation:
+            return
+        size = cell_size(result)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = CacheEntry(result, size, time.monotonic() + self.ttl, sql_words(key[0]))
+        self.size += size
+        while self.size > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def invalidate(self, table: Optional[str] = None):
+        """Drop entries mentioning a table, or all entries if table is None"""
+        self.generation += 1
+        name = table_key(table) if table else None
+        if name is None:
+            self.clear()
+            return
+        for key in [key for key, entry in self._entries.items() if name in entry.words]:
+            self._remove(key)
+
+    def clear(self):
+        """Drop all entries"""
+        self._entries.clear()
+        self.size = 0
+
+    def _remove(self, key: Hashable):
+        self.size -= self._entries.pop(key).size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class MetadataEntry(NamedTuple):
+    value: Any
+    expires: float
+
+
+class MetadataCache:
+    """LRU cache of table metadata validated by a schema version
+
+    Entries expire after ttl seconds. Before an entry is served the caller
+    reads the database's schema version; when it differs from the version
+    the entries were loaded under, every entry is dropped, since one DDL
+    statement may change the answer of any metadata call. A version of None
+    means the database has no probe and entries only expire.
+    """
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.version: Hashable = None
+        self._entries: OrderedDict[Hashable, MetadataEntry] = OrderedDict()
+
+    def get(self, key: Hashable, version: Hashable) -> Optional[MetadataEntry]:
+        """Get a cached entry, None if missing, expired or of another version"""
+        self._validate(version)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: Hashable, value: Any, version: Hashable):
+        """Cache a value loaded after version was read
+
+        Args:
+            key: Method name and arguments
+            value: Metadata returned by the method
+            version: Schema version read before the value was loaded
+        """
+        self._validate(version)
+        self._entries[key] = MetadataEntry(value, time.monotonic() + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _validate(self, version: Hashable):
+        if version != self.version:
+            self._entries.clear()
+            self.version = version
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,8 +1,24 @@
 """Common configuration utilities"""
 
+import copy
 import os
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Literal, Optional, Set, Union
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
 import yaml
 
@@ -15,6 +31,168 @@ WriteOperationType = Literal['INSERT', 'UPDATE', 'DELETE']
 # Default policy for tables not explicitly listed in write_permissions
 DefaultPolicyType = Literal['read_only', 'allow_all']
 
+# Supported driver modes: blocking drivers in worker threads or native asyncio drivers
+DriverType = Literal['sync', 'async']
+
+# Default number of worker threads running blocking driver calls per connection
+DEFAULT_MAX_WORKERS = 4
+
+# Default time limit for a single query in seconds
+DEFAULT_QUERY_TIMEOUT = 60
+
+# Default cap on the rows returned by a single query
+DEFAULT_MAX_ROWS = 10000
+
+# Default byte budget of a single query result, and of one cell in it
+DEFAULT_MAX_RESULT_BYTES = 8 * 1024 * 1024
+DEFAULT_MAX_CELL_BYTES = 8192
+
+# Files modified less than this many seconds ago are re-read on every load,
+# because a second write within the file system's timestamp granularity
+# would leave modification time and size unchanged
+CONFIG_RACY_WINDOW = 2
+
+
+class ConfigStore:
+    """Parsed configuration file shared by the server and all handlers
+
+    The file is parsed once and parsed again only when its modification time
+    or size changes. Connection configurations built from a snapshot are kept
+    with it. A reload replaces the snapshot and the built configurations
+    together instead of modifying them, so callers still holding the previous
+    snapshot finish on a consistent view.
+    """
+
+    _stores: Dict[str, 'ConfigStore'] = {}
+    _stores_lock = threading.Lock()
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._signature: Optional[Tuple[int, int, int]] = None
+        self._connections: Dict[Tuple[Any, ...], ConnectionConfig] = {}
+
+    @classmethod
+    def for_path(cls, path: str) -> 'ConfigStore':
+        """Get the store of a configuration file, creating it on first use
+
+        Args:
+            path: Path to YAML configuration file
+        """
+        key = os.path.abspath(path)
+        with cls._stores_lock:
+            store = cls._stores.get(key)
+            if store is None:
+                store = cls._stores[key] = cls(path)
+            return store
+
+    def _get_signature(self) -> Optional[Tuple[int, int, int]]:
+        """Identify the file's current version, None if it cannot be trusted"""
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        if time.time() - st.st_mtime < CONFIG_RACY_WINDOW:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Get the current configuration, parsing the file again if it changed
+
+        Returns:
+            Parsed configuration file. It is shared between callers and must
+            not be modified.
+        """
+        signature = self._get_signature()
+        with self._lock:
+            if signature is not None and signature == self._signature:
+                return self._snapshot
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            config = yaml.safe_load(f)
+
+        with self._lock:
+            # 原子替换快照，正在处理的调用继续使用旧快照
+            self._snapshot, self._signature = config, signature
+            self._connections = {}
+        return config
+
+    def get_connection(self, key: Tuple[Any, ...], build: Callable[[], 'ConnectionConfig']) -> 'ConnectionConfig':
+        """Get a connection configuration built from the current snapshot
+
+        Args:
+            key: Identifies the configuration class, connection name and build options
+            build: Builds the configuration, loading the file itself
+
+        Returns:
+            Configuration shared between callers. It must not be modified.
+        """
+        snapshot = self.load()
+        with self._lock:
+            if self._snapshot is snapshot and key in self._connections:
+                return self._connections[key]
+
+        config = build()
+
+        with self._lock:
+            # 构建期间文件被重新加载时不缓存，避免新快照下保留旧配置
+            if self._snapshot is snapshot:
+                self._connections[key] = config
+        return config
+
+
+@dataclass
+class LimitsConfig:
+    """Admission control for tool calls on one connection"""
+    max_concurrency: int = 8  # Tool calls allowed to run at the same time
+    max_queue: int = 64  # Tool calls allowed to wait for a free slot
+    queue_timeout: float = 30  # seconds a tool call may wait before failing
+
+
+@dataclass
+class HealthCheckConfig:
+    """Connection status probes reported by dbutils-list-connections"""
+    timeout: float = 5  # seconds a single probe may take
+    ttl: float = 30  # seconds a probe result is reused
+    interval: Optional[float] = None  # seconds between background refreshes, None to disable
+
+
+@dataclass
+class CursorConfig:
+    """Query results kept open for paging with dbutils-fetch-more"""
+    idle_ttl: float = 300  # seconds an unread cursor stays open
+    max_open: int = 8  # cursors open at the same time, each pins one connection
+
+
+@dataclass
+class CacheConfig:
+    """Cache of read query results on one connection"""
+    ttl: float = 60  # seconds a cached result is reused
+    max_bytes: int = 64 * 1024 * 1024  # total size of cached results
+
+
+@dataclass
+class MetadataCacheConfig:
+    """Cache of table lists, schemas, DDL, indexes and constraints on one connection"""
+    ttl: float = 300  # seconds cached metadata is reused while the schema is unchanged
+    max_entries: int = 1024  # metadata calls cached, one per method and table
+
+
+@dataclass
+class SharedCacheConfig:
+    """Cache file shared by the server processes of one host"""
+    directory: Optional[str] = None  # the shared cache is disabled unless set
+    max_bytes: int = 256 * 1024 * 1024  # total size of shared entries
+    max_entry_bytes: int = 1024 * 1024  # larger results are only cached per process
+
+
+@dataclass
+class ExportConfig:
+    """Local files written by dbutils-export-query"""
+    directory: Optional[str] = None  # exports are disabled unless set
+
+
 class WritePermissions:
     """Write permissions configuration"""
 
@@ -100,6 +278,10 @@ class WritePermissions:
         """
         return operation in self.allowed_operations(table_name)
 
+
+ConnectionConfigT = TypeVar('ConnectionConfigT', bound='ConnectionConfig')
+
+
 class ConnectionConfig(ABC):
     """Base class for connection configuration"""
 
@@ -107,6 +289,13 @@ class ConnectionConfig(ABC):
     type: ConnectionType  # Connection type
     writable: bool = False  # Whether write operations are allowed
     write_permissions: Optional[WritePermissions] = None  # Write permissions configuration
+    max_workers: int = DEFAULT_MAX_WORKERS  # Worker threads for blocking driver calls
+    query_timeout: Optional[float] = DEFAULT_QUERY_TIMEOUT  # seconds, None = unlimited
+    max_rows: Optional[int] = DEFAULT_MAX_ROWS  # None = unlimited
+    max_result_bytes: Optional[int] = DEFAULT_MAX_RESULT_BYTES  # None = unlimited
+    max_cell_bytes: Optional[int] = DEFAULT_MAX_CELL_BYTES  # None = unlimited
+    cache: Optional[CacheConfig] = None  # None = results are not cached
+    metadata_cache: Optional[MetadataCacheConfig] = None  # None = metadata is not cached
 
     @abstractmethod
     def get_connection_params(self) -> Dict[str, Any]:
@@ -118,6 +307,29 @@ class ConnectionConfig(ABC):
         """Get masked connection information for logging"""
         pass
 
+    @classmethod
+    def from_yaml(cls: Type[ConnectionConfigT], yaml_path: str, db_name: str, **kwargs) -> ConnectionConfigT:
+        """Create configuration from YAML file
+
+        The configuration is built once per version of the file and copied
+        for each caller, so handlers may adjust their copy.
+
+        Args:
+            yaml_path: Path to YAML configuration file
+            db_name: Connection configuration name to use
+            **kwargs: Options passed on to the connection type's builder
+        """
+        key = (cls, db_name, tuple(sorted(kwargs.items())))
+        store = ConfigStore.for_path(yaml_path)
+        config = copy.copy(store.get_connection(key, lambda: cls._from_yaml(yaml_path, db_name, **kwargs)))
+        config.debug = cls.get_debug_mode()
+        return config
+
+    @classmethod
+    def _from_yaml(cls: Type[ConnectionConfigT], yaml_path: str, db_name: str, **kwargs) -> ConnectionConfigT:
+        """Build configuration from YAML file, implemented by each connection type"""
+        raise NotImplementedError
+
     @classmethod
     def load_yaml_config(cls, yaml_path: str) -> Dict[str, Any]:
         """Load YAML configuration file
@@ -128,8 +340,7 @@ class ConnectionConfig(ABC):
         Returns:
             Parsed configuration dictionary
         """
-        with open(yaml_path, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
+        config = ConfigStore.for_path(yaml_path).load()
 
         if not config or 'connections' not in config:
             raise ValueError("Configuration file must contain 'connections' section")
@@ -154,6 +365,317 @@ class ConnectionConfig(ABC):
 
         return connections
 
+    @classmethod
+    def parse_max_workers(cls, db_config: Dict[str, Any]) -> int:
+        """Get the worker thread count from a connection configuration
+
+        Args:
+            db_config: Connection configuration dictionary
+
+        Returns:
+            Number of worker threads
+
+        Raises:
+            ValueError: If max_workers is not a positive integer
+        """
+        value = db_config.get('max_workers', DEFAULT_MAX_WORKERS)
+        if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+            raise ValueError(f"Invalid max_workers: {value}")
+        return value
+
+    @classmethod
+    def parse_query_timeout(cls, db_config: Dict[str, Any]) -> Optional[float]:
+        """Get the query time limit from a connection configuration
+
+        Args:
+            db_config: Connection configuration dictionary
+
+        Returns:
+            Timeout in seconds, None if queries may run without limit
+
+        Raises:
+            ValueError: If query_timeout is not a positive number or null
+        """
+        value = db_config.get('query_timeout', DEFAULT_QUERY_TIMEOUT)
+        if value is not None and (
+            not isinstance(value, (int, float)) or isinstance(value, bool) or value <= 0
+        ):
+            raise ValueError(f"Invalid query_timeout: {value}")
+        return value
+
+    @classmethod
+    def parse_limits(cls, db_config: Dict[str, Any]) -> LimitsConfig:
+        """Get tool call admission limits from a connection configuration
+
+        Args:
+            db_config: Connection configuration dictionary
+
+        Returns:
+            LimitsConfig instance
+
+        Raises:
+            ValueError: If the limits configuration is invalid
+        """
+        limits = LimitsConfig()
+        if 'limits' not in db_config:
+            return limits
+
+        params = db_config['limits']
+        if not isinstance(params, dict):
+            raise ValueError("Limits configuration must be a dictionary")
+        for key, minimum in (('max_concurrency', 1), ('max_queue', 0)):
+            if key in params:
+                value = params[key]
+                if not isinstance(value, int) or isinstance(value, bool) or value < minimum:
+                    raise ValueError(f"Invalid limits {key}: {value}")
+                setattr(limits, key, value)
+        if 'queue_timeout' in params:
+            value = params['queue_timeout']
+            if not isinstance(value, (int, float)) or isinstance(value, bool) or value <= 0:
+                raise ValueError(f"Invalid limits queue_timeout: {value}")
+            limits.queue_timeout = value
+        return limits
+
+    @classmethod
+    def parse_max_rows(cls, db_config: Dict[str, Any]) -> Optional[int]:
+        """Get the row cap from a connection configuration
+
+        Args:
+            db_config: Connection configuration dictionary
+
+        Returns:
+            Maximum rows returned by a query, None if unlimited
+
+        Raises:
+            ValueError: If max_rows is not a positive integer or null
+        """
+        value = db_config.get('max_rows', DEFAULT_MAX_ROWS)
+        if value is not None and (not isinstance(value, int) or isinstance(value, bool) or value < 1):
+            raise ValueError(f"Invalid max_rows: {value}")
+        return value
+
+    @classmethod
+    def parse_result_bytes(cls, db_config: Dict[str, Any]) -> Tuple[Optional[int], Optional[int]]:
+        """Get the byte budget of query results from a connection configuration
+
+        Args:
+            db_config: Connection configuration dictionary
+
+        Returns:
+            Tuple of max_result_bytes and max_cell_bytes, each None if unlimited
+
+        Raises:
+            ValueError: If either is not a positive integer or null
+        """
+        limits = []
+        for key, default in (
+            ('max_result_bytes', DEFAULT_MAX_RESULT_BYTES),
+            ('max_cell_bytes', DEFAULT_MAX_CELL_BYTES),
+        ):
+            value = db_config.get(key, default)
+            if value is not None and (not isinstance(value, int) or isinstance(value, bool) or value < 1):
+                raise ValueError(f"Invalid {key}: {value}")
+            limits.append(value)
+        return limits[0], limits[1]
+
+    @classmethod
+    def parse_cache(cls, db_config: Dict[str, Any]) -> Optional[CacheConfig]:
+        """Get result cache settings from a connection configuration
+
+        Args:
+            db_config: Connection configuration dictionary
+
+        Returns:
+            CacheConfig instance, None if the connection has no cache section
+
+        Raises:
+            ValueError: If the cache configuration is invalid
+        """
+        params = db_config.get('cache')
+        if params is None:
+            return None
+        if not isinstance(params, dict):
+            raise ValueError("Cache configuration must be a dictionary")
+        cache = CacheConfig()
+        if 'ttl' in params:
+            value = params['ttl']
+            if not isinstance(value, (int, float)) or isinstance(value, bool) or value <= 0:
+                raise ValueError(f"Invalid cache ttl: {value}")
+            cache.ttl = value
+        if 'max_bytes' in params:
+            value = params['max_bytes']
+            if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+                raise ValueError(f"Invalid cache max_bytes: {value}")
+            cache.max_bytes = value
+        return cache
+
+    @classmethod
+    def parse_metadata_cache(cls, db_config: Dict[str, Any]) -> Optional[MetadataCacheConfig]:
+        """Get metadata cache settings from a connection configuration
+
+        Args:
+            db_config: Connection configuration dictionary
+
+        Returns:
+            MetadataCacheConfig instance, None if the connection has no metadata_cache section
+
+        Raises:
+            ValueError: If the metadata cache configuration is invalid
+        """
+        params = db_config.get('metadata_cache')
+        if params is None:
+            return None
+        if not isinstance(params, dict):
+            raise ValueError("Metadata cache configuration must be a dictionary")
+        cache = MetadataCacheConfig()
+        if 'ttl' in params:
+            value = params['ttl']
+            if not isinstance(value, (int, float)) or isinstance(value, bool) or value <= 0:
+                raise ValueError(f"Invalid metadata cache ttl: {value}")
+            cache.ttl = value
+        if 'max_entries' in params:
+            value = params['max_entries']
+            if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+                raise ValueError(f"Invalid metadata cache max_entries: {value}")
+            cache.max_entries = value
+        return cache
+
+    @classmethod
+    def parse_health_check(cls, config: Dict[str, Any]) -> HealthCheckConfig:
+        """Get health check settings from the top level of the configuration file
+
+        Args:
+            config: Parsed configuration file
+
+        Returns:
+            HealthCheckConfig instance
+
+        Raises:
+            ValueError: If the health_check configuration is invalid
+        """
+        health_check = HealthCheckConfig()
+        params = config.get('health_check')
+        if params is None:
+            return health_check
+        if not isinstance(params, dict):
+            raise ValueError("Health check configuration must be a dictionary")
+        for key in ('timeout', 'ttl', 'interval'):
+            if key not in params:
+                continue
+            value = params[key]
+            if key == 'interval' and value is None:
+                continue
+            if not isinstance(value, (int, float)) or isinstance(value, bool) or value < 0 \
+                    or (value == 0 and key != 'ttl'):
+                raise ValueError(f"Invalid health_check {key}: {value}")
+            setattr(health_check, key, value)
+        return health_check
+
+    @classmethod
+    def parse_cursors(cls, config: Dict[str, Any]) -> CursorConfig:
+        """Get result paging settings from the top level of the configuration file
+
+        Args:
+            config: Parsed configuration file
+
+        Returns:
+            CursorConfig instance
+
+        Raises:
+            ValueError: If the cursors configuration is invalid
+        """
+        cursors = CursorConfig()
+        params = config.get('cursors')
+        if params is None:
+            return cursors
+        if not isinstance(params, dict):
+            raise ValueError("Cursors configuration must be a dictionary")
+        if 'idle_ttl' in params:
+            value = params['idle_ttl']
+            if not isinstance(value, (int, float)) or isinstance(value, bool) or value <= 0:
+                raise ValueError(f"Invalid cursors idle_ttl: {value}")
+            cursors.idle_ttl = value
+        if 'max_open' in params:
+            value = params['max_open']
+            if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+                raise ValueError(f"Invalid cursors max_open: {value}")
+            cursors.max_open = value
+        return cursors
+
+    @classmethod
+    def parse_exports(cls, config: Dict[str, Any]) -> ExportConfig:
+        """Get export settings from the top level of the configuration file
+
+        Args:
+            config: Parsed configuration file
+
+        Returns:
+            ExportConfig instance
+
+        Raises:
+            ValueError: If the exports configuration is invalid
+        """
+        exports = ExportConfig()
+        params = config.get('exports')
+        if params is None:
+            return exports
+        if not isinstance(params, dict):
+            raise ValueError("Exports configuration must be a dictionary")
+        directory = params.get('directory')
+        if directory is not None and (not isinstance(directory, str) or not directory):
+            raise ValueError(f"Invalid exports directory: {directory}")
+        exports.directory = directory
+        return exports
+
+    @classmethod
+    def parse_shared_cache(cls, config: Dict[str, Any]) -> SharedCacheConfig:
+        """Get shared cache settings from the top level of the configuration file
+
+        Args:
+            config: Parsed configuration file
+
+        Returns:
+            SharedCacheConfig instance
+
+        Raises:
+            ValueError: If the shared_cache configuration is invalid
+        """
+        shared = SharedCacheConfig()
+        params = config.get('shared_cache')
+        if params is None:
+            return shared
+        if not isinstance(params, dict):
+            raise ValueError("Shared cache configuration must be a dictionary")
+        directory = params.get('directory')
+        if directory is not None and (not isinstance(directory, str) or not directory):
+            raise ValueError(f"Invalid shared cache directory: {directory}")
+        shared.directory = directory
+        for key in ('max_bytes', 'max_entry_bytes'):
+            if key in params:
+                value = params[key]
+                if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+                    raise ValueError(f"Invalid shared cache {key}: {value}")
+                setattr(shared, key, value)
+        return shared
+
+    @classmethod
+    def parse_driver(cls, db_config: Dict[str, Any]) -> DriverType:
+        """Get the driver mode from a connection configuration
+
+        Args:
+            db_config: Connection configuration dictionary
+
+        Returns:
+            'sync' or 'async'
+
+        Raises:
+            ValueError: If driver is not a supported mode
+        """
+        driver = db_config.get('driver', 'sync')
+        if driver not in ('sync', 'async'):
+            raise ValueError(f"Invalid driver: {driver}")
+        return driver
+
     @classmethod
     def get_debug_mode(cls) -> bool:
         """Get debug mode status"""
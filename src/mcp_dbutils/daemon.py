@@ -0,0 +1,294 @@
+"""Local daemon serving MCP clients over a Unix domain socket"""
+
+import asyncio
+import contextlib
+import hashlib
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, List, Optional, Set, TextIO
+
+import anyio
+import mcp.types as types
+from mcp.shared.message import SessionMessage
+
+from .log import create_logger
+
+if TYPE_CHECKING:
+    from .base import ConnectionServer
+
+# Longest JSON-RPC message read from a client, one message per line
+MAX_MESSAGE_BYTES = 16 * 1024 * 1024
+
+# 转发器每次读取的字节数
+COPY_BUFFER_SIZE = 64 * 1024
+
+# 转发器自动启动守护进程后等待其开始监听的最长时间（秒）
+DAEMON_START_TIMEOUT = 30
+
+log = create_logger("dbutils.daemon")
+
+
+def require_unix_sockets():
+    """Check the platform can run the daemon and connect to it
+
+    Raises:
+        RuntimeError: If Unix domain sockets or user IDs are not available
+    """
+    if not hasattr(socket, "AF_UNIX") or not hasattr(os, "getuid"):
+        raise RuntimeError("Daemon mode requires Unix domain sockets, which are not available on this platform")
+
+
+def default_socket_path(config_path: str) -> str:
+    """Socket of the daemon serving a configuration file
+
+    Each configuration file gets its own daemon. Sockets live in a
+    directory only the current user can open, under XDG_RUNTIME_DIR when set.
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    directory = os.path.join(runtime_dir, f"mcp-dbutils-{os.getuid()}")
+    digest = hashlib.sha256(os.path.abspath(config_path).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(directory, f"{digest}.sock")
+
+
+def prepare_socket_directory(socket_path: str):
+    """Create the directory of a socket, refusing one owned by another user
+
+    Raises:
+        RuntimeError: If the directory belongs to another user
+    """
+    directory = os.path.dirname(socket_path)
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    # 其他用户创建的目录中的套接字可能被替换
+    if os.stat(directory).st_uid != os.getuid():
+        raise RuntimeError(f"Socket directory {directory} is owned by another user")
+
+
+@asynccontextmanager
+async def socket_transport(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """MCP transport over a stream socket, one JSON-RPC message per line as on stdio
+
+    Serves both ends: the daemon runs a server session on it and tests
+    run a client session.
+    """
+    read_stream_writer, read_stream = anyio.create_memory_object_stream(0)
+    write_stream, write_stream_reader = anyio.create_memory_object_stream(0)
+
+    async def socket_reader():
+        async with read_stream_writer:
+            while line := await reader.readline():
+                try:
+                    message = types.JSONRPCMessage.model_validate_json(line)
+                except Exception as exc:
+                    await read_stream_writer.send(exc)
+                    continue
+                await read_stream_writer.send(SessionMessage(message))
+
+    async def socket_writer():
+        async with write_stream_reader:
+            async for session_message in write_stream_reader:
+                data = session_message.message.model_dump_json(by_alias=True, exclude_none=True)
+                writer.write(data.encode("utf-8") + b"\n")
+                await writer.drain()
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(socket_reader)
+        tg.start_soon(socket_writer)
+        try:
+            yield read_stream, write_stream
+        finally:
+            # 会话结束后不再读写，连接由调用方关闭
+            tg.cancel_scope.cancel()
+
+
+class DaemonLock:
+    """Exclusive claim of a socket path, held for the life of a daemon
+
+    The lock file next to the socket is locked with flock, so a daemon that
+    died leaves no stale claim behind and two daemons starting at once
+    cannot both take over the socket.
+    """
+
+    def __init__(self, socket_path: str):
+        self.path = socket_path + ".lock"
+        self._file: Optional[TextIO] = None
+
+    def acquire(self):
+        """Take the lock, creating the socket directory if needed
+
+        Raises:
+            RuntimeError: If another daemon holds the lock or the directory
+                belongs to another user
+        """
+        import fcntl
+
+        prepare_socket_directory(self.path)
+        # 锁随文件一直持有到release
+        file = open(self.path, "a")  # noqa: SIM115
+        try:
+            fcntl.flock(file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            file.close()
+            raise RuntimeError(f"Another daemon is already serving {self.path[:-5]}")
+        self._file = file
+
+    def release(self):
+        """Give up the lock"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+async def serve(server: "ConnectionServer", socket_path: str):
+    """Serve MCP sessions on a Unix domain socket until SIGTERM or SIGINT
+
+    Every client gets a session of its own on the same ConnectionServer, so
+    all of them share its handlers, pools, caches and statistics.
+
+    Args:
+        server: Connection server, kept alive by the caller between sessions
+        socket_path: Path of the socket, readable only by the current user
+
+    Raises:
+        RuntimeError: If another daemon is serving the socket
+    """
+    lock = DaemonLock(socket_path)
+    lock.acquire()
+    sessions: Set[asyncio.Task] = set()
+
+    async def handle_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        task = asyncio.current_task()
+        sessions.add(task)
+        server.send_log("info", f"Client connected ({len(sessions)} connected)")
+        try:
+            async with socket_transport(reader, writer) as (read_stream, write_stream):
+                await server.server.run(read_stream, write_stream, server.server.create_initialization_options())
+        except Exception as e:
+            server.send_log("warning", f"Client session failed: {str(e)}")
+        finally:
+            sessions.discard(task)
+            writer.close()
+            with contextlib.suppress(Exception):
+                await writer.wait_closed()
+            server.send_log("info", f"Client disconnected ({len(sessions)} connected)")
+
+    try:
+        # 持有锁时残留的套接字文件来自已退出的守护进程
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(socket_path)
+        old_umask = os.umask(0o177)
+        try:
+            unix_server = await asyncio.start_unix_server(handle_client, path=socket_path, limit=MAX_MESSAGE_BYTES)
+        finally:
+            os.umask(old_umask)
+
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(signum, stop.set)
+        server.send_log("info", f"Daemon listening on {socket_path}")
+        try:
+            await stop.wait()
+        finally:
+            for signum in (signal.SIGTERM, signal.SIGINT):
+                loop.remove_signal_handler(signum)
+            unix_server.close()
+            for task in list(sessions):
+                task.cancel()
+            await asyncio.gather(*sessions, return_exceptions=True)
+            await unix_server.wait_closed()
+    finally:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(socket_path)
+        lock.release()
+        server.send_log("info", "Daemon stopped")
+
+
+def daemon_command(config_path: str, socket_path: str) -> List[str]:
+    """Command starting the daemon for a configuration file"""
+    return [
+        sys.executable, "-c", "from mcp_dbutils import main; main()",
+        "daemon", "--config", os.path.abspath(config_path), "--socket", socket_path,
+    ]
+
+
+def start_daemon(command: List[str], socket_path: str):
+    """Start the daemon in a session of its own, logging next to its socket"""
+    prepare_socket_directory(socket_path)
+    log_path = os.path.splitext(socket_path)[0] + ".log"
+    log("info", f"Starting daemon, logging to {log_path}")
+    with open(log_path, "a") as log_file:
+        subprocess.Popen(
+            command,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=log_file,
+            start_new_session=True,
+            close_fds=True,
+        )
+
+
+async def connect(socket_path: str, command: Optional[List[str]] = None):
+    """Open a connection to the daemon, starting it with command if none is listening
+
+    Raises:
+        ConnectionError: If the daemon is not listening and cannot be started
+    """
+    try:
+        return await asyncio.open_unix_connection(socket_path)
+    except (FileNotFoundError, ConnectionRefusedError):
+        if command is None:
+            raise ConnectionError(f"No daemon is listening on {socket_path}")
+    start_daemon(command, socket_path)
+    deadline = time.monotonic() + DAEMON_START_TIMEOUT
+    while True:
+        await asyncio.sleep(0.05)
+        try:
+            return await asyncio.open_unix_connection(socket_path)
+        except (FileNotFoundError, ConnectionRefusedError):
+            if time.monotonic() > deadline:
+                raise ConnectionError(
+                    f"Daemon did not start listening on {socket_path} within {DAEMON_START_TIMEOUT}s"
+                )
+
+
+async def run_shim(socket_path: str, command: Optional[List[str]] = None):
+    """Forward MCP traffic between this process's stdin/stdout and the daemon
+
+    Bytes are copied as they are, so the shim needs neither the database
+    drivers nor the configuration. It exits when the daemon closes the
+    connection, which it does once stdin is closed and pending responses
+    have been sent.
+
+    Args:
+        socket_path: Socket of the daemon
+        command: Command starting the daemon if it is not running
+    """
+    reader, writer = await connect(socket_path, command)
+    loop = asyncio.get_running_loop()
+    stdin = asyncio.StreamReader(limit=MAX_MESSAGE_BYTES)
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(stdin), sys.stdin)
+    stdout = sys.stdout.buffer
+
+    async def forward_requests():
+        while data := await stdin.read(COPY_BUFFER_SIZE):
+            writer.write(data)
+            await writer.drain()
+        if writer.can_write_eof():
+            writer.write_eof()
+
+    requests = asyncio.create_task(forward_requests())
+    try:
+        while data := await reader.read(COPY_BUFFER_SIZE):
+            stdout.write(data)
+            stdout.flush()
+    finally:
+        requests.cancel()
+        with contextlib.suppress(asyncio.CancelledError, ConnectionError):
+            await requests
+        writer.close()
@@ -0,0 +1,213 @@
+"""Query result encoding"""
+
+import base64
+import datetime
+import decimal
+import json
+import math
+import uuid
+from operator import itemgetter
+from typing import Any, Callable, Dict, List, Literal, Optional, Sequence
+
+# Supported result formats: Python literal (legacy), JSON objects, or JSON arrays
+ResultFormat = Literal['text', 'json', 'columnar']
+RESULT_FORMATS = ('text', 'json', 'columnar')
+
+# Integers beyond this cannot be represented exactly by JSON parsers using doubles
+MAX_SAFE_INTEGER = 2**53 - 1
+
+# Rows encoded per json.dumps call by encode_result
+ENCODE_BATCH_SIZE = 1000
+
+# 无需转换即可由json模块正确编码的类型
+_PLAIN_TYPES = frozenset((str, bool, type(None)))
+
+
+def _adapt_int(value: int) -> Any:
+    return value if -MAX_SAFE_INTEGER <= value <= MAX_SAFE_INTEGER else str(value)
+
+
+def _adapt_float(value: float) -> Any:
+    return value if math.isfinite(value) else str(value)
+
+
+def _adapt_bytes(value: Any) -> str:
+    return base64.b64encode(bytes(value)).decode('ascii')
+
+
+def _adapt_timedelta(value: datetime.timedelta) -> str:
+    return str(value)
+
+
+# 按值的确切类型选择转换函数
+_ADAPTERS: Dict[type, Callable[[Any], Any]] = {
+    int: _adapt_int,
+    float: _adapt_float,
+    decimal.Decimal: str,
+    datetime.datetime: datetime.datetime.isoformat,
+    datetime.date: datetime.date.isoformat,
+    datetime.time: datetime.time.isoformat,
+    datetime.timedelta: _adapt_timedelta,
+    uuid.UUID: str,
+    bytes: _adapt_bytes,
+    bytearray: _adapt_bytes,
+    memoryview: _adapt_bytes,
+}
+# 子类按顺序匹配，datetime需在date之前
+_BASE_ADAPTERS = tuple(_ADAPTERS.items())
+
+
+def adapt_value(value: Any) -> Any:
+    """Convert a driver value to a JSON-compatible value
+
+    Decimals, UUIDs and large integers become strings so no precision is
+    lost, temporal values use ISO 8601, and binary values are base64 encoded.
+    """
+    value_type = type(value)
+    if value_type in _PLAIN_TYPES:
+        return value
+    adapter = _ADAPTERS.get(value_type)
+    if adapter is not None:
+        return adapter(value)
+    # 驱动返回的子类，如带时区信息的datetime子类
+    for base_type, base_adapter in _BASE_ADAPTERS:
+        if isinstance(value, base_type):
+            return base_adapter(value)
+    if isinstance(value, (list, tuple, dict)):
+        # JSON/数组列，嵌套的值在编码时通过default转换
+        return value
+    return str(value)
+
+
+def _column_adapter(rows: Sequence[Any], getter: Callable[[Any], Any]) -> Optional[Callable[[Any], Any]]:
+    """Choose the conversion for one column of a batch, None if it needs none
+
+    Type and range checks run over the whole column with map/min/max, so
+    columns of plain values cost no Python-level work per value.
+    """
+    value_types = set(map(type, map(getter, rows)))
+    has_null = type(None) in value_types
+    value_types.discard(type(None))
+    if value_types <= _PLAIN_TYPES:
+        return None
+    if value_types == {int} or value_types == {float}:
+        values = map(getter, rows)
+        present = [value for value in values if value is not None] if has_null else list(values)
+        if value_types == {int}:
+            if min(present) >= -MAX_SAFE_INTEGER and max(present) <= MAX_SAFE_INTEGER:
+                return None
+        elif all(map(math.isfinite, present)):
+            return None
+    if len(value_types) == 1:
+        return _ADAPTERS.get(next(iter(value_types)), adapt_value)
+    return adapt_value
+
+
+def adapt_rows(columns: Sequence[str], rows: Sequence[Any]) -> Sequence[Any]:
+    """Convert a batch of rows to JSON-compatible values
+
+    Rows keep their shape: sequences stay sequences and dictionaries stay
+    dictionaries. Only columns holding values the json module cannot encode
+    as-is are converted; if there are none the batch is returned unchanged.
+
+    Args:
+        columns: Column names
+        rows: Rows as sequences or dictionaries keyed by column name
+    """
+    if not rows:
+        return rows
+    is_dict = isinstance(rows[0], dict)
+    getters = [itemgetter(column if is_dict else index) for index, column in enumerate(columns)]
+    adapters = [_column_adapter(rows, getter) for getter in getters]
+    if not any(adapters):
+        return rows
+
+    column_values = [
+        list(map(getter, rows)) if adapter is None
+        else [None if value is None else adapter(value) for value in map(getter, rows)]
+        for getter, adapter in zip(getters, adapters)
+    ]
+    if is_dict:
+        return [dict(zip(columns, row)) for row in zip(*column_values)]
+    return list(zip(*column_values))
+
+
+class JSONResultEncoder:
+    """Encode query results as JSON, one batch of rows at a time
+
+    Rows are written as objects keyed by column name, or in columnar mode as
+    arrays ordered like columns, which lists each column name only once.
+    Batches are encoded as they arrive, so a result read through RowBatches
+    is never held in full as Python objects.
+    """
+
+    def __init__(self, columns: Sequence[str], columnar: bool = False):
+        self.columns = list(columns)
+        self.columnar = columnar
+        self.row_count = 0
+        self._parts: List[str] = []
+
+    def add_batch(self, rows: Sequence[Any]):
+        """Encode a batch of rows"""
+        if not rows:
+            return
+        adapted = adapt_rows(self.columns, rows)
+        if isinstance(adapted[0], dict):
+            if self.columnar:
+                adapted = [[row[column] for column in self.columns] for row in adapted]
+        elif not self.columnar:
+            adapted = [dict(zip(self.columns, row)) for row in adapted]
+        encoded = json.dumps(adapted, ensure_ascii=False, check_circular=False, default=adapt_value)
+        # 去掉批次数组的方括号，拼接为一个数组
+        self._parts.append(encoded[1:-1])
+        self.row_count += len(rows)
+
+    def finish(self, truncated: bool = False, **extra: Any) -> str:
+        """Get the encoded result
+
+        Args:
+            truncated: Whether rows were left unread
+            extra: Additional top-level fields
+        """
+        header = json.dumps({"columns": self.columns}, ensure_ascii=False)[:-1]
+        trailer = json.dumps(
+            {"row_count": self.row_count, "truncated": truncated, **extra},
+            ensure_ascii=False,
+            default=adapt_value,
+        )[1:]
+        return f'{header}, "rows": [{", ".join(self._parts)}], {trailer}'
+
+
+def encode_result(
+    columns: Sequence[str],
+    rows: Sequence[Any],
+    truncated: bool = False,
+    columnar: bool = False,
+    **extra: Any,
+) -> str:
+    """Encode a query result as JSON
+
+    Args:
+        columns: Column names
+        rows: Rows as sequences or dictionaries
+        truncated: Whether rows were left unread
+        columnar: Write rows as arrays instead of objects
+        extra: Additional top-level fields
+    """
+    encoder = JSONResultEncoder(columns, columnar)
+    for start in range(0, len(rows), ENCODE_BATCH_SIZE):
+        encoder.add_batch(rows[start:start + ENCODE_BATCH_SIZE])
+    return encoder.finish(truncated, **extra)
+
+
+def parse_result_format(value: Optional[str]) -> ResultFormat:
+    """Validate a requested result format
+
+    Raises:
+        ValueError: If the format is not supported
+    """
+    if value is None:
+        return 'text'
+    if value not in RESULT_FORMATS:
+        raise ValueError(f"Invalid format: {value}. Must be one of: {', '.join(RESULT_FORMATS)}")
+    return value  # type: ignore
@@ -0,0 +1,253 @@
+"""Export of query results to local files"""
+
+import csv
+import io
+import json
+import os
+import re
+import secrets
+from datetime import datetime
+from operator import itemgetter
+from typing import Any, List, Literal, Optional, Sequence
+
+from .encoder import adapt_rows, adapt_value
+
+# Supported export file formats
+ExportFormat = Literal['csv', 'jsonl', 'parquet']
+EXPORT_FORMATS = ('csv', 'jsonl', 'parquet')
+
+# Suffix of the file an export is written to until it completes
+PARTIAL_SUFFIX = ".part"
+
+# CSV中写为JSON文本的值类型
+_NESTED_TYPES = frozenset((list, dict))
+
+# 生成文件名时只保留安全的字符
+_UNSAFE_NAME_CHARS = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+class ExportWriter:
+    """Result rows written to a file one batch at a time
+
+    Rows go to a temporary file next to the target, which is renamed once
+    the export is committed, so a failed export never leaves a partial file
+    behind under the target name.
+    """
+
+    format: ExportFormat
+
+    def __init__(self, path: str):
+        self.path = path
+        self.temp_path = path + PARTIAL_SUFFIX
+        self.row_count = 0
+        self.started = False
+        # 文件在多次写入之间保持打开，由commit或discard关闭
+        self.file = open(self.temp_path, "xb")  # noqa: SIM115
+
+    def write(self, columns: Sequence[str], rows: Sequence[Any]):
+        """Write a batch of rows, preceded by the header on the first call
+
+        Args:
+            columns: Column names
+            rows: Rows as sequences
+        """
+        if not self.started:
+            self.started = True
+            self._start(list(columns))
+        if rows:
+            self._write_rows(list(columns), rows)
+            self.row_count += len(rows)
+
+    def copied(self, row_count: int):
+        """Record rows the database wrote to file directly, header included"""
+        self.started = True
+        self.row_count = row_count
+
+    def commit(self) -> int:
+        """Finish the file and move it to its target name
+
+        Returns:
+            Size of the file in bytes
+        """
+        self._finish()
+        self.file.close()
+        os.replace(self.temp_path, self.path)
+        return os.path.getsize(self.path)
+
+    def discard(self):
+        """Remove the partially written file"""
+        try:
+            self.file.close()
+        finally:
+            if os.path.exists(self.temp_path):
+                os.remove(self.temp_path)
+
+    def _start(self, columns: List[str]):
+        pass
+
+    def _write_rows(self, columns: List[str], rows: Sequence[Any]):
+        raise NotImplementedError
+
+    def _finish(self):
+        pass
+
+
+class CSVExportWriter(ExportWriter):
+    """CSV with a header row; NULL is written as an empty field"""
+
+    format = 'csv'
+
+    def _start(self, columns: List[str]):
+        self._text = io.TextIOWrapper(self.file, encoding="utf-8", newline="")
+        self._csv = csv.writer(self._text)
+        self._csv.writerow(columns)
+
+    def _write_rows(self, columns: List[str], rows: Sequence[Any]):
+        rows = adapt_rows(columns, rows)
+        # JSON/数组列写为JSON文本
+        nested = [
+            index for index in range(len(columns))
+            if not _NESTED_TYPES.isdisjoint(map(type, map(itemgetter(index), rows)))
+        ]
+        if nested:
+            rows = [list(row) for row in rows]
+            for row in rows:
+                for index in nested:
+                    if isinstance(row[index], (list, dict)):
+                        row[index] = json.dumps(row[index], ensure_ascii=False, default=adapt_value)
+        self._csv.writerows(rows)
+
+    def _finish(self):
+        self._detach()
+
+    def discard(self):
+        try:
+            self._detach()
+        finally:
+            super().discard()
+
+    def _detach(self):
+        # 分离包装器，文件由ExportWriter关闭
+        text = getattr(self, "_text", None)
+        if text is not None:
+            self._text = None
+            text.flush()
+            text.detach()
+
+
+class JSONLExportWriter(ExportWriter):
+    """One JSON object per line, values converted like the json result format"""
+
+    format = 'jsonl'
+
+    def _write_rows(self, columns: List[str], rows: Sequence[Any]):
+        lines = [
+            json.dumps(dict(zip(columns, row)), ensure_ascii=False, check_circular=False, default=adapt_value)
+            for row in adapt_rows(columns, rows)
+        ]
+        lines.append("")
+        self.file.write("\n".join(lines).encode("utf-8"))
+
+
+class ParquetExportWriter(ExportWriter):
+    """Parquet file written one row group per batch
+
+    Requires pyarrow. Column types are inferred from the first batch.
+    """
+
+    format = 'parquet'
+
+    def __init__(self, path: str):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ValueError("Parquet export requires pyarrow: pip install 'mcp-dbutils[parquet]'")
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        self._writer = None
+        self._columns: List[str] = []
+        super().__init__(path)
+
+    def _start(self, columns: List[str]):
+        self._columns = columns
+
+    def _write_rows(self, columns: List[str], rows: Sequence[Any]):
+        pa = self._pa
+        schema = self._writer.schema if self._writer is not None else None
+        arrays = [
+            pa.array(list(map(itemgetter(index), rows)), type=schema.field(index).type if schema else None)
+            for index in range(len(columns))
+        ]
+        table = pa.Table.from_arrays(arrays, schema=schema) if schema else pa.Table.from_arrays(arrays, names=columns)
+        if self._writer is None:
+            self._writer = self._pq.ParquetWriter(self.file, table.schema)
+        self._writer.write_table(table)
+
+    def _finish(self):
+        if self._writer is None:
+            # 空结果写入只有列名的文件
+            pa = self._pa
+            table = pa.table({column: pa.array([], pa.string()) for column in self._columns})
+            self._writer = self._pq.ParquetWriter(self.file, table.schema)
+            self._writer.write_table(table)
+        self._writer.close()
+
+
+_WRITERS = {
+    'csv': CSVExportWriter,
+    'jsonl': JSONLExportWriter,
+    'parquet': ParquetExportWriter,
+}
+
+
+def parse_export_format(value: Optional[str]) -> ExportFormat:
+    """Validate a requested export format, CSV if none
+
+    Raises:
+        ValueError: If the format is not supported
+    """
+    if value is None:
+        return 'csv'
+    if value not in EXPORT_FORMATS:
+        raise ValueError(f"Invalid format: {value}. Must be one of: {', '.join(EXPORT_FORMATS)}")
+    return value  # type: ignore
+
+
+def resolve_export_path(directory: str, filename: Optional[str], export_format: ExportFormat, stem: str) -> str:
+    """Choose the file an export is written to
+
+    Args:
+        directory: Export directory, created if missing
+        filename: Requested file name relative to directory, generated if None
+        export_format: Export format, appended as extension if missing
+        stem: Prefix of generated file names
+
+    Raises:
+        ValueError: If the file name leaves the directory or the file exists
+    """
+    directory = os.path.realpath(directory)
+    if filename is None:
+        stem = _UNSAFE_NAME_CHARS.sub("_", stem) or "export"
+        filename = f"{stem}-{datetime.now():%Y%m%d-%H%M%S}-{secrets.token_hex(4)}"
+    if not isinstance(filename, str) or not filename or os.path.isabs(filename):
+        raise ValueError(f"Invalid filename: {filename}. Must be a path relative to the export directory")
+    if not filename.endswith(f".{export_format}"):
+        filename = f"{filename}.{export_format}"
+    path = os.path.realpath(os.path.join(directory, filename))
+    # 解析符号链接后仍须位于导出目录内
+    if os.path.commonpath([directory, path]) != directory or path == directory:
+        raise ValueError(f"Invalid filename: {filename}. Must be a path inside the export directory")
+    if os.path.exists(path) or os.path.exists(path + PARTIAL_SUFFIX):
+        raise ValueError(f"Export file already exists: {filename}")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+
+def open_export(path: str, export_format: ExportFormat) -> ExportWriter:
+    """Create the writer of an export file
+
+    Raises:
+        ValueError: If the format's library is not installed
+    """
+    return _WRITERS[export_format](path)
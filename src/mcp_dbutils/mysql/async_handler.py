@@ -0,0 +1,776 @@
+"""MySQL connection handler implementation based on aiomysql"""
+
+import asyncio
+import math
+import random
+from contextlib import asynccontextmanager
+
+import aiomysql
+import mcp.types as types
+
+from ..base import (
+    ConnectionHandler,
+    ConnectionHandlerError,
+    ResultCursor,
+    cached_metadata,
+)
+from .config import MySQLConfig
+
+# 常量定义
+COLUMNS_HEADER = "Columns:"
+POOL_CLOSE_TIMEOUT = 10  # seconds
+# 分页游标空闲期间服务端等待客户端读取的额外时间(秒)
+NET_WRITE_TIMEOUT_MARGIN = 30
+# KILL QUERY中止语句时返回的错误码
+ER_QUERY_INTERRUPTED = 1317
+# 表的数量和最新的创建、更新时间，建表、删表和重建表时改变
+SCHEMA_VERSION_SQL = """
+    SELECT COUNT(*), MAX(CREATE_TIME), MAX(UPDATE_TIME)
+    FROM information_schema.TABLES
+    WHERE TABLE_SCHEMA = %s
+"""
+
+
+class AsyncMySQLHandler(ConnectionHandler):
+    """MySQL handler using aiomysql and its native connection pool
+
+    Queries run on the event loop instead of worker threads, so many
+    concurrent tool calls share one thread.
+    """
+
+    driver = "async"
+
+    @property
+    def db_type(self) -> str:
+        return 'mysql'
+
+    def __init__(self, config_path: str, connection: str, debug: bool = False):
+        """Initialize aiomysql-based MySQL handler
+
+        Args:
+            config_path: Path to configuration file
+            connection: Database connection name
+            debug: Enable debug mode
+        """
+        super().__init__(config_path, connection, debug)
+        self.config = MySQLConfig.from_yaml(config_path, connection)
+
+        # No connection pool creation during initialization
+        masked_params = self.config.get_masked_connection_info()
+        self.log("debug", f"Configuring async connection with parameters: {masked_params}")
+        self.pool = None
+        self._pool_lock = asyncio.Lock()
+        # 正在执行的KILL QUERY任务，保持引用直到完成
+        self._kill_tasks: set[asyncio.Task] = set()
+
+    async def get_connection(self) -> aiomysql.Pool:
+        """Get the connection pool, creating it on first use"""
+        async with self._pool_lock:
+            if self.pool is None or self.pool.closed:
+                self.pool = await self._create_pool(self.config.get_connection_params())
+            return self.pool
+
+    async def _create_pool(self, mysql_config: dict) -> aiomysql.Pool:
+        """Create the connection pool, retrying with exponential backoff
+
+        Raises:
+            ConnectionHandlerError: If the server is still unreachable after max_retries
+        """
+        pool_config = self.config.pool
+        host = mysql_config["host"]
+        port = mysql_config["port"]
+        username = mysql_config["user"]
+        database = mysql_config["database"]
+        self.log_info("Connect mysql ... (host: {}:{}, database: {})", host, port, database)
+        attempt = 0
+        while True:
+            try:
+                pool = await aiomysql.create_pool(
+                    minsize=pool_config.mincached,  # 初始化时，链接池中至少创建的空闲的链接
+                    maxsize=pool_config.maxconnections,  # 连接池允许的最大连接数（0 表示不限制）
+                    autocommit=True,  # 是否自动提交
+                    host=host,  # 数据库服务器地址
+                    port=port,  # 数据库服务器端口
+                    user=username,  # 数据库用户名
+                    password=str(mysql_config["password"]),  # 数据库密码
+                    db=database,  # 数据库名
+                    charset=mysql_config.get("charset", "utf8mb4"),
+                    connect_timeout=pool_config.connect_timeout,  # 连接超时（秒）
+                    cursorclass=aiomysql.DictCursor)
+                self.log_info('Connect mysql success.')
+                return pool
+            except Exception as e:
+                self.log_error('Connect mysql failed. host: {}:{}, username: {}, database: {}, {}', host, port, username, database, str(e))
+                if attempt >= pool_config.max_retries:
+                    raise ConnectionHandlerError(
+                        f"Failed to connect to MySQL at {host}:{port} after {attempt + 1} attempts: {str(e)}"
+                    )
+                # 指数退避加随机抖动，避免服务不可用时空转
+                delay = min(pool_config.retry_backoff_max, pool_config.retry_backoff * (2 ** attempt))
+                delay = random.uniform(delay / 2, delay)
+                attempt += 1
+                self.log_warn("Retrying mysql connection in {:.2f}s (attempt {}/{})", delay, attempt, pool_config.max_retries)
+                await asyncio.sleep(delay)
+
+    @asynccontextmanager
+    async def _limit_statement(self, conn, is_select: bool):
+        """Apply the query timeout and kill the statement on cancellation
+
+        Args:
+            conn: Connection the statement will run on
+            is_select: MAX_EXECUTION_TIME only applies to SELECT statements
+        """
+        timeout_ms = self.get_query_timeout_ms() if is_select else None
+        thread_id = conn.thread_id()
+        if timeout_ms:
+            async with conn.cursor() as cur:
+                await cur.execute("SET SESSION MAX_EXECUTION_TIME = %s", (timeout_ms,))
+        try:
+            yield
+        except asyncio.CancelledError:
+            # 不将半读状态的连接归还连接池；关闭连接不会中止服务端的语句
+            conn.close()
+            await self._kill_query_quietly(thread_id)
+            raise
+        finally:
+            # 连接会归还到连接池，查询出错时也恢复默认值
+            if timeout_ms and not conn.closed:
+                try:
+                    async with conn.cursor() as cur:
+                        await cur.execute("SET SESSION MAX_EXECUTION_TIME = 0")
+                except Exception:
+                    conn.close()
+
+    async def _kill_query(self, thread_id: int) -> None:
+        """Abort the statement running on another session"""
+        mysql_config = self.config.get_connection_params()
+        conn = await aiomysql.connect(host=mysql_config["host"],
+                                      port=mysql_config["port"],
+                                      user=mysql_config["user"],
+                                      password=str(mysql_config["password"]),
+                                      db=mysql_config["database"],
+                                      connect_timeout=self.config.pool.connect_timeout)
+        try:
+            async with conn.cursor() as cur:
+                await cur.execute("KILL QUERY %s", (thread_id,))
+        finally:
+            conn.close()
+
+    async def _kill_query_quietly(self, thread_id: int) -> None:
+        """Kill a statement from a task of its own, logging failures
+
+        The kill runs on even if the caller is cancelled again while waiting.
+        """
+        task = asyncio.ensure_future(self._kill_query(thread_id))
+        self._kill_tasks.add(task)
+        task.add_done_callback(self._kill_tasks.discard)
+        try:
+            await asyncio.shield(task)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            self.log("warning", f"Failed to kill query on thread {thread_id}: {str(e)}")
+
+    async def _abort_unread_result(self, conn, cur) -> None:
+        """Stop a statement whose remaining rows will not be read
+
+        Closing an unbuffered cursor reads and discards every row left on the
+        socket, so the statement is killed first and closing only reads the
+        rows already in flight, up to the interruption error.
+        """
+        try:
+            await self._kill_query(conn.thread_id())
+        except Exception as e:
+            self.log("warning", f"Failed to stop truncated query: {str(e)}")
+            return
+        try:
+            await cur.close()
+        except aiomysql.OperationalError as e:
+            if e.args[0] != ER_QUERY_INTERRUPTED:
+                raise
+
+    async def _check_table_exists(self, cursor, table_name: str) -> None:
+        """检查表是否存在
+
+        Args:
+            cursor: 数据库游标
+            table_name: 表名
+
+        Raises:
+            ConnectionHandlerError: 如果表不存在
+        """
+        await cursor.execute("""
+            SELECT COUNT(*) as count
+            FROM information_schema.tables
+            WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s
+        """, (self.config.database, table_name))
+        table_exists = await cursor.fetchone()
+
+        if not table_exists or table_exists['count'] == 0:
+            raise ConnectionHandlerError(f"Table '{self.config.database}.{table_name}' doesn't exist")
+
+    async def _schema_version(self) -> tuple:
+        """Table count and newest creation and update times of the database"""
+        pool = await self.get_connection()
+        async with pool.acquire() as conn, conn.cursor() as cur:
+            await cur.execute(SCHEMA_VERSION_SQL, (self.config.database,))
+            row = await cur.fetchone()
+            return tuple(row.values()) if isinstance(row, dict) else tuple(row)
+
+    @cached_metadata
+    async def get_tables(self) -> list[types.Resource]:
+        """Get all table resources"""
+        try:
+            pool = await self.get_connection()
+            async with pool.acquire() as conn, conn.cursor() as cur:
+                await cur.execute("""
+                    SELECT
+                        TABLE_NAME as table_name,
+                        TABLE_COMMENT as description
+                    FROM information_schema.tables
+                    WHERE TABLE_SCHEMA = %s
+                """, (self.config.database,))
+                tables = await cur.fetchall()
+                return [
+                    types.Resource(
+                        uri=f"mysql://{self.connection}/{table['table_name']}/schema",
+                        name=f"{table['table_name']} schema",
+                        description=table['description'] if table['description'] else None,
+                        mimeType="application/json"
+                    ) for table in tables
+                ]
+        except Exception as e:
+            error_msg = f"Failed to get tables: {str(e)}"
+            self.stats.record_error(e.__class__.__name__)
+            raise ConnectionHandlerError(error_msg)
+
+    @cached_metadata
+    async def get_schema(self, table_name: str) -> str:
+        """Get table schema information"""
+        try:
+            pool = await self.get_connection()
+            async with pool.acquire() as conn, conn.cursor() as cur:
+                # Get column information
+                await cur.execute("""
+                    SELECT
+                        COLUMN_NAME as column_name,
+                        DATA_TYPE as data_type,
+                        IS_NULLABLE as is_nullable,
+                        COLUMN_COMMENT as description
+                    FROM information_schema.columns
+                    WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s
+                    ORDER BY ORDINAL_POSITION
+                """, (self.config.database, table_name))
+                columns = await cur.fetchall()
+
+                # Get constraint information
+                await cur.execute("""
+                    SELECT
+                        CONSTRAINT_NAME as constraint_name,
+                        CONSTRAINT_TYPE as constraint_type
+                    FROM information_schema.table_constraints
+                    WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s
+                """, (self.config.database, table_name))
+                constraints = await cur.fetchall()
+
+                return str({
+                    'columns': [{
+                        'name': col['column_name'],
+                        'type': col['data_type'],
+                        'nullable': col['is_nullable'] == 'YES',
+                        'description': col['description']
+                    } for col in columns],
+                    'constraints': [{
+                        'name': con['constraint_name'],
+                        'type': con['constraint_type']
+                    } for con in constraints]
+                })
+        except Exception as e:
+            error_msg = f"Failed to read table schema: {str(e)}"
+            self.stats.record_error(e.__class__.__name__)
+            raise ConnectionHandlerError(error_msg)
+
+    async def _execute_query(self, sql: str) -> str:
+        """Execute SQL query"""
+        try:
+            pool = await self.get_connection()
+            self.log_debug(f"Executing query: {sql}")
+
+            # Check if the query is a SELECT statement
+            sql_upper = sql.strip().upper()
+            is_select = sql_upper.startswith("SELECT")
+
+            # SELECT使用非缓冲游标，行按批从服务端读取而不是在执行时全部载入内存
+            # 行以元组返回，只有需要时才按列名构建字典
+            cursor_class = aiomysql.SSCursor if is_select else aiomysql.Cursor
+            async with pool.acquire() as conn, self._limit_statement(conn, is_select), \
+                    conn.cursor(cursor_class) as cur:
+
+                # Only set read-only transaction for SELECT statements
+                if is_select:
+                    await cur.execute("SET TRANSACTION READ ONLY")
+                try:
+                    await cur.execute(sql)
+                    if not is_select:
+                        await conn.commit()
+                    results, truncated = await self.fetch_rows_async(cur.fetchmany) if is_select else ([], False)
+                    if truncated:
+                        await self._abort_unread_result(conn, cur)
+                    if cur.description is None:  # DDL statements
+                        return "Query executed successfully"
+                    columns = [desc[0] for desc in cur.description]
+                    return self.format_result(columns, results, truncated)
+                except Exception as e:
+                    self.log("error", f"Query error: {str(e)}")
+                    raise ConnectionHandlerError(str(e))
+        except Exception as e:
+            error_msg = f"[{self.db_type}] Query execution failed: {str(e)}"
+            raise ConnectionHandlerError(error_msg)
+
+    async def _open_cursor(self, sql: str, idle_ttl: float) -> ResultCursor:
+        """Start an unbuffered query on a pooled connection held until the cursor is closed
+
+        MAX_EXECUTION_TIME would stop the statement while its rows wait
+        between pages, so the query is bounded by the tool call timeout, and
+        a cursor closed before its last page drops its connection instead of
+        reading the remaining rows.
+        """
+        pool = await self.get_connection()
+        conn = await pool.acquire()
+        try:
+            async with conn.cursor() as cur:
+                # 结果在两页之间留在服务端，空闲期间服务端不能因写超时断开连接
+                await cur.execute(
+                    "SET SESSION net_write_timeout = %s",
+                    (math.ceil(idle_ttl) + NET_WRITE_TIMEOUT_MARGIN,),
+                )
+                await cur.execute("SET TRANSACTION READ ONLY")
+            stream = conn.cursor(aiomysql.SSCursor)
+            await stream.execute(sql)
+        except BaseException as e:
+            conn.close()
+            pool.release(conn)
+            if isinstance(e, Exception):
+                raise ConnectionHandlerError(f"[{self.db_type}] Query execution failed: {str(e)}")
+            raise
+        state = {"exhausted": False}
+
+        async def fetchmany(size: int) -> list:
+            try:
+                rows = await stream.fetchmany(size)
+            except asyncio.CancelledError:
+                # 关闭连接使服务端中止语句
+                conn.close()
+                raise
+            state["exhausted"] = len(rows) < size
+            return rows
+
+        async def close():
+            try:
+                if state["exhausted"] and not conn.closed:
+                    await stream.close()
+                    async with conn.cursor() as cur:
+                        await cur.execute("SET SESSION net_write_timeout = DEFAULT")
+                else:
+                    conn.close()
+            finally:
+                pool.release(conn)
+
+        return ResultCursor(
+            fetchmany, close, lambda: [desc[0] for desc in stream.description], is_async=True
+        )
+
+    async def _execute_write_query(self, sql: str) -> str:
+        """Execute SQL write query
+
+        Args:
+            sql: SQL write query (INSERT, UPDATE, DELETE)
+
+        Returns:
+            str: Execution result
+
+        Raises:
+            ConnectionHandlerError: If query execution fails
+        """
+        try:
+            # Check if the query is a write operation
+            sql_upper = sql.strip().upper()
+            is_insert = sql_upper.startswith("INSERT")
+            is_update = sql_upper.startswith("UPDATE")
+            is_delete = sql_upper.startswith("DELETE")
+            is_transaction = sql_upper.startswith(("BEGIN", "COMMIT", "ROLLBACK", "START TRANSACTION"))
+
+            if not (is_insert or is_update or is_delete or is_transaction):
+                raise ConnectionHandlerError("Only INSERT, UPDATE, DELETE, and transaction statements are allowed for write operations")
+
+            pool = await self.get_connection()
+            self.log("debug", f"Executing write operation: {sql}")
+
+            async with pool.acquire() as conn, self._limit_statement(conn, False), conn.cursor() as cur:
+                try:
+                    # Execute the write operation
+                    await cur.execute(sql)
+
+                    # Get number of affected rows
+                    affected_rows = cur.rowcount
+
+                    # Commit the transaction if not in a transaction block
+                    if not is_transaction:
+                        await conn.commit()
+
+                    self.log("debug", f"Write operation executed successfully, affected {affected_rows} rows")
+
+                    # Return result
+                    if is_transaction:
+                        return f"Transaction operation executed successfully"
+                    else:
+                        return f"Write operation executed successfully. {affected_rows} row{'s' if affected_rows != 1 else ''} affected."
+                except Exception as e:
+                    # Rollback on error
+                    if not is_transaction:
+                        await conn.rollback()
+                    self.log("error", f"Write operation error: {str(e)}")
+                    raise ConnectionHandlerError(str(e))
+        except Exception as e:
+            error_msg = f"[{self.db_type}] Write operation failed: {str(e)}"
+            raise ConnectionHandlerError(error_msg)
+
+    @cached_metadata
+    async def get_table_description(self, table_name: str) -> str:
+        """Get detailed table description"""
+        try:
+            pool = await self.get_connection()
+            async with pool.acquire() as conn, conn.cursor() as cur:
+                # Check if table exists
+                await self._check_table_exists(cur, table_name)
+
+                # Get table information and comment
+                await cur.execute("""
+                    SELECT
+                        TABLE_COMMENT as table_comment
+                    FROM information_schema.tables
+                    WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s
+                """, (self.config.database, table_name))
+                table_info = await cur.fetchone()
+                table_comment = table_info['table_comment'] if table_info else None
+
+                # Get column information
+                await cur.execute("""
+                    SELECT
+                        COLUMN_NAME as column_name,
+                        DATA_TYPE as data_type,
+                        COLUMN_DEFAULT as column_default,
+                        IS_NULLABLE as is_nullable,
+                        CHARACTER_MAXIMUM_LENGTH as character_maximum_length,
+                        NUMERIC_PRECISION as numeric_precision,
+                        NUMERIC_SCALE as numeric_scale,
+                        COLUMN_COMMENT as column_comment
+                    FROM information_schema.columns
+                    WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s
+                    ORDER BY ORDINAL_POSITION
+                """, (self.config.database, table_name))
+                columns = await cur.fetchall()
+
+                # Format output
+                description = [
+                    f"Table: {table_name}",
+                    f"Comment: {table_comment or 'No comment'}\n",
+                    COLUMNS_HEADER
+                ]
+
+                for col in columns:
+                    col_info = [
+                        f"  {col['column_name']} ({col['data_type']})",
+                        f"    Nullable: {col['is_nullable']}",
+                        f"    Default: {col['column_default'] or 'None'}"
+                    ]
+
+                    if col['character_maximum_length']:
+                        col_info.append(f"    Max Length: {col['character_maximum_length']}")
+                    if col['numeric_precision']:
+                        col_info.append(f"    Precision: {col['numeric_precision']}")
+                    if col['numeric_scale']:
+                        col_info.append(f"    Scale: {col['numeric_scale']}")
+                    if col['column_comment']:
+                        col_info.append(f"    Comment: {col['column_comment']}")
+
+                    description.extend(col_info)
+                    description.append("")  # Empty line between columns
+
+                return "\n".join(description)
+
+        except Exception as e:
+            error_msg = f"Failed to get table description: {str(e)}"
+            self.stats.record_error(e.__class__.__name__)
+            raise ConnectionHandlerError(error_msg)
+
+    @cached_metadata
+    async def get_table_ddl(self, table_name: str) -> str:
+        """Get DDL statement for creating table"""
+        try:
+            pool = await self.get_connection()
+            async with pool.acquire() as conn, conn.cursor() as cur:
+                # MySQL provides a SHOW CREATE TABLE statement
+                await cur.execute(f"SHOW CREATE TABLE {table_name}")
+                result = await cur.fetchone()
+                if result:
+                    return result['Create Table']
+                return f"Failed to get DDL for table {table_name}"
+
+        except Exception as e:
+            error_msg = f"Failed to get table DDL: {str(e)}"
+            self.stats.record_error(e.__class__.__name__)
+            raise ConnectionHandlerError(error_msg)
+
+    @cached_metadata
+    async def get_table_indexes(self, table_name: str) -> str:
+        """Get index information for table"""
+        try:
+            pool = await self.get_connection()
+            async with pool.acquire() as conn, conn.cursor() as cur:
+                # Check if table exists
+                await self._check_table_exists(cur, table_name)
+
+                # Get index information
+                await cur.execute("""
+                    SELECT
+                        INDEX_NAME as index_name,
+                        COLUMN_NAME as column_name,
+                        NON_UNIQUE as non_unique,
+                        INDEX_TYPE as index_type,
+                        INDEX_COMMENT as index_comment
+                    FROM information_schema.statistics
+                    WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s
+                    ORDER BY INDEX_NAME, SEQ_IN_INDEX
+                """, (self.config.database, table_name))
+                indexes = await cur.fetchall()
+
+                if not indexes:
+                    return f"No indexes found on table {table_name}"
+
+                # Group by index name
+                current_index = None
+                formatted_indexes = []
+                index_info = []
+
+                for idx in indexes:
+                    if current_index != idx['index_name']:
+                        if index_info:
+                            formatted_indexes.extend(index_info)
+                            formatted_indexes.append("")
+                        current_index = idx['index_name']
+                        index_info = [
+                            f"Index: {idx['index_name']}",
+                            f"Type: {'UNIQUE' if not idx['non_unique'] else 'INDEX'}",
+                            f"Method: {idx['index_type']}",
+                            COLUMNS_HEADER,
+                        ]
+                        if idx['index_comment']:
+                            index_info.insert(1, f"Comment: {idx['index_comment']}")
+
+                    index_info.append(f"  - {idx['column_name']}")
+
+                if index_info:
+                    formatted_indexes.extend(index_info)
+
+                return "\n".join(formatted_indexes)
+
+        except Exception as e:
+            error_msg = f"Failed to get index information: {str(e)}"
+            self.stats.record_error(e.__class__.__name__)
+            raise ConnectionHandlerError(error_msg)
+
+    async def get_table_stats(self, table_name: str) -> str:
+        """Get table statistics information"""
+        try:
+            pool = await self.get_connection()
+            async with pool.acquire() as conn, conn.cursor() as cur:
+                # Check if table exists
+                await self._check_table_exists(cur, table_name)
+
+                # Get table statistics
+                await cur.execute("""
+                    SELECT
+                        TABLE_ROWS as table_rows,
+                        AVG_ROW_LENGTH as avg_row_length,
+                        DATA_LENGTH as data_length,
+                        INDEX_LENGTH as index_length,
+                        DATA_FREE as data_free
+                    FROM information_schema.tables
+                    WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s
+                """, (self.config.database, table_name))
+                stats = await cur.fetchone()
+
+                if not stats:
+                    return f"No statistics found for table {table_name}"
+
+                # Get column statistics
+                await cur.execute("""
+                    SELECT
+                        COLUMN_NAME as column_name,
+                        DATA_TYPE as data_type,
+                        COLUMN_TYPE as column_type
+                    FROM information_schema.columns
+                    WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s
+                    ORDER BY ORDINAL_POSITION
+                """, (self.config.database, table_name))
+                columns = await cur.fetchall()
+
+                # Format the output
+                output = [
+                    f"Table Statistics for {table_name}:",
+                    f"  Estimated Row Count: {stats['table_rows']:,}",
+                    f"  Average Row Length: {stats['avg_row_length']} bytes",
+                    f"  Data Length: {stats['data_length']:,} bytes",
+                    f"  Index Length: {stats['index_length']:,} bytes",
+                    f"  Data Free: {stats['data_free']:,} bytes\n",
+                    "Column Information:"
+                ]
+
+                for col in columns:
+                    col_info = [
+                        f"  {col['column_name']}:",
+                        f"    Data Type: {col['data_type']}",
+                        f"    Column Type: {col['column_type']}"
+                    ]
+                    output.extend(col_info)
+                    output.append("")  # Empty line between columns
+
+                return "\n".join(output)
+
+        except Exception as e:
+            error_msg = f"Failed to get table statistics: {str(e)}"
+            self.stats.record_error(e.__class__.__name__)
+            raise ConnectionHandlerError(error_msg)
+
+    @cached_metadata
+    async def get_table_constraints(self, table_name: str) -> str:
+        """Get constraint information for table"""
+        try:
+            pool = await self.get_connection()
+            async with pool.acquire() as conn, conn.cursor() as cur:
+                # Check if table exists
+                await self._check_table_exists(cur, table_name)
+
+                # Get constraint information
+                await cur.execute("""
+                    SELECT
+                        k.CONSTRAINT_NAME as constraint_name,
+                        t.CONSTRAINT_TYPE as constraint_type,
+                        k.COLUMN_NAME as column_name,
+                        k.REFERENCED_TABLE_NAME as referenced_table_name,
+                        k.REFERENCED_COLUMN_NAME as referenced_column_name
+                    FROM information_schema.key_column_usage k
+                    JOIN information_schema.table_constraints t
+                        ON k.CONSTRAINT_NAME = t.CONSTRAINT_NAME
+                        AND k.TABLE_SCHEMA = t.TABLE_SCHEMA
+                        AND k.TABLE_NAME = t.TABLE_NAME
+                    WHERE k.TABLE_SCHEMA = %s
+                        AND k.TABLE_NAME = %s
+                    ORDER BY t.CONSTRAINT_TYPE, k.CONSTRAINT_NAME, k.ORDINAL_POSITION
+                """, (self.config.database, table_name))
+                constraints = await cur.fetchall()
+
+                if not constraints:
+                    return f"No constraints found on table {table_name}"
+
+                # Format constraints by type
+                output = [f"Constraints for {table_name}:"]
+                current_constraint = None
+                constraint_info = []
+
+                for con in constraints:
+                    if current_constraint != con['constraint_name']:
+                        if constraint_info:
+                            output.extend(constraint_info)
+                            output.append("")
+                        current_constraint = con['constraint_name']
+                        constraint_info = [
+                            f"\n{con['constraint_type']} Constraint: {con['constraint_name']}",
+                            COLUMNS_HEADER
+                        ]
+
+                    col_info = f"  - {con['column_name']}"
+                    if con['referenced_table_name']:
+                        col_info += f" -> {con['referenced_table_name']}.{con['referenced_column_name']}"
+                    constraint_info.append(col_info)
+
+                if constraint_info:
+                    output.extend(constraint_info)
+
+                return "\n".join(output)
+
+        except Exception as e:
+            error_msg = f"Failed to get constraint information: {str(e)}"
+            self.stats.record_error(e.__class__.__name__)
+            raise ConnectionHandlerError(error_msg)
+
+    async def explain_query(self, sql: str) -> str:
+        """Get query execution plan"""
+        try:
+            pool = await self.get_connection()
+            async with pool.acquire() as conn, conn.cursor() as cur:
+                # Get EXPLAIN output
+                await cur.execute(f"EXPLAIN FORMAT=TREE {sql}")
+                explain_result = await cur.fetchall()
+
+                # Get EXPLAIN ANALYZE output
+                await cur.execute(f"EXPLAIN ANALYZE {sql}")
+                analyze_result = await cur.fetchall()
+
+                output = [
+                    "Query Execution Plan:",
+                    "==================",
+                    "\nEstimated Plan:",
+                    "----------------"
+                ]
+                for row in explain_result:
+                    output.append(str(row['EXPLAIN']))
+
+                output.extend([
+                    "\nActual Plan (ANALYZE):",
+                    "----------------------"
+                ])
+                for row in analyze_result:
+                    output.append(str(row['EXPLAIN']))
+
+                return "\n".join(output)
+
+        except Exception as e:
+            error_msg = f"Failed to explain query: {str(e)}"
+            self.stats.record_error(e.__class__.__name__)
+            raise ConnectionHandlerError(error_msg)
+
+    async def test_connection(self) -> bool:
+        """Test database connection
+
+        Returns:
+            bool: True if connection is successful, False otherwise
+        """
+        try:
+            pool = await self.get_connection()
+            async with pool.acquire() as conn, conn.cursor() as cur:
+                await cur.execute("SELECT 1")
+                return True
+        except Exception as e:
+            self.log("error", f"Connection test failed: {str(e)}")
+            return False
+
+    async def cleanup(self):
+        """Cleanup resources"""
+        # Log final stats before cleanup
+        self.log("info", f"Final MySQL handler stats: {self.stats.to_dict()}")
+
+        # 关闭连接池，超时后强制终止仍在执行的连接
+        if self.pool is not None:
+            try:
+                self.log("debug", "Closing MySQL async connection pool")
+                self.pool.close()
+                await asyncio.wait_for(self.pool.wait_closed(), timeout=POOL_CLOSE_TIMEOUT)
+            except Exception as e:
+                self.log("warning", f"Error closing MySQL async connection pool: {str(e)}")
+                self.pool.terminate()
+            self.pool = None
+
+        # 清理其他资源
+        self.log("debug", "MySQL handler cleanup complete")
@@ -3,7 +3,7 @@ from dataclasses import dataclass
 from typing import Any, Dict, Literal, Optional
 from urllib.parse import parse_qs, urlparse
 
-from ..config import ConnectionConfig, WritePermissions
+from ..config import ConnectionConfig, DriverType, WritePermissions
 
 
 @dataclass
@@ -14,6 +14,58 @@ class SSLConfig:
     cert: Optional[str] = None
     key: Optional[str] = None
 
+@dataclass
+class PoolConfig:
+    """Connection pool configuration for MySQL connection"""
+    mincached: int = 5  # Idle connections opened up front
+    maxcached: int = 5  # Maximum idle connections kept in the pool
+    maxconnections: int = 100  # Maximum open connections (0 = unlimited)
+    blocking: bool = True  # Wait for a free connection instead of failing
+    ping: int = 1  # DBUtils ping policy (0 = never, 1 = on checkout, 7 = always)
+    connect_timeout: int = 10  # seconds
+    max_retries: int = 3  # Retries after the first failed connect attempt
+    retry_backoff: float = 0.5  # Base delay for exponential backoff in seconds
+    retry_backoff_max: float = 8  # Upper bound for a single backoff delay in seconds
+
+def parse_pool_config(pool_params: Any) -> PoolConfig:
+    """Parse pool configuration block
+
+    Args:
+        pool_params: Value of the 'pool' key in the connection configuration
+
+    Returns:
+        PoolConfig instance
+
+    Raises:
+        ValueError: If the pool configuration is invalid
+    """
+    if not isinstance(pool_params, dict):
+        raise ValueError("Pool configuration must be a dictionary")
+
+    pool = PoolConfig()
+    for key in ('mincached', 'maxcached', 'maxconnections', 'ping', 'max_retries'):
+        if key in pool_params:
+            value = pool_params[key]
+            if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+                raise ValueError(f"Invalid pool {key}: {value}")
+            setattr(pool, key, value)
+    for key in ('connect_timeout', 'retry_backoff', 'retry_backoff_max'):
+        if key in pool_params:
+            value = pool_params[key]
+            if not isinstance(value, (int, float)) or isinstance(value, bool) or value <= 0:
+                raise ValueError(f"Invalid pool {key}: {value}")
+            setattr(pool, key, value)
+    if 'blocking' in pool_params:
+        if not isinstance(pool_params['blocking'], bool):
+            raise ValueError(f"Invalid pool blocking: {pool_params['blocking']}")
+        pool.blocking = pool_params['blocking']
+
+    if pool.ping > 7:
+        raise ValueError(f"Invalid pool ping: {pool.ping}")
+    if pool.maxconnections and pool.mincached > pool.maxconnections:
+        raise ValueError("Pool mincached cannot be greater than maxconnections")
+    return pool
+
 def parse_url(url: str) -> Dict[str, Any]:
     """Parse MySQL URL into connection parameters
 
@@ -75,9 +127,15 @@ class MySQLConfig(ConnectionConfig):
     type: Literal['mysql'] = 'mysql'
     url: Optional[str] = None
     ssl: Optional[SSLConfig] = None
+    pool: Optional[PoolConfig] = None
+    driver: DriverType = 'sync'  # 'async' uses aiomysql instead of pymysql
     writable: bool = False  # Whether write operations are allowed
     write_permissions: Optional[WritePermissions] = None  # Write permissions configuration
 
+    def __post_init__(self):
+        if self.pool is None:
+            self.pool = PoolConfig()
+
     @classmethod
     def _validate_connection_config(cls, configs: dict, db_name: str) -> dict:
         """验证连接配置是否有效
@@ -205,7 +263,7 @@ class MySQLConfig(ConnectionConfig):
         )
 
     @classmethod
-    def from_yaml(cls, yaml_path: str, db_name: str, local_host: Optional[str] = None) -> 'MySQLConfig':
+    def _from_yaml(cls, yaml_path: str, db_name: str, local_host: Optional[str] = None) -> 'MySQLConfig':
         """Create configuration from YAML file
 
         Args:
@@ -224,6 +282,21 @@ class MySQLConfig(ConnectionConfig):
         else:
             config = cls._create_config_from_params(db_config, local_host)
 
+        # Parse pool configuration if present
+        if 'pool' in db_config:
+            config.pool = parse_pool_config(db_config['pool'])
+
+        # Parse driver selection
+        config.driver = cls.parse_driver(db_config)
+
+        # Parse execution limits and caches
+        config.max_workers = cls.parse_max_workers(db_config)
+        config.query_timeout = cls.parse_query_timeout(db_config)
+        config.max_rows = cls.parse_max_rows(db_config)
+        config.max_result_bytes, config.max_cell_bytes = cls.parse_result_bytes(db_config)
+        config.cache = cls.parse_cache(db_config)
+        config.metadata_cache = cls.parse_metadata_cache(db_config)
+
         # Parse write permissions
         config.writable = db_config.get('writable', False)
         if config.writable and 'write_permissions' in db_config:
@@ -1,21 +1,39 @@
 """MySQL connection handler implementation"""
 
+import math
+import random
 import threading
+import time
+from contextlib import contextmanager, suppress
+from typing import Iterator, Optional
+
 import mcp.types as types
 import pymysql
-from pymysql.cursors import DictCursor
+from pymysql.cursors import Cursor, DictCursor, SSCursor
 from dbutils.pooled_db import PooledDB
 
-from ..base import ConnectionHandler, ConnectionHandlerError
+from ..base import ConnectionHandler, ConnectionHandlerError, ResultCursor, cached_metadata, run_in_executor
 from .config import MySQLConfig
 
 # 常量定义
 COLUMNS_HEADER = "Columns:"
+# 分页游标空闲期间服务端等待客户端读取的额外时间(秒)
+NET_WRITE_TIMEOUT_MARGIN = 30
+# KILL QUERY中止语句时返回的错误码
+ER_QUERY_INTERRUPTED = 1317
+# 表的数量和最新的创建、更新时间，建表、删表和重建表时改变
+SCHEMA_VERSION_SQL = """
+    SELECT COUNT(*), MAX(CREATE_TIME), MAX(UPDATE_TIME)
+    FROM information_schema.TABLES
+    WHERE TABLE_SCHEMA = %s
+"""
 
 
 class MySQLHandler(ConnectionHandler):
     _instance: dict[str, PooledDB] = {}
     _lock = threading.RLock()
+    # 每个连接池一把锁，创建连接池时的重试不阻塞其他数据库
+    _pool_locks: dict[str, threading.Lock] = {}
     
     @property
     def db_type(self) -> str:
@@ -41,37 +59,154 @@ class MySQLHandler(ConnectionHandler):
         if self.pool:
             return self.pool
         mysql_config = self.config.get_connection_params()
-        key = f"{mysql_config['host']}:{mysql_config['port']}:{mysql_config['database']}"
+        key = f"{mysql_config['user']}@{mysql_config['host']}:{mysql_config['port']}:{mysql_config['database']}"
         with MySQLHandler._lock:
-            if key not in MySQLHandler._instance:
-                host = mysql_config["host"]
-                port = mysql_config["port"]
-                username = mysql_config["user"]
-                database = mysql_config["database"]
-                self.log_info("Connect mysql ... (host: {}:{}, database: {})", host, port, database)
-                while True:
-                    try:
-                        MySQLHandler._instance[key] = PooledDB(creator=pymysql,  # 使用链接数据库的模块
-                                            maxconnections=100,  # 连接池允许的最大连接数
-                                            mincached=5,  # 初始化时，链接池中至少创建的空闲的链接
-                                            maxcached=5,  # 链接池中最多闲置的链接
-                                            maxshared=2,  # 链接池中最多共享的链接数量
-                                            blocking=True,  # 连接池中如果没有可用连接后，是否阻塞等待
-                                            autocommit=True,  # 是否自动提交
-                                            host=host,  # 数据库服务器地址
-                                            port=port,  # 数据库服务器端口
-                                            user=username,  # 数据库用户名
-                                            password=str(mysql_config["password"]),  # 数据库密码
-                                            database=database,  # 数据库名
-                                            cursorclass=DictCursor)
-                        break
-                    except Exception as e:
-                        self.log_error('Connect mysql failed. host: {}:{}, username: {}, database: {}, {}', host, port, username, database, str(e))
-                self.log_info('Connect mysql success.')
-            self.pool = MySQLHandler._instance[key]
+            pool = MySQLHandler._instance.get(key)
+            pool_lock = MySQLHandler._pool_locks.setdefault(key, threading.Lock())
+        if pool is None:
+            with pool_lock:
+                pool = MySQLHandler._instance.get(key)
+                if pool is None:
+                    pool = self._create_pool(mysql_config)
+                    with MySQLHandler._lock:
+                        MySQLHandler._instance[key] = pool
+        self.pool = pool
         return self.pool
 
-    async def _check_table_exists(self, cursor, table_name: str) -> None:
+    @classmethod
+    async def close_pools(cls):
+        """Close all shared connection pools
+
+        Called from the server lifespan on shutdown; connections still checked
+        out are closed when they are returned.
+        """
+        with cls._lock:
+            pools = list(cls._instance.values())
+            cls._instance.clear()
+        for pool in pools:
+            try:
+                pool.close()
+            except Exception:
+                pass
+
+    def _create_pool(self, mysql_config: dict) -> PooledDB:
+        """Create the connection pool, retrying with exponential backoff
+
+        Raises:
+            ConnectionHandlerError: If the server is still unreachable after max_retries
+        """
+        pool_config = self.config.pool
+        host = mysql_config["host"]
+        port = mysql_config["port"]
+        username = mysql_config["user"]
+        database = mysql_config["database"]
+        self.log_info("Connect mysql ... (host: {}:{}, database: {})", host, port, database)
+        attempt = 0
+        while True:
+            try:
+                pool = PooledDB(creator=pymysql,  # 使用链接数据库的模块
+                                maxconnections=pool_config.maxconnections,  # 连接池允许的最大连接数
+                                mincached=pool_config.mincached,  # 初始化时，链接池中至少创建的空闲的链接
+                                maxcached=pool_config.maxcached,  # 链接池中最多闲置的链接
+                                maxshared=2,  # 链接池中最多共享的链接数量
+                                blocking=pool_config.blocking,  # 连接池中如果没有可用连接后，是否阻塞等待
+                                ping=pool_config.ping,  # 何时检查连接是否可用
+                                autocommit=True,  # 是否自动提交
+                                host=host,  # 数据库服务器地址
+                                port=port,  # 数据库服务器端口
+                                user=username,  # 数据库用户名
+                                password=str(mysql_config["password"]),  # 数据库密码
+                                database=database,  # 数据库名
+                                connect_timeout=pool_config.connect_timeout,  # 连接超时（秒）
+                                cursorclass=DictCursor)
+                self.log_info('Connect mysql success.')
+                return pool
+            except Exception as e:
+                self.log_error('Connect mysql failed. host: {}:{}, username: {}, database: {}, {}', host, port, username, database, str(e))
+                if attempt >= pool_config.max_retries:
+                    raise ConnectionHandlerError(
+                        f"Failed to connect to MySQL at {host}:{port} after {attempt + 1} attempts: {str(e)}"
+                    )
+                # 指数退避加随机抖动，避免服务不可用时空转
+                delay = min(pool_config.retry_backoff_max, pool_config.retry_backoff * (2 ** attempt))
+                delay = random.uniform(delay / 2, delay)
+                attempt += 1
+                self.log_warn("Retrying mysql connection in {:.2f}s (attempt {}/{})", delay, attempt, pool_config.max_retries)
+                time.sleep(delay)
+
+    @contextmanager
+    def _limit_statement(self, conn, is_select: bool) -> Iterator[Optional[int]]:
+        """Apply the query timeout and allow the statement to be killed on cancellation
+
+        Args:
+            conn: Connection the statement will run on
+            is_select: MAX_EXECUTION_TIME only applies to SELECT statements
+
+        Yields:
+            Connection ID of the session, None if unknown
+        """
+        timeout_ms = self.get_query_timeout_ms() if is_select else None
+        with conn.cursor() as cur:
+            if timeout_ms:
+                cur.execute("SET SESSION MAX_EXECUTION_TIME = %s", (timeout_ms,))
+            cur.execute("SELECT CONNECTION_ID() AS id")
+            connection_id = (cur.fetchone() or {}).get('id')
+        try:
+            if connection_id is None:
+                yield None
+            else:
+                with self.cancel_scope(lambda: self._kill_query(connection_id)):
+                    yield connection_id
+        finally:
+            # 连接会归还到连接池，恢复默认值
+            if timeout_ms:
+                with conn.cursor() as cur:
+                    cur.execute("SET SESSION MAX_EXECUTION_TIME = 0")
+
+    def _connect_direct(self) -> pymysql.connections.Connection:
+        """Open a connection outside the pool"""
+        mysql_config = self.config.get_connection_params()
+        return pymysql.connect(host=mysql_config["host"],
+                               port=mysql_config["port"],
+                               user=mysql_config["user"],
+                               password=str(mysql_config["password"]),
+                               database=mysql_config["database"],
+                               connect_timeout=self.config.pool.connect_timeout)
+
+    def _kill_query(self, connection_id: int) -> None:
+        """Abort the statement running on another session"""
+        conn = self._connect_direct()
+        try:
+            with conn.cursor() as cur:
+                cur.execute("KILL QUERY %s", (connection_id,))
+        finally:
+            conn.close()
+
+    def _abort_unread_result(self, connection_id: Optional[int], cur) -> bool:
+        """Stop a statement whose remaining rows will not be read
+
+        Closing an unbuffered cursor reads and discards every row left on the
+        socket, so the statement is killed first and closing only reads the
+        rows already in flight, up to the interruption error.
+
+        Returns:
+            Whether the statement was stopped and the cursor closed
+        """
+        if connection_id is None:
+            return False
+        try:
+            self._kill_query(connection_id)
+        except Exception as e:
+            self.log("warning", f"Failed to stop unread query: {str(e)}")
+            return False
+        try:
+            cur.close()
+        except pymysql.err.OperationalError as e:
+            if e.args[0] != ER_QUERY_INTERRUPTED:
+                raise
+        return True
+
+    def _check_table_exists(self, cursor, table_name: str) -> None:
         """检查表是否存在
 
         Args:
@@ -100,7 +235,23 @@ class MySQLHandler(ConnectionHandler):
         if isinstance(table_exists, tuple) and table_exists[0] == 0:
             raise ConnectionHandlerError(f"Table '{self.config.database}.{table_name}' doesn't exist")
 
-    async def get_tables(self) -> list[types.Resource]:
+    @run_in_executor
+    def _schema_version(self) -> tuple:
+        """Table count and newest creation and update times of the database"""
+        conn = None
+        try:
+            conn = self.get_connection().connection()
+            with conn.cursor() as cur:  # NOSONAR
+                cur.execute(SCHEMA_VERSION_SQL, (self.config.database,))
+                row = cur.fetchone()
+                return tuple(row.values()) if isinstance(row, dict) else tuple(row)
+        finally:
+            if conn:
+                conn.close()
+
+    @cached_metadata
+    @run_in_executor
+    def get_tables(self) -> list[types.Resource]:
         """Get all table resources"""
         conn = None
         try:
@@ -130,7 +281,9 @@ class MySQLHandler(ConnectionHandler):
             if conn:
                 conn.close()
 
-    async def get_schema(self, table_name: str) -> str:
+    @cached_metadata
+    @run_in_executor
+    def get_schema(self, table_name: str) -> str:
         """Get table schema information"""
         conn = None
         try:
@@ -179,18 +332,22 @@ class MySQLHandler(ConnectionHandler):
             if conn:
                 conn.close()
 
-    async def _execute_query(self, sql: str) -> str:
+    @run_in_executor
+    def _execute_query(self, sql: str) -> str:
         """Execute SQL query"""
         conn = None
         try:
             conn = self.get_connection().connection()
             self.log_debug(f"Executing query: {sql}")
 
-            with conn.cursor() as cur:  # NOSONAR
-                # Check if the query is a SELECT statement
-                sql_upper = sql.strip().upper()
-                is_select = sql_upper.startswith("SELECT")
+            # Check if the query is a SELECT statement
+            sql_upper = sql.strip().upper()
+            is_select = sql_upper.startswith("SELECT")
 
+            # SELECT使用非缓冲游标，行按批从服务端读取而不是在执行时全部载入内存
+            # 行以元组返回，只有需要时才按列名构建字典
+            cursor_class = SSCursor if is_select else Cursor
+            with self._limit_statement(conn, is_select) as connection_id, conn.cursor(cursor_class) as cur:  # NOSONAR
                 # Only set read-only transaction for SELECT statements
                 if is_select:
                     cur.execute("SET TRANSACTION READ ONLY")
@@ -198,14 +355,13 @@ class MySQLHandler(ConnectionHandler):
                     cur.execute(sql)
                     if not is_select:
                         conn.commit()
-                    results = cur.fetchall() if is_select else []
+                    results, truncated = self.fetch_rows(cur.fetchmany) if is_select else ([], False)
+                    if truncated:
+                        self._abort_unread_result(connection_id, cur)
                     if cur.description is None:  # DDL statements
                         return "Query executed successfully"
                     columns = [desc[0] for desc in cur.description]
-                    return str({
-                        "columns": columns,
-                        "rows": results
-                    })
+                    return self.format_result(columns, results, truncated)
                 except Exception as e:
                     self.log("error", f"Query error: {str(e)}")
                     raise ConnectionHandlerError(str(e))
@@ -218,7 +374,73 @@ class MySQLHandler(ConnectionHandler):
             if conn:
                 conn.close()
 
-    async def _execute_write_query(self, sql: str) -> str:
+    @run_in_executor
+    def _open_cursor(self, sql: str, idle_ttl: float) -> ResultCursor:
+        """Start an unbuffered query on a pooled connection held until the cursor is closed
+
+        The connection is dedicated to the cursor and counts against the
+        pool's maxconnections. MAX_EXECUTION_TIME would stop the statement
+        while its rows wait between pages, so the timeout is enforced by
+        killing the statement. A cursor closed before its last page kills its
+        statement too, so the connection goes back to the pool without
+        reading the remaining rows.
+        """
+        try:
+            conn = self.get_connection().connection(shareable=False)
+        except Exception as e:
+            raise ConnectionHandlerError(f"[{self.db_type}] Query execution failed: {str(e)}")
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT CONNECTION_ID() AS id")
+                connection_id = cur.fetchone()['id']
+                # 结果在两页之间留在服务端，空闲期间服务端不能因写超时断开连接
+                cur.execute(
+                    "SET SESSION net_write_timeout = %s",
+                    (math.ceil(idle_ttl) + NET_WRITE_TIMEOUT_MARGIN,),
+                )
+                cur.execute("SET TRANSACTION READ ONLY")
+            stream = conn.cursor(SSCursor)
+            with self.cancel_scope(lambda: self._kill_query(connection_id)):
+                stream.execute(sql)
+        except BaseException as e:
+            self._release_cursor_connection(conn)
+            if isinstance(e, Exception):
+                raise ConnectionHandlerError(f"[{self.db_type}] Query execution failed: {str(e)}")
+            raise
+        state = {"exhausted": False}
+
+        def fetchmany(size: int) -> list:
+            with self.cancel_scope(lambda: self._kill_query(connection_id)):
+                rows = stream.fetchmany(size)
+            state["exhausted"] = len(rows) < size
+            return rows
+
+        def close():
+            if state["exhausted"] or self._abort_unread_result(connection_id, stream):
+                stream.close()
+                self._release_cursor_connection(conn)
+                return
+            # 语句未能中止时关闭驱动连接，服务端随之中止语句，连接池下次取出时重新连接
+            try:
+                with suppress(pymysql.err.Error):
+                    stream.connection.close()
+            finally:
+                conn.close()
+
+        return ResultCursor(fetchmany, close, lambda: [desc[0] for desc in stream.description])
+
+    def _release_cursor_connection(self, conn) -> None:
+        """Restore the session settings of a paging cursor and return its connection to the pool"""
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SET SESSION net_write_timeout = DEFAULT")
+        except Exception as e:
+            self.log("warning", f"Failed to reset cursor session: {str(e)}")
+        finally:
+            conn.close()
+
+    @run_in_executor
+    def _execute_write_query(self, sql: str) -> str:
         """Execute SQL write query
 
         Args:
@@ -245,7 +467,7 @@ class MySQLHandler(ConnectionHandler):
             conn = self.get_connection().connection()
             self.log("debug", f"Executing write operation: {sql}")
 
-            with conn.cursor() as cur:
+            with self._limit_statement(conn, False), conn.cursor() as cur:
                 try:
                     # Execute the write operation
                     cur.execute(sql)
@@ -277,14 +499,16 @@ class MySQLHandler(ConnectionHandler):
             if conn:
                 conn.close()
 
-    async def get_table_description(self, table_name: str) -> str:
+    @cached_metadata
+    @run_in_executor
+    def get_table_description(self, table_name: str) -> str:
         """Get detailed table description"""
         conn = None
         try:
             conn = self.get_connection().connection()
             with conn.cursor() as cur:  # NOSONAR
                 # Check if table exists
-                await self._check_table_exists(cur, table_name)
+                self._check_table_exists(cur, table_name)
 
                 # Get table information and comment
                 cur.execute("""
@@ -349,7 +573,9 @@ class MySQLHandler(ConnectionHandler):
             if conn:
                 conn.close()
 
-    async def get_table_ddl(self, table_name: str) -> str:
+    @cached_metadata
+    @run_in_executor
+    def get_table_ddl(self, table_name: str) -> str:
         """Get DDL statement for creating table"""
         conn = None
         try:
@@ -370,14 +596,16 @@ class MySQLHandler(ConnectionHandler):
             if conn:
                 conn.close()
 
-    async def get_table_indexes(self, table_name: str) -> str:
+    @cached_metadata
+    @run_in_executor
+    def get_table_indexes(self, table_name: str) -> str:
         """Get index information for table"""
         conn = None
         try:
             conn = self.get_connection().connection()
             with conn.cursor() as cur:  # NOSONAR
                 # Check if table exists
-                await self._check_table_exists(cur, table_name)
+                self._check_table_exists(cur, table_name)
 
                 # Get index information
                 cur.execute("""
@@ -431,14 +659,15 @@ class MySQLHandler(ConnectionHandler):
             if conn:
                 conn.close()
 
-    async def get_table_stats(self, table_name: str) -> str:
+    @run_in_executor
+    def get_table_stats(self, table_name: str) -> str:
         """Get table statistics information"""
         conn = None
         try:
             conn = self.get_connection().connection()
             with conn.cursor() as cur:  # NOSONAR
                 # Check if table exists
-                await self._check_table_exists(cur, table_name)
+                self._check_table_exists(cur, table_name)
 
                 # Get table statistics
                 cur.execute("""
@@ -498,14 +727,16 @@ class MySQLHandler(ConnectionHandler):
             if conn:
                 conn.close()
 
-    async def get_table_constraints(self, table_name: str) -> str:
+    @cached_metadata
+    @run_in_executor
+    def get_table_constraints(self, table_name: str) -> str:
         """Get constraint information for table"""
         conn = None
         try:
             conn = self.get_connection().connection()
             with conn.cursor() as cur:  # NOSONAR
                 # Check if table exists
-                await self._check_table_exists(cur, table_name)
+                self._check_table_exists(cur, table_name)
 
                 # Get constraint information
                 cur.execute("""
@@ -563,7 +794,8 @@ class MySQLHandler(ConnectionHandler):
             if conn:
                 conn.close()
 
-    async def explain_query(self, sql: str) -> str:
+    @run_in_executor
+    def explain_query(self, sql: str) -> str:
         """Get query execution plan"""
         conn = None
         try:
@@ -603,7 +835,8 @@ class MySQLHandler(ConnectionHandler):
             if conn:
                 conn.close()
 
-    async def test_connection(self) -> bool:
+    @run_in_executor
+    def test_connection(self) -> bool:
         """Test database connection
 
         Returns:
@@ -636,5 +869,8 @@ class MySQLHandler(ConnectionHandler):
             except Exception as e:
                 self.log("warning", f"Error closing MySQL connection: {str(e)}")
 
+        # 停止工作线程
+        self.shutdown_executor()
+
         # 清理其他资源
         self.log("debug", "MySQL handler cleanup complete")
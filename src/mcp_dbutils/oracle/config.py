@@ -5,6 +5,43 @@ from urllib.parse import parse_qs, urlparse
 
 from ..config import ConnectionConfig, WritePermissions
 
+@dataclass
+class PoolConfig:
+    """Connection pool configuration for Oracle connection"""
+    min: int = 2  # Sessions opened when the pool is created
+    max: int = 10  # Maximum sessions
+    increment: int = 1  # Sessions opened at a time when the pool grows
+    stmtcachesize: int = 20  # Statement cache size per session
+
+def parse_pool_config(pool_params: Any) -> PoolConfig:
+    """Parse pool configuration block
+
+    Args:
+        pool_params: Value of the 'pool' key in the connection configuration
+
+    Returns:
+        PoolConfig instance
+
+    Raises:
+        ValueError: If the pool configuration is invalid
+    """
+    if not isinstance(pool_params, dict):
+        raise ValueError("Pool configuration must be a dictionary")
+
+    pool = PoolConfig()
+    for key in ('min', 'max', 'increment', 'stmtcachesize'):
+        if key in pool_params:
+            value = pool_params[key]
+            if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+                raise ValueError(f"Invalid pool {key}: {value}")
+            setattr(pool, key, value)
+
+    if pool.max < 1:
+        raise ValueError(f"Invalid pool max: {pool.max}")
+    if pool.min > pool.max:
+        raise ValueError("Pool min cannot be greater than max")
+    return pool
+
 def parse_url(url: str) -> Dict[str, Any]:
     """Parse Oracle URL into connection parameters
 
@@ -62,6 +99,11 @@ class OracleConfig(ConnectionConfig):
     debug: bool = False
     thick_mode: bool = False  # 是否使用 thick mode 连接
     lib_dir: Optional[str] = None  # 可选的 Oracle 客户端库目录
+    pool: Optional[PoolConfig] = None
+
+    def __post_init__(self):
+        if self.pool is None:
+            self.pool = PoolConfig()
 
     @classmethod
     def _validate_connection_config(cls, configs: dict, db_name: str) -> dict:
@@ -133,7 +175,7 @@ class OracleConfig(ConnectionConfig):
         return config
 
     @classmethod
-    def from_yaml(cls, yaml_path: str, db_name: str, local_host: Optional[str] = None) -> 'OracleConfig':
+    def _from_yaml(cls, yaml_path: str, db_name: str, local_host: Optional[str] = None) -> 'OracleConfig':
         configs = cls.load_yaml_config(yaml_path)
         db_config = cls._validate_connection_config(configs, db_name)
         if 'url' in db_config:
@@ -141,6 +183,16 @@ class OracleConfig(ConnectionConfig):
         else:
             config = cls._create_config_from_params(db_config, local_host)
 
+        if 'pool' in db_config:
+            config.pool = parse_pool_config(db_config['pool'])
+
+        config.max_workers = cls.parse_max_workers(db_config)
+        config.query_timeout = cls.parse_query_timeout(db_config)
+        config.max_rows = cls.parse_max_rows(db_config)
+        config.max_result_bytes, config.max_cell_bytes = cls.parse_result_bytes(db_config)
+        config.cache = cls.parse_cache(db_config)
+        config.metadata_cache = cls.parse_metadata_cache(db_config)
+
         config.writable = db_config.get('writable', False)
         if config.writable and 'write_permissions' in db_config:
             config.write_permissions = WritePermissions(db_config['write_permissions'])
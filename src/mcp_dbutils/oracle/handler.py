@@ -1,14 +1,28 @@
-import asyncio
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
 import mcp.types as types
 import oracledb
 
-from ..base import ConnectionHandler, ConnectionHandlerError
+from ..base import (
+    FETCH_BATCH_SIZE,
+    ConnectionHandler,
+    ConnectionHandlerError,
+    ResultCursor,
+    cached_metadata,
+    run_in_executor,
+)
 from .config import OracleConfig
 
 COLUMNS_HEADER = "Columns:"
 
 class OracleHandler(ConnectionHandler):
-    _lock = asyncio.Lock()
+    # 进程级连接池注册表，按 user@dsn 共享
+    _pools: dict[str, oracledb.ConnectionPool] = {}
+    _lock = threading.RLock()
+    # 每个连接池一把锁，创建连接池时不阻塞其他数据库
+    _pool_locks: dict[str, threading.Lock] = {}
 
     @property
     def db_type(self) -> str:
@@ -33,63 +47,60 @@ class OracleHandler(ConnectionHandler):
                 self.log_warning("Falling back to thin mode")
                 self.thick_mode = False
 
-    async def initialize_pool(self, connection_string: str):
-        """Initialize the connection pool"""
-        async with OracleHandler._lock:
-            if self.pool is None:
-                try:
-                    if self.thick_mode:
-                        self.pool = oracledb.create_pool(
-                            connection_string,
-                            min=2,
-                            max=10,
-                            increment=1,
-                            getmode=oracledb.POOL_GETMODE_WAIT
-                        )
-                    else:
-                        self.pool = oracledb.create_pool_async(
-                            connection_string,
-                            min=2,
-                            max=10,
-                            increment=1,
+    def initialize_pool(self, oracle_config: dict):
+        """Get the shared connection pool for this user/DSN, creating it on first use"""
+        key = f"{oracle_config.get('user')}@{oracle_config.get('dsn')}"
+        with OracleHandler._lock:
+            pool = OracleHandler._pools.get(key)
+            pool_lock = OracleHandler._pool_locks.setdefault(key, threading.Lock())
+        if pool is None:
+            with pool_lock:
+                pool = OracleHandler._pools.get(key)
+                if pool is None:
+                    pool_config = self.config.pool
+                    try:
+                        pool = oracledb.create_pool(
+                            user=oracle_config.get('user'),
+                            password=oracle_config.get('password'),
+                            dsn=oracle_config.get('dsn'),
+                            min=pool_config.min,
+                            max=pool_config.max,
+                            increment=pool_config.increment,
+                            stmtcachesize=pool_config.stmtcachesize,
                             getmode=oracledb.POOL_GETMODE_WAIT
                         )
-                    self.log_info("Database connection pool initialized")
-                except Exception as e:
-                    self.log_error(f"Error creating connection pool: {e}")
-                    raise
-                
-    async def close_pool(self):
-        """Close the connection pool"""
-        if self.pool:
+                        self.log_info("Database connection pool initialized")
+                    except Exception as e:
+                        self.log_error(f"Error creating connection pool: {e}")
+                        raise
+                    with OracleHandler._lock:
+                        OracleHandler._pools[key] = pool
+        self.pool = pool
+
+    @classmethod
+    async def close_pools(cls):
+        """Close all shared connection pools
+
+        Called from the server lifespan on shutdown; sessions still checked out
+        are closed as well.
+        """
+        with cls._lock:
+            pools = list(cls._pools.values())
+            cls._pools.clear()
+        for pool in pools:
             try:
-                if self.thick_mode:
-                    self.pool.close()
-                else:
-                    await self.pool.close()
-                self.pool = None
-                self.log_info("Connection pool closed")
-            except Exception as e:
-                self.log_error(f"Error closing connection pool: {e}")
-                
-    async def get_connection(self):
-        # 这里可扩展为连接池，当前直接 connect
-        oracle_config = self.config.get_connection_params()
-        connection_string = "{user}/{password}@{dsn}".format(
-            user=oracle_config.get('user'),
-            password=oracle_config.get('password'),
-            dsn=oracle_config.get('dsn')
-        )
+                pool.close(force=True)
+            except Exception:
+                pass
+
+    def get_connection(self):
         if self.pool is None:
-            await self.initialize_pool(connection_string)
+            self.initialize_pool(self.config.get_connection_params())
         if self.pool is None:
             raise ConnectionHandlerError("Connection pool is not initialized")
-        if self.thick_mode:
-            return self.pool.acquire()
-        else:
-            return await self.pool.acquire()
+        return self.pool.acquire()
 
-    async def _check_table_exists(self, cursor, table_name: str) -> None:
+    def _check_table_exists(self, cursor, table_name: str) -> None:
         cursor.execute("""
             SELECT COUNT(*) FROM user_tables WHERE table_name = :1
         """, [table_name.upper()])
@@ -97,10 +108,25 @@ class OracleHandler(ConnectionHandler):
         if not count or count[0] == 0:
             raise ConnectionHandlerError(f"Table '{table_name}' doesn't exist")
 
-    async def get_tables(self) -> list[types.Resource]:
+    @run_in_executor
+    def _schema_version(self) -> tuple:
+        """Object count and newest DDL time of the user's schema"""
         conn = None
         try:
-            conn = await self.get_connection()
+            conn = self.get_connection()
+            cur = conn.cursor()
+            cur.execute("SELECT COUNT(*), MAX(last_ddl_time) FROM user_objects")
+            return tuple(cur.fetchone())
+        finally:
+            if conn:
+                conn.close()
+
+    @cached_metadata
+    @run_in_executor
+    def get_tables(self) -> list[types.Resource]:
+        conn = None
+        try:
+            conn = self.get_connection()
             cur = conn.cursor()
             cur.execute("""
                 SELECT table_name FROM user_tables
@@ -122,12 +148,14 @@ class OracleHandler(ConnectionHandler):
             if conn:
                 conn.close()
 
-    async def get_schema(self, table_name: str) -> str:
+    @cached_metadata
+    @run_in_executor
+    def get_schema(self, table_name: str) -> str:
         conn = None
         try:
-            conn = await self.get_connection()
+            conn = self.get_connection()
             cur = conn.cursor()
-            await self._check_table_exists(cur, table_name)
+            self._check_table_exists(cur, table_name)
             # 列信息
             cur.execute("""
                 SELECT column_name, data_type, nullable FROM user_tab_columns
@@ -194,28 +222,44 @@ class OracleHandler(ConnectionHandler):
             if conn:
                 conn.close()
 
-    async def _execute_query(self, sql: str) -> str:
+    @contextmanager
+    def _limit_call(self, conn) -> Iterator[None]:
+        """Bound database round trips by the query timeout and allow cancellation"""
+        timeout_ms = self.get_query_timeout_ms()
+        if timeout_ms:
+            conn.call_timeout = timeout_ms
+        try:
+            with self.cancel_scope(conn.cancel):
+                yield
+        finally:
+            # 连接会归还到共享连接池，恢复默认值
+            if timeout_ms:
+                conn.call_timeout = 0
+
+    @run_in_executor
+    def _execute_query(self, sql: str) -> str:
         conn = None
         try:
-            conn = await self.get_connection()
+            conn = self.get_connection()
             self.log("debug", f"Executing query: {sql}")
             cur = conn.cursor()
             sql_upper = sql.strip().upper()
             is_select = sql_upper.startswith("SELECT")
             if is_select:
                 cur.execute("SAVEPOINT ro_savepoint")  # Oracle没有SET TRANSACTION READ ONLY
+                # 每次往返读取一批行，执行时预取第一批
+                cur.arraysize = FETCH_BATCH_SIZE
+                cur.prefetchrows = FETCH_BATCH_SIZE
             try:
-                cur.execute(sql)
-                if not is_select:
-                    conn.commit()
-                results = cur.fetchall() if is_select else []
+                with self._limit_call(conn):
+                    cur.execute(sql)
+                    if not is_select:
+                        conn.commit()
+                    results, truncated = self.fetch_rows(cur.fetchmany) if is_select else ([], False)
                 if cur.description is None:
                     return "Query executed successfully"
                 columns = [desc[0] for desc in cur.description]
-                return str({
-                    "columns": columns,
-                    "rows": results
-                })
+                return self.format_result(columns, results, truncated)
             except Exception as e:
                 self.log("error", f"Query error: {str(e)}")
                 raise ConnectionHandlerError(str(e))
@@ -228,7 +272,34 @@ class OracleHandler(ConnectionHandler):
             if conn:
                 conn.close()
 
-    async def _execute_write_query(self, sql: str) -> str:
+    @run_in_executor
+    def _open_cursor(self, sql: str, idle_ttl: float) -> ResultCursor:
+        """Execute a query on a pooled connection held until the cursor is closed"""
+        conn = self.get_connection()
+        try:
+            cur = conn.cursor()
+            cur.arraysize = FETCH_BATCH_SIZE
+            cur.prefetchrows = FETCH_BATCH_SIZE
+            with self._limit_call(conn):
+                cur.execute(sql)
+        except Exception as e:
+            conn.close()
+            raise ConnectionHandlerError(f"[{self.db_type}] Query execution failed: {str(e)}")
+
+        def fetchmany(size: int) -> list:
+            with self._limit_call(conn):
+                return cur.fetchmany(size)
+
+        def close():
+            try:
+                cur.close()
+            finally:
+                conn.close()
+
+        return ResultCursor(fetchmany, close, lambda: [desc[0] for desc in cur.description])
+
+    @run_in_executor
+    def _execute_write_query(self, sql: str) -> str:
         conn = None
         try:
             sql_upper = sql.strip().upper()
@@ -238,11 +309,12 @@ class OracleHandler(ConnectionHandler):
             is_transaction = sql_upper.startswith(("BEGIN", "COMMIT", "ROLLBACK", "SAVEPOINT"))
             if not (is_insert or is_update or is_delete or is_transaction):
                 raise ConnectionHandlerError("Only INSERT, UPDATE, DELETE, and transaction statements are allowed for write operations")
-            conn = await self.get_connection()
+            conn = self.get_connection()
             self.log("debug", f"Executing write operation: {sql}")
             cur = conn.cursor()
             try:
-                cur.execute(sql)
+                with self._limit_call(conn):
+                    cur.execute(sql)
                 affected_rows = cur.rowcount
                 if not is_transaction:
                     conn.commit()
@@ -265,12 +337,14 @@ class OracleHandler(ConnectionHandler):
             if conn:
                 conn.close()
 
-    async def get_table_description(self, table_name: str) -> str:
+    @cached_metadata
+    @run_in_executor
+    def get_table_description(self, table_name: str) -> str:
         conn = None
         try:
-            conn = await self.get_connection()
+            conn = self.get_connection()
             cur = conn.cursor()
-            await self._check_table_exists(cur, table_name)
+            self._check_table_exists(cur, table_name)
             # Oracle没有表注释字段，需查user_tab_comments
             cur.execute("""
                 SELECT comments FROM user_tab_comments WHERE table_name = :1
@@ -320,10 +394,12 @@ class OracleHandler(ConnectionHandler):
             if conn:
                 conn.close()
 
-    async def get_table_ddl(self, table_name: str) -> str:
+    @cached_metadata
+    @run_in_executor
+    def get_table_ddl(self, table_name: str) -> str:
         conn = None
         try:
-            conn = await self.get_connection()
+            conn = self.get_connection()
             cur = conn.cursor()
             cur.execute(
                 "SELECT dbms_metadata.get_ddl('TABLE', :1) FROM dual",
@@ -341,12 +417,14 @@ class OracleHandler(ConnectionHandler):
             if conn:
                 conn.close()
 
-    async def get_table_indexes(self, table_name: str) -> str:
+    @cached_metadata
+    @run_in_executor
+    def get_table_indexes(self, table_name: str) -> str:
         conn = None
         try:
-            conn = await self.get_connection()
+            conn = self.get_connection()
             cur = conn.cursor()
-            await self._check_table_exists(cur, table_name)
+            self._check_table_exists(cur, table_name)
             cur.execute("""
                 SELECT index_name, uniqueness FROM user_indexes WHERE table_name = :1
             """, [table_name.upper()])
@@ -376,12 +454,13 @@ class OracleHandler(ConnectionHandler):
             if conn:
                 conn.close()
 
-    async def get_table_stats(self, table_name: str) -> str:
+    @run_in_executor
+    def get_table_stats(self, table_name: str) -> str:
         conn = None
         try:
-            conn = await self.get_connection()
+            conn = self.get_connection()
             cur = conn.cursor()
-            await self._check_table_exists(cur, table_name)
+            self._check_table_exists(cur, table_name)
             cur.execute("""
                 SELECT num_rows, blocks, avg_row_len
                 FROM user_tables
@@ -405,12 +484,14 @@ class OracleHandler(ConnectionHandler):
             if conn:
                 conn.close()
 
-    async def get_table_constraints(self, table_name: str) -> str:
+    @cached_metadata
+    @run_in_executor
+    def get_table_constraints(self, table_name: str) -> str:
         conn = None
         try:
-            conn = await self.get_connection()
+            conn = self.get_connection()
             cur = conn.cursor()
-            await self._check_table_exists(cur, table_name)
+            self._check_table_exists(cur, table_name)
             cur.execute("""
                 SELECT
                     c.constraint_name,
@@ -467,10 +548,11 @@ class OracleHandler(ConnectionHandler):
             if conn:
                 conn.close()
 
-    async def explain_query(self, sql: str) -> str:
+    @run_in_executor
+    def explain_query(self, sql: str) -> str:
         conn = None
         try:
-            conn = await self.get_connection()
+            conn = self.get_connection()
             cur = conn.cursor()
             # Oracle EXPLAIN PLAN
             cur.execute("EXPLAIN PLAN FOR " + sql)
@@ -490,10 +572,11 @@ class OracleHandler(ConnectionHandler):
             if conn:
                 conn.close()
 
-    async def test_connection(self) -> bool:
+    @run_in_executor
+    def test_connection(self) -> bool:
         conn = None
         try:
-            conn = await self.get_connection()
+            conn = self.get_connection()
             cur = conn.cursor()
             cur.execute("SELECT 1 FROM DUAL")
             return True
@@ -513,4 +596,7 @@ class OracleHandler(ConnectionHandler):
                 self._connection = None
             except Exception as e:
                 self.log("warning", f"Error closing Oracle connection: {str(e)}")
+        # 连接池由所有处理器共享，在服务器关闭时通过 close_pools() 释放
+        self.pool = None
+        self.shutdown_executor()
         self.log("debug", "Oracle handler cleanup complete")
\ No newline at end of file
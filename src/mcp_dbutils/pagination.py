@@ -0,0 +1,163 @@
+"""Keyset pagination of read queries"""
+
+import base64
+import binascii
+import json
+import math
+import re
+from typing import Any, List, Optional, Sequence
+
+from .encoder import adapt_value
+
+# 子查询别名，原查询的列通过它引用
+PAGE_ALIAS = "dbutils_page"
+
+# 键列只允许简单标识符，直接写入改写后的SQL
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_$]*$")
+
+# 支持行值比较 (a, b) > (x, y) 的方言，可直接用于索引范围扫描
+_ROW_VALUE_DIALECTS = ("sqlite", "postgres", "mysql")
+
+
+class KeysetPage:
+    """One page of a query read in keyset (seek) order
+
+    The query is wrapped as a subquery, filtered to rows after the key of
+    the previous page's last row, ordered by the key and limited to the page
+    size, so every page is one index range scan and nothing is kept on the
+    server between pages. The key must be unique and not NULL.
+    """
+
+    def __init__(self, key: Sequence[str], after: Optional[List[Any]] = None):
+        self.key = list(key)
+        self.after = after
+
+    @classmethod
+    def parse(cls, key: Any, after: Optional[str] = None) -> "KeysetPage":
+        """Validate the key columns and the token of the previous page
+
+        Args:
+            key: Column name or list of column names
+            after: next_after token of the previous page
+
+        Raises:
+            ValueError: If the key or the token is invalid
+        """
+        columns = [key] if isinstance(key, str) else key
+        if not isinstance(columns, list) or not columns or not all(
+            isinstance(column, str) and _IDENTIFIER.match(column) for column in columns
+        ):
+            raise ValueError(f"Invalid key: {key}. Must be a column name or a list of column names")
+        values = None
+        if after is not None:
+            values = decode_after(after)
+            if len(values) != len(columns):
+                raise ValueError("Invalid after token: it does not match the key columns")
+        return cls(columns, values)
+
+    def build_query(self, sql: str, dialect: str, limit: int) -> str:
+        """Rewrite a SELECT to read the next page
+
+        Args:
+            sql: Original query, without ORDER BY or LIMIT
+            dialect: Database type: sqlite, postgres, mysql or oracle
+            limit: Rows to read
+        """
+        sql = sql.strip().rstrip(";")
+        order = ", ".join(self.key)
+        # 换行结束原查询末尾可能的行注释
+        query = f"SELECT * FROM ({sql}\n) {PAGE_ALIAS}"
+        if self.after is not None:
+            query += f" WHERE {self._seek_condition(dialect)}"
+        query += f" ORDER BY {order}"
+        if dialect == "oracle":
+            return f"{query} FETCH FIRST {limit} ROWS ONLY"
+        return f"{query} LIMIT {limit}"
+
+    def _seek_condition(self, dialect: str) -> str:
+        """Condition selecting rows after the previous page's last key"""
+        literals = [render_literal(value, dialect) for value in self.after]
+        if len(self.key) == 1:
+            return f"{self.key[0]} > {literals[0]}"
+        if dialect in _ROW_VALUE_DIALECTS:
+            return f"({', '.join(self.key)}) > ({', '.join(literals)})"
+        # Oracle不支持行值比较，展开为 a > x OR (a = x AND b > y)
+        terms = []
+        for index, column in enumerate(self.key):
+            equal = [f"{self.key[i]} = {literals[i]}" for i in range(index)]
+            terms.append("(" + " AND ".join(equal + [f"{column} > {literals[index]}"]) + ")")
+        return " OR ".join(terms)
+
+    def next_after(self, columns: Sequence[str], row: Any) -> str:
+        """Token selecting the rows after row
+
+        Args:
+            columns: Result column names
+            row: Last row of the page, as a sequence or dictionary
+
+        Raises:
+            ValueError: If a key column is missing from the result or NULL
+        """
+        # Oracle返回大写列名
+        positions = {column.lower(): index for index, column in enumerate(columns)}
+        values = []
+        for column in self.key:
+            if column.lower() not in positions:
+                raise ValueError(f"Key column {column} is not in the query result")
+            index = positions[column.lower()]
+            value = row[columns[index]] if isinstance(row, dict) else row[index]
+            if value is None:
+                raise ValueError(f"Key column {column} is NULL; keyset pagination needs a non-NULL key")
+            values.append(adapt_value(value))
+        return encode_after(values)
+
+
+def encode_after(values: List[Any]) -> str:
+    """Encode key values as an opaque token"""
+    data = json.dumps(values, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(data).decode("ascii").rstrip("=")
+
+
+def decode_after(token: str) -> List[Any]:
+    """Decode a token created by encode_after
+
+    Raises:
+        ValueError: If the token is malformed
+    """
+    try:
+        data = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        values = json.loads(data.decode("utf-8"))
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError, TypeError):
+        raise ValueError("Invalid after token")
+    if not isinstance(values, list):
+        raise ValueError("Invalid after token")
+    return values
+
+
+def render_literal(value: Any, dialect: str) -> str:
+    """Write a key value as a SQL literal
+
+    Only numbers and strings can occur in tokens. Strings rely on the
+    database converting them to the key column's type, which covers
+    decimals, large integers, UUIDs and ISO 8601 timestamps.
+
+    Raises:
+        ValueError: If the value cannot be used as a key
+    """
+    if isinstance(value, bool) or value is None:
+        raise ValueError(f"Unsupported key value: {value}")
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            raise ValueError(f"Unsupported key value: {value}")
+        return repr(value)
+    if isinstance(value, str):
+        if "\x00" in value:
+            raise ValueError("Unsupported key value: contains a NUL character")
+        escaped = value.replace("'", "''")
+        if dialect == "mysql":
+            # MySQL默认把反斜杠作为转义符
+            escaped = escaped.replace("\\", "\\\\")
+        return f"'{escaped}'"
+    raise ValueError(f"Unsupported key value: {value}")
@@ -0,0 +1,784 @@
+"""PostgreSQL connection handler implementation based on asyncpg"""
+
+import asyncio
+from typing import Any, Dict
+from urllib.parse import urlencode
+
+import asyncpg
+import mcp.types as types
+
+from ..base import (
+    ConnectionHandler,
+    ConnectionHandlerError,
+    ResultCursor,
+    cached_metadata,
+)
+from ..export import ExportWriter
+from .config import PostgreSQLConfig
+
+# 常量定义
+COLUMNS_HEADER = "Columns:"
+POOL_CLOSE_TIMEOUT = 10  # seconds
+# 元数据所在系统表累计写入的行数，任何DDL都会使其增加
+# 只读取统计计数器，不扫描系统表；计数器只增不减，不受事务ID回卷影响
+SCHEMA_VERSION_SQL = """
+    SELECT sum(pg_stat_get_tuples_inserted(c) + pg_stat_get_tuples_updated(c)
+               + pg_stat_get_tuples_deleted(c))::bigint
+    FROM unnest(ARRAY['pg_catalog.pg_class', 'pg_catalog.pg_attribute',
+                      'pg_catalog.pg_constraint', 'pg_catalog.pg_description']::regclass[]) AS c
+"""
+
+# asyncpg在连接、协议和服务端层面抛出的异常
+DRIVER_ERRORS = (asyncpg.PostgresError, asyncpg.InterfaceError, OSError, asyncio.TimeoutError)
+
+
+def format_error(e: Exception) -> str:
+    """Format a driver error like the psycopg2 handler does"""
+    return f"[Code: {getattr(e, 'sqlstate', None)}] {str(e) or e.__class__.__name__}"
+
+
+class AsyncPostgreSQLHandler(ConnectionHandler):
+    """PostgreSQL handler using asyncpg and its native connection pool
+
+    Queries run on the event loop instead of worker threads, so many
+    concurrent tool calls share one thread, and cancelling a tool call
+    cancels the running statement on the server.
+    """
+
+    driver = "async"
+
+    @property
+    def db_type(self) -> str:
+        return 'postgres'
+
+    def __init__(self, config_path: str, connection: str, debug: bool = False):
+        """Initialize asyncpg-based PostgreSQL handler
+
+        Args:
+            config_path: Path to configuration file
+            connection: Database connection name
+            debug: Enable debug mode
+        """
+        super().__init__(config_path, connection, debug)
+        self.config = PostgreSQLConfig.from_yaml(config_path, connection)
+
+        # No connection pool creation during initialization
+        masked_params = self.config.get_masked_connection_info()
+        self.log("debug", f"Configuring async connection with parameters: {masked_params}")
+        self.pool = None
+        self._pool_lock = asyncio.Lock()
+
+    def _get_pool_params(self) -> Dict[str, Any]:
+        """Translate psycopg2 connection parameters to asyncpg pool arguments"""
+        conn_params = self.config.get_connection_params()
+        pool_config = self.config.pool
+        params = {
+            'host': conn_params.get('host'),
+            'port': int(conn_params['port']) if conn_params.get('port') else None,
+            'user': conn_params.get('user'),
+            'password': conn_params.get('password'),
+            'database': conn_params.get('dbname'),
+            'min_size': pool_config.min_size,
+            'max_size': pool_config.max_size,
+            # 0 表示不回收空闲连接
+            'max_inactive_connection_lifetime': pool_config.idle_timeout or 0,
+        }
+        # asyncpg通过DSN查询参数支持libpq风格的SSL设置
+        ssl_params = {
+            key: conn_params[key]
+            for key in ('sslmode', 'sslcert', 'sslkey', 'sslrootcert')
+            if key in conn_params
+        }
+        if ssl_params:
+            params['dsn'] = f"postgresql://?{urlencode(ssl_params)}"
+        return {k: v for k, v in params.items() if v is not None}
+
+    async def _get_pool(self) -> asyncpg.Pool:
+        """Get the connection pool, creating it on first use"""
+        async with self._pool_lock:
+            if self.pool is None or self.pool.is_closing():
+                pool_config = self.config.pool
+                self.pool = await asyncpg.create_pool(**self._get_pool_params())
+                self.log("debug", f"Async connection pool created (min={pool_config.min_size}, max={pool_config.max_size})")
+            return self.pool
+
+    async def _acquire(self):
+        """Acquire a connection from the pool"""
+        pool = await self._get_pool()
+        return pool, await pool.acquire(timeout=self.config.pool.timeout)
+
+    async def _schema_version(self) -> tuple:
+        """Rows written to the catalogs metadata is read from, as counted by the statistics system"""
+        pool = conn = None
+        try:
+            pool, conn = await self._acquire()
+            return tuple(map(tuple, await conn.fetch(SCHEMA_VERSION_SQL)))
+        finally:
+            if conn:
+                await pool.release(conn)
+
+    @cached_metadata
+    async def get_tables(self) -> list[types.Resource]:
+        """Get all table resources"""
+        pool = conn = None
+        try:
+            pool, conn = await self._acquire()
+            tables = await conn.fetch("""
+                SELECT
+                    table_name,
+                    obj_description(
+                        (quote_ident(table_schema) || '.' || quote_ident(table_name))::regclass,
+                        'pg_class'
+                    ) as description
+                FROM information_schema.tables
+                WHERE table_schema = 'public'
+            """)
+            return [
+                types.Resource(
+                    uri=f"postgres://{self.connection}/{table[0]}/schema",
+                    name=f"{table[0]} schema",
+                    description=table[1] if table[1] else None,
+                    mimeType="application/json"
+                ) for table in tables
+            ]
+        except DRIVER_ERRORS as e:
+            error_msg = f"Failed to get tables: {format_error(e)}"
+            self.stats.record_error(e.__class__.__name__)
+            raise ConnectionHandlerError(error_msg)
+        finally:
+            if conn:
+                await pool.release(conn)
+
+    @cached_metadata
+    async def get_schema(self, table_name: str) -> str:
+        """Get table schema information"""
+        pool = conn = None
+        try:
+            pool, conn = await self._acquire()
+            # Get column information
+            columns = await conn.fetch("""
+                SELECT
+                    column_name,
+                    data_type,
+                    is_nullable,
+                    col_description(
+                        (quote_ident(table_schema) || '.' || quote_ident(table_name))::regclass,
+                        ordinal_position
+                    ) as description
+                FROM information_schema.columns
+                WHERE table_name = $1
+                ORDER BY ordinal_position
+            """, table_name)
+
+            # Get constraint information
+            constraints = await conn.fetch("""
+                SELECT
+                    conname as constraint_name,
+                    contype as constraint_type
+                FROM pg_constraint c
+                JOIN pg_class t ON c.conrelid = t.oid
+                WHERE t.relname = $1
+            """, table_name)
+
+            return str({
+                'columns': [{
+                    'name': col[0],
+                    'type': col[1],
+                    'nullable': col[2] == 'YES',
+                    'description': col[3]
+                } for col in columns],
+                'constraints': [{
+                    'name': con[0],
+                    'type': con[1]
+                } for con in constraints]
+            })
+        except DRIVER_ERRORS as e:
+            error_msg = f"Failed to read table schema: {format_error(e)}"
+            self.stats.record_error(e.__class__.__name__)
+            raise ConnectionHandlerError(error_msg)
+        finally:
+            if conn:
+                await pool.release(conn)
+
+    async def _execute_query(self, sql: str) -> str:
+        """Execute SQL query"""
+        pool = conn = None
+        try:
+            pool, conn = await self._acquire()
+            self.log("debug", f"Executing query: {sql}")
+
+            # Start read-only transaction
+            transaction = conn.transaction(readonly=True)
+            await transaction.start()
+            try:
+                # 取消工具调用时asyncpg会向服务端发送取消请求
+                timeout_ms = self.get_query_timeout_ms()
+                if timeout_ms:
+                    await conn.execute(f"SET LOCAL statement_timeout = {timeout_ms}")
+                statement = await conn.prepare(sql)
+                # 通过服务端游标分批读取，达到max_rows后不再读取
+                cursor = await statement.cursor()
+                results, truncated = await self.fetch_rows_async(cursor.fetch)
+                columns = [attr.name for attr in statement.get_attributes()]
+                result_text = self.format_result(columns, results, truncated, type=self.db_type)
+
+                self.log("debug", f"Query completed, returned {len(results)} rows")
+                return result_text
+            finally:
+                await transaction.rollback()
+        except DRIVER_ERRORS as e:
+            error_msg = f"[{self.db_type}] Query execution failed: {format_error(e)}"
+            raise ConnectionHandlerError(error_msg)
+        finally:
+            if conn:
+                await pool.release(conn)
+
+    async def _open_cursor(self, sql: str, idle_ttl: float) -> ResultCursor:
+        """Open a server-side cursor on a connection held until the cursor is closed"""
+        pool, conn = await self._acquire()
+        transaction = conn.transaction(readonly=True)
+        try:
+            await transaction.start()
+            timeout_ms = self.get_query_timeout_ms()
+            if timeout_ms:
+                await conn.execute(f"SET LOCAL statement_timeout = {timeout_ms}")
+            statement = await conn.prepare(sql)
+            cursor = await statement.cursor()
+        except BaseException as e:
+            await pool.release(conn)
+            if isinstance(e, DRIVER_ERRORS):
+                raise ConnectionHandlerError(f"[{self.db_type}] Query execution failed: {format_error(e)}")
+            raise
+        columns = [attr.name for attr in statement.get_attributes()]
+
+        async def close():
+            try:
+                await transaction.rollback()
+            finally:
+                await pool.release(conn)
+
+        return ResultCursor(cursor.fetch, close, lambda: columns, is_async=True)
+
+    async def _export_query(self, sql: str, writer: ExportWriter):
+        """Stream CSV exports with COPY, other formats through a server-side cursor"""
+        if writer.format != "csv":
+            return await super()._export_query(sql, writer)
+        pool = conn = None
+        try:
+            pool, conn = await self._acquire()
+            transaction = conn.transaction(readonly=True)
+            await transaction.start()
+            try:
+                timeout_ms = self.get_query_timeout_ms()
+                if timeout_ms:
+                    await conn.execute(f"SET LOCAL statement_timeout = {timeout_ms}")
+                # asyncpg在线程中写入文件对象，返回状态如"COPY 42"
+                status = await conn.copy_from_query(sql, output=writer.file, format="csv", header=True)
+                writer.copied(int(status.split()[-1]))
+            finally:
+                await transaction.rollback()
+        except DRIVER_ERRORS as e:
+            raise ConnectionHandlerError(f"[{self.db_type}] Export failed: {format_error(e)}")
+        finally:
+            if conn:
+                await pool.release(conn)
+
+    async def _execute_write_query(self, sql: str) -> str:
+        """Execute SQL write query
+
+        Args:
+            sql: SQL write query (INSERT, UPDATE, DELETE)
+
+        Returns:
+            str: Execution result
+
+        Raises:
+            ConnectionHandlerError: If query execution fails
+        """
+        pool = conn = None
+        try:
+            # Check if the query is a write operation
+            sql_upper = sql.strip().upper()
+            is_insert = sql_upper.startswith("INSERT")
+            is_update = sql_upper.startswith("UPDATE")
+            is_delete = sql_upper.startswith("DELETE")
+            is_transaction = sql_upper.startswith(("BEGIN", "COMMIT", "ROLLBACK"))
+
+            if not (is_insert or is_update or is_delete or is_transaction):
+                raise ConnectionHandlerError("Only INSERT, UPDATE, DELETE, and transaction statements are allowed for write operations")
+
+            pool, conn = await self._acquire()
+            self.log("debug", f"Executing write operation: {sql}")
+
+            try:
+                # asyncpg runs statements outside a transaction block in autocommit mode
+                status = await conn.execute(sql, timeout=None if is_transaction else self.get_query_timeout())
+
+                # Get number of affected rows from the command tag (e.g. "UPDATE 3")
+                last = status.split()[-1] if status else ""
+                affected_rows = int(last) if last.isdigit() else 0
+
+                self.log("debug", f"Write operation executed successfully, affected {affected_rows} rows")
+
+                # Return result
+                if is_transaction:
+                    return f"Transaction operation executed successfully"
+                else:
+                    return f"Write operation executed successfully. {affected_rows} row{'s' if affected_rows != 1 else ''} affected."
+            except asyncpg.PostgresError as e:
+                self.log("error", f"Write operation error: {format_error(e)}")
+                raise ConnectionHandlerError(format_error(e))
+        except DRIVER_ERRORS as e:
+            error_msg = f"[{self.db_type}] Write operation failed: {format_error(e)}"
+            raise ConnectionHandlerError(error_msg)
+        finally:
+            if conn:
+                await pool.release(conn)
+
+    @cached_metadata
+    async def get_table_description(self, table_name: str) -> str:
+        """Get detailed table description"""
+        pool = conn = None
+        try:
+            pool, conn = await self._acquire()
+            # 获取表的基本信息和注释
+            table_info = await conn.fetchrow("""
+                SELECT obj_description(
+                    (quote_ident(table_schema) || '.' || quote_ident(table_name))::regclass,
+                    'pg_class'
+                ) as table_comment
+                FROM information_schema.tables
+                WHERE table_name = $1
+            """, table_name)
+            table_comment = table_info[0] if table_info else None
+
+            # 获取列信息
+            columns = await conn.fetch("""
+                SELECT
+                    column_name,
+                    data_type,
+                    column_default,
+                    is_nullable,
+                    character_maximum_length,
+                    numeric_precision,
+                    numeric_scale,
+                    col_description(
+                        (quote_ident(table_schema) || '.' || quote_ident(table_name))::regclass,
+                        ordinal_position
+                    ) as column_comment
+                FROM information_schema.columns
+                WHERE table_name = $1
+                ORDER BY ordinal_position
+            """, table_name)
+
+            # 格式化输出
+            description = [
+                f"Table: {table_name}",
+                f"Comment: {table_comment or 'No comment'}\n",
+                COLUMNS_HEADER
+            ]
+
+            for col in columns:
+                col_info = [
+                    f"  {col[0]} ({col[1]})",
+                    f"    Nullable: {col[3]}",
+                    f"    Default: {col[2] or 'None'}"
+                ]
+
+                if col[4]:  # character_maximum_length
+                    col_info.append(f"    Max Length: {col[4]}")
+                if col[5]:  # numeric_precision
+                    col_info.append(f"    Precision: {col[5]}")
+                if col[6]:  # numeric_scale
+                    col_info.append(f"    Scale: {col[6]}")
+                if col[7]:  # column_comment
+                    col_info.append(f"    Comment: {col[7]}")
+
+                description.extend(col_info)
+                description.append("")  # Empty line between columns
+
+            return "\n".join(description)
+
+        except DRIVER_ERRORS as e:
+            error_msg = f"Failed to get table description: {format_error(e)}"
+            self.stats.record_error(e.__class__.__name__)
+            raise ConnectionHandlerError(error_msg)
+        finally:
+            if conn:
+                await pool.release(conn)
+
+    @cached_metadata
+    async def get_table_ddl(self, table_name: str) -> str:
+        """Get DDL statement for creating table"""
+        pool = conn = None
+        try:
+            pool, conn = await self._acquire()
+            # 获取列定义
+            columns = await conn.fetch("""
+                SELECT
+                    column_name,
+                    data_type,
+                    column_default,
+                    is_nullable,
+                    character_maximum_length,
+                    numeric_precision,
+                    numeric_scale
+                FROM information_schema.columns
+                WHERE table_name = $1
+                ORDER BY ordinal_position
+            """, table_name)
+
+            # 获取约束
+            constraints = await conn.fetch("""
+                SELECT
+                    conname as constraint_name,
+                    pg_get_constraintdef(c.oid) as constraint_def
+                FROM pg_constraint c
+                JOIN pg_class t ON c.conrelid = t.oid
+                WHERE t.relname = $1
+            """, table_name)
+
+            # 构建CREATE TABLE语句
+            ddl = [f"CREATE TABLE {table_name} ("]
+
+            # 添加列定义
+            column_defs = []
+            for col in columns:
+                col_def = [f"    {col[0]} {col[1]}"]
+
+                if col[4]:  # character_maximum_length
+                    col_def[0] = f"{col_def[0]}({col[4]})"
+                elif col[5]:  # numeric_precision
+                    if col[6]:  # numeric_scale
+                        col_def[0] = f"{col_def[0]}({col[5]},{col[6]})"
+                    else:
+                        col_def[0] = f"{col_def[0]}({col[5]})"
+
+                if col[2]:  # default
+                    col_def.append(f"DEFAULT {col[2]}")
+                if col[3] == 'NO':  # not null
+                    col_def.append("NOT NULL")
+
+                column_defs.append(" ".join(col_def))
+
+            # 添加约束定义
+            for con in constraints:
+                column_defs.append(f"    CONSTRAINT {con[0]} {con[1]}")
+
+            ddl.append(",\n".join(column_defs))
+            ddl.append(");")
+
+            # 添加注释
+            comments = await conn.fetch("""
+                SELECT
+                    c.column_name,
+                    col_description(
+                        (quote_ident(table_schema) || '.' || quote_ident(table_name))::regclass,
+                        c.ordinal_position
+                    ) as column_comment,
+                    obj_description(
+                        (quote_ident(table_schema) || '.' || quote_ident(table_name))::regclass,
+                        'pg_class'
+                    ) as table_comment
+                FROM information_schema.columns c
+                WHERE c.table_name = $1
+            """, table_name)
+
+            for comment in comments:
+                if comment[2]:  # table comment
+                    ddl.append(f"\nCOMMENT ON TABLE {table_name} IS '{comment[2]}';")
+                if comment[1]:  # column comment
+                    ddl.append(f"COMMENT ON COLUMN {table_name}.{comment[0]} IS '{comment[1]}';")
+
+            return "\n".join(ddl)
+
+        except DRIVER_ERRORS as e:
+            error_msg = f"Failed to get table DDL: {format_error(e)}"
+            self.stats.record_error(e.__class__.__name__)
+            raise ConnectionHandlerError(error_msg)
+        finally:
+            if conn:
+                await pool.release(conn)
+
+    @cached_metadata
+    async def get_table_indexes(self, table_name: str) -> str:
+        """Get index information for table"""
+        pool = conn = None
+        try:
+            pool, conn = await self._acquire()
+            # 获取索引信息
+            indexes = await conn.fetch("""
+                SELECT
+                    i.relname as index_name,
+                    a.attname as column_name,
+                    CASE
+                        WHEN ix.indisprimary THEN 'PRIMARY KEY'
+                        WHEN ix.indisunique THEN 'UNIQUE'
+                        ELSE 'INDEX'
+                    END as index_type,
+                    am.amname as index_method,
+                    pg_get_indexdef(ix.indexrelid) as index_def,
+                    obj_description(i.oid, 'pg_class') as index_comment
+                FROM pg_class t
+                JOIN pg_index ix ON t.oid = ix.indrelid
+                JOIN pg_class i ON ix.indexrelid = i.oid
+                JOIN pg_am am ON i.relam = am.oid
+                JOIN pg_attribute a ON t.oid = a.attrelid
+                WHERE t.relname = $1
+                AND a.attnum = ANY(ix.indkey)
+                ORDER BY i.relname, a.attnum
+            """, table_name)
+
+            if not indexes:
+                return f"No indexes found on table {table_name}"
+
+            # 按索引名称分组
+            current_index = None
+            formatted_indexes = []
+            index_info = []
+
+            for idx in indexes:
+                if current_index != idx[0]:
+                    if index_info:
+                        formatted_indexes.extend(index_info)
+                        formatted_indexes.append("")
+                    current_index = idx[0]
+                    index_info = [
+                        f"Index: {idx[0]}",
+                        f"Type: {idx[2]}",
+                        f"Method: {idx[3]}",
+                        COLUMNS_HEADER,
+                    ]
+                    if idx[5]:  # index comment
+                        index_info.insert(1, f"Comment: {idx[5]}")
+
+                index_info.append(f"  - {idx[1]}")
+
+            if index_info:
+                formatted_indexes.extend(index_info)
+
+            return "\n".join(formatted_indexes)
+
+        except DRIVER_ERRORS as e:
+            error_msg = f"Failed to get index information: {format_error(e)}"
+            self.stats.record_error(e.__class__.__name__)
+            raise ConnectionHandlerError(error_msg)
+        finally:
+            if conn:
+                await pool.release(conn)
+
+    async def get_table_stats(self, table_name: str) -> str:
+        """Get table statistics information"""
+        pool = conn = None
+        try:
+            pool, conn = await self._acquire()
+            # Get table statistics
+            stats = await conn.fetchrow("""
+                SELECT
+                    c.reltuples::bigint as row_estimate,
+                    pg_size_pretty(pg_total_relation_size(c.oid)) as total_size,
+                    pg_size_pretty(pg_table_size(c.oid)) as table_size,
+                    pg_size_pretty(pg_indexes_size(c.oid)) as index_size,
+                    age(c.relfrozenxid) as xid_age,
+                    c.relhasindex as has_indexes,
+                    c.relpages::bigint as pages,
+                    c.relallvisible::bigint as visible_pages
+                FROM pg_class c
+                JOIN pg_namespace n ON n.oid = c.relnamespace
+                WHERE c.relname = $1 AND n.nspname = 'public'
+            """, table_name)
+
+            if not stats:
+                return f"No statistics found for table {table_name}"
+
+            # Get column statistics
+            column_stats = await conn.fetch("""
+                SELECT
+                    a.attname as column_name,
+                    s.null_frac * 100 as null_percent,
+                    s.n_distinct as distinct_values,
+                    pg_column_size(a.attname::text) as approx_width
+                FROM pg_stats s
+                JOIN pg_attribute a ON a.attrelid = $1::regclass
+                    AND a.attnum > 0
+                    AND a.attname = s.attname
+                WHERE s.schemaname = 'public'
+                AND s.tablename = $1
+                ORDER BY a.attnum;
+            """, table_name)
+
+            # Format the output
+            output = [
+                f"Table Statistics for {table_name}:",
+                f"  Estimated Row Count: {stats[0]:,}",
+                f"  Total Size: {stats[1]}",
+                f"  Table Size: {stats[2]}",
+                f"  Index Size: {stats[3]}",
+                f"  Transaction ID Age: {stats[4]:,}",
+                f"  Has Indexes: {stats[5]}",
+                f"  Total Pages: {stats[6]:,}",
+                f"  Visible Pages: {stats[7]:,}\n",
+                "Column Statistics:"
+            ]
+
+            for col in column_stats:
+                col_info = [
+                    f"  {col[0]}:",
+                    f"    Null Values: {col[1]:.1f}%",
+                    f"    Distinct Values: {col[2] if col[2] >= 0 else 'Unknown'}",
+                    f"    Average Width: {col[3]}"
+                ]
+                output.extend(col_info)
+                output.append("")  # Empty line between columns
+
+            return "\n".join(output)
+
+        except DRIVER_ERRORS as e:
+            error_msg = f"Failed to get table statistics: {format_error(e)}"
+            self.stats.record_error(e.__class__.__name__)
+            raise ConnectionHandlerError(error_msg)
+        finally:
+            if conn:
+                await pool.release(conn)
+
+    @cached_metadata
+    async def get_table_constraints(self, table_name: str) -> str:
+        """Get constraint information for table"""
+        pool = conn = None
+        try:
+            pool, conn = await self._acquire()
+            # Get all constraints
+            constraints = await conn.fetch("""
+                SELECT
+                    con.conname as constraint_name,
+                    con.contype as constraint_type,
+                    pg_get_constraintdef(con.oid) as definition,
+                    CASE con.contype
+                        WHEN 'p' THEN 'Primary Key'
+                        WHEN 'f' THEN 'Foreign Key'
+                        WHEN 'u' THEN 'Unique'
+                        WHEN 'c' THEN 'Check'
+                        WHEN 't' THEN 'Trigger'
+                        ELSE 'Unknown'
+                    END as type_desc,
+                    con.condeferrable as is_deferrable,
+                    con.condeferred as is_deferred,
+                    obj_description(con.oid, 'pg_constraint') as comment
+                FROM pg_constraint con
+                JOIN pg_class rel ON rel.oid = con.conrelid
+                JOIN pg_namespace nsp ON nsp.oid = rel.relnamespace
+                WHERE rel.relname = $1
+                ORDER BY con.contype, con.conname
+            """, table_name)
+
+            if not constraints:
+                return f"No constraints found on table {table_name}"
+
+            # Format constraints by type
+            output = [f"Constraints for {table_name}:"]
+            current_type = None
+
+            for con in constraints:
+                if current_type != con[3]:
+                    current_type = con[3]
+                    output.append(f"\n{current_type} Constraints:")
+
+                output.extend([
+                    f"  {con[0]}:",
+                    f"    Definition: {con[2]}"
+                ])
+
+                if con[4]:  # is_deferrable
+                    output.append(f"    Deferrable: {'Deferred' if con[5] else 'Immediate'}")
+
+                if con[6]:  # comment
+                    output.append(f"    Comment: {con[6]}")
+
+                output.append("")  # Empty line between constraints
+
+            return "\n".join(output)
+
+        except DRIVER_ERRORS as e:
+            error_msg = f"Failed to get constraint information: {format_error(e)}"
+            self.stats.record_error(e.__class__.__name__)
+            raise ConnectionHandlerError(error_msg)
+        finally:
+            if conn:
+                await pool.release(conn)
+
+    async def explain_query(self, sql: str) -> str:
+        """Get query execution plan"""
+        pool = conn = None
+        try:
+            pool, conn = await self._acquire()
+            # Get EXPLAIN output (without execution)
+            regular_plan = await conn.fetch("""
+                EXPLAIN (FORMAT TEXT, VERBOSE, COSTS)
+                {}
+            """.format(sql))
+
+            # Get EXPLAIN ANALYZE output (with actual execution)
+            analyze_plan = await conn.fetch("""
+                EXPLAIN (ANALYZE, FORMAT TEXT, VERBOSE, COSTS, TIMING)
+                {}
+            """.format(sql))
+
+            output = [
+                "Query Execution Plan:",
+                "==================",
+                "\nEstimated Plan:",
+                "----------------"
+            ]
+            output.extend(line[0] for line in regular_plan)
+
+            output.extend([
+                "\nActual Plan (ANALYZE):",
+                "----------------------"
+            ])
+            output.extend(line[0] for line in analyze_plan)
+
+            return "\n".join(output)
+
+        except DRIVER_ERRORS as e:
+            error_msg = f"Failed to explain query: {format_error(e)}"
+            self.stats.record_error(e.__class__.__name__)
+            raise ConnectionHandlerError(error_msg)
+        finally:
+            if conn:
+                await pool.release(conn)
+
+    async def test_connection(self) -> bool:
+        """Test database connection
+
+        Returns:
+            bool: True if connection is successful, False otherwise
+        """
+        pool = conn = None
+        try:
+            pool, conn = await self._acquire()
+            await conn.fetchval("SELECT 1")
+            return True
+        except DRIVER_ERRORS as e:
+            self.log("error", f"Connection test failed: {format_error(e)}")
+            return False
+        finally:
+            if conn:
+                await pool.release(conn)
+
+    async def cleanup(self):
+        """Cleanup resources"""
+        # Log final stats before cleanup
+        self.log("info", f"Final PostgreSQL handler stats: {self.stats.to_dict()}")
+
+        # 关闭连接池，超时后强制终止仍在执行的连接
+        if self.pool is not None:
+            try:
+                self.log("debug", "Closing PostgreSQL async connection pool")
+                await asyncio.wait_for(self.pool.close(), timeout=POOL_CLOSE_TIMEOUT)
+            except Exception as e:
+                self.log("warning", f"Error closing PostgreSQL async connection pool: {str(e)}")
+                self.pool.terminate()
+            self.pool = None
+
+        # 清理其他资源
+        self.log("debug", "PostgreSQL handler cleanup complete")
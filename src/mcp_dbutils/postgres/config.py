@@ -3,7 +3,7 @@ from dataclasses import dataclass
 from typing import Any, Dict, Literal, Optional
 from urllib.parse import parse_qs, urlparse
 
-from ..config import ConnectionConfig, WritePermissions
+from ..config import ConnectionConfig, DriverType, WritePermissions
 
 
 @dataclass
@@ -14,6 +14,52 @@ class SSLConfig:
     key: Optional[str] = None
     root: Optional[str] = None
 
+@dataclass
+class PoolConfig:
+    """Connection pool configuration for PostgreSQL connection"""
+    min_size: int = 1
+    max_size: int = 5
+    max_lifetime: Optional[float] = 3600  # seconds, None = unlimited
+    idle_timeout: Optional[float] = 600  # seconds, None = unlimited
+    timeout: Optional[float] = 30  # seconds to wait for a free connection
+
+def parse_pool_config(pool_params: Any) -> PoolConfig:
+    """Parse pool configuration block
+
+    Args:
+        pool_params: Value of the 'pool' key in the connection configuration
+
+    Returns:
+        PoolConfig instance
+
+    Raises:
+        ValueError: If the pool configuration is invalid
+    """
+    if not isinstance(pool_params, dict):
+        raise ValueError("Pool configuration must be a dictionary")
+
+    pool = PoolConfig()
+    for key in ('min_size', 'max_size'):
+        if key in pool_params:
+            value = pool_params[key]
+            if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+                raise ValueError(f"Invalid pool {key}: {value}")
+            setattr(pool, key, value)
+    for key in ('max_lifetime', 'idle_timeout', 'timeout'):
+        if key in pool_params:
+            value = pool_params[key]
+            if value is not None and (
+                not isinstance(value, (int, float)) or isinstance(value, bool) or value <= 0
+            ):
+                raise ValueError(f"Invalid pool {key}: {value}")
+            setattr(pool, key, value)
+
+    if pool.max_size < 1:
+        raise ValueError(f"Invalid pool max_size: {pool.max_size}")
+    if pool.min_size > pool.max_size:
+        raise ValueError("Pool min_size cannot be greater than max_size")
+    return pool
+
 def parse_url(url: str) -> Dict[str, Any]:
     """Parse PostgreSQL URL into connection parameters
 
@@ -73,11 +119,17 @@ class PostgreSQLConfig(ConnectionConfig):
     type: Literal['postgres'] = 'postgres'
     url: Optional[str] = None
     ssl: Optional[SSLConfig] = None
+    pool: Optional[PoolConfig] = None
+    driver: DriverType = 'sync'  # 'async' uses asyncpg instead of psycopg2
     writable: bool = False  # Whether write operations are allowed
     write_permissions: Optional[WritePermissions] = None  # Write permissions configuration
 
+    def __post_init__(self):
+        if self.pool is None:
+            self.pool = PoolConfig()
+
     @classmethod
-    def from_yaml(cls, yaml_path: str, db_name: str, local_host: Optional[str] = None) -> 'PostgreSQLConfig':
+    def _from_yaml(cls, yaml_path: str, db_name: str, local_host: Optional[str] = None) -> 'PostgreSQLConfig':
         """Create configuration from YAML file
 
         Args:
@@ -153,6 +205,21 @@ class PostgreSQLConfig(ConnectionConfig):
                 ssl=ssl_config
             )
 
+        # Parse pool configuration if present
+        if 'pool' in db_config:
+            config.pool = parse_pool_config(db_config['pool'])
+
+        # Parse driver selection
+        config.driver = cls.parse_driver(db_config)
+
+        # Parse execution limits and caches
+        config.max_workers = cls.parse_max_workers(db_config)
+        config.query_timeout = cls.parse_query_timeout(db_config)
+        config.max_rows = cls.parse_max_rows(db_config)
+        config.max_result_bytes, config.max_cell_bytes = cls.parse_result_bytes(db_config)
+        config.cache = cls.parse_cache(db_config)
+        config.metadata_cache = cls.parse_metadata_cache(db_config)
+
         # Parse write permissions
         config.writable = db_config.get('writable', False)
         if config.writable and 'write_permissions' in db_config:
@@ -1,13 +1,38 @@
 """PostgreSQL connection handler implementation"""
 
+import threading
+
 import mcp.types as types
 import psycopg2
-
-from ..base import ConnectionHandler, ConnectionHandlerError
+from psycopg2.pool import PoolError
+
+from ..base import (
+    FETCH_BATCH_SIZE,
+    ConnectionHandler,
+    ConnectionHandlerError,
+    ResultCursor,
+    cached_metadata,
+    run_in_executor,
+)
+from ..export import ExportWriter
 from .config import PostgreSQLConfig
+from .pool import PostgreSQLConnectionPool
 
 # 常量定义
 COLUMNS_HEADER = "Columns:"
+# 查询结果使用的服务端游标名称，游标随事务回滚关闭
+STREAM_CURSOR_NAME = "dbutils_stream"
+# CSV导出由服务端生成，直接写入文件
+COPY_CSV_SQL = "COPY ({sql}\n) TO STDOUT WITH (FORMAT csv, HEADER true)"
+COPY_BUFFER_SIZE = 1024 * 1024
+# 元数据所在系统表累计写入的行数，任何DDL都会使其增加
+# 只读取统计计数器，不扫描系统表；计数器只增不减，不受事务ID回卷影响
+SCHEMA_VERSION_SQL = """
+    SELECT sum(pg_stat_get_tuples_inserted(c) + pg_stat_get_tuples_updated(c)
+               + pg_stat_get_tuples_deleted(c))::bigint
+    FROM unnest(ARRAY['pg_catalog.pg_class', 'pg_catalog.pg_attribute',
+                      'pg_catalog.pg_constraint', 'pg_catalog.pg_description']::regclass[]) AS c
+"""
 
 
 class PostgreSQLHandler(ConnectionHandler):
@@ -30,13 +55,65 @@ class PostgreSQLHandler(ConnectionHandler):
         masked_params = self.config.get_masked_connection_info()
         self.log("debug", f"Configuring connection with parameters: {masked_params}")
         self.pool = None
+        self._pool_lock = threading.Lock()
+
+    def _get_pool(self) -> PostgreSQLConnectionPool:
+        """Get the connection pool, creating it on first use"""
+        with self._pool_lock:
+            if self.pool is None or self.pool.closed:
+                pool_config = self.config.pool
+                self.pool = PostgreSQLConnectionPool(
+                    self.config.get_connection_params(),
+                    min_size=pool_config.min_size,
+                    max_size=pool_config.max_size,
+                    max_lifetime=pool_config.max_lifetime,
+                    idle_timeout=pool_config.idle_timeout,
+                    timeout=pool_config.timeout,
+                )
+                self.log("debug", f"Connection pool created (min={pool_config.min_size}, max={pool_config.max_size})")
+            return self.pool
+
+    def _get_connection(self):
+        """Get a connection from the pool"""
+        return self._get_pool().getconn()
+
+    def _release_connection(self, conn):
+        """Return a connection to the pool"""
+        try:
+            if self.pool is not None:
+                self.pool.putconn(conn)
+                return
+        except PoolError:
+            # 连接不属于当前连接池（连接池已被重建）
+            pass
+        conn.close()
+
+    def _apply_statement_timeout(self, cur) -> None:
+        """Limit statements of the current transaction to the query timeout"""
+        timeout_ms = self.get_query_timeout_ms()
+        if timeout_ms:
+            cur.execute("SET LOCAL statement_timeout = %s", (timeout_ms,))
+
+    @run_in_executor
+    def _schema_version(self) -> tuple:
+        """Rows written to the catalogs metadata is read from, as counted by the statistics system"""
+        conn = None
+        try:
+            conn = self._get_connection()
+            with conn.cursor() as cur:
+                cur.execute(SCHEMA_VERSION_SQL)
+                return tuple(map(tuple, cur.fetchall()))
+        finally:
+            if conn:
+                self._release_connection(conn)
 
-    async def get_tables(self) -> list[types.Resource]:
+    @cached_metadata
+    @run_in_executor
+    def get_tables(self) -> list[types.Resource]:
         """Get all table resources"""
         conn = None
         try:
-            conn_params = self.config.get_connection_params()
-            conn = psycopg2.connect(**conn_params)
+            conn = self._get_connection()
             with conn.cursor() as cur:
                 cur.execute("""
                     SELECT
@@ -63,14 +140,15 @@ class PostgreSQLHandler(ConnectionHandler):
             raise ConnectionHandlerError(error_msg)
         finally:
             if conn:
-                conn.close()
+                self._release_connection(conn)
 
-    async def get_schema(self, table_name: str) -> str:
+    @cached_metadata
+    @run_in_executor
+    def get_schema(self, table_name: str) -> str:
         """Get table schema information"""
         conn = None
         try:
-            conn_params = self.config.get_connection_params()
-            conn = psycopg2.connect(**conn_params)
+            conn = self._get_connection()
             with conn.cursor() as cur:
                 # Get column information
                 cur.execute("""
@@ -117,31 +195,28 @@ class PostgreSQLHandler(ConnectionHandler):
             raise ConnectionHandlerError(error_msg)
         finally:
             if conn:
-                conn.close()
+                self._release_connection(conn)
 
-    async def _execute_query(self, sql: str) -> str:
+    @run_in_executor
+    def _execute_query(self, sql: str) -> str:
         """Execute SQL query"""
         conn = None
         try:
-            conn_params = self.config.get_connection_params()
-            conn = psycopg2.connect(**conn_params)
+            conn = self._get_connection()
             self.log("debug", f"Executing query: {sql}")
 
             with conn.cursor() as cur:
                 # Start read-only transaction
                 cur.execute("BEGIN TRANSACTION READ ONLY")
                 try:
-                    cur.execute(sql)
-                    results = cur.fetchall()
-                    columns = [desc[0] for desc in cur.description]
-                    formatted_results = [dict(zip(columns, row)) for row in results]
-
-                    result_text = str({
-                        'type': self.db_type,
-                        'columns': columns,
-                        'rows': formatted_results,
-                        'row_count': len(results)
-                    })
+                    self._apply_statement_timeout(cur)
+                    # 服务端游标：结果保留在服务端，按批读取，客户端内存不随结果集增长
+                    with conn.cursor(name=STREAM_CURSOR_NAME) as stream, self.cancel_scope(conn.cancel):
+                        stream.itersize = FETCH_BATCH_SIZE
+                        stream.execute(sql)
+                        results, truncated = self.fetch_rows(stream.fetchmany)
+                        columns = [desc[0] for desc in stream.description]
+                    result_text = self.format_result(columns, results, truncated, type=self.db_type)
 
                     self.log("debug", f"Query completed, returned {len(results)} rows")
                     return result_text
@@ -152,9 +227,73 @@ class PostgreSQLHandler(ConnectionHandler):
             raise ConnectionHandlerError(error_msg)
         finally:
             if conn:
-                conn.close()
+                self._release_connection(conn)
+
+    @run_in_executor
+    def _open_cursor(self, sql: str, idle_ttl: float) -> ResultCursor:
+        """Declare a server-side cursor on a connection held until the cursor is closed"""
+        conn = self._get_connection()
+        try:
+            with conn.cursor() as cur:
+                cur.execute("BEGIN TRANSACTION READ ONLY")
+                self._apply_statement_timeout(cur)
+            stream = conn.cursor(name=STREAM_CURSOR_NAME)
+            stream.itersize = FETCH_BATCH_SIZE
+            with self.cancel_scope(conn.cancel):
+                stream.execute(sql)
+        except BaseException as e:
+            # 取消等任何异常都须结束只读事务并归还连接
+            try:
+                conn.rollback()
+            finally:
+                self._release_connection(conn)
+            if isinstance(e, psycopg2.Error):
+                raise ConnectionHandlerError(
+                    f"[{self.db_type}] Query execution failed: [Code: {e.pgcode}] {e.pgerror or str(e)}"
+                )
+            raise
+
+        def fetchmany(size: int) -> list:
+            with self.cancel_scope(conn.cancel):
+                return stream.fetchmany(size)
+
+        def close():
+            # 回滚事务时服务端游标随之关闭
+            try:
+                conn.rollback()
+            finally:
+                self._release_connection(conn)
+
+        return ResultCursor(fetchmany, close, lambda: [desc[0] for desc in stream.description])
 
-    async def _execute_write_query(self, sql: str) -> str:
+    async def _export_query(self, sql: str, writer: ExportWriter):
+        """Stream CSV exports with COPY, other formats through a server-side cursor"""
+        if writer.format != "csv":
+            return await super()._export_query(sql, writer)
+        return await self.run_in_thread(self._copy_csv, sql, writer)
+
+    def _copy_csv(self, sql: str, writer: ExportWriter):
+        """Write a query result to the export file with COPY ... TO STDOUT"""
+        conn = self._get_connection()
+        try:
+            with conn.cursor() as cur:
+                cur.execute("BEGIN TRANSACTION READ ONLY")
+                try:
+                    self._apply_statement_timeout(cur)
+                    with self.cancel_scope(conn.cancel):
+                        cur.copy_expert(COPY_CSV_SQL.format(sql=sql), writer.file, size=COPY_BUFFER_SIZE)
+                    writer.copied(cur.rowcount)
+                finally:
+                    cur.execute("ROLLBACK")
+        except psycopg2.Error as e:
+            raise ConnectionHandlerError(
+                f"[{self.db_type}] Export failed: [Code: {e.pgcode}] {e.pgerror or str(e)}"
+            )
+        finally:
+            self._release_connection(conn)
+
+    @run_in_executor
+    def _execute_write_query(self, sql: str) -> str:
         """Execute SQL write query
 
         Args:
@@ -178,14 +317,16 @@ class PostgreSQLHandler(ConnectionHandler):
             if not (is_insert or is_update or is_delete or is_transaction):
                 raise ConnectionHandlerError("Only INSERT, UPDATE, DELETE, and transaction statements are allowed for write operations")
 
-            conn_params = self.config.get_connection_params()
-            conn = psycopg2.connect(**conn_params)
+            conn = self._get_connection()
             self.log("debug", f"Executing write operation: {sql}")
 
             with conn.cursor() as cur:
                 try:
                     # Execute the write operation
-                    cur.execute(sql)
+                    if not is_transaction:
+                        self._apply_statement_timeout(cur)
+                    with self.cancel_scope(conn.cancel):
+                        cur.execute(sql)
 
                     # Get number of affected rows
                     affected_rows = cur.rowcount
@@ -212,14 +353,15 @@ class PostgreSQLHandler(ConnectionHandler):
             raise ConnectionHandlerError(error_msg)
         finally:
             if conn:
-                conn.close()
+                self._release_connection(conn)
 
-    async def get_table_description(self, table_name: str) -> str:
+    @cached_metadata
+    @run_in_executor
+    def get_table_description(self, table_name: str) -> str:
         """Get detailed table description"""
         conn = None
         try:
-            conn_params = self.config.get_connection_params()
-            conn = psycopg2.connect(**conn_params)
+            conn = self._get_connection()
             with conn.cursor() as cur:
                 # 获取表的基本信息和注释
                 cur.execute("""
@@ -287,14 +429,15 @@ class PostgreSQLHandler(ConnectionHandler):
             raise ConnectionHandlerError(error_msg)
         finally:
             if conn:
-                conn.close()
+                self._release_connection(conn)
 
-    async def get_table_ddl(self, table_name: str) -> str:
+    @cached_metadata
+    @run_in_executor
+    def get_table_ddl(self, table_name: str) -> str:
         """Get DDL statement for creating table"""
         conn = None
         try:
-            conn_params = self.config.get_connection_params()
-            conn = psycopg2.connect(**conn_params)
+            conn = self._get_connection()
             with conn.cursor() as cur:
                 # 获取列定义
                 cur.execute("""
@@ -384,14 +527,15 @@ class PostgreSQLHandler(ConnectionHandler):
             raise ConnectionHandlerError(error_msg)
         finally:
             if conn:
-                conn.close()
+                self._release_connection(conn)
 
-    async def get_table_indexes(self, table_name: str) -> str:
+    @cached_metadata
+    @run_in_executor
+    def get_table_indexes(self, table_name: str) -> str:
         """Get index information for table"""
         conn = None
         try:
-            conn_params = self.config.get_connection_params()
-            conn = psycopg2.connect(**conn_params)
+            conn = self._get_connection()
             with conn.cursor() as cur:
                 # 获取索引信息
                 cur.execute("""
@@ -453,14 +597,14 @@ class PostgreSQLHandler(ConnectionHandler):
             raise ConnectionHandlerError(error_msg)
         finally:
             if conn:
-                conn.close()
+                self._release_connection(conn)
 
-    async def get_table_stats(self, table_name: str) -> str:
+    @run_in_executor
+    def get_table_stats(self, table_name: str) -> str:
         """Get table statistics information"""
         conn = None
         try:
-            conn_params = self.config.get_connection_params()
-            conn = psycopg2.connect(**conn_params)
+            conn = self._get_connection()
             with conn.cursor() as cur:
                 # Get table statistics
                 cur.execute("""
@@ -531,14 +675,15 @@ class PostgreSQLHandler(ConnectionHandler):
             raise ConnectionHandlerError(error_msg)
         finally:
             if conn:
-                conn.close()
+                self._release_connection(conn)
 
-    async def get_table_constraints(self, table_name: str) -> str:
+    @cached_metadata
+    @run_in_executor
+    def get_table_constraints(self, table_name: str) -> str:
         """Get constraint information for table"""
         conn = None
         try:
-            conn_params = self.config.get_connection_params()
-            conn = psycopg2.connect(**conn_params)
+            conn = self._get_connection()
             with conn.cursor() as cur:
                 # Get all constraints
                 cur.execute("""
@@ -598,14 +743,14 @@ class PostgreSQLHandler(ConnectionHandler):
             raise ConnectionHandlerError(error_msg)
         finally:
             if conn:
-                conn.close()
+                self._release_connection(conn)
 
-    async def explain_query(self, sql: str) -> str:
+    @run_in_executor
+    def explain_query(self, sql: str) -> str:
         """Get query execution plan"""
         conn = None
         try:
-            conn_params = self.config.get_connection_params()
-            conn = psycopg2.connect(**conn_params)
+            conn = self._get_connection()
             with conn.cursor() as cur:
                 # Get both regular and analyze explain plans
                 # Get EXPLAIN output (without execution)
@@ -644,9 +789,10 @@ class PostgreSQLHandler(ConnectionHandler):
             raise ConnectionHandlerError(error_msg)
         finally:
             if conn:
-                conn.close()
+                self._release_connection(conn)
 
-    async def test_connection(self) -> bool:
+    @run_in_executor
+    def test_connection(self) -> bool:
         """Test database connection
 
         Returns:
@@ -654,8 +800,7 @@ class PostgreSQLHandler(ConnectionHandler):
         """
         conn = None
         try:
-            conn_params = self.config.get_connection_params()
-            conn = psycopg2.connect(**conn_params)
+            conn = self._get_connection()
             with conn.cursor() as cur:
                 cur.execute("SELECT 1")
                 return True
@@ -664,13 +809,22 @@ class PostgreSQLHandler(ConnectionHandler):
             return False
         finally:
             if conn:
-                conn.close()
+                self._release_connection(conn)
 
     async def cleanup(self):
         """Cleanup resources"""
         # Log final stats before cleanup
         self.log("info", f"Final PostgreSQL handler stats: {self.stats.to_dict()}")
 
+        # 关闭连接池
+        if self.pool is not None:
+            try:
+                self.log("debug", "Closing PostgreSQL connection pool")
+                self.pool.closeall()
+            except Exception as e:
+                self.log("warning", f"Error closing PostgreSQL connection pool: {str(e)}")
+            self.pool = None
+
         # 主动关闭连接
         if hasattr(self, '_connection') and self._connection:
             try:
@@ -680,5 +834,8 @@ class PostgreSQLHandler(ConnectionHandler):
             except Exception as e:
                 self.log("warning", f"Error closing PostgreSQL connection: {str(e)}")
 
+        # 停止工作线程
+        self.shutdown_executor()
+
         # 清理其他资源
         self.log("debug", "PostgreSQL handler cleanup complete")
@@ -0,0 +1,189 @@
+"""PostgreSQL connection pool implementation"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+import psycopg2
+from psycopg2 import extensions
+from psycopg2.pool import PoolError
+
+
+class PostgreSQLConnectionPool:
+    """Thread-safe psycopg2 connection pool with lifetime and idle limits
+
+    Unlike psycopg2's SimpleConnectionPool, connections older than
+    ``max_lifetime`` or idle longer than ``idle_timeout`` are closed and
+    replaced, and callers wait (up to ``timeout``) for a free connection
+    instead of failing immediately when the pool is exhausted.
+    """
+
+    def __init__(
+        self,
+        conn_params: Dict[str, Any],
+        min_size: int = 1,
+        max_size: int = 5,
+        max_lifetime: Optional[float] = None,
+        idle_timeout: Optional[float] = None,
+        timeout: Optional[float] = None,
+    ):
+        """Initialize connection pool
+
+        Args:
+            conn_params: psycopg2 connection parameters
+            min_size: Number of connections opened up front and kept idle
+            max_size: Maximum number of open connections
+            max_lifetime: Maximum age of a connection in seconds (None = unlimited)
+            idle_timeout: Maximum idle time of a connection in seconds (None = unlimited)
+            timeout: Maximum time to wait for a free connection in seconds (None = wait forever)
+        """
+        self._conn_params = conn_params
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_lifetime = max_lifetime
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+
+        self._cond = threading.Condition()
+        # 空闲连接: (connection, created_at, last_used_at)
+        self._idle: deque = deque()
+        # 已借出连接: id(connection) -> created_at
+        self._used: Dict[int, float] = {}
+        self._closed = False
+
+        for _ in range(min_size):
+            conn = self._connect()
+            now = time.monotonic()
+            self._idle.append((conn, now, now))
+
+    @property
+    def size(self) -> int:
+        """Number of open connections managed by the pool"""
+        with self._cond:
+            return len(self._idle) + len(self._used)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def _connect(self):
+        return psycopg2.connect(**self._conn_params)
+
+    def _is_expired(self, created_at: float, last_used: float, now: float) -> bool:
+        if self.max_lifetime is not None and now - created_at >= self.max_lifetime:
+            return True
+        return self.idle_timeout is not None and now - last_used >= self.idle_timeout
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def getconn(self):
+        """Get a connection from the pool
+
+        Returns:
+            A psycopg2 connection
+
+        Raises:
+            PoolError: If the pool is closed or no connection became available in time
+        """
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise PoolError("connection pool is closed")
+
+                now = time.monotonic()
+                while self._idle:
+                    conn, created_at, last_used = self._idle.pop()
+                    if conn.closed or self._is_expired(created_at, last_used, now):
+                        self._close_quietly(conn)
+                        continue
+                    self._used[id(conn)] = created_at
+                    return conn
+
+                if len(self._used) < self.max_size:
+                    # 预占位后在锁外建立连接，避免阻塞其他线程
+                    placeholder = object()
+                    self._used[id(placeholder)] = now
+                    break
+
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise PoolError(
+                        f"connection pool exhausted (max_size={self.max_size})"
+                    )
+                self._cond.wait(remaining)
+
+        try:
+            conn = self._connect()
+        except Exception:
+            with self._cond:
+                self._used.pop(id(placeholder), None)
+                self._cond.notify()
+            raise
+
+        with self._cond:
+            created_at = self._used.pop(id(placeholder))
+            self._used[id(conn)] = created_at
+        return conn
+
+    def putconn(self, conn, close: bool = False):
+        """Return a connection to the pool
+
+        Connections left inside a transaction are rolled back; broken,
+        expired or explicitly closed connections are discarded.
+
+        Args:
+            conn: Connection previously obtained from getconn()
+            close: Close the connection instead of keeping it
+        """
+        with self._cond:
+            created_at = self._used.pop(id(conn), None)
+            self._cond.notify()
+        if created_at is None:
+            raise PoolError("trying to put unkeyed connection")
+
+        if not close and not self._closed and not conn.closed:
+            try:
+                status = conn.get_transaction_status()
+                if status == extensions.TRANSACTION_STATUS_UNKNOWN:
+                    close = True
+                elif status != extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except Exception:
+                close = True
+        else:
+            close = True
+
+        now = time.monotonic()
+        if not close and self.max_lifetime is not None and now - created_at >= self.max_lifetime:
+            close = True
+
+        if close:
+            self._close_quietly(conn)
+            return
+
+        with self._cond:
+            if self._closed:
+                self._close_quietly(conn)
+                return
+            self._idle.append((conn, created_at, now))
+            self._cond.notify()
+
+    def closeall(self):
+        """Close all idle connections and refuse further checkouts
+
+        Connections currently checked out are closed when they are returned.
+        """
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._cond.notify_all()
+        for conn, _, _ in idle:
+            self._close_quietly(conn)
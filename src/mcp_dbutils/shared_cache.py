@@ -0,0 +1,175 @@
+"""Cache shared by the server processes of one host"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Iterable, Optional
+
+import mcp.types as types
+
+from .budget import cell_size
+
+# File holding the shared cache inside the configured directory
+SHARED_CACHE_FILE = "dbutils-cache.sqlite3"
+
+# 每写入这么多条目清理一次过期条目并检查总大小
+PURGE_INTERVAL = 64
+
+# 其他进程正在写入时等待的最长时间（秒），超时按未命中处理
+BUSY_TIMEOUT = 1
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS entries (
+        key TEXT PRIMARY KEY,
+        scope TEXT NOT NULL,
+        value TEXT NOT NULL,
+        size INTEGER NOT NULL,
+        expires REAL NOT NULL,
+        written REAL NOT NULL,
+        words TEXT NOT NULL
+    )
+"""
+
+
+class SharedCache:
+    """Cached results and metadata in a local SQLite file shared by processes
+
+    Every MCP client starts a server process of its own; with this tier a
+    process reuses what its siblings already read from the same database.
+    The file is in WAL mode, so readers do not wait for the writer. Entries
+    expire after their TTL, are never larger than max_entry_bytes, and the
+    oldest are dropped once the file holds more than max_bytes, which is
+    checked every PURGE_INTERVAL writes. Callers treat errors as misses.
+    """
+
+    def __init__(self, path: str, max_bytes: int, max_entry_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    @staticmethod
+    def make_key(scope: str, *parts: Any) -> str:
+        """Key of an entry: digest of its database scope and parts"""
+        data = json.dumps([scope, *parts], default=repr, ensure_ascii=False)
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Get a cached value, None if missing or expired"""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT value FROM entries WHERE key = ? AND expires > ?", (key, time.time())
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, key: str, scope: str, value: str, ttl: float, words: Iterable[str] = ()):
+        """Cache a value for ttl seconds unless it is larger than max_entry_bytes
+
+        Args:
+            key: Key from make_key
+            scope: Database the value was read from
+            value: Value as text
+            ttl: Seconds the value is reused
+            words: Table names that drop the entry when written
+        """
+        size = cell_size(value)
+        if size > self.max_entry_bytes:
+            return
+        now = time.time()
+        # 前后加空格，按完整单词匹配表名
+        tags = f" {' '.join(sorted(words))} " if words else ""
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, scope, value, size, now + ttl, now, tags),
+            )
+            self._writes += 1
+            if self._writes % PURGE_INTERVAL == 0:
+                self._purge(conn, now)
+
+    def invalidate(self, scope: str, table: Optional[str] = None):
+        """Drop entries of a scope mentioning a table, or all of them if table is None"""
+        with self._lock:
+            conn = self._connect()
+            if table is None:
+                conn.execute("DELETE FROM entries WHERE scope = ?", (scope,))
+            else:
+                conn.execute(
+                    "DELETE FROM entries WHERE scope = ? AND instr(words, ?) > 0", (scope, f" {table} ")
+                )
+
+    def close(self):
+        """Close this process's connection to the file"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the file, readable only by the current user
+
+        Raises:
+            PermissionError: If the directory belongs to another user
+        """
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+            # 缓存中是数据库的查询结果，不能使用其他用户可以替换或读取的目录
+            if hasattr(os, "getuid") and os.stat(directory).st_uid != os.getuid():
+                raise PermissionError(f"Shared cache directory {directory} is owned by another user")
+            # 数据库文件及其-wal、-shm文件只允许当前用户读写
+            old_umask = os.umask(0o177)
+            try:
+                conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, isolation_level=None, check_same_thread=False)
+                try:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    # 缓存丢失最近的写入无妨，不必每次提交都刷盘
+                    conn.execute("PRAGMA synchronous=NORMAL")
+                    conn.execute(_SCHEMA)
+                    conn.execute("CREATE INDEX IF NOT EXISTS entries_written ON entries (written)")
+                    self._purge(conn, time.time())
+                except sqlite3.Error:
+                    conn.close()
+                    raise
+            finally:
+                os.umask(old_umask)
+            self._conn = conn
+        return self._conn
+
+    def _purge(self, conn: sqlite3.Connection, now: float):
+        """Drop expired entries, then the oldest until the rest fit in max_bytes"""
+        conn.execute("DELETE FROM entries WHERE expires <= ?", (now,))
+        conn.execute(
+            """
+            DELETE FROM entries WHERE written <= (
+                SELECT MAX(written) FROM (
+                    SELECT written, SUM(size) OVER (ORDER BY written DESC, key) AS total FROM entries
+                ) WHERE total > ?
+            )
+            """,
+            (self.max_bytes,),
+        )
+
+
+def encode_metadata(value: Any) -> Optional[str]:
+    """Write the result of a metadata method as text, None if it cannot be shared"""
+    if isinstance(value, str):
+        return json.dumps({"text": value}, ensure_ascii=False)
+    if isinstance(value, list) and all(isinstance(item, types.Resource) for item in value):
+        resources = [item.model_dump(mode="json", exclude_unset=True, by_alias=True) for item in value]
+        return json.dumps({"resources": resources}, ensure_ascii=False)
+    return None
+
+
+def decode_metadata(data: str) -> Any:
+    """Read a value written by encode_metadata"""
+    value = json.loads(data)
+    if "resources" in value:
+        return [types.Resource.model_validate(item) for item in value["resources"]]
+    return value["text"]
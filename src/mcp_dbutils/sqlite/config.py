@@ -2,7 +2,7 @@
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Literal, Optional
+from typing import Any, Dict, List, Literal, Optional
 from urllib.parse import parse_qs, urlparse
 
 from ..config import ConnectionConfig, WritePermissions
@@ -49,15 +49,81 @@ def parse_jdbc_url(jdbc_url: str) -> Dict[str, str]:
         'parameters': params
     }
 
+JOURNAL_MODES = ('DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'WAL', 'OFF')
+TEMP_STORES = ('DEFAULT', 'FILE', 'MEMORY')
+
+@dataclass
+class PragmaConfig:
+    """PRAGMA settings applied to each new SQLite connection
+
+    A value of None leaves the SQLite default untouched.
+    """
+    journal_mode: Optional[str] = None  # e.g. WAL (persistent, stored in the database file)
+    cache_size: Optional[int] = -65536  # pages, or KiB when negative (64 MiB)
+    mmap_size: Optional[int] = 268435456  # bytes (256 MiB)
+    temp_store: Optional[str] = 'MEMORY'
+    busy_timeout: Optional[int] = 5000  # milliseconds
+
+    def get_statements(self) -> List[str]:
+        """Return PRAGMA statements for the configured values"""
+        statements = []
+        for key in ('busy_timeout', 'journal_mode', 'cache_size', 'mmap_size', 'temp_store'):
+            value = getattr(self, key)
+            if value is not None:
+                statements.append(f"PRAGMA {key} = {value}")
+        return statements
+
+def parse_pragma_config(pragma_params: Any) -> PragmaConfig:
+    """Parse pragmas configuration block
+
+    Args:
+        pragma_params: Value of the 'pragmas' key in the connection configuration
+
+    Returns:
+        PragmaConfig instance
+
+    Raises:
+        ValueError: If the pragmas configuration is invalid
+    """
+    if not isinstance(pragma_params, dict):
+        raise ValueError("Pragmas configuration must be a dictionary")
+
+    pragmas = PragmaConfig()
+    for key, choices in (('journal_mode', JOURNAL_MODES), ('temp_store', TEMP_STORES)):
+        if key in pragma_params:
+            value = pragma_params[key]
+            if value is not None:
+                value = str(value).upper()
+                if value not in choices:
+                    raise ValueError(f"Invalid pragma {key}: {pragma_params[key]}. Must be one of {list(choices)}")
+            setattr(pragmas, key, value)
+    for key in ('cache_size', 'mmap_size', 'busy_timeout'):
+        if key in pragma_params:
+            value = pragma_params[key]
+            if value is not None and (
+                not isinstance(value, int) or isinstance(value, bool)
+                or (key != 'cache_size' and value < 0)
+            ):
+                raise ValueError(f"Invalid pragma {key}: {value}")
+            setattr(pragmas, key, value)
+    return pragmas
+
 @dataclass
 class SQLiteConfig(ConnectionConfig):
     path: str
     password: Optional[str] = None
     uri: bool = True  # Enable URI mode to support parameters like password
     type: Literal['sqlite'] = 'sqlite'
+    read_only: bool = False  # Open the database file with mode=ro
+    immutable: bool = False  # Open with immutable=1 (implies read-only, no locking)
+    pragmas: Optional[PragmaConfig] = None
     writable: bool = False  # Whether write operations are allowed
     write_permissions: Optional[WritePermissions] = None  # Write permissions configuration
 
+    def __post_init__(self):
+        if self.pragmas is None:
+            self.pragmas = PragmaConfig()
+
     @classmethod
     def from_jdbc_url(cls, jdbc_url: str, password: Optional[str] = None) -> 'SQLiteConfig':
         """Create configuration from JDBC URL
@@ -89,11 +155,16 @@ class SQLiteConfig(ConnectionConfig):
 
     def get_connection_params(self) -> Dict[str, Any]:
         """Get sqlite3 connection parameters"""
-        if not self.password:
+        if not (self.password or self.read_only or self.immutable):
             return {'database': self.absolute_path, 'uri': self.uri}
 
-        # Use URI format if password is provided
-        uri = f"file:{self.absolute_path}?mode=rw"
+        # Use URI format if password or read-only mode is requested
+        if self.read_only or self.immutable:
+            uri = f"file:{self.absolute_path}?mode=ro"
+            if self.immutable:
+                uri += "&immutable=1"
+        else:
+            uri = f"file:{self.absolute_path}?mode=rw"
         if self.password:
             uri += f"&password={self.password}"
 
@@ -108,12 +179,14 @@ class SQLiteConfig(ConnectionConfig):
             'database': self.absolute_path,
             'uri': self.uri
         }
+        if self.read_only or self.immutable:
+            info['mode'] = 'immutable' if self.immutable else 'ro'
         if self.password:
             info['password'] = '******'
         return info
 
     @classmethod
-    def from_yaml(cls, yaml_path: str, db_name: str, **kwargs) -> 'SQLiteConfig':
+    def _from_yaml(cls, yaml_path: str, db_name: str, **kwargs) -> 'SQLiteConfig':
         """Create SQLite configuration from YAML
 
         Args:
@@ -149,10 +222,28 @@ class SQLiteConfig(ConnectionConfig):
                 uri=True
             )
 
+        config.read_only = bool(db_config.get('read_only', False))
+        config.immutable = bool(db_config.get('immutable', False))
+
+        # Parse pragmas configuration if present
+        if 'pragmas' in db_config:
+            config.pragmas = parse_pragma_config(db_config['pragmas'])
+
+        # Parse execution limits and caches
+        config.max_workers = cls.parse_max_workers(db_config)
+        config.query_timeout = cls.parse_query_timeout(db_config)
+        config.max_rows = cls.parse_max_rows(db_config)
+        config.max_result_bytes, config.max_cell_bytes = cls.parse_result_bytes(db_config)
+        config.cache = cls.parse_cache(db_config)
+        config.metadata_cache = cls.parse_metadata_cache(db_config)
+
         # Parse write permissions
         config.writable = db_config.get('writable', False)
         if config.writable and 'write_permissions' in db_config:
             config.write_permissions = WritePermissions(db_config['write_permissions'])
 
+        if config.writable and (config.read_only or config.immutable):
+            raise ValueError("A read-only or immutable SQLite connection cannot be writable")
+
         config.debug = cls.get_debug_mode()
         return config
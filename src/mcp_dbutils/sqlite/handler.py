@@ -1,15 +1,25 @@
 """SQLite connection handler implementation"""
 
 import sqlite3
+import threading
 import time
+from contextlib import contextmanager
+from typing import Iterator
 
 import mcp.types as types
 
-from ..base import ConnectionHandler, ConnectionHandlerError
+from ..base import (
+    ConnectionHandler,
+    ConnectionHandlerError,
+    ResultCursor,
+    cached_metadata,
+    run_in_executor,
+)
 from .config import SQLiteConfig
 
 # 常量定义
 COLUMNS_HEADER = "Columns:"
+PROGRESS_HANDLER_STEPS = 1000  # VM instructions between timeout checks
 
 
 class SQLiteHandler(ConnectionHandler):
@@ -27,11 +37,51 @@ class SQLiteHandler(ConnectionHandler):
         """
         super().__init__(config_path, connection, debug)
         self.config = SQLiteConfig.from_yaml(config_path, connection)
-
-    async def get_tables(self) -> list[types.Resource]:
+        self._connection = None
+        self._connection_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a new connection and apply the configured PRAGMAs"""
+        conn = sqlite3.connect(check_same_thread=False, **self.config.get_connection_params())
+        read_only = self.config.read_only or self.config.immutable
+        for statement in self.config.pragmas.get_statements():
+            # 只读连接无法切换journal_mode
+            if read_only and statement.startswith("PRAGMA journal_mode"):
+                continue
+            conn.execute(statement)
+        return conn
+
+    @contextmanager
+    def _get_connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow the cached connection, opening it on first use
+
+        The connection is kept open across tool calls so the page cache and
+        memory map stay warm. Access is serialized, and any transaction left
+        open by the caller is rolled back before the connection is released.
+        """
+        with self._connection_lock:
+            if self._connection is None:
+                self._connection = self._connect()
+                self.log("debug", f"Opened SQLite connection: {self.config.get_masked_connection_info()}")
+            conn = self._connection
+            try:
+                yield conn
+            finally:
+                if conn.in_transaction:
+                    conn.rollback()
+
+    @run_in_executor
+    def _schema_version(self) -> int:
+        """Schema cookie, incremented by SQLite on every schema change"""
+        with self._get_connection() as conn:
+            return conn.execute("PRAGMA schema_version").fetchone()[0]
+
+    @cached_metadata
+    @run_in_executor
+    def get_tables(self) -> list[types.Resource]:
         """Get all table resources"""
         try:
-            with sqlite3.connect(self.config.path) as conn:
+            with self._get_connection() as conn:
                 cur = conn.cursor()
                 cur.execute("SELECT name FROM sqlite_master WHERE type='table'")
                 tables = cur.fetchall()
@@ -47,10 +97,12 @@ class SQLiteHandler(ConnectionHandler):
             self.stats.record_error(e.__class__.__name__)
             raise ConnectionHandlerError(error_msg)
 
-    async def get_schema(self, table_name: str) -> str:
+    @cached_metadata
+    @run_in_executor
+    def get_schema(self, table_name: str) -> str:
         """Get table schema information"""
         try:
-            with sqlite3.connect(self.config.path) as conn:
+            with self._get_connection() as conn:
                 cur = conn.cursor()
                 cur.execute(f"PRAGMA table_info({table_name})")
                 columns = cur.fetchall()
@@ -76,7 +128,23 @@ class SQLiteHandler(ConnectionHandler):
             self.stats.record_error(e.__class__.__name__)
             raise ConnectionHandlerError(error_msg)
 
-    async def _execute_query(self, sql: str) -> str:
+    @contextmanager
+    def _limit_statement(self, conn: sqlite3.Connection) -> Iterator[None]:
+        """Interrupt the statement on timeout or when the tool call is cancelled"""
+        timeout = self.get_query_timeout()
+        if timeout:
+            deadline = time.monotonic() + timeout
+            # 返回真值时SQLite中断当前语句
+            conn.set_progress_handler(lambda: time.monotonic() > deadline, PROGRESS_HANDLER_STEPS)
+        try:
+            with self.cancel_scope(conn.interrupt):
+                yield
+        finally:
+            if timeout:
+                conn.set_progress_handler(None, 0)
+
+    @run_in_executor
+    def _execute_query(self, sql: str) -> str:
         """Execute SQL query"""
         try:
             # Check if the query is a DDL statement
@@ -88,47 +156,63 @@ class SQLiteHandler(ConnectionHandler):
             if not (is_select or is_ddl or is_dml):
                 raise ConnectionHandlerError("Only SELECT, DDL, and DML statements are allowed")
 
-            conn = sqlite3.connect(self.config.path)
-            cur = conn.cursor()
+            with self._get_connection() as conn:
+                cur = conn.cursor()
 
-            try:
-                start_time = time.time()
-                cur.execute(sql)
-                conn.commit()
-                end_time = time.time()
-                elapsed_ms = (end_time - start_time) * 1000
-                self.log("debug", f"Query executed in {elapsed_ms:.2f}ms")
-
-                if is_select:
-                    # Get column names
-                    columns = [description[0] for description in cur.description]
-                    # Fetch results and convert to dictionaries
-                    results = []
-                    for row in cur.fetchall():
-                        # Convert each row to a dictionary
-                        row_dict = {}
-                        for i, col_name in enumerate(columns):
-                            row_dict[col_name] = row[i]
-                        results.append(row_dict)
-
-                    return str({
-                        "columns": columns,
-                        "rows": results
-                    })
-                else:
-                    # For DDL/DML statements
-                    return "Query executed successfully"
-            except sqlite3.Error as e:
-                self.log("error", f"Query error: {str(e)}")
-                raise ConnectionHandlerError(str(e))
-            finally:
-                cur.close()
-                conn.close()
+                try:
+                    start_time = time.time()
+                    with self._limit_statement(conn):
+                        cur.execute(sql)
+                        conn.commit()
+                        rows, truncated = self.fetch_rows(cur.fetchmany) if is_select else ([], False)
+                    end_time = time.time()
+                    elapsed_ms = (end_time - start_time) * 1000
+                    self.log("debug", f"Query executed in {elapsed_ms:.2f}ms")
+
+                    if is_select:
+                        # Get column names
+                        columns = [description[0] for description in cur.description]
+                        return self.format_result(columns, rows, truncated)
+                    else:
+                        # For DDL/DML statements
+                        return "Query executed successfully"
+                except sqlite3.Error as e:
+                    self.log("error", f"Query error: {str(e)}")
+                    raise ConnectionHandlerError(str(e))
+                finally:
+                    cur.close()
         except sqlite3.Error as e:
             error_msg = f"[{self.db_type}] Query execution failed: {str(e)}"
             raise ConnectionHandlerError(error_msg)
 
-    async def _execute_write_query(self, sql: str) -> str:
+    @run_in_executor
+    def _open_cursor(self, sql: str, idle_ttl: float) -> ResultCursor:
+        """Execute a query on a dedicated connection kept open for paging"""
+        # 游标在多次调用之间保持打开，不占用共享连接
+        conn = self._connect()
+        try:
+            cur = conn.cursor()
+            with self._limit_statement(conn):
+                cur.execute(sql)
+        except BaseException as e:
+            # 取消等任何异常都须关闭专用连接
+            conn.close()
+            if isinstance(e, sqlite3.Error):
+                raise ConnectionHandlerError(f"[{self.db_type}] Query execution failed: {str(e)}")
+            raise
+
+        def fetchmany(size: int) -> list:
+            with self._limit_statement(conn):
+                return cur.fetchmany(size)
+
+        return ResultCursor(
+            fetchmany,
+            conn.close,
+            lambda: [description[0] for description in cur.description],
+        )
+
+    @run_in_executor
+    def _execute_write_query(self, sql: str) -> str:
         """Execute SQL write query
 
         Args:
@@ -151,40 +235,42 @@ class SQLiteHandler(ConnectionHandler):
             if not (is_insert or is_update or is_delete or is_transaction):
                 raise ConnectionHandlerError("Only INSERT, UPDATE, DELETE, and transaction statements are allowed for write operations")
 
-            conn = sqlite3.connect(self.config.path)
-            cur = conn.cursor()
+            with self._get_connection() as conn:
+                cur = conn.cursor()
 
-            try:
-                start_time = time.time()
-                cur.execute(sql)
-                conn.commit()
-                end_time = time.time()
-                elapsed_ms = (end_time - start_time) * 1000
-
-                # Get number of affected rows
-                affected_rows = cur.rowcount
-
-                self.log("debug", f"Write operation executed in {elapsed_ms:.2f}ms, affected {affected_rows} rows")
-
-                # Return result
-                if is_transaction:
-                    return f"Transaction operation executed successfully"
-                else:
-                    return f"Write operation executed successfully. {affected_rows} row{'s' if affected_rows != 1 else ''} affected."
-            except sqlite3.Error as e:
-                self.log("error", f"Write operation error: {str(e)}")
-                raise ConnectionHandlerError(str(e))
-            finally:
-                cur.close()
-                conn.close()
+                try:
+                    start_time = time.time()
+                    with self._limit_statement(conn):
+                        cur.execute(sql)
+                        conn.commit()
+                    end_time = time.time()
+                    elapsed_ms = (end_time - start_time) * 1000
+
+                    # Get number of affected rows
+                    affected_rows = cur.rowcount
+
+                    self.log("debug", f"Write operation executed in {elapsed_ms:.2f}ms, affected {affected_rows} rows")
+
+                    # Return result
+                    if is_transaction:
+                        return f"Transaction operation executed successfully"
+                    else:
+                        return f"Write operation executed successfully. {affected_rows} row{'s' if affected_rows != 1 else ''} affected."
+                except sqlite3.Error as e:
+                    self.log("error", f"Write operation error: {str(e)}")
+                    raise ConnectionHandlerError(str(e))
+                finally:
+                    cur.close()
         except sqlite3.Error as e:
             error_msg = f"[{self.db_type}] Write operation failed: {str(e)}"
             raise ConnectionHandlerError(error_msg)
 
-    async def get_table_description(self, table_name: str) -> str:
+    @cached_metadata
+    @run_in_executor
+    def get_table_description(self, table_name: str) -> str:
         """Get detailed table description"""
         try:
-            with sqlite3.connect(self.config.path) as conn:
+            with self._get_connection() as conn:
                 cur = conn.cursor()
                 # 获取表信息
                 cur.execute(f"PRAGMA table_info({table_name})")
@@ -213,10 +299,12 @@ class SQLiteHandler(ConnectionHandler):
             self.stats.record_error(e.__class__.__name__)
             raise ConnectionHandlerError(error_msg)
 
-    async def get_table_ddl(self, table_name: str) -> str:
+    @cached_metadata
+    @run_in_executor
+    def get_table_ddl(self, table_name: str) -> str:
         """Get DDL statement for creating table"""
         try:
-            with sqlite3.connect(self.config.path) as conn:
+            with self._get_connection() as conn:
                 cur = conn.cursor()
                 # SQLite provides the complete CREATE statement
                 cur.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name=?", (table_name,))
@@ -245,10 +333,12 @@ class SQLiteHandler(ConnectionHandler):
             self.stats.record_error(e.__class__.__name__)
             raise ConnectionHandlerError(error_msg)
 
-    async def get_table_indexes(self, table_name: str) -> str:
+    @cached_metadata
+    @run_in_executor
+    def get_table_indexes(self, table_name: str) -> str:
         """Get index information for table"""
         try:
-            with sqlite3.connect(self.config.path) as conn:
+            with self._get_connection() as conn:
                 cur = conn.cursor()
 
                 # Check if table exists
@@ -298,10 +388,11 @@ class SQLiteHandler(ConnectionHandler):
             self.stats.record_error(e.__class__.__name__)
             raise ConnectionHandlerError(error_msg)
 
-    async def get_table_stats(self, table_name: str) -> str:
+    @run_in_executor
+    def get_table_stats(self, table_name: str) -> str:
         """Get table statistics information"""
         try:
-            with sqlite3.connect(self.config.path) as conn:
+            with self._get_connection() as conn:
                 cur = conn.cursor()
 
                 # Check if table exists
@@ -384,10 +475,12 @@ class SQLiteHandler(ConnectionHandler):
             self.stats.record_error(e.__class__.__name__)
             raise ConnectionHandlerError(error_msg)
 
-    async def get_table_constraints(self, table_name: str) -> str:
+    @cached_metadata
+    @run_in_executor
+    def get_table_constraints(self, table_name: str) -> str:
         """Get constraint information for table"""
         try:
-            with sqlite3.connect(self.config.path) as conn:
+            with self._get_connection() as conn:
                 cur = conn.cursor()
 
                 # Get table info (includes PRIMARY KEY)
@@ -464,10 +557,11 @@ class SQLiteHandler(ConnectionHandler):
             self.stats.record_error(e.__class__.__name__)
             raise ConnectionHandlerError(error_msg)
 
-    async def explain_query(self, sql: str) -> str:
+    @run_in_executor
+    def explain_query(self, sql: str) -> str:
         """Get query execution plan"""
         try:
-            with sqlite3.connect(self.config.path) as conn:
+            with self._get_connection() as conn:
                 cur = conn.cursor()
 
                 # Check if the query is valid by preparing it
@@ -509,14 +603,15 @@ class SQLiteHandler(ConnectionHandler):
             self.stats.record_error(e.__class__.__name__)
             raise ConnectionHandlerError(error_msg)
 
-    async def test_connection(self) -> bool:
+    @run_in_executor
+    def test_connection(self) -> bool:
         """Test database connection
 
         Returns:
             bool: True if connection is successful, False otherwise
         """
         try:
-            with sqlite3.connect(self.config.path) as conn:
+            with self._get_connection() as conn:
                 cur = conn.cursor()
                 cur.execute("SELECT 1")
                 return True
@@ -529,14 +624,18 @@ class SQLiteHandler(ConnectionHandler):
         # Log final stats
         self.log("info", f"Final SQLite handler stats: {self.stats.to_dict()}")
 
-        # 主动关闭连接
-        if hasattr(self, '_connection') and self._connection:
-            try:
-                self.log("debug", "Closing SQLite connection")
-                self._connection.close()
-                self._connection = None
-            except Exception as e:
-                self.log("warning", f"Error closing SQLite connection: {str(e)}")
+        # 主动关闭缓存的连接
+        with self._connection_lock:
+            if self._connection:
+                try:
+                    self.log("debug", "Closing SQLite connection")
+                    self._connection.close()
+                    self._connection = None
+                except Exception as e:
+                    self.log("warning", f"Error closing SQLite connection: {str(e)}")
+
+        # 停止工作线程
+        self.shutdown_executor()
 
         # 清理其他资源
         self.log("debug", "SQLite handler cleanup complete")
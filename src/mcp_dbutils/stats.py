@@ -33,6 +33,22 @@ class ResourceStats:
     slow_queries: Optional[List[Tuple[str, float]]] = None  # 慢查询记录 (SQL, 时间)
     peak_memory: int = 0  # 峰值内存使用
 
+    # Admission control
+    queue_depth: int = 0  # 当前等待执行的工具调用数
+    peak_queue_depth: int = 0
+    queue_waits: Optional[List[float]] = None  # 排队等待时间列表 (秒)
+    rejected_requests: int = 0  # 因队列已满或等待超时被拒绝的调用数
+
+    # Result cache
+    cache_hits: int = 0
+    cache_misses: int = 0
+    cache_bytes: int = 0  # 缓存结果占用的字节数
+
+    # Metadata cache
+    metadata_cache_hits: int = 0
+    metadata_cache_misses: int = 0
+    shared_cache_hits: int = 0  # 由其他进程写入共享缓存的结果满足的查找数
+
     def __post_init__(self):
         """Initialize mutable defaults"""
         if self.error_types is None:
@@ -43,6 +59,8 @@ class ResourceStats:
             self.query_types = {}
         if self.slow_queries is None:
             self.slow_queries = []
+        if self.queue_waits is None:
+            self.queue_waits = []
 
     def record_connection_start(self):
         """Record new connection start"""
@@ -79,6 +97,55 @@ class ResourceStats:
                 self.slow_queries.pop(0)
             self.slow_queries.append((sql[:100], duration))  # Truncate SQL to avoid excessive length
 
+    def record_queued(self):
+        """Record a tool call starting to wait for a free slot"""
+        self.queue_depth += 1
+        self.peak_queue_depth = max(self.peak_queue_depth, self.queue_depth)
+
+    def record_dequeued(self, wait: float, admitted: bool = True):
+        """Record a tool call leaving the wait queue
+
+        Args:
+            wait: Time spent waiting in seconds
+            admitted: False if the call gave up waiting
+        """
+        self.queue_depth = max(0, self.queue_depth - 1)
+        self.queue_waits.append(wait)
+        if not admitted:
+            self.rejected_requests += 1
+
+    def record_rejection(self):
+        """Record a tool call rejected because the wait queue is full"""
+        self.rejected_requests += 1
+
+    def record_cache_lookup(self, hit: bool, cache_bytes: int):
+        """Record a result cache lookup
+
+        Args:
+            hit: Whether the result was served from the cache
+            cache_bytes: Bytes held by the cache afterwards
+        """
+        if hit:
+            self.cache_hits += 1
+        else:
+            self.cache_misses += 1
+        self.cache_bytes = cache_bytes
+
+    def record_metadata_lookup(self, hit: bool):
+        """Record a metadata cache lookup
+
+        Args:
+            hit: Whether the metadata was served from the cache
+        """
+        if hit:
+            self.metadata_cache_hits += 1
+        else:
+            self.metadata_cache_misses += 1
+
+    def record_shared_cache_hit(self):
+        """Record a lookup answered from the cache file shared with other processes"""
+        self.shared_cache_hits += 1
+
     def record_error(self, error_type: str):
         """Record error occurrence
 
@@ -93,9 +160,16 @@ class ResourceStats:
         """Update estimated memory usage
 
         Args:
-            obj: Object to estimate size for
+            obj: Result produced; text counts its UTF-8 bytes, binary data
+                its length, other objects their size in memory
         """
-        current_memory = sys.getsizeof(obj)
+        if isinstance(obj, str):
+            # isascii无需扫描字符串，ASCII文本的字节数即长度
+            current_memory = len(obj) if obj.isascii() else len(obj.encode("utf-8"))
+        elif isinstance(obj, (bytes, bytearray)):
+            current_memory = len(obj)
+        else:
+            current_memory = sys.getsizeof(obj)
         self.estimated_memory = current_memory
         self.peak_memory = max(self.peak_memory, current_memory)
 
@@ -157,6 +231,29 @@ class ResourceStats:
             for etype, count in self.error_types.items():
                 stats.append(f"  - {etype}: {count}")
         
+        # Admission control
+        if self.queue_waits or self.rejected_requests:
+            avg_wait = sum(self.queue_waits) / len(self.queue_waits) if self.queue_waits else 0
+            max_wait = max(self.queue_waits) if self.queue_waits else 0
+            stats.append(f"Queue: depth={self.queue_depth}, peak={self.peak_queue_depth}, rejected={self.rejected_requests}")
+            stats.append(f"Queue Wait Times: avg={avg_wait*1000:.2f}ms, max={max_wait*1000:.2f}ms")
+
+        # Result cache
+        lookups = self.cache_hits + self.cache_misses
+        if lookups:
+            stats.append(
+                f"Result Cache: hits={self.cache_hits}, misses={self.cache_misses}, "
+                f"hit rate={self.cache_hits / lookups * 100:.1f}%, size={self.cache_bytes/1024:.2f}KB"
+            )
+        lookups = self.metadata_cache_hits + self.metadata_cache_misses
+        if lookups:
+            stats.append(
+                f"Metadata Cache: hits={self.metadata_cache_hits}, misses={self.metadata_cache_misses}, "
+                f"hit rate={self.metadata_cache_hits / lookups * 100:.1f}%"
+            )
+        if self.shared_cache_hits:
+            stats.append(f"Shared Cache: hits={self.shared_cache_hits}")
+
         # Resource usage
         stats.append(f"Memory Usage: current={self.estimated_memory/1024:.2f}KB, peak={self.peak_memory/1024:.2f}KB")
         stats.append(f"Connections: active={self.active_connections}, total={self.total_connections}")
@@ -191,5 +288,18 @@ class ResourceStats:
             "error_count": self.error_count,
             "error_types": self.error_types,
             "estimated_memory_bytes": self.estimated_memory,
-            "peak_memory_bytes": self.peak_memory
+            "peak_memory_bytes": self.peak_memory,
+            "queue_depth": self.queue_depth,
+            "peak_queue_depth": self.peak_queue_depth,
+            "queue_wait_ms": {
+                "avg": sum(self.queue_waits) / len(self.queue_waits) * 1000 if self.queue_waits else 0,
+                "max": max(self.queue_waits) * 1000 if self.queue_waits else 0
+            },
+            "rejected_requests": self.rejected_requests,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "cache_bytes": self.cache_bytes,
+            "metadata_cache_hits": self.metadata_cache_hits,
+            "metadata_cache_misses": self.metadata_cache_misses,
+            "shared_cache_hits": self.shared_cache_hits
         }
@@ -5,7 +5,7 @@ import tempfile
 import pytest
 import yaml
 
-from mcp_dbutils.mysql.config import MySQLConfig
+from mcp_dbutils.mysql.config import MySQLConfig, PoolConfig
 
 
 def test_basic_config():
@@ -200,3 +200,112 @@ def test_masked_connection_info():
     assert masked_info["host"] == "localhost"
     assert masked_info["port"] == "3306"
     assert masked_info["charset"] == "utf8mb4"
+
+def test_pool_config():
+    """Test MySQL pool configuration parsing"""
+    config_data = {
+        "connections": {
+            "test_mysql": {
+                "type": "mysql",
+                "host": "localhost",
+                "port": 3306,
+                "database": "test_db",
+                "user": "test_user",
+                "password": "test_pass",
+                "pool": {
+                    "mincached": 1,
+                    "maxconnections": 10,
+                    "blocking": False,
+                    "ping": 4,
+                    "connect_timeout": 3,
+                    "max_retries": 0
+                }
+            }
+        }
+    }
+
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml') as tmp:
+        yaml.dump(config_data, tmp)
+        tmp.flush()
+
+        config = MySQLConfig.from_yaml(tmp.name, "test_mysql")
+        assert config.pool.mincached == 1
+        assert config.pool.maxconnections == 10
+        assert config.pool.blocking is False
+        assert config.pool.ping == 4
+        assert config.pool.connect_timeout == 3
+        assert config.pool.max_retries == 0
+        assert config.pool.maxcached == PoolConfig().maxcached
+
+    # Defaults are used when no pool section is given
+    del config_data["connections"]["test_mysql"]["pool"]
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml') as tmp:
+        yaml.dump(config_data, tmp)
+        tmp.flush()
+
+        config = MySQLConfig.from_yaml(tmp.name, "test_mysql")
+        assert config.pool == PoolConfig()
+
+def test_invalid_pool_config():
+    """Test invalid MySQL pool configuration validation"""
+    config_data = {
+        "connections": {
+            "test_mysql": {
+                "type": "mysql",
+                "host": "localhost",
+                "port": 3306,
+                "database": "test_db",
+                "user": "test_user",
+                "password": "test_pass"
+            }
+        }
+    }
+
+    for pool, message in [
+        ("not_a_dict", "Pool configuration must be a dictionary"),
+        ({"maxcached": -1}, "Invalid pool maxcached"),
+        ({"ping": 8}, "Invalid pool ping"),
+        ({"blocking": "yes"}, "Invalid pool blocking"),
+        ({"connect_timeout": 0}, "Invalid pool connect_timeout"),
+        ({"mincached": 10, "maxconnections": 2}, "mincached cannot be greater than maxconnections"),
+    ]:
+        config_data["connections"]["test_mysql"]["pool"] = pool
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml') as tmp:
+            yaml.dump(config_data, tmp)
+            tmp.flush()
+
+            with pytest.raises(ValueError, match=message):
+                MySQLConfig.from_yaml(tmp.name, "test_mysql")
+
+def test_driver_config():
+    """Test MySQL driver selection"""
+    config_data = {
+        "connections": {
+            "test_mysql": {
+                "type": "mysql",
+                "host": "localhost",
+                "port": 3306,
+                "database": "test_db",
+                "user": "test_user",
+                "password": "test_pass"
+            }
+        }
+    }
+
+    for driver, expected in [(None, "sync"), ("sync", "sync"), ("async", "async")]:
+        if driver:
+            config_data["connections"]["test_mysql"]["driver"] = driver
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml') as tmp:
+            yaml.dump(config_data, tmp)
+            tmp.flush()
+
+            config = MySQLConfig.from_yaml(tmp.name, "test_mysql")
+            assert config.driver == expected
+
+    config_data["connections"]["test_mysql"]["driver"] = "aiomysql"
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml') as tmp:
+        yaml.dump(config_data, tmp)
+        tmp.flush()
+
+        with pytest.raises(ValueError, match="Invalid driver: aiomysql"):
+            MySQLConfig.from_yaml(tmp.name, "test_mysql")
@@ -3,7 +3,12 @@
 import pytest
 import yaml
 
-from mcp_dbutils.postgres.config import PostgreSQLConfig, SSLConfig, parse_url
+from mcp_dbutils.postgres.config import (
+    PoolConfig,
+    PostgreSQLConfig,
+    SSLConfig,
+    parse_url,
+)
 
 
 def test_parse_url():
@@ -146,6 +151,113 @@ def test_invalid_ssl_config(tmp_path):
     with pytest.raises(ValueError, match="SSL configuration must be a dictionary"):
         PostgreSQLConfig.from_yaml(str(config_file), "test_db")
 
+def test_from_yaml_with_pool_config(tmp_path):
+    """Test PostgreSQLConfig creation from YAML with pool configuration"""
+    config_data = {
+        "connections": {
+            "test_db": {
+                "type": "postgres",
+                "host": "localhost",
+                "port": 5432,
+                "dbname": "testdb",
+                "user": "test_user",
+                "password": "test_pass",
+                "pool": {
+                    "min_size": 2,
+                    "max_size": 20,
+                    "max_lifetime": 1800,
+                    "idle_timeout": None
+                }
+            }
+        }
+    }
+
+    config_file = tmp_path / "config.yaml"
+    with open(config_file, "w") as f:
+        yaml.dump(config_data, f)
+
+    config = PostgreSQLConfig.from_yaml(str(config_file), "test_db")
+    assert config.pool.min_size == 2
+    assert config.pool.max_size == 20
+    assert config.pool.max_lifetime == 1800
+    assert config.pool.idle_timeout is None
+    assert config.pool.timeout == PoolConfig().timeout
+
+    # Defaults are used when no pool section is given
+    del config_data["connections"]["test_db"]["pool"]
+    with open(config_file, "w") as f:
+        yaml.dump(config_data, f)
+
+    config = PostgreSQLConfig.from_yaml(str(config_file), "test_db")
+    assert config.pool == PoolConfig()
+
+def test_invalid_pool_config(tmp_path):
+    """Test invalid pool configuration validation"""
+    config_data = {
+        "connections": {
+            "test_db": {
+                "type": "postgres",
+                "host": "localhost",
+                "port": 5432,
+                "dbname": "testdb",
+                "user": "test_user",
+                "password": "test_pass",
+                "pool": "not_a_dict"
+            }
+        }
+    }
+    config_file = tmp_path / "config.yaml"
+
+    for pool, message in [
+        ("not_a_dict", "Pool configuration must be a dictionary"),
+        ({"max_size": 0}, "Invalid pool max_size"),
+        ({"min_size": -1}, "Invalid pool min_size"),
+        ({"min_size": 5, "max_size": 2}, "min_size cannot be greater than max_size"),
+        ({"idle_timeout": "soon"}, "Invalid pool idle_timeout"),
+    ]:
+        config_data["connections"]["test_db"]["pool"] = pool
+        with open(config_file, "w") as f:
+            yaml.dump(config_data, f)
+
+        with pytest.raises(ValueError, match=message):
+            PostgreSQLConfig.from_yaml(str(config_file), "test_db")
+
+def test_driver_config(tmp_path):
+    """Test driver selection for PostgreSQL connections"""
+    config_data = {
+        "connections": {
+            "test_db": {
+                "type": "postgres",
+                "host": "localhost",
+                "port": 5432,
+                "dbname": "testdb",
+                "user": "test_user",
+                "password": "test_pass"
+            }
+        }
+    }
+    config_file = tmp_path / "config.yaml"
+    with open(config_file, "w") as f:
+        yaml.dump(config_data, f)
+
+    # Default driver is psycopg2
+    config = PostgreSQLConfig.from_yaml(str(config_file), "test_db")
+    assert config.driver == "sync"
+
+    config_data["connections"]["test_db"]["driver"] = "async"
+    with open(config_file, "w") as f:
+        yaml.dump(config_data, f)
+
+    config = PostgreSQLConfig.from_yaml(str(config_file), "test_db")
+    assert config.driver == "async"
+
+    config_data["connections"]["test_db"]["driver"] = "threaded"
+    with open(config_file, "w") as f:
+        yaml.dump(config_data, f)
+
+    with pytest.raises(ValueError, match="Invalid driver: threaded"):
+        PostgreSQLConfig.from_yaml(str(config_file), "test_db")
+
 def test_required_fields_validation(tmp_path):
     """Test validation of required configuration fields"""
     # Missing user
@@ -1,10 +1,14 @@
 """Test SQLite configuration functionality"""
+import os
+import time
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 import yaml
 
-from mcp_dbutils.sqlite.config import SQLiteConfig, parse_jdbc_url
+from mcp_dbutils.config import ConfigStore
+from mcp_dbutils.sqlite.config import PragmaConfig, SQLiteConfig, parse_jdbc_url
 
 
 def test_parse_jdbc_url():
@@ -109,3 +113,333 @@ def test_required_fields_validation(tmp_path):
 
     with pytest.raises(ValueError, match="must include 'path' field"):
         SQLiteConfig.from_yaml(str(config_file), "test_db")
+
+def test_from_yaml_with_pragmas_and_read_only(tmp_path):
+    """Test SQLiteConfig creation from YAML with pragmas and read-only mode"""
+    config_data = {
+        "connections": {
+            "test_db": {
+                "type": "sqlite",
+                "path": "/path/to/test.db",
+                "immutable": True,
+                "pragmas": {
+                    "journal_mode": "wal",
+                    "cache_size": -2000,
+                    "mmap_size": None,
+                    "temp_store": "file"
+                }
+            }
+        }
+    }
+
+    config_file = tmp_path / "config.yaml"
+    with open(config_file, "w") as f:
+        yaml.dump(config_data, f)
+
+    config = SQLiteConfig.from_yaml(str(config_file), "test_db")
+    assert config.immutable is True
+    assert config.pragmas.journal_mode == "WAL"
+    assert config.pragmas.cache_size == -2000
+    assert config.pragmas.mmap_size is None
+    assert config.pragmas.temp_store == "FILE"
+    assert config.pragmas.busy_timeout == PragmaConfig().busy_timeout
+    assert "PRAGMA mmap_size" not in " ".join(config.pragmas.get_statements())
+
+    params = config.get_connection_params()
+    assert params["uri"] is True
+    assert params["database"].startswith("file:")
+    assert params["database"].endswith("?mode=ro&immutable=1")
+
+    # Defaults are used when no pragmas section is given
+    config_data["connections"]["test_db"] = {
+        "type": "sqlite",
+        "path": "/path/to/test.db",
+        "read_only": True
+    }
+    with open(config_file, "w") as f:
+        yaml.dump(config_data, f)
+
+    config = SQLiteConfig.from_yaml(str(config_file), "test_db")
+    assert config.pragmas == PragmaConfig()
+    assert config.get_connection_params()["database"].endswith("?mode=ro")
+
+def test_invalid_pragmas_config(tmp_path):
+    """Test invalid pragmas and read-only configuration validation"""
+    config_data = {
+        "connections": {
+            "test_db": {
+                "type": "sqlite",
+                "path": "/path/to/test.db"
+            }
+        }
+    }
+    config_file = tmp_path / "config.yaml"
+
+    for extra, message in [
+        ({"pragmas": "not_a_dict"}, "Pragmas configuration must be a dictionary"),
+        ({"pragmas": {"journal_mode": "fast"}}, "Invalid pragma journal_mode"),
+        ({"pragmas": {"temp_store": "disk"}}, "Invalid pragma temp_store"),
+        ({"pragmas": {"mmap_size": -1}}, "Invalid pragma mmap_size"),
+        ({"pragmas": {"busy_timeout": "5s"}}, "Invalid pragma busy_timeout"),
+        ({"read_only": True, "writable": True}, "cannot be writable"),
+    ]:
+        config_data["connections"]["test_db"] = {
+            "type": "sqlite",
+            "path": "/path/to/test.db",
+            **extra
+        }
+        with open(config_file, "w") as f:
+            yaml.dump(config_data, f)
+
+        with pytest.raises(ValueError, match=message):
+            SQLiteConfig.from_yaml(str(config_file), "test_db")
+
+def test_max_workers_config(tmp_path):
+    """Test max_workers parsing and validation"""
+    config_data = {
+        "connections": {
+            "test_db": {
+                "type": "sqlite",
+                "path": "/path/to/test.db",
+                "max_workers": 8
+            }
+        }
+    }
+    config_file = tmp_path / "config.yaml"
+    with open(config_file, "w") as f:
+        yaml.dump(config_data, f)
+
+    assert SQLiteConfig.from_yaml(str(config_file), "test_db").max_workers == 8
+
+    config_data["connections"]["test_db"]["max_workers"] = 0
+    with open(config_file, "w") as f:
+        yaml.dump(config_data, f)
+
+    with pytest.raises(ValueError, match="Invalid max_workers"):
+        SQLiteConfig.from_yaml(str(config_file), "test_db")
+
+def test_query_timeout_config(tmp_path):
+    """Test query_timeout parsing and validation"""
+    config_data = {
+        "connections": {
+            "test_db": {
+                "type": "sqlite",
+                "path": "/path/to/test.db"
+            }
+        }
+    }
+    config_file = tmp_path / "config.yaml"
+    with open(config_file, "w") as f:
+        yaml.dump(config_data, f)
+
+    assert SQLiteConfig.from_yaml(str(config_file), "test_db").query_timeout == 60
+
+    for value, expected in ((5.5, 5.5), (None, None)):
+        config_data["connections"]["test_db"]["query_timeout"] = value
+        with open(config_file, "w") as f:
+            yaml.dump(config_data, f)
+        assert SQLiteConfig.from_yaml(str(config_file), "test_db").query_timeout == expected
+
+    config_data["connections"]["test_db"]["query_timeout"] = -1
+    with open(config_file, "w") as f:
+        yaml.dump(config_data, f)
+
+    with pytest.raises(ValueError, match="Invalid query_timeout"):
+        SQLiteConfig.from_yaml(str(config_file), "test_db")
+
+def test_max_rows_config(tmp_path):
+    """Test max_rows parsing and validation"""
+    config_data = {
+        "connections": {
+            "test_db": {
+                "type": "sqlite",
+                "path": "/path/to/test.db"
+            }
+        }
+    }
+    config_file = tmp_path / "config.yaml"
+    for value, expected in ((None, None), (500, 500), ("absent", 10000)):
+        if value == "absent":
+            config_data["connections"]["test_db"].pop("max_rows")
+        else:
+            config_data["connections"]["test_db"]["max_rows"] = value
+        with open(config_file, "w") as f:
+            yaml.dump(config_data, f)
+        assert SQLiteConfig.from_yaml(str(config_file), "test_db").max_rows == expected
+
+    for value in (0, 2.5, True):
+        config_data["connections"]["test_db"]["max_rows"] = value
+        with open(config_file, "w") as f:
+            yaml.dump(config_data, f)
+        with pytest.raises(ValueError, match="Invalid max_rows"):
+            SQLiteConfig.from_yaml(str(config_file), "test_db")
+
+def test_result_bytes_config(tmp_path):
+    """Test max_result_bytes and max_cell_bytes parsing and validation"""
+    assert SQLiteConfig.parse_result_bytes({}) == (8 * 1024 * 1024, 8192)
+    assert SQLiteConfig.parse_result_bytes(
+        {"max_result_bytes": None, "max_cell_bytes": 100}
+    ) == (None, 100)
+
+    config_file = tmp_path / "config.yaml"
+    with open(config_file, "w") as f:
+        yaml.dump({"connections": {"test_db": {
+            "type": "sqlite", "path": "/path/to/test.db", "max_result_bytes": 4096,
+        }}}, f)
+    config = SQLiteConfig.from_yaml(str(config_file), "test_db")
+    assert (config.max_result_bytes, config.max_cell_bytes) == (4096, 8192)
+
+    for key in ("max_result_bytes", "max_cell_bytes"):
+        for value in (0, 1.5, True, "1MB"):
+            with pytest.raises(ValueError, match=f"Invalid {key}"):
+                SQLiteConfig.parse_result_bytes({key: value})
+
+def test_cache_config():
+    """Test cache parsing and validation"""
+    assert SQLiteConfig.parse_cache({}) is None
+    cache = SQLiteConfig.parse_cache({"cache": {}})
+    assert (cache.ttl, cache.max_bytes) == (60, 64 * 1024 * 1024)
+    cache = SQLiteConfig.parse_cache({"cache": {"ttl": 5, "max_bytes": 1024}})
+    assert (cache.ttl, cache.max_bytes) == (5, 1024)
+    for params, message in (
+        (True, "must be a dictionary"),
+        ({"ttl": 0}, "Invalid cache ttl"),
+        ({"max_bytes": 1.5}, "Invalid cache max_bytes"),
+    ):
+        with pytest.raises(ValueError, match=message):
+            SQLiteConfig.parse_cache({"cache": params})
+
+def test_metadata_cache_config():
+    """Test metadata_cache parsing and validation"""
+    assert SQLiteConfig.parse_metadata_cache({}) is None
+    cache = SQLiteConfig.parse_metadata_cache({"metadata_cache": {}})
+    assert (cache.ttl, cache.max_entries) == (300, 1024)
+    cache = SQLiteConfig.parse_metadata_cache({"metadata_cache": {"ttl": 30, "max_entries": 10}})
+    assert (cache.ttl, cache.max_entries) == (30, 10)
+    for params, message in (
+        ([], "must be a dictionary"),
+        ({"ttl": -1}, "Invalid metadata cache ttl"),
+        ({"max_entries": 0}, "Invalid metadata cache max_entries"),
+    ):
+        with pytest.raises(ValueError, match=message):
+            SQLiteConfig.parse_metadata_cache({"metadata_cache": params})
+
+def test_shared_cache_config():
+    """Test shared_cache parsing and validation"""
+    shared = SQLiteConfig.parse_shared_cache({"connections": {}})
+    assert (shared.directory, shared.max_bytes, shared.max_entry_bytes) == (None, 256 * 1024 * 1024, 1024 * 1024)
+    shared = SQLiteConfig.parse_shared_cache({"shared_cache": {"directory": "cache", "max_entry_bytes": 10}})
+    assert (shared.directory, shared.max_entry_bytes) == ("cache", 10)
+    for params, message in (
+        ("cache", "must be a dictionary"),
+        ({"directory": ""}, "Invalid shared cache directory"),
+        ({"directory": "cache", "max_bytes": 0}, "Invalid shared cache max_bytes"),
+    ):
+        with pytest.raises(ValueError, match=message):
+            SQLiteConfig.parse_shared_cache({"shared_cache": params})
+
+def test_exports_config():
+    """Test exports parsing and validation"""
+    assert SQLiteConfig.parse_exports({"connections": {}}).directory is None
+    assert SQLiteConfig.parse_exports({"exports": {"directory": "out"}}).directory == "out"
+    for params, message in (
+        ("out", "must be a dictionary"),
+        ({"directory": ""}, "Invalid exports directory"),
+        ({"directory": 1}, "Invalid exports directory"),
+    ):
+        with pytest.raises(ValueError, match=message):
+            SQLiteConfig.parse_exports({"exports": params})
+
+def test_health_check_config():
+    """Test health_check parsing and validation"""
+    health_check = SQLiteConfig.parse_health_check({"connections": {}})
+    assert (health_check.timeout, health_check.ttl, health_check.interval) == (5, 30, None)
+
+    health_check = SQLiteConfig.parse_health_check(
+        {"health_check": {"timeout": 2, "ttl": 0, "interval": 60}}
+    )
+    assert (health_check.timeout, health_check.ttl, health_check.interval) == (2, 0, 60)
+
+    for params, message in (
+        ({"timeout": 0}, "Invalid health_check timeout"),
+        ({"interval": -5}, "Invalid health_check interval"),
+        ("fast", "must be a dictionary"),
+    ):
+        with pytest.raises(ValueError, match=message):
+            SQLiteConfig.parse_health_check({"health_check": params})
+
+def test_cursors_config():
+    """Test cursors parsing and validation"""
+    cursors = SQLiteConfig.parse_cursors({"connections": {}})
+    assert (cursors.idle_ttl, cursors.max_open) == (300, 8)
+
+    cursors = SQLiteConfig.parse_cursors({"cursors": {"idle_ttl": 30, "max_open": 0}})
+    assert (cursors.idle_ttl, cursors.max_open) == (30, 0)
+
+    for params, message in (
+        ({"idle_ttl": 0}, "Invalid cursors idle_ttl"),
+        ({"max_open": 1.5}, "Invalid cursors max_open"),
+        ([], "must be a dictionary"),
+    ):
+        with pytest.raises(ValueError, match=message):
+            SQLiteConfig.parse_cursors({"cursors": params})
+
+def test_config_store_reload(tmp_path):
+    """Test the configuration file is parsed once and reloaded when it changes"""
+    config_file = tmp_path / "config.yaml"
+
+    def write_config(path, mtime):
+        with open(config_file, "w") as f:
+            yaml.dump({"connections": {"test_db": {"type": "sqlite", "path": path}}}, f)
+        os.utime(config_file, (mtime, mtime))
+
+    old = time.time() - 60
+    write_config("/path/to/test.db", old)
+    store = ConfigStore.for_path(str(config_file))
+    assert ConfigStore.for_path(str(config_file)) is store
+
+    with patch("yaml.safe_load", wraps=yaml.safe_load) as safe_load:
+        first = store.load()
+        assert SQLiteConfig.from_yaml(str(config_file), "test_db").path == "/path/to/test.db"
+        assert store.load() is first
+        assert safe_load.call_count == 1
+
+        write_config("/path/to/other.db", old + 1)
+        assert SQLiteConfig.from_yaml(str(config_file), "test_db").path == "/path/to/other.db"
+        assert safe_load.call_count == 2
+
+        # The previous snapshot is left untouched
+        assert first["connections"]["test_db"]["path"] == "/path/to/test.db"
+
+        # Recently modified files are parsed on every load
+        write_config("/path/to/recent.db", time.time())
+        store.load()
+        store.load()
+        assert safe_load.call_count == 4
+
+def test_config_store_reuses_built_configs(tmp_path):
+    """Test connection configurations are built once per version of the file"""
+    config_file = tmp_path / "config.yaml"
+
+    def write_config(path, mtime):
+        with open(config_file, "w") as f:
+            yaml.dump({"connections": {"test_db": {"type": "sqlite", "path": path, "max_rows": 5}}}, f)
+        os.utime(config_file, (mtime, mtime))
+
+    old = time.time() - 60
+    write_config("/path/to/test.db", old)
+
+    with patch.object(SQLiteConfig, "_from_yaml", wraps=SQLiteConfig._from_yaml) as build:
+        first = SQLiteConfig.from_yaml(str(config_file), "test_db")
+        second = SQLiteConfig.from_yaml(str(config_file), "test_db")
+        assert build.call_count == 1
+
+        # Each caller gets its own copy of the cached configuration
+        assert first is not second
+        first.max_rows = 10
+        assert second.max_rows == 5
+        assert SQLiteConfig.from_yaml(str(config_file), "test_db").max_rows == 5
+
+        write_config("/path/to/other.db", old + 1)
+        assert SQLiteConfig.from_yaml(str(config_file), "test_db").path == "/path/to/other.db"
+        assert build.call_count == 2
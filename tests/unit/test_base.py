@@ -1,6 +1,9 @@
 """Unit tests for base connection classes"""
+import asyncio
 import json
 import os
+import sqlite3
+import threading
 from contextlib import asynccontextmanager
 from unittest.mock import AsyncMock, MagicMock, mock_open, patch
 
@@ -15,11 +18,24 @@ from mcp_dbutils.base import (
     EMPTY_TABLE_NAME_ERROR,
     INVALID_URI_FORMAT_ERROR,
     SELECT_ONLY_ERROR,
+    ConcurrencyLimiter,
+    ConcurrencyLimitError,
     ConfigurationError,
     ConnectionError,
     ConnectionHandler,
+    ConnectionHandlerError,
     ConnectionServer,
+    QueryContext,
+    ResultCursor,
+    SingleFlight,
+    current_query,
+    requested_max_rows,
+    requested_timeout,
+    run_in_executor,
 )
+from mcp_dbutils.budget import TRUNCATION_MARKER, ResultBudget
+from mcp_dbutils.config import LimitsConfig
+from mcp_dbutils.stats import ResourceStats
 
 
 class MockConnectionHandler(ConnectionHandler):
@@ -199,6 +215,280 @@ class TestConnectionHandler:
         handler.send_log("error", "Test error message")
         mock_request_context.session.send_log_message.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_run_in_executor(self, handler):
+        """Test decorated methods run in the handler's worker threads"""
+        class ThreadedHandler(MockConnectionHandler):
+            @run_in_executor
+            def get_table_stats(self, table_name: str) -> str:
+                return threading.current_thread().name
+
+        threaded = ThreadedHandler("/path/to/config.yaml", "test_connection")
+        threaded.config = MagicMock(max_workers=2)
+        try:
+            thread_name = await threaded.get_table_stats("users")
+            assert thread_name.startswith("dbutils-test_connection")
+            assert threaded._executor._max_workers == 2
+
+            # Concurrent calls do not serialize on the event loop
+            barrier = threading.Barrier(2, timeout=5)
+            await asyncio.gather(
+                threaded.run_in_thread(barrier.wait),
+                threaded.run_in_thread(barrier.wait),
+            )
+        finally:
+            threaded.shutdown_executor()
+        assert threaded._executor is None
+
+    def test_resolve_query_timeout(self, handler):
+        """Test a tool call can lower but not raise the configured timeout"""
+        handler.config = MagicMock(query_timeout=10)
+        assert handler._resolve_query_timeout() == 10
+
+        for requested, expected in ((2, 2), (20, 10)):
+            token = requested_timeout.set(requested)
+            try:
+                assert handler._resolve_query_timeout() == expected
+            finally:
+                requested_timeout.reset(token)
+
+        handler.config = MagicMock(query_timeout=None)
+        assert handler._resolve_query_timeout() is None
+
+    def test_fetch_rows(self, handler):
+        """Test rows are read in batches and reading stops past max_rows"""
+        def make_fetchmany(total):
+            rows = iter(range(total))
+            requested = []
+
+            def fetchmany(size):
+                requested.append(size)
+                return [row for _, row in zip(range(size), rows)]
+            return fetchmany, requested
+
+        token = current_query.set(QueryContext(max_rows=2500))
+        try:
+            fetchmany, requested = make_fetchmany(10000)
+            rows, truncated = handler.fetch_rows(fetchmany)
+            assert (len(rows), truncated) == (2500, True)
+            assert requested == [1000, 1000, 501]
+
+            fetchmany, requested = make_fetchmany(2500)
+            rows, truncated = handler.fetch_rows(fetchmany)
+            assert (len(rows), truncated) == (2500, False)
+        finally:
+            current_query.reset(token)
+
+        # Without a row cap every row is read
+        fetchmany, requested = make_fetchmany(2500)
+        assert handler.fetch_rows(fetchmany) == (list(range(2500)), False)
+
+    def test_result_cursor_pages(self):
+        """Test pages continue where the previous one stopped without losing the look-ahead row"""
+        rows = iter(range(5))
+        closed = []
+        cursor = ResultCursor(
+            lambda size: [row for _, row in zip(range(size), rows)],
+            lambda: closed.append(True),
+            lambda: ["i"],
+        )
+
+        assert cursor.read_page(2) == [0, 1]
+        assert (cursor.columns, cursor.exhausted) == (["i"], False)
+        assert cursor.read_page(2) == [2, 3]
+        assert cursor.read_page(2) == [4]
+        assert cursor.exhausted
+        assert cursor.rows_read == 5
+
+        cursor.close()
+        assert cursor.closed and closed == [True]
+
+    def test_result_cursor_budget(self):
+        """Test rows left out by the byte budget are returned on the next page"""
+        rows = iter([("a" * 10,), ("b" * 10,), ("c" * 10,)])
+        cursor = ResultCursor(
+            lambda size: [row for _, row in zip(range(size), rows)],
+            lambda: None,
+            lambda: ["s"],
+        )
+
+        assert cursor.read_page(3, ResultBudget(max_bytes=20)) == [("a" * 10,)]
+        assert not cursor.exhausted
+        assert cursor.read_page(3, ResultBudget(max_cell_bytes=2)) == [
+            ("bb" + TRUNCATION_MARKER,), ("cc" + TRUNCATION_MARKER,)
+        ]
+        assert cursor.exhausted
+
+    def test_resolve_max_rows(self, handler):
+        """Test a tool call can lower but not raise the configured row cap"""
+        handler.config = MagicMock(max_rows=100)
+        assert handler._resolve_max_rows() == 100
+
+        token = requested_max_rows.set(10)
+        try:
+            assert handler._resolve_max_rows() == 10
+        finally:
+            requested_max_rows.reset(token)
+
+    @pytest.mark.asyncio
+    async def test_query_timeout(self, handler):
+        """Test queries the driver fails to stop are abandoned after the timeout"""
+        async def slow_query(sql):
+            await asyncio.sleep(5)
+
+        handler.config = MagicMock(query_timeout=0.05)
+        handler._execute_query = slow_query
+        with patch("mcp_dbutils.base.QUERY_TIMEOUT_GRACE", 0), \
+             pytest.raises(ConnectionHandlerError, match="exceeded the 0.05s timeout"):
+            await handler.execute_query("SELECT 1")
+
+    @pytest.mark.asyncio
+    async def test_cancel_interrupts_statement(self, handler):
+        """Test cancelling a tool call invokes the driver's canceller"""
+        started, interrupted = threading.Event(), threading.Event()
+
+        class ThreadedHandler(MockConnectionHandler):
+            @run_in_executor
+            def _execute_query(self, sql: str) -> str:
+                with self.cancel_scope(interrupted.set):
+                    started.set()
+                    interrupted.wait(timeout=5)
+                return "interrupted" if interrupted.is_set() else "finished"
+
+        threaded = ThreadedHandler("/path/to/config.yaml", "test_connection")
+        threaded.config = MagicMock(max_workers=1, query_timeout=None)
+        try:
+            task = asyncio.create_task(threaded.execute_query("SELECT 1"))
+            await asyncio.to_thread(started.wait, 5)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            assert await asyncio.to_thread(interrupted.wait, 5)
+        finally:
+            threaded.shutdown_executor()
+
+
+class TestConcurrencyLimiter:
+    """Test per-connection admission control"""
+
+    @pytest.mark.asyncio
+    async def test_queue_and_reject(self):
+        """Test calls queue in order and are rejected once the queue is full"""
+        limiter = ConcurrencyLimiter("test", LimitsConfig(max_concurrency=1, max_queue=1, queue_timeout=5))
+        stats = ResourceStats()
+        order = []
+        release = asyncio.Event()
+
+        async def call(name):
+            async with limiter.acquire(stats):
+                order.append(name)
+                await release.wait()
+
+        first = asyncio.create_task(call("first"))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(call("second"))
+        await asyncio.sleep(0)
+        assert limiter.waiting == 1
+        assert stats.queue_depth == 1
+
+        # Queue is full
+        with pytest.raises(ConcurrencyLimitError, match="Too many pending requests"):
+            async with limiter.acquire(stats):
+                pass
+
+        release.set()
+        await asyncio.gather(first, second)
+        assert order == ["first", "second"]
+        assert stats.queue_depth == 0
+        assert len(stats.queue_waits) == 1
+        assert stats.rejected_requests == 1
+
+    @pytest.mark.asyncio
+    async def test_queue_timeout(self):
+        """Test a queued call fails after queue_timeout"""
+        limiter = ConcurrencyLimiter("test", LimitsConfig(max_concurrency=1, max_queue=4, queue_timeout=0.05))
+        stats = ResourceStats()
+
+        async with limiter.acquire(stats):
+            with pytest.raises(ConcurrencyLimitError, match="Timed out after 0.05s"):
+                async with limiter.acquire(stats):
+                    pass
+
+        assert limiter.waiting == 0
+        assert stats.rejected_requests == 1
+
+        # The slot is free again
+        async with limiter.acquire(stats):
+            pass
+
+
+class TestSingleFlight:
+    """Test coalescing of identical concurrent calls"""
+
+    @pytest.mark.asyncio
+    async def test_shared_execution(self):
+        """Test concurrent calls with one key run once and share the result or error"""
+        flight = SingleFlight()
+        release = asyncio.Event()
+        calls = []
+
+        async def work(result):
+            calls.append(result)
+            await release.wait()
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        tasks = [asyncio.create_task(flight.do("a", lambda: work("first"))) for _ in range(3)]
+        tasks.append(asyncio.create_task(flight.do("b", lambda: work("other"))))
+        await asyncio.sleep(0)
+        assert "a" in flight and len(flight) == 2
+        release.set()
+        assert await asyncio.gather(*tasks) == ["first", "first", "first", "other"]
+        assert calls == ["first", "other"]
+        assert flight.shared == 2 and len(flight) == 0
+
+        # 结束后的调用重新执行，错误传给所有等待者
+        release.clear()
+        tasks = [asyncio.create_task(flight.do("a", lambda: work(ValueError("failed")))) for _ in range(2)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        assert [str(result) for result in results] == ["failed", "failed"]
+        assert len(calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_cancellation(self):
+        """Test a cancelled caller leaves the others waiting, and the last one cancels the work"""
+        flight = SingleFlight()
+        release = asyncio.Event()
+        started = []
+
+        async def work():
+            started.append(True)
+            await release.wait()
+            return "done"
+
+        first = asyncio.create_task(flight.do("a", work))
+        second = asyncio.create_task(flight.do("a", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        assert await second == "done"
+        assert first.cancelled()
+
+        release.clear()
+        only = asyncio.create_task(flight.do("a", work))
+        await asyncio.sleep(0)
+        only.cancel()
+        await asyncio.sleep(0)
+        assert "a" not in flight
+        # 取消后立即到来的调用开始新的执行
+        release.set()
+        assert await flight.do("a", work) == "done"
+        assert len(started) == 3
+
 
 class TestConnectionServer:
     """Test ConnectionServer class"""
@@ -275,7 +565,11 @@ class TestConnectionServer:
                     assert handler == mock_handler
                     mock_handler_class.assert_called_once_with("/path/to/config.yaml", "test_sqlite", True)
 
-                # Verify cleanup was called
+                # Handler is kept alive between calls
+                mock_handler.cleanup.assert_not_awaited()
+
+                # Verify cleanup is called when the server releases its handlers
+                await server.close_handlers()
                 mock_handler.cleanup.assert_awaited_once()
 
     @pytest.mark.asyncio
@@ -292,7 +586,11 @@ class TestConnectionServer:
                     assert handler == mock_handler
                     mock_handler_class.assert_called_once_with("/path/to/config.yaml", "test_postgres", True)
 
-                # Verify cleanup was called
+                # Handler is kept alive between calls
+                mock_handler.cleanup.assert_not_awaited()
+
+                # Verify cleanup is called when the server releases its handlers
+                await server.close_handlers()
                 mock_handler.cleanup.assert_awaited_once()
 
     @pytest.mark.asyncio
@@ -309,9 +607,378 @@ class TestConnectionServer:
                     assert handler == mock_handler
                     mock_handler_class.assert_called_once_with("/path/to/config.yaml", "test_mysql", True)
 
-                # Verify cleanup was called
+                # Handler is kept alive between calls
+                mock_handler.cleanup.assert_not_awaited()
+
+                # Verify cleanup is called when the server releases its handlers
+                await server.close_handlers()
                 mock_handler.cleanup.assert_awaited_once()
 
+    @pytest.mark.asyncio
+    async def test_get_handler_reuses_handler(self, server, mock_config_yaml):
+        """Test get_handler returns the same handler across calls"""
+        with patch('builtins.open', mock_open(read_data=mock_config_yaml)), \
+             patch('mcp_dbutils.sqlite.handler.SQLiteHandler') as mock_handler_class:
+                mock_handler = MagicMock()
+                mock_handler.db_type = "sqlite"
+                mock_handler.driver = "sync"
+                mock_handler.stats = MagicMock()
+                mock_handler.cleanup = AsyncMock()
+                mock_handler_class.return_value = mock_handler
+
+                async with server.get_handler("test_sqlite") as first:
+                    pass
+                async with server.get_handler("test_sqlite") as second:
+                    pass
+
+                assert first is second
+                mock_handler_class.assert_called_once()
+                assert mock_handler.stats.record_connection_start.call_count == 2
+                assert mock_handler.stats.record_connection_end.call_count == 2
+
+                await server.close_handlers()
+                mock_handler.cleanup.assert_awaited_once()
+                assert server._handlers == {}
+
+    @pytest.mark.asyncio
+    async def test_get_handler_recreates_on_config_change(self, server, mock_config_yaml):
+        """Test a changed connection gets a new handler once in-flight calls finish"""
+        with patch('mcp_dbutils.sqlite.handler.SQLiteHandler') as mock_handler_class:
+            old_handler, new_handler = MagicMock(), MagicMock()
+            for handler in (old_handler, new_handler):
+                handler.db_type = "sqlite"
+                handler.driver = "sync"
+                handler.stats = ResourceStats()
+                handler.cleanup = AsyncMock()
+            mock_handler_class.side_effect = [old_handler, new_handler]
+
+            with patch('builtins.open', mock_open(read_data=mock_config_yaml)):
+                in_flight = server.get_handler("test_sqlite")
+                assert await in_flight.__aenter__() is old_handler
+
+            changed_yaml = mock_config_yaml.replace("/path/to/test.db", "/path/to/new.db")
+            with patch('builtins.open', mock_open(read_data=changed_yaml)):
+                async with server.get_handler("test_sqlite") as handler:
+                    assert handler is new_handler
+
+            # The replaced handler is released after its last call finishes
+            old_handler.cleanup.assert_not_awaited()
+            await in_flight.__aexit__(None, None, None)
+            old_handler.cleanup.assert_awaited_once()
+            assert server._retired_handlers == []
+
+    @pytest.mark.asyncio
+    async def test_close_handlers_closes_shared_pools(self, server):
+        """Test close_handlers closes pools shared at handler class level"""
+        class PooledHandler:
+            close_pools = AsyncMock()
+            cleanup = AsyncMock()
+
+        server._handlers = {"first": PooledHandler(), "second": PooledHandler()}
+
+        await server.close_handlers()
+
+        # Each handler is cleaned up, shared pools are closed once per class
+        assert PooledHandler.cleanup.await_count == 2
+        PooledHandler.close_pools.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_get_handler_recreates_on_type_change(self, server, mock_config_yaml):
+        """Test handler is recreated when the connection type changes"""
+        stale_handler = MagicMock()
+        stale_handler.db_type = "postgres"
+        stale_handler.cleanup = AsyncMock()
+        server._handlers["test_sqlite"] = stale_handler
+
+        with patch('builtins.open', mock_open(read_data=mock_config_yaml)), \
+             patch('mcp_dbutils.sqlite.handler.SQLiteHandler') as mock_handler_class:
+                mock_handler = MagicMock()
+                mock_handler.db_type = "sqlite"
+                mock_handler.stats = MagicMock()
+                mock_handler_class.return_value = mock_handler
+
+                async with server.get_handler("test_sqlite") as handler:
+                    assert handler is mock_handler
+
+                stale_handler.cleanup.assert_awaited_once()
+                assert server._handlers["test_sqlite"] is mock_handler
+
+    @pytest.mark.asyncio
+    async def test_get_handler_limits(self, server):
+        """Test get_handler applies the connection's limits configuration"""
+        config_yaml = """
+        connections:
+          test_sqlite:
+            type: sqlite
+            path: /path/to/test.db
+            limits:
+              max_concurrency: 2
+              max_queue: 0
+        """
+        with patch('builtins.open', mock_open(read_data=config_yaml)), \
+             patch('mcp_dbutils.sqlite.handler.SQLiteHandler') as mock_handler_class:
+                mock_handler = MagicMock()
+                mock_handler.db_type = "sqlite"
+                mock_handler.driver = "sync"
+                mock_handler.stats = ResourceStats()
+                mock_handler_class.return_value = mock_handler
+
+                async with server.get_handler("test_sqlite"), server.get_handler("test_sqlite"):
+                    with pytest.raises(ConcurrencyLimitError):
+                        async with server.get_handler("test_sqlite"):
+                            pass
+
+                assert mock_handler.stats.rejected_requests == 1
+
+        invalid_yaml = config_yaml.replace("max_queue: 0", "max_queue: -1")
+        with patch('builtins.open', mock_open(read_data=invalid_yaml)), \
+             pytest.raises(ConfigurationError, match="Invalid limits max_queue"):
+                async with server.get_handler("test_sqlite"):
+                    pass
+
+    @pytest.mark.asyncio
+    async def test_list_connections_health_checks(self, server):
+        """Test status probes run concurrently, time out and are cached"""
+        config_yaml = """
+        health_check:
+          timeout: 0.2
+          ttl: 60
+        connections:
+          fast_a:
+            type: sqlite
+            path: /path/to/a.db
+          fast_b:
+            type: sqlite
+            path: /path/to/b.db
+          unreachable:
+            type: sqlite
+            path: /path/to/c.db
+        """
+        probes = []
+
+        @asynccontextmanager
+        async def fake_get_handler(connection):
+            async def test_connection():
+                probes.append(connection)
+                await asyncio.sleep(10 if connection == "unreachable" else 0.1)
+                return True
+            yield MagicMock(test_connection=test_connection)
+
+        server.get_handler = fake_get_handler
+        with patch('builtins.open', mock_open(read_data=config_yaml)):
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            result = await server._handle_list_connections(check_status=True)
+            assert loop.time() - started < 1
+
+            text = result[0].text
+            assert text.count("Status: Available") == 2
+            assert "Status: Unavailable (no response within 0.2s)" in text
+            assert sorted(probes) == ["fast_a", "fast_b", "unreachable"]
+
+            # Results are reused within the TTL
+            assert (await server._handle_list_connections(check_status=True))[0].text == text
+            assert len(probes) == 3
+
+        # A configuration change invalidates the cached status
+        with patch('builtins.open', mock_open(read_data=config_yaml.replace("a.db", "d.db"))):
+            await server._handle_list_connections(check_status=True)
+            assert probes[3:] == ["fast_a"]
+
+    @pytest.mark.asyncio
+    async def test_background_health_checks(self, server):
+        """Test the background task refreshes the status cache"""
+        config_yaml = """
+        health_check:
+          interval: 0.05
+        connections:
+          test_sqlite:
+            type: sqlite
+            path: /path/to/test.db
+        """
+        server._probe_connection = AsyncMock(return_value="Available")
+        with patch('builtins.open', mock_open(read_data=config_yaml)):
+            server._start_health_checks()
+            try:
+                await asyncio.sleep(0.2)
+            finally:
+                await server._stop_health_checks()
+
+        assert server._probe_connection.await_count >= 2
+        assert server._health_cache["test_sqlite"][2] == "Available"
+        assert server._health_task is None
+
+    @pytest.mark.asyncio
+    async def test_run_query_argument_validation(self, server):
+        """Test run-query rejects invalid per-call limits and formats"""
+        for kwargs, message in (
+            ({"timeout": 0}, "Invalid timeout"),
+            ({"max_rows": 1.5}, "Invalid max_rows"),
+            ({"result_format": "xml"}, "Invalid format"),
+        ):
+            with pytest.raises(ConfigurationError, match=message):
+                await server._handle_run_query("test_sqlite", "SELECT 1", **kwargs)
+
+    def test_coalesce_key(self, server):
+        """Test only read-only calls without a cursor of their own are coalesced"""
+        key = server._coalesce_key("dbutils-describe-table", {"table": "users", "connection": "db"})
+        assert key == server._coalesce_key("dbutils-describe-table", {"connection": "db", "table": "users"})
+        assert key != server._coalesce_key("dbutils-describe-table", {"connection": "db", "table": "orders"})
+        assert server._coalesce_key("dbutils-run-query", {"connection": "db", "sql": "SELECT 1"}) is not None
+        assert server._coalesce_key("dbutils-run-query", {"connection": "db", "sql": "SELECT 1", "page_size": 10, "key": "id"}) is not None
+        assert server._coalesce_key("dbutils-run-query", {"connection": "db", "sql": "SELECT 1", "page_size": 10}) is None
+        assert server._coalesce_key("dbutils-execute-write", {"connection": "db", "sql": "DELETE FROM t"}) is None
+        assert server._coalesce_key("dbutils-fetch-more", {"connection": "db", "token": "t"}) is None
+
+    @pytest.mark.asyncio
+    async def test_paged_query(self, tmp_path):
+        """Test run-query pages are continued by dbutils-fetch-more and cursors are released"""
+        db_path = tmp_path / "paging.db"
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE t (i INTEGER)")
+        conn.executemany("INSERT INTO t VALUES (?)", [(i,) for i in range(5)])
+        conn.commit()
+        conn.close()
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text(yaml.safe_dump({
+            "cursors": {"max_open": 1},
+            "connections": {"db": {"type": "sqlite", "path": str(db_path)}},
+        }))
+        server = ConnectionServer(str(config_path))
+        sql = "SELECT i FROM t ORDER BY i"
+
+        try:
+            page = json.loads((await server._handle_run_query(
+                "db", sql, result_format="columnar", page_size=2
+            ))[0].text)
+            assert page["rows"] == [[0], [1]]
+            first_token = page["next_token"]
+
+            page = json.loads((await server._handle_fetch_more("db", first_token))[0].text)
+            assert page["rows"] == [[2], [3]]
+
+            # 令牌只能使用一次
+            with pytest.raises(ConfigurationError, match="expired continuation token"):
+                await server._handle_fetch_more("db", first_token)
+
+            page = json.loads((await server._handle_fetch_more("db", page["next_token"], 5))[0].text)
+            assert page["rows"] == [[4]]
+            assert "next_token" not in page
+            assert server._cursors == {}
+
+            # 打开的游标达到上限时关闭最久未读取的游标
+            first, second = [
+                json.loads((await server._handle_run_query(
+                    "db", sql, result_format="json", page_size=1
+                ))[0].text)
+                for _ in range(2)
+            ]
+            assert len(server._cursors) == 1
+            with pytest.raises(ConfigurationError, match="expired continuation token"):
+                await server._handle_fetch_more("db", first["next_token"])
+
+            # 空闲超过idle_ttl的游标被关闭
+            paged = next(iter(server._cursors.values()))
+            paged.last_used -= 3600
+            await server._expire_cursors()
+            assert server._cursors == {}
+            with pytest.raises(ConfigurationError, match="expired continuation token"):
+                await server._handle_fetch_more("db", second["next_token"])
+            assert server._handler_users.get(paged.handler, 0) == 0
+        finally:
+            await server.close_handlers()
+
+    @pytest.mark.asyncio
+    async def test_export_query(self, tmp_path):
+        """Test export-query writes the whole result to a file and reports it"""
+        db_path = tmp_path / "export.db"
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE t (i INTEGER, s TEXT)")
+        conn.executemany("INSERT INTO t VALUES (?, ?)", [(i, "x" * 10000) for i in range(2500)])
+        conn.commit()
+        conn.close()
+        config_path = tmp_path / "config.yaml"
+        config = {
+            "connections": {"db": {"type": "sqlite", "path": str(db_path), "max_rows": 10}},
+        }
+        config_path.write_text(yaml.safe_dump(config))
+        server = ConnectionServer(str(config_path))
+        sql = "SELECT i, s FROM t ORDER BY i;"
+
+        try:
+            with pytest.raises(ConfigurationError, match="exports.directory is not set"):
+                await server._handle_export_query("db", sql)
+
+            # 相对路径以配置文件所在目录为基准
+            config["exports"] = {"directory": "exports"}
+            config_path.write_text(yaml.safe_dump(config))
+            result = json.loads((await server._handle_export_query(
+                "db", sql, "jsonl", "t"
+            ))[0].text)
+            path = tmp_path / "exports" / "t.jsonl"
+            assert result["path"] == str(path)
+            assert result["format"] == "jsonl"
+            # max_rows和结果字节数限制不适用于导出
+            assert result["row_count"] == 2500
+            assert result["bytes"] == path.stat().st_size
+            with open(path, encoding="utf-8") as f:
+                lines = f.read().splitlines()
+            assert len(lines) == 2500
+            assert json.loads(lines[-1]) == {"i": 2499, "s": "x" * 10000}
+
+            with pytest.raises(ConfigurationError, match="already exists"):
+                await server._handle_export_query("db", sql, "jsonl", "t")
+            with pytest.raises(ConfigurationError, match="Invalid filename"):
+                await server._handle_export_query("db", sql, "csv", "../t")
+            with pytest.raises(ConfigurationError, match="Invalid format"):
+                await server._handle_export_query("db", sql, "xml")
+
+            with pytest.raises(ConnectionHandlerError):
+                await server._handle_export_query("db", "SELECT missing FROM t", "csv", "failed")
+            assert sorted(os.listdir(tmp_path / "exports")) == ["t.jsonl"]
+        finally:
+            await server.close_handlers()
+
+    @pytest.mark.asyncio
+    async def test_keyset_query(self, tmp_path):
+        """Test run-query pages through a result in key order without keeping a cursor"""
+        db_path = tmp_path / "keyset.db"
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE t (a INTEGER, b TEXT)")
+        conn.executemany("INSERT INTO t VALUES (?, ?)", [(i // 2, f"it's {i}") for i in range(5)])
+        conn.commit()
+        conn.close()
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text(yaml.safe_dump({
+            "connections": {"db": {"type": "sqlite", "path": str(db_path)}},
+        }))
+        server = ConnectionServer(str(config_path))
+        sql = "SELECT a, b FROM t -- 行注释"
+
+        try:
+            rows, after = [], None
+            for _ in range(3):
+                page = json.loads((await server._handle_run_query(
+                    "db", sql, result_format="columnar", page_size=2, key=["a", "b"], after=after
+                ))[0].text)
+                rows.extend(page["rows"])
+                assert page["truncated"] is False
+                after = page.get("next_after")
+            assert after is None
+            assert rows == [[i // 2, f"it's {i}"] for i in range(5)]
+            assert server._cursors == {}
+
+            with pytest.raises(ConfigurationError, match="requires page_size"):
+                await server._handle_run_query("db", sql, key="a")
+            with pytest.raises(ConfigurationError, match="after requires key"):
+                await server._handle_run_query("db", sql, page_size=2, after="WzFd")
+            with pytest.raises(ConfigurationError, match="Invalid key"):
+                await server._handle_run_query("db", sql, page_size=2, key="a; DROP")
+            with pytest.raises(ConfigurationError, match="Invalid after token"):
+                await server._handle_run_query("db", sql, page_size=2, key="a", after="!!")
+        finally:
+            await server.close_handlers()
+
     @pytest.mark.asyncio
     async def test_get_handler_errors(self, server, mock_config_yaml):
         """Test get_handler with various error conditions"""
@@ -98,8 +98,10 @@ class TestBaseHelpers:
                 assert handler._session == "test_session"
                 assert handler.stats.record_connection_start.called
         
-        # Check cleanup is called
+        # Handler is kept for reuse, cleanup happens when handlers are closed
         assert mock_handler.stats.record_connection_end.called
+        assert not mock_handler.cleanup.called
+        await server.close_handlers()
         assert mock_handler.cleanup.called
 
     @patch('mcp_dbutils.sqlite.handler.SQLiteHandler')
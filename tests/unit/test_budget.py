@@ -0,0 +1,59 @@
+"""Unit tests for the byte budget of query results"""
+
+from mcp_dbutils.budget import (
+    CELL_OVERHEAD,
+    FIXED_CELL_BYTES,
+    TRUNCATION_MARKER,
+    ResultBudget,
+    cell_size,
+    truncate_cell,
+)
+
+
+class TestResultBudget:
+    """Test cell previews and result byte limits"""
+
+    def test_cell_size(self):
+        """Test text is measured in UTF-8 bytes and binary values by length"""
+        assert cell_size("abc") == 3
+        assert cell_size("é") == 2
+        assert cell_size(memoryview(b"abcd")) == 4
+        assert cell_size(12) == FIXED_CELL_BYTES
+        assert cell_size({"a": 1}) == len("{'a': 1}")
+
+    def test_truncate_cell(self):
+        """Test previews keep the leading bytes without splitting characters"""
+        assert truncate_cell("abcdef", 3) == "abc" + TRUNCATION_MARKER
+        assert truncate_cell("éé", 3) == "é" + TRUNCATION_MARKER
+        assert truncate_cell(bytearray(b"abcdef"), 2) == b"ab"
+
+    def test_long_cells(self):
+        """Test long cells are cut and recorded with their original size"""
+        budget = ResultBudget(max_cell_bytes=4)
+        rows = budget.admit([(1, "short", None), (2, "ok", b"123456")])
+        assert rows == [(1, "shor" + TRUNCATION_MARKER, None), (2, "ok", b"1234")]
+        assert budget.admit([(3, "x" * 10, None)]) == [(3, "xxxx" + TRUNCATION_MARKER, None)]
+        assert budget.report(["id", "name", "data"]) == {
+            "truncated_cells": [
+                {"row": 0, "column": "name", "bytes": 5},
+                {"row": 1, "column": "data", "bytes": 6},
+                {"row": 2, "column": "name", "bytes": 10},
+            ]
+        }
+
+    def test_result_bytes(self):
+        """Test reading stops before the first row past the budget"""
+        row_size = 2 * CELL_OVERHEAD + FIXED_CELL_BYTES + 10
+        budget = ResultBudget(max_bytes=row_size * 3)
+        batch = [(i, "x" * 10) for i in range(2)]
+        assert budget.admit(batch) == batch
+        assert budget.admit(batch) == batch[:1]
+        assert budget.exhausted and budget.used == row_size * 3
+        assert budget.admit(batch) == []
+        assert budget.report(["id", "name"]) == {"truncated_reason": "max_result_bytes"}
+
+    def test_first_row_always_returned(self):
+        """Test a first row larger than the budget is still returned"""
+        budget = ResultBudget(max_bytes=10)
+        assert budget.admit([("x" * 100,), ("y",)]) == [("x" * 100,)]
+        assert budget.exhausted
@@ -0,0 +1,98 @@
+"""Unit tests for the read query result and metadata caches"""
+
+from unittest.mock import patch
+
+from mcp_dbutils.cache import MetadataCache, ResultCache, normalize_sql, table_key
+
+
+class TestResultCache:
+    """Test keys, LRU eviction, expiry and invalidation"""
+
+    def test_normalize_sql(self):
+        """Test whitespace is collapsed outside quotes only"""
+        assert normalize_sql("SELECT  *\n FROM t\tWHERE s = 'a  b';") == "SELECT * FROM t WHERE s = 'a  b'"
+        assert normalize_sql('SELECT "x  y" FROM t') == 'SELECT "x  y" FROM t'
+        assert ResultCache.make_key("SELECT 1 ", "json") == ResultCache.make_key("SELECT\n1;", "json")
+
+    def test_table_key(self):
+        """Test written table names are reduced to their unqualified name"""
+        assert table_key("PUBLIC.USERS") == "users"
+        assert table_key('"Orders"') == "orders"
+        assert table_key("ITEMS(ID,") == "items"
+        assert table_key("unknown_table") is None
+
+    def test_lru_eviction(self):
+        """Test the least recently used entries are evicted past max_bytes"""
+        cache = ResultCache(ttl=60, max_bytes=10)
+        cache.put(("a",), "1234", 0)
+        cache.put(("b",), "1234", 0)
+        assert cache.get(("a",)) == "1234"
+        cache.put(("c",), "1234", 0)
+        assert cache.get(("b",)) is None
+        assert (len(cache), cache.size, cache.evictions) == (2, 8, 1)
+
+        # 超过上限的结果不缓存
+        cache.put(("d",), "x" * 11, 0)
+        assert cache.get(("d",)) is None and len(cache) == 2
+
+    def test_expiry(self):
+        """Test entries expire after ttl"""
+        cache = ResultCache(ttl=5, max_bytes=100)
+        with patch("mcp_dbutils.cache.time.monotonic", return_value=100):
+            cache.put(("a",), "result", 0)
+        with patch("mcp_dbutils.cache.time.monotonic", return_value=104):
+            assert cache.get(("a",)) == "result"
+        with patch("mcp_dbutils.cache.time.monotonic", return_value=105):
+            assert cache.get(("a",)) is None
+        assert cache.size == 0
+
+    def test_invalidate(self):
+        """Test writes drop entries mentioning the table and block concurrent queries"""
+        cache = ResultCache(ttl=60, max_bytes=100)
+        cache.put(ResultCache.make_key("SELECT * FROM users u JOIN orders o ON o.uid = u.id"), "1", 0)
+        cache.put(ResultCache.make_key('SELECT * FROM "Items"'), "2", 0)
+        generation = cache.generation
+
+        cache.invalidate("ORDERS")
+        assert len(cache) == 1
+        cache.invalidate("main.items")
+        assert len(cache) == 0
+
+        # 查询期间发生写入时结果不缓存
+        cache.put(ResultCache.make_key("SELECT 1"), "1", generation)
+        assert len(cache) == 0
+        cache.put(ResultCache.make_key("SELECT 1"), "1", cache.generation)
+        cache.invalidate("unknown_table")
+        assert len(cache) == 0
+
+
+class TestMetadataCache:
+    """Test schema version validation, expiry and eviction"""
+
+    def test_version(self):
+        """Test a new schema version drops every entry"""
+        cache = MetadataCache(ttl=60, max_entries=10)
+        cache.put(("get_tables",), ["users"], 1)
+        cache.put(("get_schema", "users"), "id", 1)
+        assert cache.get(("get_schema", "users"), 1).value == "id"
+        assert cache.get(("get_tables",), 2) is None
+        assert len(cache) == 0
+
+        # 加载期间版本变化时，按旧版本缓存的值在下次读取时丢弃
+        cache.put(("get_tables",), ["users"], 2)
+        cache.put(("get_schema", "users"), "id", 3)
+        assert cache.get(("get_tables",), 3) is None
+        assert cache.get(("get_schema", "users"), 3).value == "id"
+
+    def test_expiry_and_eviction(self):
+        """Test entries expire after ttl and the least recently used is evicted"""
+        cache = MetadataCache(ttl=5, max_entries=2)
+        with patch("mcp_dbutils.cache.time.monotonic", return_value=100):
+            cache.put(("a",), [], None)
+            cache.put(("b",), "", None)
+            assert cache.get(("a",), None).value == []
+            cache.put(("c",), "c", None)
+            assert cache.get(("b",), None) is None
+        with patch("mcp_dbutils.cache.time.monotonic", return_value=105):
+            assert cache.get(("a",), None) is None
+        assert len(cache) == 1
@@ -0,0 +1,79 @@
+"""Unit tests for the daemon serving MCP clients over a Unix domain socket"""
+
+import asyncio
+import os
+import sqlite3
+import stat
+
+import pytest
+from mcp import ClientSession
+
+from mcp_dbutils.base import ConnectionServer
+from mcp_dbutils.daemon import DaemonLock, default_socket_path, socket_transport
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    """Configuration with one SQLite connection"""
+    db_path = tmp_path / "test.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE items (id INTEGER)")
+    conn.commit()
+    conn.close()
+    path = tmp_path / "config.yaml"
+    path.write_text(f"connections:\n  local:\n    type: sqlite\n    path: {db_path}\n")
+    return str(path)
+
+
+async def list_tables(socket_path):
+    """Run one client session listing the tables of the local connection"""
+    reader, writer = await asyncio.open_unix_connection(socket_path)
+    try:
+        async with socket_transport(reader, writer) as (read_stream, write_stream), \
+                ClientSession(read_stream, write_stream) as session:
+            await session.initialize()
+            result = await session.call_tool("dbutils-list-tables", {"connection": "local"})
+            return result.content[0].text
+    finally:
+        writer.close()
+
+
+class TestDaemon:
+    """Test clients share the daemon's handlers"""
+
+    def test_default_socket_path(self, tmp_path, monkeypatch):
+        """Test each configuration file gets its own socket in a per-user directory"""
+        monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+        path = default_socket_path("config.yaml")
+        assert path == default_socket_path(os.path.abspath("config.yaml"))
+        assert path != default_socket_path("other.yaml")
+        assert os.path.dirname(path) == str(tmp_path / f"mcp-dbutils-{os.getuid()}")
+
+    @pytest.mark.asyncio
+    async def test_clients_share_handlers(self, config_path, tmp_path):
+        """Test consecutive clients are served by one handler that outlives them"""
+        socket_path = str(tmp_path / "run" / "daemon.sock")
+        server = ConnectionServer(config_path)
+        task = asyncio.create_task(server.run_daemon(socket_path))
+        try:
+            for _ in range(100):
+                if os.path.exists(socket_path):
+                    break
+                await asyncio.sleep(0.02)
+            assert stat.S_IMODE(os.stat(socket_path).st_mode) == 0o600
+
+            # 已有守护进程时不能再启动第二个
+            with pytest.raises(RuntimeError, match="already serving"):
+                DaemonLock(socket_path).acquire()
+
+            assert "items schema" in await list_tables(socket_path)
+            handler = server._handlers["local"]
+            results = await asyncio.gather(list_tables(socket_path), list_tables(socket_path))
+            assert all("items schema" in result for result in results)
+            assert server._handlers["local"] is handler
+        finally:
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+        assert not os.path.exists(socket_path)
+        assert server._handlers == {}
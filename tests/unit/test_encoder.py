@@ -0,0 +1,109 @@
+"""Unit tests for query result encoding"""
+
+import datetime
+import decimal
+import json
+import uuid
+
+import pytest
+
+from mcp_dbutils.encoder import (
+    JSONResultEncoder,
+    adapt_value,
+    encode_result,
+    parse_result_format,
+)
+
+
+class TestAdaptValue:
+    """Test conversion of driver values to JSON-compatible values"""
+
+    @pytest.mark.parametrize("value, expected", [
+        (decimal.Decimal("12.50"), "12.50"),
+        (datetime.datetime(2024, 5, 1, 8, 30, tzinfo=datetime.timezone.utc), "2024-05-01T08:30:00+00:00"),
+        (datetime.date(2024, 5, 1), "2024-05-01"),
+        (datetime.time(8, 30), "08:30:00"),
+        (datetime.timedelta(hours=1, seconds=5), "1:00:05"),
+        (uuid.UUID(int=255), "00000000-0000-0000-0000-0000000000ff"),
+        (b"\x00\xff", "AP8="),
+        (memoryview(b"ab"), "YWI="),
+        (2**53 - 1, 2**53 - 1),
+        (-2**60, "-1152921504606846976"),
+        (float("inf"), "inf"),
+        (1.5, 1.5),
+        (None, None),
+    ])
+    def test_adapters(self, value, expected):
+        """Test each supported type is converted losslessly"""
+        assert adapt_value(value) == expected
+
+    def test_unknown_type(self):
+        """Test unknown types fall back to their string form"""
+        class Point:
+            def __str__(self):
+                return "(1,2)"
+
+        assert adapt_value(Point()) == "(1,2)"
+
+
+class TestEncodeResult:
+    """Test JSON result encoding"""
+
+    def test_encode_result(self):
+        """Test rows are encoded as JSON objects with typed values"""
+        result = json.loads(encode_result(
+            ["id", "price", "tags"],
+            [(1, decimal.Decimal("9.99"), ["a", decimal.Decimal("1")]), (2**60, None, None)],
+            truncated=True,
+        ))
+
+        assert result == {
+            "columns": ["id", "price", "tags"],
+            "rows": [
+                {"id": 1, "price": "9.99", "tags": ["a", "1"]},
+                {"id": "1152921504606846976", "price": None, "tags": None},
+            ],
+            "row_count": 2,
+            "truncated": True,
+        }
+
+    def test_dict_rows_and_batches(self):
+        """Test dictionary rows and several batches produce one array"""
+        encoder = JSONResultEncoder(["id"])
+        encoder.add_batch([{"id": 1}, {"id": 2}])
+        encoder.add_batch([])
+        encoder.add_batch([{"id": 3}])
+
+        result = json.loads(encoder.finish())
+        assert result["rows"] == [{"id": 1}, {"id": 2}, {"id": 3}]
+        assert result["row_count"] == 3
+
+    def test_dict_rows_adapted(self):
+        """Test only the columns that need it are converted in dictionary rows"""
+        rows = [{"id": 1, "day": datetime.date(2025, 1, 31)}, {"id": 2, "day": None}]
+
+        result = json.loads(encode_result(["id", "day"], rows))
+        assert result["rows"] == [{"id": 1, "day": "2025-01-31"}, {"id": 2, "day": None}]
+
+    def test_columnar(self):
+        """Test columnar mode writes tuple and dictionary rows as arrays"""
+        result = json.loads(encode_result(["id", "day"], [(1, datetime.date(2025, 1, 31))], columnar=True))
+        assert result["rows"] == [[1, "2025-01-31"]]
+
+        encoder = JSONResultEncoder(["id", "name"], columnar=True)
+        encoder.add_batch([{"name": "a", "id": 1}])
+        assert json.loads(encoder.finish())["rows"] == [[1, "a"]]
+
+    def test_empty_result(self):
+        """Test an empty result is valid JSON"""
+        assert json.loads(encode_result(["id"], [])) == {
+            "columns": ["id"], "rows": [], "row_count": 0, "truncated": False
+        }
+
+    def test_parse_result_format(self):
+        """Test format validation"""
+        assert parse_result_format(None) == "text"
+        assert parse_result_format("json") == "json"
+        assert parse_result_format("columnar") == "columnar"
+        with pytest.raises(ValueError, match="Invalid format: xml"):
+            parse_result_format("xml")
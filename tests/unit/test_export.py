@@ -0,0 +1,122 @@
+"""Unit tests for exporting query results to files"""
+
+import csv
+import datetime
+import decimal
+import json
+import os
+
+import pytest
+
+from mcp_dbutils.export import (
+    PARTIAL_SUFFIX,
+    open_export,
+    parse_export_format,
+    resolve_export_path,
+)
+
+COLUMNS = ["id", "price", "created", "tags", "note"]
+ROWS = [
+    (1, decimal.Decimal("9.99"), datetime.date(2025, 1, 31), ["a", "b"], "line\nbreak, \"quoted\""),
+    (2, None, None, None, None),
+]
+
+
+class TestExportWriters:
+    """Test each file format and the temporary file handling"""
+
+    def test_csv(self, tmp_path):
+        """Test CSV files have a header and quote values as needed"""
+        path = str(tmp_path / "out.csv")
+        writer = open_export(path, "csv")
+        writer.write(COLUMNS, ROWS[:1])
+        writer.write(COLUMNS, ROWS[1:])
+        assert os.path.exists(path + PARTIAL_SUFFIX) and not os.path.exists(path)
+        assert writer.commit() == os.path.getsize(path)
+
+        with open(path, newline="", encoding="utf-8") as f:
+            assert list(csv.reader(f)) == [
+                COLUMNS,
+                ["1", "9.99", "2025-01-31", '["a", "b"]', "line\nbreak, \"quoted\""],
+                ["2", "", "", "", ""],
+            ]
+        assert writer.row_count == 2
+        assert not os.path.exists(path + PARTIAL_SUFFIX)
+
+    def test_jsonl(self, tmp_path):
+        """Test JSON Lines files hold one object per row"""
+        path = str(tmp_path / "out.jsonl")
+        writer = open_export(path, "jsonl")
+        writer.write(COLUMNS, ROWS)
+        writer.commit()
+
+        with open(path, encoding="utf-8") as f:
+            lines = [json.loads(line) for line in f]
+        assert lines[0] == {
+            "id": 1, "price": "9.99", "created": "2025-01-31", "tags": ["a", "b"], "note": ROWS[0][4],
+        }
+        assert lines[1] == dict.fromkeys(COLUMNS, None) | {"id": 2}
+
+    def test_parquet(self, tmp_path):
+        """Test Parquet files keep column types across batches"""
+        pq = pytest.importorskip("pyarrow.parquet")
+        path = str(tmp_path / "out.parquet")
+        writer = open_export(path, "parquet")
+        writer.write(["id", "name"], [(1, "a")])
+        writer.write(["id", "name"], [(2, None)])
+        writer.commit()
+
+        table = pq.read_table(path)
+        assert table.column_names == ["id", "name"]
+        assert table.to_pylist() == [{"id": 1, "name": "a"}, {"id": 2, "name": None}]
+
+    def test_empty_result(self, tmp_path):
+        """Test an empty result still writes the header"""
+        path = str(tmp_path / "empty.csv")
+        writer = open_export(path, "csv")
+        writer.write(["id"], [])
+        writer.commit()
+        with open(path, newline="", encoding="utf-8") as f:
+            assert f.read() == "id\r\n"
+
+    def test_discard(self, tmp_path):
+        """Test a failed export leaves no file behind"""
+        path = str(tmp_path / "failed.csv")
+        writer = open_export(path, "csv")
+        writer.write(["id"], [(1,)])
+        writer.discard()
+        assert os.listdir(tmp_path) == []
+
+
+class TestExportPath:
+    """Test the choice of export files"""
+
+    def test_generated_name(self, tmp_path):
+        """Test generated names use the connection name and the format"""
+        path = resolve_export_path(str(tmp_path), None, "jsonl", "my db/1")
+        assert os.path.dirname(path) == os.path.realpath(tmp_path)
+        assert os.path.basename(path).startswith("my_db_1-")
+        assert path.endswith(".jsonl")
+
+    def test_requested_name(self, tmp_path):
+        """Test requested names get the format's extension and may use subdirectories"""
+        path = resolve_export_path(str(tmp_path), "daily/orders", "csv", "db")
+        assert path == os.path.join(os.path.realpath(tmp_path), "daily", "orders.csv")
+        assert os.path.isdir(tmp_path / "daily")
+
+    def test_invalid_name(self, tmp_path):
+        """Test names leaving the export directory or naming existing files are rejected"""
+        (tmp_path / "exists.csv").write_text("")
+        os.symlink("/tmp", tmp_path / "link")
+        for filename in ["../escape", "/etc/passwd", "link/out", ""]:
+            with pytest.raises(ValueError, match="Invalid filename"):
+                resolve_export_path(str(tmp_path), filename, "csv", "db")
+        with pytest.raises(ValueError, match="already exists"):
+            resolve_export_path(str(tmp_path), "exists", "csv", "db")
+
+    def test_format(self):
+        """Test export formats are validated"""
+        assert parse_export_format(None) == "csv"
+        assert parse_export_format("parquet") == "parquet"
+        with pytest.raises(ValueError, match="Invalid format"):
+            parse_export_format("xlsx")
@@ -1,7 +1,7 @@
 """Test the module initialization and command line entry point"""
 import os
 import sys
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 import yaml
@@ -38,7 +38,7 @@ class TestInit:
         # Setup mocks
         mock_logger = MagicMock()
         mock_create_logger.return_value = mock_logger
-        mock_parse_args.return_value = MagicMock(config=mock_config_file, local_host=None)
+        mock_parse_args.return_value = MagicMock(config=mock_config_file, local_host=None, command=None, connect_daemon=False, socket=None)
         mock_server_instance = MagicMock()
         mock_server.return_value = mock_server_instance
 
@@ -59,7 +59,7 @@ class TestInit:
         # Setup mocks
         mock_logger = MagicMock()
         mock_create_logger.return_value = mock_logger
-        mock_parse_args.return_value = MagicMock(config=mock_config_file, local_host=None)
+        mock_parse_args.return_value = MagicMock(config=mock_config_file, local_host=None, command=None, connect_daemon=False, socket=None)
         mock_server_instance = MagicMock()
         mock_server.return_value = mock_server_instance
 
@@ -85,7 +85,7 @@ class TestInit:
         # Setup mocks
         mock_logger = MagicMock()
         mock_create_logger.return_value = mock_logger
-        mock_parse_args.return_value = MagicMock(config=str(invalid_config_file), local_host=None)
+        mock_parse_args.return_value = MagicMock(config=str(invalid_config_file), local_host=None, command=None, connect_daemon=False, socket=None)
 
         # Run the function and expect exit
         with patch.object(sys, 'exit') as mock_exit:
@@ -107,7 +107,7 @@ class TestInit:
         # Setup mocks
         mock_logger = MagicMock()
         mock_create_logger.return_value = mock_logger
-        mock_parse_args.return_value = MagicMock(config=str(empty_config_file), local_host=None)
+        mock_parse_args.return_value = MagicMock(config=str(empty_config_file), local_host=None, command=None, connect_daemon=False, socket=None)
 
         # Run the function and expect exit
         with patch.object(sys, 'exit') as mock_exit:
@@ -123,7 +123,7 @@ class TestInit:
         # Setup mocks
         mock_logger = MagicMock()
         mock_create_logger.return_value = mock_logger
-        mock_parse_args.return_value = MagicMock(config=mock_config_file, local_host=None)
+        mock_parse_args.return_value = MagicMock(config=mock_config_file, local_host=None, command=None, connect_daemon=False, socket=None)
         mock_server_instance = MagicMock()
         mock_server_instance.run.side_effect = Exception("Test exception")
         mock_server.return_value = mock_server_instance
@@ -134,6 +134,31 @@ class TestInit:
                 await run_server()
             mock_exit.assert_called_once_with(1)
 
+    @pytest.mark.asyncio
+    @patch("mcp_dbutils.ConnectionServer")
+    @patch("argparse.ArgumentParser.parse_args")
+    @patch("mcp_dbutils.create_logger")
+    async def test_run_server_without_unix_sockets(self, mock_create_logger, mock_parse_args, mock_server, mock_config_file, monkeypatch):
+        """Test stdio mode starts on platforms without Unix domain sockets, daemon mode does not"""
+        monkeypatch.delattr(os, "getuid")
+        mock_logger = MagicMock()
+        mock_create_logger.return_value = mock_logger
+        mock_server_instance = MagicMock()
+        mock_server_instance.run = AsyncMock()
+        mock_server.return_value = mock_server_instance
+
+        mock_parse_args.return_value = MagicMock(config=mock_config_file, local_host=None, command=None, connect_daemon=False, socket=None)
+        await run_server()
+        mock_server_instance.run.assert_awaited_once()
+
+        mock_parse_args.return_value = MagicMock(config=mock_config_file, local_host=None, command=None, connect_daemon=True, socket=None)
+        with patch.object(sys, 'exit') as mock_exit:
+            await run_server()
+        mock_exit.assert_called_once_with(1)
+        mock_logger.assert_any_call(
+            "error", "Daemon mode requires Unix domain sockets, which are not available on this platform"
+        )
+
     @patch("mcp_dbutils.asyncio.run")
     def test_main(self, mock_run):
         """Test the main function"""
@@ -0,0 +1,232 @@
+"""Unit tests for aiomysql-based MySQL connection handler"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, call, patch
+
+import pytest
+
+aiomysql = pytest.importorskip("aiomysql")
+
+from mcp_dbutils.base import ConnectionHandlerError, QueryContext, current_query  # noqa: E402
+from mcp_dbutils.mysql.async_handler import AsyncMySQLHandler  # noqa: E402
+
+
+def async_context(value):
+    """Create an async context manager yielding value"""
+    context = MagicMock()
+    context.__aenter__ = AsyncMock(return_value=value)
+    context.__aexit__ = AsyncMock(return_value=False)
+    return context
+
+
+class TestAsyncMySQLHandler:
+    """Test aiomysql handler functionality with a mocked pool"""
+
+    @pytest.fixture
+    def mock_cursor(self):
+        """Create a mock aiomysql cursor"""
+        cursor = MagicMock()
+        cursor.execute = AsyncMock()
+        cursor.fetchall = AsyncMock(return_value=[])
+        cursor.fetchone = AsyncMock(return_value={'count': 1})
+        cursor.rowcount = 2
+        return cursor
+
+    @pytest.fixture
+    def mock_conn(self, mock_cursor):
+        """Create a mock aiomysql connection"""
+        conn = MagicMock()
+        conn.cursor.return_value = async_context(mock_cursor)
+        conn.commit = AsyncMock()
+        conn.rollback = AsyncMock()
+        return conn
+
+    @pytest.fixture
+    def mock_pool(self, mock_conn):
+        """Create a mock aiomysql pool handing out mock_conn"""
+        pool = MagicMock()
+        pool.closed = False
+        pool.acquire.side_effect = lambda: async_context(mock_conn)
+        pool.wait_closed = AsyncMock()
+        return pool
+
+    @pytest.fixture
+    def handler(self):
+        """Create an async MySQL handler with mocks"""
+        with patch('os.path.exists', return_value=True), \
+             patch('builtins.open', MagicMock()), \
+             patch('yaml.safe_load', return_value={
+                 'connections': {
+                     'test_mysql': {
+                         'type': 'mysql',
+                         'driver': 'async',
+                         'host': 'localhost',
+                         'port': 3306,
+                         'user': 'testuser',
+                         'password': 'testpass',
+                         'database': 'testdb',
+                         'pool': {'max_retries': 2}
+                     }
+                 }
+             }):
+            handler = AsyncMySQLHandler('config.yaml', 'test_mysql')
+            handler.log = MagicMock()
+            handler.stats = MagicMock()
+            return handler
+
+    @pytest.mark.asyncio
+    async def test_get_tables(self, handler, mock_pool, mock_cursor):
+        """Test getting tables with a pool created once"""
+        mock_cursor.fetchall.return_value = [
+            {'table_name': 'users', 'description': 'User table'},
+            {'table_name': 'orders', 'description': None}
+        ]
+
+        with patch('aiomysql.create_pool', AsyncMock(return_value=mock_pool)) as mock_create:
+            result = await handler.get_tables()
+            await handler.get_tables()
+
+        mock_create.assert_awaited_once()
+        assert mock_create.call_args.kwargs['db'] == 'testdb'
+        assert mock_create.call_args.kwargs['cursorclass'] is aiomysql.DictCursor
+        assert [r.name for r in result] == ['users schema', 'orders schema']
+        assert result[1].description is None
+
+    @pytest.mark.asyncio
+    async def test_execute_query_unbuffered(self, handler, mock_pool, mock_conn, mock_cursor):
+        """Test SELECT results are streamed through an unbuffered cursor"""
+        mock_cursor.fetchmany = AsyncMock(side_effect=[[(1,), (2,)]])
+        mock_cursor.description = [('id',)]
+
+        with patch('aiomysql.create_pool', AsyncMock(return_value=mock_pool)):
+            result = await handler._execute_query("SELECT id FROM users")
+
+        mock_conn.cursor.assert_any_call(aiomysql.SSCursor)
+        mock_cursor.fetchall.assert_not_awaited()
+        assert "'rows': [{'id': 1}, {'id': 2}]" in result
+        assert "'row_count': 2" in result
+
+    @pytest.mark.asyncio
+    async def test_execute_query_error_resets_timeout(self, handler, mock_pool, mock_conn, mock_cursor):
+        """Test the session timeout is reset before a failed query's connection is returned"""
+        mock_conn.closed = False
+        mock_cursor.execute.side_effect = [None, None, Exception("syntax error"), None]
+        token = current_query.set(QueryContext(timeout=5))
+        try:
+            with patch('aiomysql.create_pool', AsyncMock(return_value=mock_pool)), \
+                 pytest.raises(ConnectionHandlerError, match="syntax error"):
+                await handler._execute_query("SELECT broken")
+        finally:
+            current_query.reset(token)
+
+        assert mock_cursor.execute.call_args_list[0].args == ("SET SESSION MAX_EXECUTION_TIME = %s", (5000,))
+        assert mock_cursor.execute.call_args.args == ("SET SESSION MAX_EXECUTION_TIME = 0",)
+        mock_conn.close.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_cancel_kills_query(self, handler, mock_pool, mock_conn, mock_cursor):
+        """Test a cancelled query is killed on the server over another connection"""
+        mock_conn.closed = False
+        mock_conn.thread_id.return_value = 42
+        started = asyncio.Event()
+
+        async def execute(sql, *args):
+            if sql == "SELECT SLEEP(60)":
+                started.set()
+                await asyncio.sleep(60)
+
+        mock_cursor.execute.side_effect = execute
+        kill_cursor = MagicMock()
+        kill_cursor.execute = AsyncMock()
+        kill_conn = MagicMock()
+        kill_conn.cursor.return_value = async_context(kill_cursor)
+
+        with patch('aiomysql.create_pool', AsyncMock(return_value=mock_pool)), \
+             patch('aiomysql.connect', AsyncMock(return_value=kill_conn)):
+            task = asyncio.create_task(handler._execute_query("SELECT SLEEP(60)"))
+            await started.wait()
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        mock_conn.close.assert_called_once()
+        kill_cursor.execute.assert_awaited_once_with("KILL QUERY %s", (42,))
+        kill_conn.close.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_truncated_query_is_killed_before_close(self, handler, mock_pool, mock_conn, mock_cursor):
+        """Test a truncated result stops the statement instead of draining its rows"""
+        events = MagicMock()
+        mock_conn.thread_id.return_value = 7
+        mock_cursor.description = [('id',)]
+        mock_cursor.fetchmany = AsyncMock(side_effect=lambda size: [(i,) for i in range(size)])
+
+        async def close():
+            # 中止后关闭游标只读到服务端返回的中断错误
+            events.close()
+            raise aiomysql.OperationalError(1317, "Query execution was interrupted")
+
+        mock_cursor.close = close
+
+        token = current_query.set(QueryContext(max_rows=2))
+        try:
+            with patch('aiomysql.create_pool', AsyncMock(return_value=mock_pool)), \
+                 patch.object(handler, '_kill_query', AsyncMock(side_effect=events.kill)):
+                result = await handler._execute_query("SELECT id FROM events")
+        finally:
+            current_query.reset(token)
+
+        assert "'truncated': True" in result
+        assert events.mock_calls == [call.kill(7), call.close()]
+
+    @pytest.mark.asyncio
+    async def test_execute_write_query(self, handler, mock_pool, mock_conn):
+        """Test write queries are committed and report affected rows"""
+        with patch('aiomysql.create_pool', AsyncMock(return_value=mock_pool)):
+            result = await handler._execute_write_query("DELETE FROM users WHERE id > 1")
+
+        mock_conn.commit.assert_awaited_once()
+        assert result == "Write operation executed successfully. 2 rows affected."
+
+    @pytest.mark.asyncio
+    async def test_table_not_found(self, handler, mock_pool, mock_cursor):
+        """Test missing tables are reported"""
+        mock_cursor.fetchone.return_value = {'count': 0}
+
+        with patch('aiomysql.create_pool', AsyncMock(return_value=mock_pool)), \
+             pytest.raises(ConnectionHandlerError, match="doesn't exist"):
+            await handler.get_table_indexes("missing")
+
+    @pytest.mark.asyncio
+    async def test_connect_retries_with_backoff(self, handler, mock_pool):
+        """Test pool creation is retried without blocking the event loop"""
+        create_pool = AsyncMock(side_effect=[OSError("refused"), mock_pool])
+
+        with patch('aiomysql.create_pool', create_pool), \
+             patch('mcp_dbutils.mysql.async_handler.asyncio.sleep', AsyncMock()) as mock_sleep:
+            assert await handler.test_connection()
+
+        assert create_pool.await_count == 2
+        mock_sleep.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_connect_gives_up(self, handler):
+        """Test connection fails after max_retries"""
+        create_pool = AsyncMock(side_effect=OSError("refused"))
+
+        with patch('aiomysql.create_pool', create_pool), \
+             patch('mcp_dbutils.mysql.async_handler.asyncio.sleep', AsyncMock()), \
+             pytest.raises(ConnectionHandlerError, match="after 3 attempts"):
+            await handler.get_connection()
+
+    @pytest.mark.asyncio
+    async def test_cleanup_closes_pool(self, handler, mock_pool):
+        """Test cleanup closes the pool"""
+        with patch('aiomysql.create_pool', AsyncMock(return_value=mock_pool)):
+            await handler.test_connection()
+
+        await handler.cleanup()
+
+        mock_pool.close.assert_called_once()
+        mock_pool.wait_closed.assert_awaited_once()
+        assert handler.pool is None
@@ -1,12 +1,16 @@
 """Unit tests for MySQL connection handler"""
 
-from unittest.mock import AsyncMock, MagicMock, patch
+import asyncio
+import threading
+from unittest.mock import AsyncMock, MagicMock, call, patch
 
 import mcp.types as types
 import mysql.connector
+import pymysql
 import pytest
+from pymysql.cursors import SSCursor
 
-from mcp_dbutils.base import ConnectionHandlerError
+from mcp_dbutils.base import ConnectionHandlerError, QueryContext, current_query
 from mcp_dbutils.mysql.handler import MySQLHandler
 
 
@@ -811,4 +815,231 @@ class TestMySQLHandler:
             mock_conn.rollback.assert_called_once()
 
             # Verify connection was closed even after an error
-            mock_conn.close.assert_called_once()
\ No newline at end of file
+            mock_conn.close.assert_called_once()
+
+    def test_get_connection_retries_with_backoff(self, handler):
+        """Test pool creation retries a bounded number of times with backoff"""
+        handler.config.pool.max_retries = 2
+        pool = MagicMock()
+        MySQLHandler._instance.clear()
+        try:
+            with patch('mcp_dbutils.mysql.handler.PooledDB',
+                       side_effect=[Exception('down'), Exception('down'), pool]) as mock_pooled_db, \
+                 patch('mcp_dbutils.mysql.handler.time.sleep') as mock_sleep:
+                assert handler.get_connection() is pool
+
+                assert mock_pooled_db.call_count == 3
+                kwargs = mock_pooled_db.call_args.kwargs
+                assert kwargs['maxconnections'] == handler.config.pool.maxconnections
+                assert kwargs['connect_timeout'] == handler.config.pool.connect_timeout
+                assert kwargs['ping'] == handler.config.pool.ping
+
+                # Exponential backoff with jitter in [delay / 2, delay]
+                delays = [c.args[0] for c in mock_sleep.call_args_list]
+                assert len(delays) == 2
+                assert 0.25 <= delays[0] <= 0.5
+                assert 0.5 <= delays[1] <= 1.0
+        finally:
+            MySQLHandler._instance.clear()
+
+    def test_get_connection_gives_up(self, handler):
+        """Test pool creation fails fast once retries are exhausted"""
+        handler.config.pool.max_retries = 1
+        MySQLHandler._instance.clear()
+        try:
+            with patch('mcp_dbutils.mysql.handler.PooledDB', side_effect=Exception('down')) as mock_pooled_db, \
+                 patch('mcp_dbutils.mysql.handler.time.sleep'):
+                with pytest.raises(ConnectionHandlerError, match="after 2 attempts"):
+                    handler.get_connection()
+
+                assert mock_pooled_db.call_count == 2
+                assert handler.pool is None
+                assert not MySQLHandler._instance
+        finally:
+            MySQLHandler._instance.clear()
+
+    def test_get_connection_retry_does_not_block_other_pools(self, handler):
+        """Test a pool retrying its connection does not hold up other databases"""
+        other = MySQLHandler.__new__(MySQLHandler)
+        other.config = MagicMock()
+        other.config.get_connection_params.return_value = {
+            'user': 'other', 'host': 'otherhost', 'port': 3306, 'database': 'otherdb',
+        }
+        other.pool = None
+        other_pool = MagicMock()
+        retrying = threading.Event()
+        release = threading.Event()
+
+        def slow_create_pool(mysql_config):
+            retrying.set()
+            release.wait(5)
+            return MagicMock()
+
+        MySQLHandler._instance.clear()
+        try:
+            with patch.object(handler, '_create_pool', side_effect=slow_create_pool), \
+                 patch.object(other, '_create_pool', return_value=other_pool):
+                thread = threading.Thread(target=handler.get_connection)
+                thread.start()
+                try:
+                    assert retrying.wait(5)
+                    assert other.get_connection() is other_pool
+                finally:
+                    release.set()
+                    thread.join(5)
+            assert handler.pool is not None
+        finally:
+            MySQLHandler._instance.clear()
+
+    def test_close_pools(self):
+        """Test shared pools are closed and forgotten on shutdown"""
+        pool = MagicMock()
+        MySQLHandler._instance.clear()
+        MySQLHandler._instance['key'] = pool
+        asyncio.run(MySQLHandler.close_pools())
+
+        pool.close.assert_called_once()
+        assert not MySQLHandler._instance
+
+    @pytest.mark.asyncio
+    async def test_truncated_query_is_killed_before_close(self, handler):
+        """Test a truncated result stops the statement instead of draining its rows"""
+        events = MagicMock()
+        setup_cursor = MagicMock()
+        setup_cursor.__enter__.return_value = setup_cursor
+        setup_cursor.fetchone.return_value = {'id': 7}
+        stream = MagicMock()
+        stream.__enter__.return_value = stream
+        stream.description = [('id',)]
+        stream.fetchmany.side_effect = lambda size: [(i,) for i in range(size)]
+
+        def close():
+            # pymysql reports the killed statement while discarding its unread rows,
+            # later calls return immediately
+            events.close()
+            if events.close.call_count == 1:
+                raise pymysql.err.OperationalError(1317, "Query execution was interrupted")
+
+        stream.close.side_effect = close
+        conn = MagicMock()
+        conn.cursor.side_effect = lambda cursor_class=None: stream if cursor_class is SSCursor else setup_cursor
+        pool = MagicMock()
+        pool.connection.return_value = conn
+
+        token = current_query.set(QueryContext(max_rows=2))
+        try:
+            with patch.object(handler, 'get_connection', return_value=pool), \
+                 patch.object(handler, '_kill_query', side_effect=events.kill):
+                result = await handler._execute_query("SELECT id FROM events")
+        finally:
+            current_query.reset(token)
+
+        assert "'truncated': True" in result
+        assert "'rows': [{'id': 0}, {'id': 1}]" in result
+        assert events.mock_calls[0] == call.kill(7)
+        assert call.close() in events.mock_calls[1:]
+
+    @pytest.mark.asyncio
+    async def test_complete_query_is_not_killed(self, handler):
+        """Test a result read to the end closes its cursor normally"""
+        setup_cursor = MagicMock()
+        setup_cursor.__enter__.return_value = setup_cursor
+        setup_cursor.fetchone.return_value = {'id': 7}
+        stream = MagicMock()
+        stream.__enter__.return_value = stream
+        stream.description = [('id',)]
+        stream.fetchmany.side_effect = [[(1,)], []]
+        conn = MagicMock()
+        conn.cursor.side_effect = lambda cursor_class=None: stream if cursor_class is SSCursor else setup_cursor
+        pool = MagicMock()
+        pool.connection.return_value = conn
+
+        with patch.object(handler, 'get_connection', return_value=pool), \
+             patch.object(handler, '_kill_query') as mock_kill:
+            result = await handler._execute_query("SELECT id FROM events")
+
+        assert "'truncated': False" in result
+        mock_kill.assert_not_called()
+
+    @pytest.fixture
+    def cursor_pool(self):
+        """Create a pool whose connection runs an unbuffered query for a paging cursor"""
+        setup_cursor = MagicMock()
+        setup_cursor.__enter__.return_value = setup_cursor
+        setup_cursor.fetchone.return_value = {'id': 7}
+        stream = MagicMock()
+        stream.description = [('id',)]
+        conn = MagicMock()
+        conn.cursor.side_effect = lambda cursor_class=None: stream if cursor_class is SSCursor else setup_cursor
+        pool = MagicMock()
+        pool.connection.return_value = conn
+        return pool, conn, setup_cursor, stream
+
+    @pytest.mark.asyncio
+    async def test_open_cursor_returns_connection_to_pool(self, handler, cursor_pool):
+        """Test a paging cursor holds a dedicated pooled connection until it is closed"""
+        pool, conn, setup_cursor, stream = cursor_pool
+        stream.fetchmany.side_effect = [[(1,), (2,)], [(3,)]]
+
+        with patch.object(handler, 'get_connection', return_value=pool), \
+             patch.object(handler, '_kill_query') as mock_kill:
+            cursor = await handler._open_cursor("SELECT id FROM events", 300)
+            assert cursor.fetchmany(2) == [(1,), (2,)]
+            assert cursor.fetchmany(2) == [(3,)]
+            conn.close.assert_not_called()
+            cursor.close()
+
+        pool.connection.assert_called_once_with(shareable=False)
+        stream.execute.assert_called_once_with("SELECT id FROM events")
+        setup_cursor.execute.assert_any_call("SET SESSION net_write_timeout = DEFAULT")
+        mock_kill.assert_not_called()
+        stream.close.assert_called()
+        conn.close.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_open_cursor_abandoned_kills_query(self, handler, cursor_pool):
+        """Test a cursor closed before its last page stops the statement instead of draining it"""
+        pool, conn, setup_cursor, stream = cursor_pool
+        events = MagicMock()
+        stream.fetchmany.return_value = [(1,), (2,)]
+        stream.close.side_effect = events.close
+        conn.close.side_effect = events.release
+
+        with patch.object(handler, 'get_connection', return_value=pool), \
+             patch.object(handler, '_kill_query', side_effect=events.kill):
+            cursor = await handler._open_cursor("SELECT id FROM events", 300)
+            cursor.fetchmany(2)
+            cursor.close()
+
+        assert events.mock_calls[:2] == [call.kill(7), call.close()]
+        assert events.mock_calls[-1] == call.release()
+        stream.connection.close.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_open_cursor_abandoned_drops_connection_when_kill_fails(self, handler, cursor_pool):
+        """Test a cursor whose statement cannot be killed closes its driver connection"""
+        pool, conn, setup_cursor, stream = cursor_pool
+        stream.fetchmany.return_value = [(1,), (2,)]
+
+        with patch.object(handler, 'get_connection', return_value=pool), \
+             patch.object(handler, '_kill_query', side_effect=pymysql.err.OperationalError(2003, "unreachable")):
+            cursor = await handler._open_cursor("SELECT id FROM events", 300)
+            cursor.fetchmany(2)
+            cursor.close()
+
+        stream.close.assert_not_called()
+        stream.connection.close.assert_called_once()
+        conn.close.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_open_cursor_error_returns_connection_to_pool(self, handler, cursor_pool):
+        """Test a query that fails to start resets its session and releases the connection"""
+        pool, conn, setup_cursor, stream = cursor_pool
+        stream.execute.side_effect = pymysql.err.ProgrammingError(1064, "syntax error")
+
+        with patch.object(handler, 'get_connection', return_value=pool), \
+             pytest.raises(ConnectionHandlerError, match="syntax error"):
+            await handler._open_cursor("SELEC id FROM events", 300)
+
+        setup_cursor.execute.assert_any_call("SET SESSION net_write_timeout = DEFAULT")
+        conn.close.assert_called_once()
@@ -0,0 +1,89 @@
+"""Unit tests for keyset pagination"""
+
+import datetime
+import decimal
+
+import pytest
+
+from mcp_dbutils.pagination import (
+    KeysetPage,
+    decode_after,
+    encode_after,
+    render_literal,
+)
+
+
+class TestKeysetPage:
+    """Test query rewriting and page tokens"""
+
+    def test_first_page(self):
+        """Test the first page is ordered and limited without a seek condition"""
+        page = KeysetPage.parse("id")
+        assert page.build_query("SELECT id FROM t;", "sqlite", 11) == (
+            "SELECT * FROM (SELECT id FROM t\n) dbutils_page ORDER BY id LIMIT 11"
+        )
+
+    def test_row_value_seek(self):
+        """Test composite keys use a row value comparison where supported"""
+        page = KeysetPage.parse(["a", "b"], encode_after([1, "x"]))
+        assert page.build_query("SELECT a, b FROM t", "postgres", 3) == (
+            "SELECT * FROM (SELECT a, b FROM t\n) dbutils_page "
+            "WHERE (a, b) > (1, 'x') ORDER BY a, b LIMIT 3"
+        )
+
+    def test_oracle_seek(self):
+        """Test Oracle expands composite keys and uses FETCH FIRST"""
+        page = KeysetPage.parse(["a", "b"], encode_after([1, "x"]))
+        assert page.build_query("SELECT a, b FROM t", "oracle", 3) == (
+            "SELECT * FROM (SELECT a, b FROM t\n) dbutils_page "
+            "WHERE (a > 1) OR (a = 1 AND b > 'x') ORDER BY a, b FETCH FIRST 3 ROWS ONLY"
+        )
+
+    def test_next_after(self):
+        """Test tokens are built from the key columns of the last row"""
+        page = KeysetPage.parse(["ID", "created"])
+        created = datetime.datetime(2024, 1, 2, 3, 4, 5)
+        token = page.next_after(["id", "CREATED", "name"], (7, created, "n"))
+        assert decode_after(token) == [7, "2024-01-02T03:04:05"]
+        assert page.next_after(["id", "created"], {"id": 7, "created": created}) == token
+
+        with pytest.raises(ValueError, match="not in the query result"):
+            page.next_after(["id"], (7,))
+        with pytest.raises(ValueError, match="NULL"):
+            page.next_after(["id", "created"], (7, None))
+
+    def test_invalid_key(self):
+        """Test key columns must be plain identifiers"""
+        for key in ["", "a b", "a;--", [], ["a", 1], {"a": 1}]:
+            with pytest.raises(ValueError, match="Invalid key"):
+                KeysetPage.parse(key)
+
+    def test_invalid_after(self):
+        """Test malformed or mismatched tokens are rejected"""
+        for token in ["!!", encode_after([1])[:-1] + "*", "eyJhIjoxfQ"]:
+            with pytest.raises(ValueError, match="Invalid after token"):
+                KeysetPage.parse("id", token)
+        with pytest.raises(ValueError, match="does not match"):
+            KeysetPage.parse(["a", "b"], encode_after([1]))
+
+
+class TestRenderLiteral:
+    """Test key values written into the rewritten query"""
+
+    def test_values(self):
+        """Test numbers and strings are rendered as literals"""
+        assert render_literal(12, "sqlite") == "12"
+        assert render_literal(1.5, "sqlite") == "1.5"
+        assert render_literal("it's", "postgres") == "'it''s'"
+        assert render_literal(str(decimal.Decimal("1.10")), "oracle") == "'1.10'"
+
+    def test_mysql_backslash(self):
+        """Test MySQL escapes backslashes as well as quotes"""
+        assert render_literal("a\\' OR 1=1", "mysql") == "'a\\\\'' OR 1=1'"
+        assert render_literal("a\\b", "sqlite") == "'a\\b'"
+
+    def test_unsupported(self):
+        """Test values that cannot be used as keys are rejected"""
+        for value in [True, None, float("nan"), "a\x00b", {"a": 1}]:
+            with pytest.raises(ValueError, match="Unsupported key value"):
+                render_literal(value, "sqlite")
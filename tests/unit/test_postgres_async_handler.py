@@ -0,0 +1,160 @@
+"""Unit tests for asyncpg-based PostgreSQL connection handler"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+asyncpg = pytest.importorskip("asyncpg")
+
+from mcp_dbutils.base import ConnectionHandlerError  # noqa: E402
+from mcp_dbutils.postgres.async_handler import AsyncPostgreSQLHandler  # noqa: E402
+
+
+class TestAsyncPostgreSQLHandler:
+    """Test asyncpg handler functionality with a mocked pool"""
+
+    @pytest.fixture
+    def mock_conn(self):
+        """Create a mock asyncpg connection"""
+        conn = MagicMock()
+        conn.fetch = AsyncMock(return_value=[])
+        conn.fetchrow = AsyncMock(return_value=None)
+        conn.fetchval = AsyncMock(return_value=1)
+        conn.execute = AsyncMock(return_value="UPDATE 3")
+        transaction = MagicMock()
+        transaction.start = AsyncMock()
+        transaction.rollback = AsyncMock()
+        conn.transaction.return_value = transaction
+        return conn
+
+    @pytest.fixture
+    def mock_pool(self, mock_conn):
+        """Create a mock asyncpg pool handing out mock_conn"""
+        pool = MagicMock()
+        pool.is_closing.return_value = False
+        pool.acquire = AsyncMock(return_value=mock_conn)
+        pool.release = AsyncMock()
+        pool.close = AsyncMock()
+        return pool
+
+    @pytest.fixture
+    def handler(self):
+        """Create an async PostgreSQL handler with mocks"""
+        with patch('os.path.exists', return_value=True), \
+             patch('builtins.open', MagicMock()), \
+             patch('yaml.safe_load', return_value={
+                 'connections': {
+                     'test_postgres': {
+                         'type': 'postgres',
+                         'driver': 'async',
+                         'host': 'localhost',
+                         'port': 5432,
+                         'user': 'testuser',
+                         'password': 'testpass',
+                         'dbname': 'testdb',
+                         'ssl': {'mode': 'verify-full', 'root': '/certs/root.crt'}
+                     }
+                 }
+             }):
+            handler = AsyncPostgreSQLHandler('config.yaml', 'test_postgres')
+            handler.log = MagicMock()
+            handler.stats = MagicMock()
+            return handler
+
+    def test_pool_params(self, handler):
+        """Test psycopg2 parameters are translated for asyncpg"""
+        params = handler._get_pool_params()
+
+        assert params['database'] == 'testdb'
+        assert params['port'] == 5432
+        assert params['min_size'] == handler.config.pool.min_size
+        assert params['max_size'] == handler.config.pool.max_size
+        assert params['max_inactive_connection_lifetime'] == handler.config.pool.idle_timeout
+        assert params['dsn'] == 'postgresql://?sslmode=verify-full&sslrootcert=%2Fcerts%2Froot.crt'
+        assert 'dbname' not in params
+
+    @pytest.mark.asyncio
+    async def test_pool_created_once(self, handler, mock_pool, mock_conn):
+        """Test the pool is created lazily and reused"""
+        with patch('asyncpg.create_pool', AsyncMock(return_value=mock_pool)) as mock_create:
+            assert await handler.test_connection()
+            assert await handler.test_connection()
+
+            mock_create.assert_awaited_once()
+            assert mock_pool.release.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_execute_query(self, handler, mock_pool, mock_conn):
+        """Test read queries run in a read-only transaction that is rolled back"""
+        statement = MagicMock()
+        cursor = MagicMock()
+        cursor.fetch = AsyncMock(side_effect=[[(1, 'alice')], []])
+        statement.cursor = AsyncMock(return_value=cursor)
+        id_attr, name_attr = MagicMock(), MagicMock()
+        id_attr.name, name_attr.name = 'id', 'name'
+        statement.get_attributes.return_value = [id_attr, name_attr]
+        mock_conn.prepare = AsyncMock(return_value=statement)
+
+        with patch('asyncpg.create_pool', AsyncMock(return_value=mock_pool)):
+            result = await handler._execute_query("SELECT id, name FROM users")
+
+        mock_conn.transaction.assert_called_once_with(readonly=True)
+        mock_conn.transaction.return_value.rollback.assert_awaited_once()
+        mock_pool.release.assert_awaited_once_with(mock_conn)
+        assert "'rows': [{'id': 1, 'name': 'alice'}]" in result
+        assert "'row_count': 1" in result
+        assert "'truncated': False" in result
+
+    @pytest.mark.asyncio
+    async def test_open_cursor(self, handler, mock_pool, mock_conn):
+        """Test a paging cursor keeps its connection until it is closed"""
+        statement = MagicMock()
+        cursor = MagicMock()
+        cursor.fetch = AsyncMock(side_effect=[[(1,), (2,)], [(3,)]])
+        statement.cursor = AsyncMock(return_value=cursor)
+        id_attr = MagicMock()
+        id_attr.name = 'id'
+        statement.get_attributes.return_value = [id_attr]
+        mock_conn.prepare = AsyncMock(return_value=statement)
+
+        with patch('asyncpg.create_pool', AsyncMock(return_value=mock_pool)):
+            result = await handler._open_cursor("SELECT id FROM users", 300)
+            page = await handler.fetch_page(result, 1, "next")
+            assert "'rows': [{'id': 1}]" in page
+            assert "'next_token': 'next'" in page
+            mock_pool.release.assert_not_awaited()
+
+            await handler.close_cursor(result)
+
+        mock_conn.transaction.return_value.rollback.assert_awaited_once()
+        mock_pool.release.assert_awaited_once_with(mock_conn)
+
+    @pytest.mark.asyncio
+    async def test_execute_write_query(self, handler, mock_pool, mock_conn):
+        """Test affected rows are read from the command status"""
+        with patch('asyncpg.create_pool', AsyncMock(return_value=mock_pool)):
+            result = await handler._execute_write_query("UPDATE users SET name = 'bob'")
+
+        assert result == "Write operation executed successfully. 3 rows affected."
+
+    @pytest.mark.asyncio
+    async def test_driver_error(self, handler, mock_pool, mock_conn):
+        """Test driver errors are wrapped in ConnectionHandlerError"""
+        mock_conn.fetch.side_effect = asyncpg.PostgresError("relation does not exist")
+
+        with patch('asyncpg.create_pool', AsyncMock(return_value=mock_pool)), \
+             pytest.raises(ConnectionHandlerError, match="Failed to get tables"):
+            await handler.get_tables()
+
+        mock_pool.release.assert_awaited_once_with(mock_conn)
+
+    @pytest.mark.asyncio
+    async def test_cleanup_closes_pool(self, handler, mock_pool):
+        """Test cleanup closes the pool"""
+        with patch('asyncpg.create_pool', AsyncMock(return_value=mock_pool)):
+            await handler.test_connection()
+
+        await handler.cleanup()
+
+        mock_pool.close.assert_awaited_once()
+        assert handler.pool is None
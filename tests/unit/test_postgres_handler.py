@@ -5,8 +5,12 @@ from unittest.mock import MagicMock, patch
 import psycopg2
 import pytest
 
-from mcp_dbutils.base import ConnectionHandlerError
-from mcp_dbutils.postgres.handler import PostgreSQLHandler
+from mcp_dbutils.base import ConnectionHandlerError, QueryContext, current_query
+from mcp_dbutils.postgres.handler import (
+    SCHEMA_VERSION_SQL,
+    STREAM_CURSOR_NAME,
+    PostgreSQLHandler,
+)
 
 
 class TestPostgreSQLHandler:
@@ -26,6 +30,8 @@ class TestPostgreSQLHandler:
         """Create a mock connection for PostgreSQL"""
         conn = MagicMock()
         conn.cursor.return_value = mock_cursor
+        conn.closed = 0
+        conn.get_transaction_status.return_value = psycopg2.extensions.TRANSACTION_STATUS_IDLE
         return conn
 
     @pytest.fixture
@@ -80,8 +86,9 @@ class TestPostgreSQLHandler:
             assert result[1].name == 'orders schema'
             assert result[1].description is None
 
-            # Verify connection was closed
-            mock_conn.close.assert_called_once()
+            # Verify connection was returned to the pool instead of being closed
+            mock_conn.close.assert_not_called()
+            assert handler.pool.size == 1
 
     @pytest.mark.asyncio
     async def test_get_tables_error(self, handler):
@@ -127,8 +134,9 @@ class TestPostgreSQLHandler:
             assert "'columns':" in result
             assert "'constraints':" in result
 
-            # Verify connection was closed
-            mock_conn.close.assert_called_once()
+            # Verify connection was returned to the pool instead of being closed
+            mock_conn.close.assert_not_called()
+            assert handler.pool.size == 1
 
     @pytest.mark.asyncio
     async def test_get_schema_error(self, handler):
@@ -172,6 +180,8 @@ class TestPostgreSQLHandler:
                 ('users', 'User table')
             ]
             mock_conn.cursor.return_value = mock_cursor
+            mock_conn.closed = 0
+            mock_conn.get_transaction_status.return_value = psycopg2.extensions.TRANSACTION_STATUS_IDLE
 
             with patch('psycopg2.connect', return_value=mock_conn) as mock_connect:
                 # Test get_tables method
@@ -187,8 +197,9 @@ class TestPostgreSQLHandler:
                 assert len(result) == 1
                 assert result[0].name == 'users schema'
 
-                # Verify connection was closed
-                mock_conn.close.assert_called_once()
+                # Verify connection was returned to the pool instead of being closed
+                mock_conn.close.assert_not_called()
+                assert special_handler.pool.size == 1
 
     @pytest.mark.asyncio
     async def test_special_character_password_connection_error(self):
@@ -325,6 +336,25 @@ class TestPostgreSQLHandler:
         handler.log.assert_any_call('warning', 'Error closing PostgreSQL connection: Connection close error')
         handler.log.assert_any_call('debug', 'PostgreSQL handler cleanup complete')
 
+    @pytest.mark.asyncio
+    async def test_connection_pool_reused_across_calls(self, handler, mock_conn):
+        """Test connections come from one pool shared by all handler methods"""
+        with patch('psycopg2.connect', return_value=mock_conn) as mock_connect:
+            mock_cursor = mock_conn.cursor().__enter__()
+            mock_cursor.fetchall.return_value = []
+
+            await handler.get_tables()
+            await handler.get_tables()
+            assert await handler.test_connection() is True
+
+            # Only one physical connection was opened
+            mock_connect.assert_called_once()
+            assert handler.pool.size == 1
+
+            await handler.cleanup()
+            mock_conn.close.assert_called_once()
+            assert handler.pool is None
+
     @pytest.mark.asyncio
     async def test_execute_write_query(self, handler, mock_conn):
         """Test executing a write query"""
@@ -349,8 +379,9 @@ class TestPostgreSQLHandler:
             assert "Write operation executed successfully" in result
             assert "5 rows affected" in result
 
-            # Verify connection was closed
-            mock_conn.close.assert_called_once()
+            # Verify connection was returned to the pool instead of being closed
+            mock_conn.close.assert_not_called()
+            assert handler.pool.size == 1
 
     @pytest.mark.asyncio
     async def test_execute_write_query_error(self, handler, mock_conn):
@@ -368,5 +399,68 @@ class TestPostgreSQLHandler:
             # Verify rollback was called
             mock_conn.rollback.assert_called_once()
 
-            # Verify connection was closed even after an error
-            mock_conn.close.assert_called_once()
+            # Verify connection was returned to the pool even after an error
+            mock_conn.close.assert_not_called()
+            assert handler.pool.size == 1
+
+    @pytest.mark.asyncio
+    async def test_execute_query_uses_server_cursor(self, handler, mock_conn, mock_cursor):
+        """Test query results are read in batches from a named server-side cursor"""
+        mock_cursor.fetchmany.side_effect = [[(1, 'alice'), (2, 'bob')]]
+        mock_cursor.description = [('id',), ('name',)]
+
+        with patch('psycopg2.connect', return_value=mock_conn):
+            result = await handler._execute_query("SELECT id, name FROM users")
+
+        mock_conn.cursor.assert_any_call(name=STREAM_CURSOR_NAME)
+        assert mock_cursor.itersize == 1000
+        mock_cursor.fetchall.assert_not_called()
+        assert "'rows': [{'id': 1, 'name': 'alice'}, {'id': 2, 'name': 'bob'}]" in result
+        assert "'truncated': False" in result
+
+    @pytest.mark.asyncio
+    async def test_open_cursor_cancelled_releases_connection(self, handler, mock_conn):
+        """Test a cursor cancelled before its statement starts gives its connection back"""
+        query = QueryContext()
+        query.cancel()
+        token = current_query.set(query)
+        try:
+            with patch.object(handler, '_get_connection', return_value=mock_conn), \
+                 patch.object(handler, '_release_connection') as mock_release, \
+                 pytest.raises(ConnectionHandlerError, match="Query cancelled"):
+                await handler._open_cursor("SELECT id FROM users", 300)
+        finally:
+            current_query.reset(token)
+
+        mock_conn.rollback.assert_called_once()
+        mock_release.assert_called_once_with(mock_conn)
+
+    @pytest.mark.asyncio
+    async def test_schema_version_reads_statistics_counters(self, handler, mock_conn, mock_cursor):
+        """Test the schema version comes from catalog write counters without scanning catalogs"""
+        mock_cursor.fetchall.return_value = [(1234,)]
+
+        with patch('psycopg2.connect', return_value=mock_conn):
+            version = await handler._schema_version()
+
+        mock_cursor.execute.assert_called_once_with(SCHEMA_VERSION_SQL)
+        assert version == ((1234,),)
+        assert "pg_stat_get_tuples_updated" in SCHEMA_VERSION_SQL
+        assert "xmin" not in SCHEMA_VERSION_SQL
+
+    @pytest.mark.asyncio
+    async def test_export_csv_uses_copy(self, handler, mock_conn, mock_cursor):
+        """Test CSV exports are written by COPY inside a read-only transaction"""
+        writer = MagicMock(format="csv")
+        mock_cursor.rowcount = 42
+
+        with patch('psycopg2.connect', return_value=mock_conn):
+            await handler._export_query("SELECT id FROM users", writer)
+
+        sql, output = mock_cursor.copy_expert.call_args.args
+        assert sql == "COPY (SELECT id FROM users\n) TO STDOUT WITH (FORMAT csv, HEADER true)"
+        assert output is writer.file
+        writer.copied.assert_called_once_with(42)
+        executed = [c.args[0] for c in mock_cursor.execute.call_args_list]
+        assert executed[0] == "BEGIN TRANSACTION READ ONLY"
+        assert executed[-1] == "ROLLBACK"
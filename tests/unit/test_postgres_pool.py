@@ -0,0 +1,124 @@
+"""Unit tests for PostgreSQL connection pool"""
+
+from unittest.mock import MagicMock, patch
+
+import psycopg2
+import pytest
+from psycopg2.pool import PoolError
+
+from mcp_dbutils.postgres.pool import PostgreSQLConnectionPool
+
+
+def make_conn():
+    """Create a mock psycopg2 connection"""
+    conn = MagicMock()
+    conn.closed = 0
+    conn.get_transaction_status.return_value = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+    return conn
+
+
+class TestPostgreSQLConnectionPool:
+    """Test PostgreSQL connection pool with mocked connections"""
+
+    def test_prefills_min_size(self):
+        """Test pool opens min_size connections up front"""
+        with patch('psycopg2.connect', side_effect=lambda **kw: make_conn()) as mock_connect:
+            pool = PostgreSQLConnectionPool({'dbname': 'testdb'}, min_size=2, max_size=5)
+
+            assert mock_connect.call_count == 2
+            assert pool.size == 2
+
+    def test_reuses_returned_connection(self):
+        """Test a returned connection is handed out again"""
+        with patch('psycopg2.connect', side_effect=lambda **kw: make_conn()) as mock_connect:
+            pool = PostgreSQLConnectionPool({'dbname': 'testdb'}, min_size=0, max_size=5)
+
+            conn = pool.getconn()
+            pool.putconn(conn)
+            assert pool.getconn() is conn
+            assert mock_connect.call_count == 1
+
+    def test_rolls_back_open_transaction(self):
+        """Test connections left in a transaction are rolled back on return"""
+        conn = make_conn()
+        conn.get_transaction_status.return_value = psycopg2.extensions.TRANSACTION_STATUS_INTRANS
+        with patch('psycopg2.connect', return_value=conn):
+            pool = PostgreSQLConnectionPool({'dbname': 'testdb'}, min_size=0, max_size=1)
+
+            pool.putconn(pool.getconn())
+
+            conn.rollback.assert_called_once()
+            conn.close.assert_not_called()
+            assert pool.size == 1
+
+    def test_discards_broken_connection(self):
+        """Test connections in unknown state are closed instead of reused"""
+        conn = make_conn()
+        conn.get_transaction_status.return_value = psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN
+        with patch('psycopg2.connect', return_value=conn):
+            pool = PostgreSQLConnectionPool({'dbname': 'testdb'}, min_size=0, max_size=1)
+
+            pool.putconn(pool.getconn())
+
+            conn.close.assert_called_once()
+            assert pool.size == 0
+
+    def test_expired_connections_are_replaced(self):
+        """Test connections past max_lifetime or idle_timeout are replaced"""
+        with patch('psycopg2.connect', side_effect=lambda **kw: make_conn()), \
+             patch('mcp_dbutils.postgres.pool.time.monotonic') as mock_time:
+            mock_time.return_value = 100.0
+            pool = PostgreSQLConnectionPool(
+                {'dbname': 'testdb'}, min_size=0, max_size=2, max_lifetime=60, idle_timeout=10
+            )
+
+            first = pool.getconn()
+            pool.putconn(first)
+
+            # Idle longer than idle_timeout
+            mock_time.return_value = 115.0
+            second = pool.getconn()
+            assert second is not first
+            first.close.assert_called_once()
+
+            # Older than max_lifetime when returned
+            mock_time.return_value = 200.0
+            pool.putconn(second)
+            second.close.assert_called_once()
+            assert pool.size == 0
+
+    def test_exhausted_pool_times_out(self):
+        """Test getconn raises PoolError when no connection becomes available"""
+        with patch('psycopg2.connect', side_effect=lambda **kw: make_conn()):
+            pool = PostgreSQLConnectionPool({'dbname': 'testdb'}, min_size=0, max_size=1, timeout=0.01)
+
+            pool.getconn()
+            with pytest.raises(PoolError, match="exhausted"):
+                pool.getconn()
+
+    def test_connect_failure_releases_slot(self):
+        """Test a failed connect does not leak a pool slot"""
+        with patch('psycopg2.connect', side_effect=psycopg2.OperationalError('down')):
+            pool = PostgreSQLConnectionPool({'dbname': 'testdb'}, min_size=0, max_size=1, timeout=0.01)
+
+            with pytest.raises(psycopg2.OperationalError):
+                pool.getconn()
+            assert pool.size == 0
+
+    def test_closeall(self):
+        """Test closeall closes idle connections and rejects new checkouts"""
+        with patch('psycopg2.connect', side_effect=lambda **kw: make_conn()):
+            pool = PostgreSQLConnectionPool({'dbname': 'testdb'}, min_size=0, max_size=2)
+
+            idle = pool.getconn()
+            busy = pool.getconn()
+            pool.putconn(idle)
+
+            pool.closeall()
+            idle.close.assert_called_once()
+            with pytest.raises(PoolError, match="closed"):
+                pool.getconn()
+
+            # Connections returned after close are closed as well
+            pool.putconn(busy)
+            busy.close.assert_called_once()
@@ -0,0 +1,85 @@
+"""Unit tests for the cache file shared by server processes"""
+
+import os
+import stat
+from unittest.mock import patch
+
+import mcp.types as types
+import pytest
+
+from mcp_dbutils.shared_cache import SharedCache, decode_metadata, encode_metadata
+
+
+class TestSharedCache:
+    """Test entries written by one process are read by another"""
+
+    def test_shared_between_instances(self, tmp_path):
+        """Test values, expiry and the per-entry size limit"""
+        path = str(tmp_path / "cache" / "shared.sqlite3")
+        first = SharedCache(path, max_bytes=1000, max_entry_bytes=10)
+        second = SharedCache(path, max_bytes=1000, max_entry_bytes=10)
+        key = SharedCache.make_key("db", "result", "SELECT 1")
+        assert key != SharedCache.make_key("other", "result", "SELECT 1")
+
+        with patch("mcp_dbutils.shared_cache.time.time", return_value=100):
+            first.put(key, "db", "result", 5)
+            # 超过单条上限的值不写入
+            first.put(SharedCache.make_key("db", "big"), "db", "x" * 11, 5)
+            assert second.get(key) == "result"
+            assert second.get(SharedCache.make_key("db", "big")) is None
+        with patch("mcp_dbutils.shared_cache.time.time", return_value=105):
+            assert second.get(key) is None
+        first.close()
+        second.close()
+
+    def test_file_readable_only_by_owner(self, tmp_path):
+        """Test the directory and cache files are created for the current user only"""
+        path = tmp_path / "cache" / "shared.sqlite3"
+        cache = SharedCache(str(path), max_bytes=1000, max_entry_bytes=100)
+        cache.put("key", "db", "result", 60)
+
+        assert stat.S_IMODE(os.stat(path.parent).st_mode) == 0o700
+        for name in ("shared.sqlite3", "shared.sqlite3-wal", "shared.sqlite3-shm"):
+            assert stat.S_IMODE(os.stat(path.parent / name).st_mode) == 0o600
+        cache.close()
+
+    def test_directory_of_another_user(self, tmp_path):
+        """Test a directory owned by another user is refused"""
+        cache = SharedCache(str(tmp_path / "shared.sqlite3"), max_bytes=1000, max_entry_bytes=100)
+        with patch("mcp_dbutils.shared_cache.os.getuid", return_value=os.getuid() + 1), \
+             pytest.raises(PermissionError, match="owned by another user"):
+            cache.get("key")
+        assert not (tmp_path / "shared.sqlite3").exists()
+
+    def test_invalidate(self, tmp_path):
+        """Test writes drop the entries of their database mentioning the table"""
+        cache = SharedCache(str(tmp_path / "shared.sqlite3"), max_bytes=1000, max_entry_bytes=100)
+        cache.put("users", "db", "1", 60, {"select", "users"})
+        cache.put("orders", "db", "2", 60, {"select", "orders"})
+        cache.put("other", "other-db", "3", 60, {"select", "users"})
+        cache.invalidate("db", "users")
+        assert [cache.get(key) for key in ("users", "orders", "other")] == [None, "2", "3"]
+        cache.invalidate("db")
+        assert [cache.get(key) for key in ("orders", "other")] == [None, "3"]
+        cache.close()
+
+    def test_purge(self, tmp_path):
+        """Test the oldest entries are dropped once the file holds more than max_bytes"""
+        cache = SharedCache(str(tmp_path / "shared.sqlite3"), max_bytes=25, max_entry_bytes=10)
+        with patch("mcp_dbutils.shared_cache.PURGE_INTERVAL", 4):
+            for index in range(4):
+                with patch("mcp_dbutils.shared_cache.time.time", return_value=100 + index):
+                    cache.put(str(index), "db", "x" * 10, 60)
+        with patch("mcp_dbutils.shared_cache.time.time", return_value=110):
+            assert [cache.get(str(index)) is not None for index in range(4)] == [False, False, True, True]
+        cache.close()
+
+    def test_metadata_encoding(self):
+        """Test table lists and text survive the round trip"""
+        tables = [
+            types.Resource(uri="sqlite://db/users/schema", name="users schema", mimeType="application/json"),
+            types.Resource(uri="mysql://db/t/schema", name="t schema", description="Orders", mimeType="application/json"),
+        ]
+        assert decode_metadata(encode_metadata(tables)) == tables
+        assert decode_metadata(encode_metadata("Columns:\n- id")) == "Columns:\n- id"
+        assert encode_metadata({"not": "shared"}) is None
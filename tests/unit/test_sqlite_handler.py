@@ -1,12 +1,22 @@
 """Unit tests for SQLite connection handler"""
 
+import json
 import sqlite3
 from unittest.mock import MagicMock, call, patch
 
 import pytest
 
-from mcp_dbutils.base import ConnectionHandlerError
+from mcp_dbutils.base import (
+    ConnectionHandlerError,
+    QueryContext,
+    current_query,
+    requested_format,
+)
+from mcp_dbutils.budget import TRUNCATION_MARKER
+from mcp_dbutils.config import CacheConfig, MetadataCacheConfig
+from mcp_dbutils.shared_cache import SharedCache
 from mcp_dbutils.sqlite.handler import SQLiteHandler
+from mcp_dbutils.stats import ResourceStats
 
 
 class TestSQLiteHandler:
@@ -270,3 +280,285 @@ class TestSQLiteHandler:
 
             # Verify error was recorded
             handler.stats.record_error.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_connection_reused_across_calls(self, handler):
+        """Test the cached connection is opened once and reused"""
+        mock_conn = MagicMock()
+        mock_conn.in_transaction = False
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = [('table1',)]
+        mock_conn.cursor.return_value = mock_cursor
+
+        with patch('sqlite3.connect', return_value=mock_conn) as mock_connect:
+            await handler.get_tables()
+            await handler.get_tables()
+            assert await handler.test_connection() is True
+
+            mock_connect.assert_called_once()
+            assert mock_connect.call_args.kwargs['check_same_thread'] is False
+            mock_conn.close.assert_not_called()
+
+        # Configured PRAGMAs are applied once when the connection is opened
+        pragma_calls = [c for c in mock_conn.execute.call_args_list if c.args[0].startswith("PRAGMA")]
+        assert [c.args[0] for c in pragma_calls] == handler.config.pragmas.get_statements()
+
+    @pytest.mark.asyncio
+    async def test_read_only_connection_skips_journal_mode(self, handler):
+        """Test journal_mode is not changed on read-only connections"""
+        handler.config.read_only = True
+        handler.config.pragmas.journal_mode = 'WAL'
+        mock_conn = MagicMock()
+
+        with patch('sqlite3.connect', return_value=mock_conn) as mock_connect:
+            await handler.test_connection()
+
+            assert mock_connect.call_args.kwargs['database'].endswith('?mode=ro')
+            executed = [c.args[0] for c in mock_conn.execute.call_args_list]
+            assert not any(sql.startswith("PRAGMA journal_mode") for sql in executed)
+            assert "PRAGMA busy_timeout = 5000" in executed
+
+    @pytest.mark.asyncio
+    async def test_open_transaction_rolled_back(self, handler):
+        """Test a failed query does not leave the cached connection in a transaction"""
+        mock_conn = MagicMock()
+        mock_conn.in_transaction = True
+        mock_cursor = MagicMock()
+        mock_cursor.execute.side_effect = sqlite3.Error('constraint failed')
+        mock_conn.cursor.return_value = mock_cursor
+
+        with patch('sqlite3.connect', return_value=mock_conn):
+            with pytest.raises(ConnectionHandlerError):
+                await handler._execute_query('DELETE FROM users')
+
+            mock_conn.rollback.assert_called_once()
+            assert handler._connection is mock_conn
+
+    @pytest.mark.asyncio
+    async def test_query_timeout_interrupts_statement(self, handler, tmp_path):
+        """Test the progress handler stops a query running past query_timeout"""
+        handler.config.path = str(tmp_path / "test.db")
+        handler.config.query_timeout = 0.2
+        handler.stats = ResourceStats()
+        sql = ("SELECT count(*) FROM (WITH RECURSIVE n(i) AS "
+               "(SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 1000000000) SELECT i FROM n)")
+
+        try:
+            with pytest.raises(ConnectionHandlerError, match="interrupted"):
+                await handler.execute_query(sql)
+
+            # The cached connection is usable afterwards
+            assert "'count': 1" in await handler.execute_query("SELECT 1 AS count")
+        finally:
+            handler._connection.close()
+            handler.shutdown_executor()
+
+    @pytest.mark.asyncio
+    async def test_open_cursor_cancelled_closes_connection(self, handler, mock_conn):
+        """Test a cursor cancelled before its statement starts closes its connection"""
+        query = QueryContext()
+        query.cancel()
+        token = current_query.set(query)
+        try:
+            with patch.object(handler, '_connect', return_value=mock_conn), \
+                 pytest.raises(ConnectionHandlerError, match="Query cancelled"):
+                await handler._open_cursor("SELECT 1", 300)
+        finally:
+            current_query.reset(token)
+            handler.shutdown_executor()
+
+        mock_conn.close.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_max_rows_truncates_result(self, handler, tmp_path):
+        """Test reading stops at max_rows and the result is marked truncated"""
+        handler.config.path = str(tmp_path / "test.db")
+        handler.config.max_rows = 3
+        handler.stats = ResourceStats()
+        sql = "SELECT i FROM (WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 10) SELECT i FROM n)"
+
+        try:
+            result = await handler.execute_query(sql)
+            assert "'rows': [{'i': 1}, {'i': 2}, {'i': 3}]" in result
+            assert "'row_count': 3, 'truncated': True" in result
+
+            handler.config.max_rows = 10
+            assert "'row_count': 10, 'truncated': False" in await handler.execute_query(sql)
+        finally:
+            handler._connection.close()
+            handler.shutdown_executor()
+
+    @pytest.mark.asyncio
+    async def test_result_cache(self, handler, tmp_path):
+        """Test repeated queries are served from the cache until a write touches their table"""
+        db_path = tmp_path / "test.db"
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE items (id INTEGER)")
+        conn.commit()
+        handler.config.path = str(db_path)
+        handler.config.cache = CacheConfig()
+        handler.config.writable = True
+        handler.stats = ResourceStats()
+
+        try:
+            assert "'row_count': 0" in await handler.execute_query("SELECT id FROM items")
+            conn.execute("INSERT INTO items VALUES (1)")
+            conn.commit()
+
+            # 绕过服务端的写入在缓存过期前不可见
+            assert "'row_count': 0" in await handler.execute_query("SELECT  id\nFROM items;")
+            assert (handler.stats.cache_hits, handler.stats.cache_misses) == (1, 1)
+
+            # 不同的结果格式单独缓存
+            token = requested_format.set("json")
+            try:
+                assert json.loads(await handler.execute_query("SELECT id FROM items"))["rows"] == [{"id": 1}]
+            finally:
+                requested_format.reset(token)
+
+            with patch('mcp_dbutils.base.log_write_operation'):
+                await handler.execute_write_query("INSERT INTO items VALUES (2)")
+            assert "'row_count': 2" in await handler.execute_query("SELECT id FROM items")
+            assert (handler.stats.cache_hits, handler.stats.cache_misses) == (1, 3)
+        finally:
+            conn.close()
+            handler._connection.close()
+            handler.shutdown_executor()
+
+    @pytest.mark.asyncio
+    async def test_metadata_cache(self, handler, tmp_path):
+        """Test metadata is served from the cache until the schema version changes"""
+        db_path = tmp_path / "test.db"
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE items (id INTEGER)")
+        conn.commit()
+        handler.config.path = str(db_path)
+        handler.config.metadata_cache = MetadataCacheConfig()
+        handler.stats = ResourceStats()
+
+        try:
+            assert [table.name for table in await handler.get_tables()] == ["items schema"]
+            description = await handler.get_table_description("items")
+            assert await handler.get_table_description("items") == description
+            assert len(await handler.get_tables()) == 1
+            assert (handler.stats.metadata_cache_hits, handler.stats.metadata_cache_misses) == (2, 2)
+
+            # 其他连接执行的DDL改变schema_version，缓存失效
+            conn.execute("ALTER TABLE items ADD COLUMN name TEXT")
+            conn.execute("CREATE TABLE orders (id INTEGER)")
+            conn.commit()
+            assert "name" in await handler.get_table_description("items")
+            assert len(await handler.get_tables()) == 2
+            assert handler.stats.metadata_cache_misses == 4
+        finally:
+            conn.close()
+            handler._connection.close()
+            handler.shutdown_executor()
+
+    @pytest.mark.asyncio
+    async def test_shared_cache(self, handler, tmp_path):
+        """Test a second handler, as in another process, reads what the first cached"""
+        db_path = tmp_path / "test.db"
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE items (id INTEGER)")
+        conn.commit()
+        with patch('os.path.exists', return_value=True), \
+             patch('builtins.open', MagicMock()), \
+             patch('yaml.safe_load', return_value={
+                 'connections': {'test_sqlite': {'type': 'sqlite', 'path': str(db_path)}}
+             }):
+            handlers = [handler, SQLiteHandler('config.yaml', 'test_sqlite')]
+        for item in handlers:
+            item.log = MagicMock()
+            item.config.path = str(db_path)
+            item.config.cache = CacheConfig()
+            item.config.metadata_cache = MetadataCacheConfig()
+            item.stats = ResourceStats()
+            item.shared_cache = SharedCache(str(tmp_path / "shared.sqlite3"), 1024 * 1024, 1024)
+
+        try:
+            await handlers[0].execute_query("SELECT id FROM items")
+            await handlers[0].get_tables()
+            conn.execute("INSERT INTO items VALUES (1)")
+            conn.commit()
+
+            assert "'row_count': 0" in await handlers[1].execute_query("SELECT id FROM items")
+            assert [table.name for table in await handlers[1].get_tables()] == ["items schema"]
+            assert handlers[1].stats.shared_cache_hits == 2
+
+            # 写入使所有进程缓存的结果失效
+            with patch('mcp_dbutils.base.log_write_operation'):
+                handlers[0].config.writable = True
+                await handlers[0].execute_write_query("INSERT INTO items VALUES (2)")
+            handlers[1]._result_cache.clear()
+            assert "'row_count': 2" in await handlers[1].execute_query("SELECT id FROM items")
+        finally:
+            conn.close()
+            for item in handlers:
+                item.shared_cache.close()
+                item._connection.close()
+                item.shutdown_executor()
+
+    @pytest.mark.asyncio
+    async def test_result_bytes_budget(self, handler, tmp_path):
+        """Test long cells are cut and reading stops once the byte budget is spent"""
+        handler.config.path = str(tmp_path / "test.db")
+        handler.config.max_cell_bytes = 100
+        handler.config.max_result_bytes = 1000
+        handler.stats = ResourceStats()
+        token = requested_format.set("json")
+        sql = "SELECT i, printf('%.500c', 'x') AS text FROM (WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 100) SELECT i FROM n)"
+
+        try:
+            result = await handler.execute_query(sql)
+        finally:
+            requested_format.reset(token)
+            handler._connection.close()
+            handler.shutdown_executor()
+
+        data = json.loads(result)
+        assert 1 < data["row_count"] < 100
+        assert data["truncated"] is True
+        assert data["truncated_reason"] == "max_result_bytes"
+        assert data["rows"][0]["text"] == "x" * 100 + TRUNCATION_MARKER
+        assert data["truncated_cells"][0] == {"row": 0, "column": "text", "bytes": 500}
+        assert len(data["truncated_cells"]) == data["row_count"]
+        # 统计的是实际返回的字节数
+        assert handler.stats.estimated_memory == len(result)
+
+    @pytest.mark.asyncio
+    async def test_json_result_format(self, handler, tmp_path):
+        """Test results are returned as JSON when requested"""
+        handler.config.path = str(tmp_path / "test.db")
+        handler.stats = ResourceStats()
+        token = requested_format.set("json")
+
+        try:
+            result = json.loads(await handler.execute_query("SELECT 1 AS id, x'00ff' AS data, 'é' AS name"))
+        finally:
+            requested_format.reset(token)
+            handler._connection.close()
+            handler.shutdown_executor()
+
+        assert result["rows"] == [{"id": 1, "data": "AP8=", "name": "é"}]
+        assert result["truncated"] is False
+
+    @pytest.mark.asyncio
+    async def test_columnar_result_format(self, handler, tmp_path):
+        """Test columnar results list column names once and rows as arrays"""
+        handler.config.path = str(tmp_path / "test.db")
+        handler.stats = ResourceStats()
+        token = requested_format.set("columnar")
+
+        try:
+            result = json.loads(await handler.execute_query(
+                "SELECT 1 AS id, 'a' AS name UNION ALL SELECT 2, x'00ff'"
+            ))
+        finally:
+            requested_format.reset(token)
+            handler._connection.close()
+            handler.shutdown_executor()
+
+        assert result["columns"] == ["id", "name"]
+        assert result["rows"] == [[1, "a"], [2, "AP8="]]
+        assert result["row_count"] == 2
@@ -74,6 +74,28 @@ def test_error_tracking():
     assert stats.error_types["DatabaseError"] == 2
     assert stats.error_types["ConfigurationError"] == 1
 
+def test_queue_tracking():
+    """Test admission queue tracking"""
+    stats = ResourceStats()
+
+    stats.record_queued()
+    stats.record_queued()
+    assert stats.queue_depth == 2
+    assert stats.peak_queue_depth == 2
+
+    stats.record_dequeued(0.5)
+    stats.record_dequeued(1.5, admitted=False)
+    stats.record_rejection()
+    assert stats.queue_depth == 0
+    assert stats.peak_queue_depth == 2
+    assert stats.queue_waits == [0.5, 1.5]
+    assert stats.rejected_requests == 2
+
+    data = stats.to_dict()
+    assert data["queue_wait_ms"] == {"avg": 1000, "max": 1500}
+    assert data["rejected_requests"] == 2
+    assert "Queue: depth=0, peak=2, rejected=2" in stats.get_performance_stats()
+
 def test_stats_serialization():
     """Test statistics serialization to dict"""
     stats = ResourceStats()